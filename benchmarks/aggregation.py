@@ -0,0 +1,120 @@
+"""
+Kafka volume and cost of raw readings versus client-side windowed aggregation.
+
+Ten minutes of 100 Hz vibration readings per sensor are logged with and without 60 s
+tumbling windows (and 60 s windows sliding by 10 s); one second per minute is WARNING and
+passes through immediately. The rollups are checked against statistics computed from the raw data.
+
+Run from the repository root:
+
+    python -m benchmarks.aggregation
+"""
+import array
+import asyncio
+import json
+import math
+import statistics
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.processing.aggregation import WindowAggregation
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+SENSORS = 4
+RATE = 100
+SECONDS = 600
+# Windows are aligned to the epoch, so start on a minute boundary.
+START = 1_699_999_980.0
+
+
+def readings(sensor):
+    count = RATE * SECONDS
+    timestamps = array.array("d", (START + i / RATE for i in range(count)))
+    measurements = array.array("d", (50.0 + sensor + 5.0 * math.sin(i / 37.0) for i in range(count)))
+    return timestamps, measurements
+
+
+async def run(log_directory, aggregation):
+    producer = FakeProducer()
+    logger = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=producer,
+        file_format="ndjson",
+        aggregation=aggregation,
+    )
+    await logger.initialize()
+
+    start = time.perf_counter()
+    for sensor in range(SENSORS):
+        logger.sensor_id = f"sensor-{sensor}"
+        timestamps, measurements = readings(sensor)
+        for offset in range(0, len(measurements), RATE):
+            # One second of WARNING readings per minute, the rest NORMAL.
+            status = Status.WARNING if offset % (60 * RATE) == 30 * RATE else Status.NORMAL
+            await logger.log_batch(
+                VibrationLogData,
+                measurements[offset:offset + RATE],
+                timestamps=timestamps[offset:offset + RATE],
+                durations=1.0 / RATE,
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                product=Product.MACHINE_MONITORING,
+                status=status,
+            )
+    await logger.close()
+    elapsed = time.perf_counter() - start
+    return producer.messages, elapsed
+
+
+def check_tumbling(messages):
+    """
+    Compares every 60 s rollup of sensor-0 with the statistics of its raw readings.
+    """
+    _, measurements = readings(0)
+    window = 60 * RATE
+    rollups = [
+        record for record in map(json.loads, messages)
+        if record["sensor_id"] == "sensor-0" and "aggregation" in record["metadata"]
+    ]
+    assert len(rollups) == SECONDS // 60, len(rollups)
+    for index, record in enumerate(rollups):
+        values = measurements[index * window:(index + 1) * window]
+        stats = record["metadata"]["aggregation"]
+        assert stats["count"] == len(values)
+        assert math.isclose(stats["mean"], statistics.fmean(values), rel_tol=1e-9)
+        assert math.isclose(stats["variance"], statistics.pvariance(values), rel_tol=1e-6)
+        assert stats["min"] == min(values) and stats["max"] == max(values)
+        assert record["status"] == Status.WARNING.value
+
+
+async def main():
+    print(f"{SENSORS} sensors x {SECONDS} s at {RATE} Hz = {SENSORS * RATE * SECONDS} readings")
+    with tempfile.TemporaryDirectory() as log_directory:
+        for label, aggregation in (
+            ("raw", None),
+            ("tumbling 60s", {SensorType.VIBRATION: WindowAggregation(60.0)}),
+            ("sliding 60/10s", {SensorType.VIBRATION: WindowAggregation(60.0, slide_seconds=10.0)}),
+        ):
+            messages, elapsed = await run(log_directory, aggregation)
+            size = sum(len(message) for message in messages)
+            print(
+                f"{label:>15}: {len(messages):>8} messages  {size / 1024:>9.1f} KiB"
+                f"  {elapsed:6.2f} s"
+            )
+            if label == "tumbling 60s":
+                check_tumbling(messages)
+    print("tumbling rollups match the raw statistics")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
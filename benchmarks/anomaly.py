@@ -0,0 +1,160 @@
+"""
+Cost and accuracy of edge anomaly detection on synthetic vibration traces.
+
+Every sensor reports 1 kHz vibration around its own level with Gaussian noise and a slow
+drift. Spikes of 8 standard deviations are injected at random, plus one level shift per
+sensor that crosses the fixed CRITICAL threshold. Reports:
+
+    per reading     AnomalyDetector.process one reading at a time, and NumPy over arrays
+    detection       injected spikes found and false positives on the rest of the trace
+    batch path      process_batch (NumPy) gives the same statuses as process one by one
+    end to end      log_batch through LoggerConfig(anomaly=...) into a memory sink
+
+Run from the repository root:
+
+    python -m benchmarks.anomaly
+"""
+import asyncio
+import random
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.processing.anomaly import AnomalyDetector, AnomalyRule
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.transport.sinks.memory_sink import MemorySink
+
+SENSORS = 10
+READINGS = 20000
+SPIKES = 20
+START = 1_767_225_600.0
+
+FIELDS = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+
+def rules():
+    return {SensorType.VIBRATION: AnomalyRule(critical_above=20.0, alpha=0.01, warning_z=4.0, critical_z=6.0, warmup=200)}
+
+
+def trace(sensor):
+    """
+    Returns the readings of a sensor and the indexes of the injected spikes.
+    """
+    rng = random.Random(sensor)
+    level = rng.uniform(3.0, 6.0)
+    readings = [level + 0.5 * (i / READINGS) + rng.gauss(0.0, 0.2) for i in range(READINGS)]
+    spikes = sorted(rng.sample(range(1000, READINGS - 2000), SPIKES))
+    for index in spikes:
+        readings[index] += rng.choice((-8.0, 8.0)) * 0.2
+    for index in range(READINGS - 1000, READINGS - 990):
+        readings[index] = 25.0
+    return readings, spikes
+
+
+def log_objects(sensor, readings):
+    return [
+        VibrationLogData(f"sensor-{sensor:03d}", duration=0.001, measurement=reading, **FIELDS)
+        for reading in readings
+    ]
+
+
+def per_reading(traces):
+    detector = AnomalyDetector(rules())
+    objects = [log_objects(sensor, readings) for sensor, (readings, _) in enumerate(traces)]
+    start = time.perf_counter()
+    for sensor_objects in objects:
+        for log_object in sensor_objects:
+            detector.process(log_object)
+    elapsed = time.perf_counter() - start
+    print(f"per reading: process {elapsed / (SENSORS * READINGS) * 1e6:.2f} us", end="")
+
+    detector = AnomalyDetector(rules())
+    detector.evaluate("warmup", SensorType.VIBRATION, [0.0])  # imports NumPy
+    start = time.perf_counter()
+    for sensor, (readings, _) in enumerate(traces):
+        detector.evaluate(f"sensor-{sensor:03d}", SensorType.VIBRATION, readings)
+    elapsed = time.perf_counter() - start
+    print(f", numpy evaluate {elapsed / (SENSORS * READINGS) * 1e9:.0f} ns")
+    return objects
+
+
+def detection(traces, objects):
+    found = false_positives = 0
+    for (_, spikes), sensor_objects in zip(traces, objects):
+        flagged = {index for index, log_object in enumerate(sensor_objects) if log_object.status is not Status.NORMAL}
+        found += len(flagged & set(spikes))
+        shift = set(range(READINGS - 1000, READINGS - 990))
+        assert shift <= flagged, "the threshold crossing was not flagged"
+        assert all(sensor_objects[index].channel is Channel.ALERT for index in shift)
+        # Readings right after the shift are expected to deviate from the baseline it pulled along.
+        false_positives += len({index for index in flagged - set(spikes) - shift if index < READINGS - 1000})
+    total = SENSORS * SPIKES
+    print(f"detection: {found}/{total} spikes of 8 sigma flagged, {false_positives} false positives in {SENSORS * (READINGS - 1000):,} readings")
+    assert found >= 0.95 * total
+
+
+def batch_path(traces, objects):
+    detector = AnomalyDetector(rules())
+    batched = [log_objects(sensor, readings) for sensor, (readings, _) in enumerate(traces)]
+    start = time.perf_counter()
+    for sensor_objects in batched:
+        for offset in range(0, READINGS, 1000):
+            detector.process_batch(sensor_objects[offset:offset + 1000])
+    elapsed = time.perf_counter() - start
+
+    mismatches = sum(
+        one.status is not other.status or one.channel is not other.channel
+        for sensor_objects, batch_objects in zip(objects, batched)
+        for one, other in zip(sensor_objects, batch_objects)
+    )
+    print(f"batch path: process_batch of 1000 readings {elapsed / (SENSORS * READINGS) * 1e6:.2f} us/reading, {mismatches} statuses differ from process")
+    assert mismatches == 0
+
+
+async def end_to_end(traces):
+    sink = MemorySink()
+    config = LoggerConfig(
+        sensor_id="sensor-000",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        sinks=[sink],
+        anomaly=rules(),
+    )
+    await config.initialize()
+    readings, _ = traces[0]
+    timestamps = [START + i / 1000 for i in range(READINGS)]
+    start = time.perf_counter()
+    for offset in range(0, READINGS, 1000):
+        await config.log_batch(
+            VibrationLogData, readings[offset:offset + 1000], timestamps[offset:offset + 1000], durations=0.001, **FIELDS)
+    elapsed = time.perf_counter() - start
+    counters = config.processing_counters()
+    await config.close()
+
+    records = sink.records()
+    alerts = [record for record in records if record["channel"] == Channel.ALERT.value]
+    assert len(records) == READINGS
+    assert all(record["status"] == Status.CRITICAL.value for record in alerts)
+    print(f"end to end: {elapsed / READINGS * 1e6:.1f} us/reading, {len(alerts)} records on the alert channel, {counters}")
+
+
+def main():
+    traces = [trace(sensor) for sensor in range(SENSORS)]
+    print(f"{SENSORS} sensors x {READINGS:,} readings")
+    objects = per_reading(traces)
+    detection(traces, objects)
+    batch_path(traces, objects)
+    asyncio.run(end_to_end(traces))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Throughput and correctness of re-publishing local log files with log_sdk.backfill.
+
+Log directories are written by a LoggerHub whose Kafka producer is down, in both file
+formats, so the pretty files interleave records with "Machine status updated" and
+"Kafka Error" lines like the backups left by an outage. They are then published to the fake
+producer:
+
+    all records     per parsing mode (on the event loop, 1 and WORKERS processes), records/s
+    filtered        a time window and a subset of the sensors
+    resumed         stopped half way, then resumed from the checkpoint
+    rate limited    with max_rate, the run may not finish early
+
+Every run is checked to deliver exactly the expected records, in order per sensor.
+
+Run from the repository root:
+
+    python -m benchmarks.backfill
+"""
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.suite import scratch_directory
+from log_sdk.backfill import Backfill
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.hub import LoggerHub
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+SENSORS = 20
+BATCHES = 30
+SAMPLES = 100
+WORKERS = 4
+# Samples are one second apart, starting at START (local time).
+START = 1_767_225_600
+
+READING = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+
+async def write_logs(log_directory, file_format):
+    """
+    Logs BATCHES * SAMPLES readings of every sensor, one second apart, through a hub while Kafka is down.
+    """
+    producer = FakeProducer()
+    producer.fail = True
+    hub = LoggerHub(
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=producer,
+        file_format=file_format,
+    )
+    await hub.initialize()
+    sensors = [hub.sensor(f"sensor-{index:03d}") for index in range(SENSORS)]
+    for sensor in sensors:
+        sensor.update_machine_status(Action.START)
+    # Records are built here to stamp them with known times; log_batch would write one-line JSON.
+    for second in range(BATCHES * SAMPLES):
+        for sensor in sensors:
+            await sensor._log(VibrationLogData(
+                sensor.sensor_id,
+                measurement=float(second),
+                duration=1.0,
+                metadata={"machine_status": Action.START.value},
+                timestamp_ns=(START + second) * 1_000_000_000,
+                **READING,
+            ))
+    await hub.close()
+
+
+def check(messages, sensor_ids=None, first=0, last=BATCHES * SAMPLES):
+    """
+    Asserts that messages hold exactly the samples first..last-1 of the sensors, in order per sensor.
+    """
+    sensor_ids = sensor_ids or [f"sensor-{index:03d}" for index in range(SENSORS)]
+    expected = {sensor_id: first for sensor_id in sensor_ids}
+    for payload in messages:
+        record = json.loads(payload)
+        sensor_id = record["sensor_id"]
+        assert record["measurement"] == expected[sensor_id], (record, expected[sensor_id])
+        expected[sensor_id] += 1
+    assert all(count == last for count in expected.values()), expected
+
+
+async def backfill(log_directory, producer=None, **options):
+    producer = producer or FakeProducer()
+    config = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=producer,
+        sinks=["kafka"],
+        batching=True,
+        partition_key="sensor_id",
+    )
+    await config.initialize()
+    runner = Backfill(config, [log_directory], report_interval=None, **options)
+    if hasattr(producer, "backfill"):
+        producer.backfill = runner
+    try:
+        stats = await runner.run()
+    finally:
+        runner.close()
+        await config.close()
+    return stats, producer
+
+
+class StoppingProducer(FakeProducer):
+    """
+    Fake producer stopping the backfill once it received stop_after messages.
+    """
+    def __init__(self, stop_after):
+        super().__init__()
+        self.stop_after = stop_after
+        self.backfill = None
+
+
+    async def _send(self, data, *args, key=None, **kwargs):
+        await super()._send(data, *args, key=key, **kwargs)
+        if len(self.messages) == self.stop_after:
+            self.backfill.stop()
+
+
+async def main():
+    total = SENSORS * BATCHES * SAMPLES
+    with scratch_directory() as scratch:
+        for file_format in ("pretty", "ndjson"):
+            log_directory = os.path.join(scratch, file_format)
+            await write_logs(log_directory, file_format)
+            files = sorted(os.listdir(log_directory))
+            size = sum(os.path.getsize(os.path.join(log_directory, name)) for name in files)
+            print(f"{file_format}: {total:,} records in {len(files)} file(s), {size / 1e6:.1f} MB")
+
+            for name, options in (
+                    ("event loop", dict(executor=None)),
+                    ("1 process", dict(executor="process", workers=1)),
+                    (f"{WORKERS} processes", dict(executor="process", workers=WORKERS))):
+                start = time.perf_counter()
+                stats, producer = await backfill(log_directory, **options)
+                elapsed = time.perf_counter() - start
+                check(producer.messages)
+                assert stats.records == total
+                print(f"  all records   {name:>11}: {total / elapsed:>9,.0f} records/s")
+
+            # The second third of the samples of half the sensors.
+            sensor_ids = [f"sensor-{index:03d}" for index in range(0, SENSORS, 2)]
+            first, last = BATCHES * SAMPLES // 3, 2 * BATCHES * SAMPLES // 3
+            stats, producer = await backfill(
+                log_directory,
+                executor="process",
+                workers=WORKERS,
+                sensor_ids=sensor_ids,
+                since=time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(START + first)),
+                until=time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(START + last)),
+            )
+            check(producer.messages, sensor_ids, first, last)
+            print(f"  filtered: {stats.records:,} records published, {stats.filtered:,} filtered out")
+
+            checkpoint = os.path.join(scratch, f"{file_format}.checkpoint.json")
+            first_run, stopped = await backfill(
+                log_directory, producer=StoppingProducer(total // 2), executor="process", checkpoint=checkpoint)
+            second_run, resumed = await backfill(log_directory, executor="process", checkpoint=checkpoint)
+            check(stopped.messages + resumed.messages)
+            print(
+                f"  resumed: {first_run.records:,} records before the stop, "
+                f"{second_run.records:,} after resuming ({second_run.resumed:,} skipped), no duplicates"
+            )
+
+            max_rate = 20000
+            stats, producer = await backfill(log_directory, executor="process", max_rate=max_rate)
+            check(producer.messages)
+            assert stats.elapsed >= total / max_rate
+            print(
+                f"  rate limited to {max_rate:,}/s: {stats.elapsed:.2f} s "
+                f"(at least {total / max_rate:.2f} s, parsing the first file included)\n"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""
+Overload policies of the send buffer against a broker slower than the log rate.
+
+Records with a realistic status mix (mostly NORMAL, some WARNING, few CRITICAL/FAULT and
+alert channel records) are logged as fast as possible into a fake producer that accepts
+one batch every ROUND_TRIP seconds. For every policy the suite reports the caller latency,
+the peak buffer memory against its byte budget, and how many records of each status were
+delivered and shed.
+
+Run from the repository root:
+
+    python -m benchmarks.backpressure
+"""
+import asyncio
+import json
+import random
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from tests.fakes import FakeProducer
+
+RECORDS = 20000
+ROUND_TRIP = 0.02
+BUDGET = 256 * 1024
+
+MIX = [
+    (Status.NORMAL, Channel.SENSOR, 0.90),
+    (Status.WARNING, Channel.SENSOR, 0.07),
+    (Status.CRITICAL, Channel.SENSOR, 0.015),
+    (Status.FAULT, Channel.SENSOR, 0.01),
+    (Status.WARNING, Channel.ALERT, 0.005),
+]
+
+
+def workload(seed=1):
+    rng = random.Random(seed)
+    choices = [(status, channel) for status, channel, _ in MIX]
+    weights = [weight for *_, weight in MIX]
+    return rng.choices(choices, weights, k=RECORDS)
+
+
+def label(status, channel):
+    return "Alert" if channel is Channel.ALERT else status.value
+
+
+async def run(policy, records, log_directory, **options):
+    producer = FakeProducer(latency=ROUND_TRIP)
+    logger = LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=producer,
+        file_format="ndjson",
+        batching=True,
+        batch_size=200,
+        max_queue_bytes=BUDGET,
+        overload_policy=policy,
+        **options,
+    )
+    await logger.initialize()
+
+    latencies = []
+    peak = 0
+    start = time.perf_counter()
+    for status, channel in records:
+        t0 = time.perf_counter()
+        await logger.log_vibration(
+            channel=channel,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=4.5,
+            product=Product.MACHINE_MONITORING,
+            status=status,
+        )
+        latencies.append(time.perf_counter() - t0)
+        peak = max(peak, logger.batch_sender.nbytes)
+        # Yield to the drain task like a sensor read would.
+        await asyncio.sleep(0)
+    logging_time = time.perf_counter() - start
+    shed = logger.shed_counters()
+    await logger.close()
+
+    delivered = {}
+    for message in producer.messages:
+        record = json.loads(message)
+        key = "Alert" if record["channel"] == Channel.ALERT.value else record["status"]
+        delivered[key] = delivered.get(key, 0) + 1
+
+    latencies.sort()
+    return {
+        "logging_time": logging_time,
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "max": latencies[-1],
+        "peak": peak,
+        "delivered": delivered,
+        "shed": shed,
+    }
+
+
+async def main():
+    records = workload()
+    logged = {}
+    for status, channel in records:
+        logged[label(status, channel)] = logged.get(label(status, channel), 0) + 1
+    print(f"{RECORDS} records {logged}, broker accepts 200 records per {ROUND_TRIP * 1e3:.0f} ms, budget {BUDGET // 1024} KiB")
+
+    configurations = [
+        ("block", {}),
+        ("block", {"block_timeout": 0.001}),
+        ("drop_newest", {}),
+        ("drop_oldest", {}),
+        ("drop_priority", {}),
+    ]
+    with tempfile.TemporaryDirectory() as log_directory:
+        for policy, options in configurations:
+            result = await run(policy, records, log_directory, **options)
+            name = policy + (f" {options['block_timeout'] * 1e3:.0f} ms" if options else "")
+            print(
+                f"{name:>13}: logged in {result['logging_time']:5.2f} s  "
+                f"p99 {result['p99'] * 1e3:6.2f} ms  max {result['max'] * 1e3:6.1f} ms  "
+                f"peak buffer {result['peak'] / 1024:5.0f} KiB"
+            )
+            print(f"{'':>15}delivered {result['delivered']}")
+            print(f"{'':>15}shed      {result['shed']}")
+            assert result["peak"] <= BUDGET
+
+            if policy == "drop_priority":
+                # Alarms always get through.
+                for key in ("Critical", "Fault", "Alert"):
+                    assert result["delivered"].get(key, 0) == logged[key], (key, result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
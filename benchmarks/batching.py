@@ -0,0 +1,71 @@
+"""
+Compares awaited per-record sends with the batching send pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.batching
+"""
+import asyncio
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from tests.fakes import FakeProducer
+
+RECORDS = 20000
+ROUND_TRIP = 0.0005
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(batching: bool, log_directory: str):
+    producer = FakeProducer(latency=ROUND_TRIP)
+    logger = LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=producer,
+        batching=batching,
+    )
+    await logger.initialize()
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        t0 = time.perf_counter()
+        await logger.log_vibration(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=float(i),
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+        latencies.append(time.perf_counter() - t0)
+    await logger.close()
+    elapsed = time.perf_counter() - start
+
+    assert len(producer.messages) == RECORDS
+    print(
+        f"{'batched' if batching else 'awaited':>8}: {RECORDS / elapsed:>10.0f} records/s  "
+        f"p50 {percentile(latencies, 50) * 1e6:8.1f} us  p99 {percentile(latencies, 99) * 1e6:8.1f} us"
+    )
+
+
+async def main():
+    print(f"{RECORDS} records, simulated produce round trip {ROUND_TRIP * 1e3:.1f} ms")
+    with tempfile.TemporaryDirectory() as log_directory:
+        await run(False, log_directory)
+        await run(True, log_directory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Disk usage and logging cost of compressing rotated log files in the background.
+
+About 60 MB of pretty-printed records (six 10 MB rotations) are logged without compression,
+with gzip and with zstd (if zstandard is installed). Reports the per-call latency, the bytes
+left on disk and the time to stream every record back with the readers, then checks that a
+byte budget bounds the directory size.
+
+Run from the repository root:
+
+    python -m benchmarks.compression
+"""
+import asyncio
+import glob
+import os
+import statistics
+import tempfile
+import time
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.storage.readers import iter_directory
+
+RECORDS = 150000
+
+
+def disk_usage(directory):
+    return sum(os.path.getsize(path) for path in glob.glob(os.path.join(directory, "*")))
+
+
+async def run(log_directory, **options):
+    logger = LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        kafka_enabled=False,
+        log_directory=log_directory,
+        **options,
+    )
+    logger.update_machine_status(Action.START)
+    latencies = []
+    for i in range(RECORDS):
+        start = time.perf_counter()
+        await logger.log_vibration(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=i * 0.01,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+        latencies.append(time.perf_counter() - start)
+    await logger.close()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.999)]
+
+
+def zstd_available():
+    try:
+        import zstandard
+    except ImportError:
+        return False
+    return zstandard is not None
+
+
+async def main():
+    print(f"{RECORDS} pretty records")
+    configurations = [("none", {}), ("gzip", {"compression": "gzip"})]
+    if zstd_available():
+        configurations.append(("zstd", {"compression": "zstd"}))
+
+    for label, options in configurations:
+        with tempfile.TemporaryDirectory() as log_directory:
+            p50, p999 = await run(log_directory, **options)
+            usage = disk_usage(log_directory)
+
+            start = time.perf_counter()
+            count = sum(1 for _ in iter_directory(log_directory))
+            read = time.perf_counter() - start
+            print(
+                f"{label:>5}: p50 {p50 * 1e6:5.1f} us  p99.9 {p999 * 1e6:6.1f} us  "
+                f"{usage / 2**20:6.1f} MiB on disk  read back {count} records in {read:5.2f} s"
+            )
+            # Six rotations stay within the default retention of 12 rotated files.
+            assert count == RECORDS, count
+
+    with tempfile.TemporaryDirectory() as log_directory:
+        budget = 2**19
+        await run(log_directory, compression="gzip", retention_bytes=budget)
+        rotated = sum(
+            os.path.getsize(path) for path in glob.glob(os.path.join(log_directory, "*.log.*"))
+        )
+        kept = len(glob.glob(os.path.join(log_directory, "*.log.*")))
+        print(f"gzip with a {budget // 1024} KiB budget: {kept} rotated files, {rotated // 1024} KiB kept")
+        assert rotated <= budget
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Throughput of the original poll/decode/print loop versus the batched ConsumerRunner.
+
+Both read from an in-process fake consumer, so no broker is needed. The runner is measured
+with inline, thread pool and process pool decoding into an NDJSON file and with a SQLite
+sink; afterwards the committed offsets and the sink contents are checked against the input.
+
+Run from the repository root:
+
+    python -m benchmarks.consumer
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.consumer.runner import ConsumerRunner
+from log_sdk.consumer.sinks import CallbackSink, NdjsonFileSink, SQLiteSink
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.serializers import get_serializer
+from tests.fakes import FakeConsumer
+
+MESSAGES = 200000
+# Every ERROR_EVERY-th message is a broker error and every CORRUPT_EVERY-th payload is garbage.
+ERROR_EVERY = 10007
+CORRUPT_EVERY = 20011
+
+
+def make_payloads(serializer):
+    serializer = get_serializer(serializer)
+    payloads = []
+    for i in range(MESSAGES):
+        if i % ERROR_EVERY == ERROR_EVERY - 1:
+            payloads.append(None)
+        elif i % CORRUPT_EVERY == CORRUPT_EVERY - 1:
+            payloads.append(b"{not json")
+        else:
+            payloads.append(serializer.dumps(VibrationLogData(
+                sensor_id=f"sensor-{i % 50}",
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                duration=1.0,
+                measurement=i * 0.25,
+                product=Product.MACHINE_MONITORING,
+                status=Status.NORMAL,
+                metadata={"machine_status": "Start", "uptime": float(i)},
+            ).to_dict()))
+    return payloads
+
+
+def expected_records(payloads):
+    return sum(1 for payload in payloads if payload is not None and payload != b"{not json")
+
+
+def poll_loop(payloads, path):
+    """
+    The original consumer.py loop, printing to a file instead of the terminal.
+    """
+    from log_sdk.serializers import decode
+
+    consumer = FakeConsumer(payloads)
+    start = time.perf_counter()
+    with open(path, "w") as out:
+        while consumer.position < len(consumer.messages):
+            (msg,) = consumer.consume(1, 1.0)
+            if msg.error():
+                continue
+            try:
+                print(f"Received Message: {json.dumps(decode(msg.value()))}", file=out)
+            except ValueError:
+                continue
+    return time.perf_counter() - start
+
+
+def run_runner(payloads, sink, executor):
+    consumer = FakeConsumer(payloads)
+    events = []
+
+    # Record the order of sink flushes and offset commits.
+    commit = consumer.commit
+    consumer.commit = lambda **kwargs: (events.append(("commit", consumer.position)), commit(**kwargs))
+    flush_check = CallbackSink(lambda records: None, on_flush=lambda: events.append(("flush", consumer.position)))
+
+    runner = ConsumerRunner(
+        consumer,
+        [sink, flush_check],
+        batch_size=1000,
+        executor=executor,
+        commit_interval=0.2,
+        report_interval=None,
+    )
+    # The runner logs every error record; keep the benchmark output readable.
+    runner.logger.disabled = True
+    start = time.perf_counter()
+    runner.run(idle_timeout=0.0)
+    elapsed = time.perf_counter() - start
+    stats = runner.stats
+    runner.close()
+
+    assert consumer.committed == len(payloads), (consumer.committed, len(payloads))
+    for previous, event in zip(events, events[1:]):
+        if event[0] == "commit":
+            assert previous == ("flush", event[1]), "offsets committed before the sinks were flushed"
+    return elapsed, stats
+
+
+def main():
+    for serializer in ("json", "binary"):
+        payloads = make_payloads(serializer)
+        expected = expected_records(payloads)
+        print(f"{MESSAGES} {serializer} messages ({expected} valid)")
+
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed = poll_loop(payloads, os.path.join(directory, "print.log"))
+            print(f"{'poll loop':>24}: {MESSAGES / elapsed:>9.0f} msg/s")
+
+            for executor in (None, "thread", "process"):
+                path = os.path.join(directory, f"{executor}.ndjson")
+                elapsed, stats = run_runner(payloads, NdjsonFileSink(path), executor)
+                with open(path) as written:
+                    assert sum(1 for _ in written) == expected == stats.records
+                print(
+                    f"{'runner ndjson ' + str(executor):>24}: {MESSAGES / elapsed:>9.0f} msg/s"
+                    f"  ({stats.errors} errors, {stats.commits} commits)"
+                )
+
+            path = os.path.join(directory, "records.db")
+            elapsed, stats = run_runner(payloads, SQLiteSink(path), "thread")
+            with sqlite3.connect(path) as connection:
+                (rows,) = connection.execute("SELECT COUNT(*) FROM sensor_logs").fetchone()
+            assert rows == expected
+            print(f"{'runner sqlite thread':>24}: {MESSAGES / elapsed:>9.0f} msg/s  ({stats.commits} commits)")
+
+
+if __name__ == "__main__":
+    main()
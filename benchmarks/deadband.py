@@ -0,0 +1,96 @@
+"""
+Kafka volume with and without deadband filtering of slowly changing sensors.
+
+A day of 1 Hz pressure readings per sensor that mostly hover around a set point (with
+small noise and an occasional step) is logged raw and through a 0.05 bar deadband with a
+60 s heartbeat. Reports messages sent, the filter counters and the cost per reading.
+
+Run from the repository root:
+
+    python -m benchmarks.deadband
+"""
+import array
+import asyncio
+import random
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.processing.deadband import Deadband
+from log_sdk.sensor_logs.pressure import PressureLogData
+from tests.fakes import FakeProducer
+
+SENSORS = 4
+SECONDS = 24 * 3600
+BATCH = 3600
+START = 1_700_000_000.0
+
+
+def readings(sensor):
+    rng = random.Random(sensor)
+    set_point = 5.0
+    measurements = array.array("d")
+    for second in range(SECONDS):
+        if second % 3600 == 0:
+            set_point += rng.choice((-0.5, 0.0, 0.5))
+        measurements.append(round(set_point + rng.gauss(0.0, 0.01), 3))
+    timestamps = array.array("d", (START + second for second in range(SECONDS)))
+    return timestamps, measurements
+
+
+async def run(log_directory, deadband):
+    producer = FakeProducer()
+    logger = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=producer,
+        file_format="ndjson",
+        deadband=deadband,
+    )
+    await logger.initialize()
+
+    elapsed = 0.0
+    for sensor in range(SENSORS):
+        logger.sensor_id = f"sensor-{sensor}"
+        timestamps, measurements = readings(sensor)
+        start = time.perf_counter()
+        for offset in range(0, SECONDS, BATCH):
+            await logger.log_batch(
+                PressureLogData,
+                measurements[offset:offset + BATCH],
+                timestamps=timestamps[offset:offset + BATCH],
+                durations=1.0,
+                channel=Channel.SENSOR,
+                data_center=DataCenter.POWER_PLANT,
+                product=Product.POWER_PLANT,
+                status=Status.NORMAL,
+            )
+        elapsed += time.perf_counter() - start
+    await logger.close()
+    return len(producer.messages), logger.processing_counters(), elapsed
+
+
+async def main():
+    readings_total = SENSORS * SECONDS
+    print(f"{SENSORS} sensors x {SECONDS} s at 1 Hz = {readings_total} readings")
+    with tempfile.TemporaryDirectory() as log_directory:
+        for label, deadband in (
+            ("raw", None),
+            ("deadband 0.05", {PressureLogData: Deadband(absolute=0.05, max_silence_seconds=60.0)}),
+            ("deadband 1%", {PressureLogData: Deadband(percent=1.0, max_silence_seconds=60.0)}),
+        ):
+            messages, counters, elapsed = await run(log_directory, deadband)
+            print(
+                f"{label:>14}: {messages:>7} messages ({readings_total / messages:5.1f}x fewer)"
+                f"  {elapsed / readings_total * 1e6:5.2f} us/reading  {counters}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
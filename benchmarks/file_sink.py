@@ -0,0 +1,76 @@
+"""
+Compares the synchronous pretty-printed file sink with the threaded NDJSON sink.
+
+Reports the time each log call spends on the event loop and the bytes written to disk.
+
+Run from the repository root:
+
+    python -m benchmarks.file_sink
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+
+RECORDS = 50000
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def directory_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+async def run(label, **options):
+    with tempfile.TemporaryDirectory() as log_directory:
+        logger = LoggerConfig(
+            sensor_id="bench-sensor",
+            KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+            KAFKA_TOPIC="sensor_logs",
+            kafka_enabled=False,
+            log_directory=log_directory,
+            **options,
+        )
+
+        latencies = []
+        start = time.perf_counter()
+        for i in range(RECORDS):
+            t0 = time.perf_counter()
+            await logger.log_vibration(
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                duration=1.0,
+                measurement=float(i),
+                product=Product.MACHINE_MONITORING,
+                status=Status.NORMAL,
+            )
+            latencies.append(time.perf_counter() - t0)
+        on_loop = time.perf_counter() - start
+        await logger.close()
+        total = time.perf_counter() - start
+
+        print(
+            f"{label:>16}: loop {on_loop:6.2f} s  p50 {percentile(latencies, 50) * 1e6:6.1f} us  "
+            f"p99 {percentile(latencies, 99) * 1e6:7.1f} us  total {total:6.2f} s  "
+            f"{directory_size(log_directory) / RECORDS:6.1f} bytes/record"
+        )
+
+
+async def main():
+    print(f"{RECORDS} records, file only")
+    await run("sync pretty")
+    await run("sync ndjson", file_format="ndjson")
+    await run("threaded ndjson", file_format="ndjson", async_file_sink=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
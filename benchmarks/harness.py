@@ -0,0 +1,190 @@
+"""
+Measurement helpers shared by the benchmark suite.
+
+Every stage is timed call by call with perf_counter_ns (minus the calibrated timer
+overhead) to get latency percentiles, and once more under tracemalloc with every result
+kept alive to count the memory blocks and bytes each call leaves allocated.
+"""
+import gc
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def timer_overhead_ns(samples=100000):
+    """
+    Median cost of one perf_counter_ns pair, subtracted from every timed call.
+    """
+    clock = time.perf_counter_ns
+    durations = []
+    for _ in range(samples):
+        start = clock()
+        durations.append(clock() - start)
+    durations.sort()
+    return durations[len(durations) // 2]
+
+
+async def _time_calls(operation, iterations, overhead):
+    clock = time.perf_counter_ns
+    durations = [0] * iterations
+    is_async = inspect.iscoroutinefunction(operation)
+    total_start = clock()
+    for i in range(iterations):
+        start = clock()
+        if is_async:
+            await operation()
+        else:
+            operation()
+        durations[i] = clock() - start - overhead
+    total = clock() - total_start
+    return durations, total
+
+
+async def _allocations(operation, iterations):
+    is_async = inspect.iscoroutinefunction(operation)
+    kept = [None] * iterations
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    bytes_before, _ = tracemalloc.get_traced_memory()
+    for i in range(iterations):
+        kept[i] = (await operation()) if is_async else operation()
+    bytes_after, _ = tracemalloc.get_traced_memory()
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+    del kept
+    return (blocks_after - blocks_before) / iterations, (bytes_after - bytes_before) / iterations
+
+
+async def measure(operation, iterations=100000, rounds=3, warmup=1000, allocation_iterations=10000, overhead=0):
+    """
+    Times a callable or coroutine function and counts what each call leaves allocated.
+
+    The timed calls are split into rounds and the fastest round is reported, which keeps
+    interference from other processes on a shared machine out of the comparison.
+
+    :param operation: Zero-argument function or coroutine function running one operation.
+    :param iterations: Number of timed calls per round.
+    :param rounds: Number of timing rounds.
+    :param warmup: Number of untimed calls first (caches, lazy imports, file creation).
+    :param allocation_iterations: Number of calls made under tracemalloc.
+    :param overhead: Timer overhead in nanoseconds to subtract from every call.
+    :return: A dict with ops_per_sec, p50/p99/p999/mean latency in ns and allocations per op.
+    """
+    is_async = inspect.iscoroutinefunction(operation)
+    for _ in range(warmup):
+        if is_async:
+            await operation()
+        else:
+            operation()
+
+    best = None
+    for _ in range(rounds):
+        gc.collect()
+        durations, total = await _time_calls(operation, iterations, overhead)
+        if best is None or total < best[1]:
+            best = durations, total
+    durations, total = best
+    durations.sort()
+
+    blocks, allocated = await _allocations(operation, allocation_iterations)
+
+    return {
+        "iterations": iterations,
+        "rounds": rounds,
+        "ops_per_sec": iterations / (total / 1e9),
+        "mean_ns": sum(durations) / iterations,
+        "p50_ns": percentile(durations, 0.50),
+        "p99_ns": percentile(durations, 0.99),
+        "p999_ns": percentile(durations, 0.999),
+        "max_ns": durations[-1],
+        "alloc_blocks_per_op": blocks,
+        "alloc_bytes_per_op": allocated,
+    }
+
+
+def environment():
+    """
+    Describes the machine and revision a run was made on, stored next to the results.
+    """
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "revision": revision,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+# Metrics where a larger value is worse; ops_per_sec is the only "higher is better" one.
+LOWER_IS_BETTER = ("p50_ns", "p99_ns", "p999_ns", "alloc_blocks_per_op", "alloc_bytes_per_op")
+
+
+def compare(baseline, current, threshold=0.15, tail_threshold=0.25):
+    """
+    Compares two result documents stage by stage.
+
+    Throughput and p50 regress beyond threshold, the noisier tail percentiles beyond
+    tail_threshold; allocations regress when they grow by more than half a block/16 bytes
+    per op and the threshold.
+
+    :return: A list of (stage, metric, baseline value, current value, relative change, regressed).
+    """
+    rows = []
+    for stage, new in current["stages"].items():
+        old = baseline["stages"].get(stage)
+        if old is None:
+            continue
+
+        for metric in ("ops_per_sec",) + LOWER_IS_BETTER:
+            before, after = old.get(metric), new.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            if metric == "ops_per_sec":
+                regressed = change < -threshold
+            elif metric in ("p99_ns", "p999_ns"):
+                regressed = change > tail_threshold
+            elif metric.startswith("alloc"):
+                slack = 0.5 if metric == "alloc_blocks_per_op" else 16
+                regressed = after - before > slack and change > threshold
+            else:
+                regressed = change > threshold
+            rows.append((stage, metric, before, after, change, regressed))
+    return rows
+
+
+def save(path, document):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as out:
+        json.dump(document, out, indent=2)
+
+
+def load(path):
+    with open(path) as source:
+        return json.load(source)
@@ -0,0 +1,76 @@
+"""
+Thousands of sensors logging concurrently through one LoggerHub.
+
+Reports the memory retained per sensor handle and the aggregate throughput of all
+sensors sharing a single (fake) producer and file sink.
+
+Run from the repository root:
+
+    python -m benchmarks.hub
+"""
+import asyncio
+import tempfile
+import time
+import tracemalloc
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.hub import LoggerHub
+from tests.fakes import FakeProducer
+
+SENSORS = 2000
+READINGS_PER_SENSOR = 20
+
+
+async def drive(handle):
+    for i in range(READINGS_PER_SENSOR):
+        await handle.log_temperature(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=20.0 + i,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+        await asyncio.sleep(0)
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as log_directory:
+        producer = FakeProducer()
+        hub = LoggerHub(
+            KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+            KAFKA_TOPIC="sensor_logs",
+            log_directory=log_directory,
+            producer=producer,
+            batching=True,
+            file_format="ndjson",
+            async_file_sink=True,
+        )
+        await hub.initialize()
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        handles = [hub.sensor(f"sensor-{i:05d}") for i in range(SENSORS)]
+        for handle in handles:
+            handle.update_machine_status(Action.START)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        per_handle = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / SENSORS
+
+        start = time.perf_counter()
+        await asyncio.gather(*(drive(handle) for handle in handles))
+        await hub.close()
+        elapsed = time.perf_counter() - start
+
+        records = SENSORS * READINGS_PER_SENSOR
+        assert len(producer.messages) == records
+        print(f"{SENSORS} sensors, one producer: {per_handle:.0f} bytes per handle (including its id and registry entry)")
+        print(f"{records} records in {elapsed:.2f} s: {records / elapsed:.0f} records/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Cold-import time of log_sdk, with and without the Kafka sink.
+
+Every measurement starts a fresh interpreter, so nothing is cached in sys.modules; the time
+of an empty interpreter start is subtracted. The median of RUNS starts is reported, plus the
+slowest modules of the file-only import according to python -X importtime.
+
+asyncio and logging dominate and are needed by any logger, so the budget applies to what
+log_sdk adds on top of them. Exits with status 1 when the file-only import exceeds the
+budget or imports fogverse or http.server.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time [--budget MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 15
+
+FLOOR = "import asyncio, logging.handlers"
+FILE_ONLY = "import log_sdk.logger_config"
+WITH_KAFKA = "import log_sdk.logger_config, log_sdk.transport.sinks.kafka_sink, fogverse"
+CHECK = (
+    "import sys, log_sdk.logger_config; "
+    "print(' '.join(name for name in ('fogverse', 'http.server') if name in sys.modules))"
+)
+
+
+def run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+
+def median_time(code):
+    """
+    Returns the median wall time of starting an interpreter running code, in milliseconds.
+    """
+    durations = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = run(code)
+        durations.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return statistics.median(durations) * 1e3
+
+
+def slowest_modules(code, count=10):
+    """
+    Returns (cumulative us, module) of the slowest modules imported by the first module code imports.
+    """
+    entries = []
+    for line in run(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Every nesting level indents the name by two more spaces.
+        if len(name) - len(name.lstrip()) == 3:
+            entries.append((int(cumulative), name.strip()))
+    return sorted(entries, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=50.0,
+                        help="Maximum import time in ms of log_sdk on top of asyncio and logging (default 50).")
+    args = parser.parse_args()
+
+    interpreter = median_time("pass")
+    floor = median_time(FLOOR) - interpreter
+    file_only = median_time(FILE_ONLY) - interpreter
+    print(f"interpreter start:          {interpreter:6.1f} ms")
+    print(f"asyncio + logging.handlers: {floor:6.1f} ms")
+    print(f"log_sdk without Kafka:      {file_only:6.1f} ms  ({file_only - floor:+.1f} ms, budget {args.budget:.0f} ms)")
+
+    with_kafka = median_time(WITH_KAFKA)
+    if with_kafka is None:
+        print("log_sdk with Kafka:         fogverse is not installed")
+    else:
+        print(f"log_sdk with Kafka:         {with_kafka - interpreter:6.1f} ms")
+
+    print("\nslowest imports of log_sdk.logger_config without Kafka (cumulative):")
+    for cumulative, name in slowest_modules(FILE_ONLY):
+        print(f"  {cumulative / 1e3:6.1f} ms  {name}")
+
+    loaded = run(CHECK).stdout.split()
+    failures = []
+    if loaded:
+        failures.append(f"the file-only import loads {', '.join(loaded)}")
+    if file_only - floor > args.budget:
+        failures.append(f"log_sdk adds {file_only - floor:.1f} ms to the import")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Throughput, lookups and restart time of the consumer-side latest-state table.
+
+A topic holds READINGS records of SENSORS sensors with two types each, spread over every
+data center and product, with machine status changes and a share of late records that
+must not overwrite newer ones. It is consumed through a ConsumerRunner into a
+LatestStateTable writing snapshots, and the table is checked against the expected latest
+records. Reports:
+
+    consume      records/s through the runner into the table
+    lookups      get() and indexed scan() by data center / product versus a full scan
+    snapshot     size and write time of a snapshot of the whole table
+    restart      a crash after the last snapshot: load the snapshot, replay the records
+                 after its offsets, same table as before; compared with replaying the topic
+
+Run from the repository root:
+
+    python -m benchmarks.latest_state
+"""
+import os
+import random
+import time
+
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.consumer.runner import ConsumerRunner
+from log_sdk.consumer.state import LatestStateTable
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.serializers import get_serializer
+from tests.fakes import FakeConsumer
+
+SENSORS = 20000
+READINGS = 400000
+# Share of records delivered late, after a newer record of the same sensor.
+LATE = 0.02
+START_NS = 1_767_225_600 * 1_000_000_000
+LOOKUPS = 100000
+SNAPSHOT_INTERVAL = 5.0
+
+
+def make_payloads():
+    """
+    Returns the payloads of the topic and the expected latest record dict per (sensor_id, type).
+    """
+    rng = random.Random(0)
+    serializer = get_serializer("json")
+    data_centers, products, statuses = list(DataCenter), list(Product), list(Status)
+    machine = {}
+    payloads, latest, late = [], {}, []
+    for i in range(READINGS):
+        sensor = rng.randrange(SENSORS)
+        log_cls = VibrationLogData if i % 2 else TemperatureLogData
+        timestamp_ns = START_NS + i * 1_000_000
+        if rng.random() < 0.001 or sensor not in machine:
+            machine[sensor] = (rng.choice((Action.START, Action.STOP, Action.MAINTENANCE)), timestamp_ns)
+        action, since_ns = machine[sensor]
+        elapsed = (timestamp_ns - since_ns) / 1e9
+        metadata = {"machine_status": action.value, "uptime" if action is Action.START else "downtime": elapsed}
+        record = log_cls(
+            sensor_id=f"sensor-{sensor:05d}",
+            channel=Channel.SENSOR,
+            data_center=data_centers[sensor % len(data_centers)],
+            duration=1.0,
+            measurement=round(rng.gauss(50.0, 5.0), 3),
+            product=products[sensor % len(products)],
+            status=statuses[0] if rng.random() < 0.95 else rng.choice(statuses),
+            metadata=metadata,
+            timestamp_ns=timestamp_ns,
+        ).to_dict()
+        latest[(record["sensor_id"], record["type"])] = record
+        payload = serializer.dumps(record)
+        if rng.random() < LATE:
+            late.append(payload)
+        else:
+            payloads.append(payload)
+        # Late records show up a while after newer ones were sent.
+        if len(late) > 50 and rng.random() < 0.1:
+            payloads.append(late.pop(0))
+    payloads.extend(late)
+    # A late record that is the newest of its sensor still counts once it arrives.
+    return payloads, latest
+
+
+def check(table, latest):
+    assert len(table) == len(latest), (len(table), len(latest))
+    for (sensor_id, type), record in latest.items():
+        state = table.get(sensor_id, type)
+        assert state.timestamp == record["timestamp"] and state.measurement == record["measurement"], (state.to_dict(), record)
+        assert state.status.value == record["status"] and state.machine_status == record["metadata"]["machine_status"]
+        assert (state.uptime if state.uptime is not None else state.downtime) == \
+            record["metadata"].get("uptime", record["metadata"].get("downtime"))
+
+
+def consume(table, payloads, start=0, stop=None):
+    consumer = FakeConsumer(payloads[:stop])
+    consumer.position = start
+    runner = ConsumerRunner(consumer, [table], batch_size=1000, executor=None, commit_records=20000, report_interval=None)
+    begin = time.perf_counter()
+    runner.run(idle_timeout=0)
+    elapsed = time.perf_counter() - begin
+    runner.commit()
+    return elapsed
+
+
+def lookups(table):
+    rng = random.Random(1)
+    keys = [(f"sensor-{rng.randrange(SENSORS):05d}", "Vibration Sensor") for _ in range(LOOKUPS)]
+    begin = time.perf_counter()
+    for sensor_id, type in keys:
+        table.get(sensor_id, type)
+    per_get = (time.perf_counter() - begin) / LOOKUPS
+
+    def timed(scan, **filters):
+        begin = time.perf_counter()
+        for _ in range(20):
+            states = scan(**filters)
+        return (time.perf_counter() - begin) / 20, len(states)
+
+    indexed, matches = timed(table.scan, data_center=DataCenter.POWER_PLANT, product=Product.OIL_AND_GAS)
+    full, full_matches = timed(lambda **filters: [
+        state for state in table if state.data_center == "Power Plant" and state.product == "Oil and Gas"
+    ])
+    assert matches == full_matches
+    critical, critical_matches = timed(table.scan, data_center=DataCenter.FACTORY_1, status=Status.CRITICAL)
+    print(
+        f"lookups: get {per_get * 1e9:.0f} ns, scan(data_center, product) {indexed * 1e6:.0f} us for {matches} states "
+        f"vs {full * 1e6:.0f} us full scan, scan(data_center, status=CRITICAL) {critical * 1e6:.0f} us for {critical_matches}"
+    )
+
+
+def main():
+    payloads, latest = make_payloads()
+    print(f"{len(payloads):,} records of {SENSORS:,} sensors x 2 types, {LATE:.0%} late")
+    with scratch_directory() as directory:
+        path = os.path.join(directory, "state.json.gz")
+
+        table = LatestStateTable(path, snapshot_interval=SNAPSHOT_INTERVAL)
+        elapsed = consume(table, payloads)
+        check(table, latest)
+        print(
+            f"consume: {len(payloads) / elapsed:,.0f} records/s with a snapshot every {SNAPSHOT_INTERVAL:g} s "
+            f"({table.snapshots} written), {table.stale:,} late records ignored"
+        )
+
+        lookups(table)
+
+        begin = time.perf_counter()
+        table.snapshot()
+        snapshot_time = time.perf_counter() - begin
+        print(f"snapshot: {os.path.getsize(path) / 1e6:.2f} MB for {len(table):,} states in {snapshot_time * 1e3:.0f} ms")
+
+        # Crash after three quarters of the topic, with the last snapshot somewhat earlier.
+        crash = 3 * len(payloads) // 4
+        table = LatestStateTable(path, snapshot_interval=None)
+        consume(table, payloads, stop=crash - 30000)
+        table.snapshot()
+        consume(table, payloads, start=crash - 30000, stop=crash)
+
+        begin = time.perf_counter()
+        restarted = LatestStateTable(path, snapshot_interval=None)
+        load = time.perf_counter() - begin
+        offset = restarted.offsets[("sensor_logs", 0)]
+        replay = consume(restarted, payloads, start=offset)
+        check(restarted, latest)
+
+        rebuilt = LatestStateTable()
+        full = consume(rebuilt, payloads)
+        check(rebuilt, latest)
+        print(
+            f"restart: snapshot loaded in {load * 1e3:.0f} ms, {len(payloads) - offset:,} records replayed from offset "
+            f"{offset:,} in {replay * 1e3:.0f} ms, vs {full * 1e3:.0f} ms replaying the whole topic; same table"
+        )
+
+
+if __name__ == "__main__":
+    main()
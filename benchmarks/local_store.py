@@ -0,0 +1,108 @@
+"""
+Range queries on the time-partitioned local store versus scanning an NDJSON log.
+
+Six hours of readings from many sensors (one log_batch per sensor and minute, so sensors
+interleave in the files) are written once as a plain NDJSON log and once to the store.
+Then one sensor's readings for one hour are looked up in both; the results must match.
+
+Run from the repository root:
+
+    python -m benchmarks.local_store
+"""
+import array
+import asyncio
+import glob
+import json
+import os
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_logs.base_sensor import parse_timestamp_ns
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+
+SENSORS = 50
+HOURS = 2
+# Hour-aligned start, so the store gets one partition per hour.
+START = 1_699_999_200.0
+
+
+async def write(log_directory, file_format):
+    logger = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        kafka_enabled=False,
+        log_directory=log_directory,
+        file_format=file_format,
+    )
+    start = time.perf_counter()
+    for minute in range(HOURS * 60):
+        timestamps = array.array("d", (START + minute * 60 + second for second in range(60)))
+        for sensor in range(SENSORS):
+            logger.sensor_id = f"sensor-{sensor:03d}"
+            await logger.log_batch(
+                TemperatureLogData,
+                array.array("d", (20.0 + sensor * 0.01 + second * 0.001 for second in range(60))),
+                timestamps=timestamps,
+                durations=1.0,
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                product=Product.MACHINE_MONITORING,
+                status=Status.NORMAL,
+            )
+    await logger.close()
+    return logger, time.perf_counter() - start
+
+
+def scan(log_directory, sensor_id, start_ns, end_ns):
+    """
+    What finding the readings takes without an index: parse every line of every log file.
+    """
+    for path in sorted(glob.glob(os.path.join(log_directory, "*.log*"))):
+        with open(path, "rb") as lines:
+            for line in lines:
+                record = json.loads(line)
+                if record["sensor_id"] == sensor_id and \
+                        start_ns <= parse_timestamp_ns(record["timestamp"]) < end_ns:
+                    yield record
+
+
+def directory_size(directory):
+    return sum(os.path.getsize(path) for path in glob.glob(os.path.join(directory, "*")))
+
+
+async def main():
+    print(f"{SENSORS} sensors x {HOURS} h at 1 Hz = {SENSORS * HOURS * 3600} records")
+    query_start, query_end = START + 900, START + 3600 + 900
+    start_ns, end_ns = int(query_start * 1e9), int(query_end * 1e9)
+
+    with tempfile.TemporaryDirectory() as ndjson_directory, tempfile.TemporaryDirectory() as store_directory:
+        _, elapsed = await write(ndjson_directory, "ndjson")
+        print(f"{'write ndjson':>14}: {elapsed:6.2f} s  {directory_size(ndjson_directory) / 2**20:7.1f} MiB")
+        logger, elapsed = await write(store_directory, "store")
+        print(f"{'write store':>14}: {elapsed:6.2f} s  {directory_size(store_directory) / 2**20:7.1f} MiB")
+
+        started = time.perf_counter()
+        expected = list(scan(ndjson_directory, "sensor-042", start_ns, end_ns))
+        scanned = time.perf_counter() - started
+
+        started = time.perf_counter()
+        found = list(logger.query(sensor_id="sensor-042", start=query_start, end=query_end, type=SensorType.TEMPERATURE))
+        queried = time.perf_counter() - started
+
+        # Rotated log files do not sort by time, so compare in timestamp order.
+        expected.sort(key=lambda record: record["timestamp"])
+        assert found == expected and len(found) == 3600, (len(found), len(expected))
+        print(f"one sensor, one hour ({len(found)} records):")
+        print(f"{'linear scan':>14}: {scanned * 1e3:8.1f} ms")
+        print(f"{'store query':>14}: {queried * 1e3:8.1f} ms  ({scanned / queried:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
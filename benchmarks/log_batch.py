@@ -0,0 +1,112 @@
+"""
+Per-sample cost of log_vibration calls versus log_batch over arrays of samples.
+
+Run from the repository root:
+
+    python -m benchmarks.log_batch
+"""
+import array
+import asyncio
+import tempfile
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_logs.batch import batch_columns, format_batch
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+SAMPLES = 50000
+BATCH = 5000
+
+
+def make_logger(log_directory):
+    return LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=FakeProducer(),
+        file_format="ndjson",
+    )
+
+
+async def per_call(log_directory):
+    logger = make_logger(log_directory)
+    await logger.initialize()
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        await logger.log_vibration(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=0.001,
+            measurement=i * 0.5,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+    elapsed = time.perf_counter() - start
+    await logger.close()
+    return elapsed
+
+
+async def batched(log_directory):
+    logger = make_logger(log_directory)
+    await logger.initialize()
+    now = time.time()
+    measurements = array.array("d", (i * 0.5 for i in range(SAMPLES)))
+    timestamps = array.array("d", (now + i * 0.001 for i in range(SAMPLES)))
+    start = time.perf_counter()
+    for offset in range(0, SAMPLES, BATCH):
+        await logger.log_batch(
+            VibrationLogData,
+            measurements[offset:offset + BATCH],
+            timestamps=timestamps[offset:offset + BATCH],
+            durations=0.001,
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+    elapsed = time.perf_counter() - start
+    await logger.close()
+    return elapsed
+
+
+async def serialization_only(log_directory):
+    template = VibrationLogData(
+        sensor_id="bench-sensor",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=0.0,
+        measurement=0.0,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start", "uptime": 1.0},
+    )
+    now = time.time()
+    measurements = array.array("d", (i * 0.5 for i in range(SAMPLES)))
+    timestamps = array.array("d", (now + i * 0.001 for i in range(SAMPLES)))
+    start = time.perf_counter()
+    for offset in range(0, SAMPLES, BATCH):
+        columns = batch_columns(template, measurements[offset:offset + BATCH], timestamps[offset:offset + BATCH], 0.001)
+        format_batch(template, columns)
+    return time.perf_counter() - start
+
+
+async def main():
+    print(f"{SAMPLES} samples, batches of {BATCH}, Kafka to a fake producer plus NDJSON file")
+    with tempfile.TemporaryDirectory() as log_directory:
+        for label, run in (
+            ("log_vibration", per_call),
+            ("log_batch", batched),
+            ("format_batch", serialization_only),
+        ):
+            elapsed = await run(log_directory)
+            print(f"{label:>14}: {elapsed / SAMPLES * 1e6:6.2f} us/sample  {SAMPLES / elapsed:>10.0f} samples/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
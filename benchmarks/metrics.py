@@ -0,0 +1,135 @@
+"""
+Hot path overhead of the runtime metrics, plus a check of the Prometheus endpoint.
+
+log_vibration is timed end to end with the fake producer and an NDJSON file on tmpfs,
+with metrics disabled and enabled, alternating blocks of calls to even out machine noise.
+Then the counters are checked after a simulated broker outage and /metrics is scraped.
+
+Run from the repository root:
+
+    python -m benchmarks.metrics
+"""
+import asyncio
+import statistics
+import time
+import urllib.request
+
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from tests.fakes import FakeProducer
+
+BLOCK = 200
+BLOCKS = 200
+
+
+def make_logger(log_directory, **options):
+    return LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=FakeProducer(),
+        file_format="ndjson",
+        **options,
+    )
+
+
+async def log_one(logger):
+    await logger.log_vibration(
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=4.5,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+    )
+
+
+async def time_blocks(logger, count):
+    """
+    Returns the duration of one block of log calls in nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        await log_one(logger)
+    return time.perf_counter_ns() - start
+
+
+async def compare_overhead():
+    """
+    Alternates blocks of calls with the metrics of one logger switched off and on, so both
+    see the same machine load.
+    """
+    with scratch_directory() as log_directory:
+        logger = make_logger(log_directory)
+        await logger.initialize()
+        logger.update_machine_status(Action.START)
+        metrics = logger.metrics
+        await time_blocks(logger, BLOCK)
+
+        blocks = {False: [], True: []}
+        for _ in range(BLOCKS):
+            for enabled in (False, True):
+                logger.metrics = metrics if enabled else None
+                blocks[enabled].append(await time_blocks(logger, BLOCK))
+        await logger.close()
+
+    medians = {enabled: statistics.median(durations) / BLOCK for enabled, durations in blocks.items()}
+    for enabled, per_record in medians.items():
+        print(f"metrics {'on' if enabled else 'off':>3}: {per_record / 1e3:6.2f} us/record  {1e9 / per_record:>8,.0f} records/s")
+    # Neighbouring blocks see the same machine load, so their ratio cancels slow drifts.
+    ratio = statistics.median(on / off for off, on in zip(blocks[False], blocks[True]))
+    print(f"overhead: {ratio - 1:+.1%} per record (median of paired blocks)\n")
+
+
+async def check_endpoint():
+    reports = []
+    with scratch_directory() as log_directory:
+        logger = make_logger(
+            log_directory,
+            metrics_port=0,
+            metrics_callback=reports.append,
+            metrics_interval=0.05,
+            metrics_sample_every=1,
+        )
+        await logger.initialize()
+
+        for _ in range(100):
+            await log_one(logger)
+        logger.producer.fail = True
+        for _ in range(10):
+            await log_one(logger)
+
+        port = logger.metrics_server.port
+        loop = asyncio.get_event_loop()
+        text = await loop.run_in_executor(
+            None, lambda: urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+        )
+        snapshot = logger.metrics_snapshot()
+        await logger.close()
+
+    assert snapshot["records_logged_total"] == 110, snapshot
+    assert snapshot["records_sent_total"] == 100, snapshot
+    assert snapshot["send_failures_total"] == 10, snapshot
+    assert snapshot["records_dropped_total"] == 10, snapshot
+    assert snapshot["send_latency_seconds"]["count"] == 100, snapshot
+    assert "sensor_logger_send_failures_total 10" in text, text
+    assert 'sensor_logger_send_latency_seconds_bucket{le="+Inf"} 100' in text, text
+    assert reports and reports[-1]["records_logged_total"] == 110
+
+    print(f"/metrics served {len(text.splitlines())} lines, callback received {len(reports)} snapshots")
+    print("\n".join(line for line in text.splitlines() if not line.startswith("#") and "_bucket" not in line))
+
+
+async def main():
+    await compare_overhead()
+    await check_endpoint()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
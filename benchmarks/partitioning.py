@@ -0,0 +1,201 @@
+"""
+Partition-key routing against a fake broker with several partitions.
+
+Many sensors log concurrently through one batching LoggerHub into a FakeBroker that assigns
+keyed messages like Kafka's default partitioner. For every key strategy the suite reports
+the records per partition and checks that, keyed by sensor_id, every sensor lands in the
+partition partition_for() predicts with its records in order, and that the sensors spread
+evenly. A broker outage with the spool enabled checks that replayed records keep their key,
+and the cost of computing the key is timed on the hot path.
+
+Run from the repository root:
+
+    python -m benchmarks.partitioning
+"""
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.hub import LoggerHub
+from log_sdk.transport.partitioning import murmur2, partition_for
+from tests.fakes import FakeBroker, FakeProducer
+
+PARTITIONS = 12
+SENSORS = 1200
+READINGS_PER_SENSOR = 10
+DATA_CENTERS = list(DataCenter)
+
+# Expected values from the unit tests of Kafka's Java client (UtilsTest.testMurmur2).
+MURMUR2_CASES = {
+    b"21": -973932308,
+    b"foobar": -790332482,
+    b"a-little-bit-long-string": -985981536,
+    b"a-little-bit-longer-string": -1486304829,
+    b"lkjh234lh9fiuh90y23oiuhsafujhadof229phr9h19h89h8": -58897971,
+    b"abc": 479470107,
+}
+
+
+async def drive(handle, index):
+    for i in range(READINGS_PER_SENSOR):
+        await handle.log_temperature(
+            channel=Channel.SENSOR,
+            data_center=DATA_CENTERS[index % len(DATA_CENTERS)],
+            duration=1.0,
+            measurement=float(i),
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+        await asyncio.sleep(0)
+
+
+async def route(partition_key, log_directory):
+    broker = FakeBroker(PARTITIONS)
+    hub = LoggerHub(
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=broker,
+        partition_key=partition_key,
+        batching=True,
+        file_format="ndjson",
+    )
+    await hub.initialize()
+    handles = [hub.sensor(f"sensor-{i:05d}") for i in range(SENSORS)]
+    for handle in handles:
+        handle.update_machine_status(Action.START)
+    await asyncio.gather(*(drive(handle, index) for index, handle in enumerate(handles)))
+    await hub.close()
+    return broker
+
+
+def check_sensor_routing(broker):
+    """
+    Asserts that every sensor sits in its predicted partition with its readings in order.
+    """
+    seen = {}
+    for partition, messages in enumerate(broker.partitions):
+        for key, payload in messages:
+            record = json.loads(payload)
+            assert key == record["sensor_id"].encode()
+            assert partition == partition_for(key, PARTITIONS)
+            seen.setdefault(record["sensor_id"], []).append(record["measurement"])
+    assert len(seen) == SENSORS
+    for measurements in seen.values():
+        assert measurements == [float(i) for i in range(READINGS_PER_SENSOR)], measurements
+
+
+def sensors_split(broker):
+    """
+    Number of sensors whose records ended up in more than one partition.
+    """
+    partitions = {}
+    for partition, messages in enumerate(broker.partitions):
+        for _, payload in messages:
+            partitions.setdefault(json.loads(payload)["sensor_id"], set()).add(partition)
+    return sum(1 for assigned in partitions.values() if len(assigned) > 1)
+
+
+async def check_spool_replay(directory):
+    """
+    Records spooled during an outage are replayed with the key of their record.
+    """
+    broker = FakeBroker(PARTITIONS)
+    hub = LoggerHub(
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=os.path.join(directory, "logs"),
+        producer=broker,
+        partition_key="sensor_id",
+        spool_directory=os.path.join(directory, "spool"),
+        replay_rate=50000.0,
+    )
+    await hub.initialize()
+    broker.fail = True
+    handles = [hub.sensor(f"sensor-{i:05d}") for i in range(100)]
+    for index, handle in enumerate(handles):
+        await drive(handle, index)
+    broker.fail = False
+    while hub.config.spool.pending:
+        await asyncio.sleep(0.01)
+    await hub.close()
+
+    assert sum(len(messages) for messages in broker.partitions) == 100 * READINGS_PER_SENSOR
+    for partition, messages in enumerate(broker.partitions):
+        for key, payload in messages:
+            assert key == json.loads(payload)["sensor_id"].encode()
+            assert partition == partition_for(key, PARTITIONS)
+    print(f"spool replay: {100 * READINGS_PER_SENSOR} records replayed with their keys")
+
+
+async def time_key(partition_key, log_directory, records=10000):
+    # The plain fake producer, so the broker's own partitioning is not timed.
+    hub = LoggerHub(
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        log_directory=log_directory,
+        producer=FakeProducer(),
+        partition_key=partition_key,
+        file_format="ndjson",
+    )
+    handle = hub.sensor("sensor-00001")
+    handle.update_machine_status(Action.START)
+    await hub.initialize()
+    start = time.perf_counter_ns()
+    for i in range(records):
+        await handle.log_temperature(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=float(i),
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+    elapsed = time.perf_counter_ns() - start
+    await hub.close()
+    return elapsed / records
+
+
+async def main():
+    for data, expected in MURMUR2_CASES.items():
+        assert murmur2(data) == expected, (data, murmur2(data), expected)
+    print(f"murmur2 matches the Kafka client on {len(MURMUR2_CASES)} reference keys\n")
+
+    print(f"{SENSORS} sensors x {READINGS_PER_SENSOR} readings, {PARTITIONS} partitions")
+    with tempfile.TemporaryDirectory() as log_directory:
+        for partition_key in (None, "sensor_id", "data_center", lambda record: record["sensor_id"][-2:]):
+            broker = await route(partition_key, log_directory)
+            counts = [len(messages) for messages in broker.partitions]
+            mean = statistics.mean(counts)
+            name = partition_key if partition_key is None or isinstance(partition_key, str) else "callable"
+            print(
+                f"{str(name):>12}: records per partition min {min(counts):5d}  max {max(counts):5d}  "
+                f"max/mean {max(counts) / mean:4.2f}  sensors split over partitions {sensors_split(broker)}"
+            )
+            if partition_key == "sensor_id":
+                check_sensor_routing(broker)
+                assert max(counts) / mean < 1.3, counts
+
+        await check_spool_replay(log_directory)
+
+    with scratch_directory() as log_directory:
+        # Alternate the two and keep the fastest run of each to even out machine noise.
+        timings = {None: [], "sensor_id": []}
+        for _ in range(5):
+            for partition_key in timings:
+                timings[partition_key].append(await time_key(partition_key, log_directory))
+        unkeyed, keyed = min(timings[None]), min(timings["sensor_id"])
+        print(f"hot path: {unkeyed / 1e3:.2f} us/record unkeyed, {keyed / 1e3:.2f} us/record keyed by sensor_id")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
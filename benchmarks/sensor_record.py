@@ -0,0 +1,59 @@
+"""
+CPU and memory cost of building a sensor record and converting it to a dict.
+
+Run from the repository root:
+
+    python -m benchmarks.sensor_record
+"""
+import time
+import tracemalloc
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+RECORDS = 100000
+
+
+def build():
+    return VibrationLogData(
+        sensor_id="bench-sensor",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=4.5,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start"},
+    )
+
+
+def main():
+    start = time.perf_counter()
+    for _ in range(RECORDS):
+        build()
+    construct = time.perf_counter() - start
+
+    records = [build() for _ in range(1000)]
+    start = time.perf_counter()
+    for _ in range(RECORDS // 1000):
+        for record in records:
+            record.to_dict()
+    to_dict = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build() for _ in range(10000)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    print(f"construct: {construct / RECORDS * 1e9:7.0f} ns/record")
+    print(f"  to_dict: {to_dict / RECORDS * 1e9:7.0f} ns/record")
+    print(f" retained: {retained / len(kept):7.0f} bytes/record (including the metadata dict)")
+
+
+if __name__ == "__main__":
+    main()
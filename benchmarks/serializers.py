@@ -0,0 +1,63 @@
+"""
+Payload size and encode/decode cost of the wire serializers.
+
+Serializers whose optional package is not installed are skipped.
+
+Run from the repository root:
+
+    python -m benchmarks.serializers
+"""
+import time
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.serializers import SERIALIZERS, get_serializer
+
+RECORDS = 50000
+
+
+def main():
+    record = VibrationLogData(
+        sensor_id="sensor-001",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=2.0,
+        measurement=4.5,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start", "uptime": 2.010275},
+    ).to_dict()
+
+    baseline = None
+    for name in SERIALIZERS:
+        try:
+            serializer = get_serializer(name)
+        except ImportError as e:
+            print(f"{name:>8}: skipped ({e})")
+            continue
+
+        payload = serializer.dumps(record)
+        assert serializer.loads(payload) == record
+        baseline = baseline or len(payload)
+
+        start = time.perf_counter()
+        for _ in range(RECORDS):
+            serializer.dumps(record)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(RECORDS):
+            serializer.loads(payload)
+        decode = time.perf_counter() - start
+
+        print(
+            f"{name:>8}: {len(payload):4d} bytes ({baseline / len(payload):4.1f}x smaller than json)  "
+            f"encode {encode / RECORDS * 1e6:5.2f} us  decode {decode / RECORDS * 1e6:5.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Fan-in of worker processes through shared-memory rings, against one LoggerConfig per process.
+
+Every worker process logs RECORDS vibration readings as fast as it can, in two setups:
+
+    per process   each worker has its own LoggerConfig, producer and RotatingFileHandler,
+                  all appending to (and rotating) the same log file
+    shared ring   each worker writes into its SharedRing; one shipper in the parent process
+                  drains the rings into the only LoggerConfig, producer and file
+
+Timing starts once every worker is ready and ends when the last record reached a producer.
+Besides the throughput the suite reports the CPU time the worker processes spend per record,
+which is what the rings take off the acquisition processes (the shipper's share is the rest).
+Afterwards the log files are read back: the shared ring has to deliver every record to the
+producer and the file exactly once and in per-worker order. For the per-process setup the
+suite only reports what the files hold, since concurrent rotation can lose records.
+
+Run from the repository root:
+
+    python -m benchmarks.shared_ring
+"""
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import time
+
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.transport.shared_ring import RingLogger, RingShipper, SharedRing
+from tests.fakes import FakeProducer
+
+RECORDS = 20000
+WORKERS = (1, 2, 4)
+RING_CAPACITY = 8192
+
+READING = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    duration=1.0,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+OPTIONS = dict(
+    KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+    KAFKA_TOPIC="sensor_logs",
+    file_format="ndjson",
+)
+
+
+def per_process_worker(index, log_directory, barrier, results):
+    async def run():
+        producer = FakeProducer()
+        config = LoggerConfig(sensor_id=f"worker-{index}", log_directory=log_directory, producer=producer, **OPTIONS)
+        await config.initialize()
+        config.update_machine_status(Action.START)
+        barrier.wait()
+        start = time.process_time()
+        for measurement in range(RECORDS):
+            await config.log_vibration(measurement=float(measurement), **READING)
+        await config.close()
+        results.put((len(producer.messages), time.process_time() - start))
+
+    asyncio.run(run())
+
+
+def ring_worker(index, ring_name, barrier, results):
+    logger = RingLogger(ring_name, f"worker-{index}")
+    logger.update_machine_status(Action.START)
+    barrier.wait()
+    start = time.process_time()
+    for measurement in range(RECORDS):
+        logger.log_vibration(measurement=float(measurement), **READING)
+    results.put(time.process_time() - start)
+    logger.close()
+
+
+def with_per_process(workers, log_directory):
+    barrier = multiprocessing.Barrier(workers + 1)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=per_process_worker, args=(index, log_directory, barrier, results))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    delivered, cpu_times = zip(*(results.get() for _ in processes))
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return elapsed, sum(delivered), sum(cpu_times)
+
+
+def with_shared_ring(workers, log_directory):
+    rings = [SharedRing(capacity=RING_CAPACITY) for _ in range(workers)]
+    barrier = multiprocessing.Barrier(workers + 1)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=ring_worker, args=(index, ring.name, barrier, results))
+        for index, ring in enumerate(rings)
+    ]
+    for process in processes:
+        process.start()
+
+    async def ship():
+        producer = FakeProducer()
+        config = LoggerConfig(sensor_id=None, log_directory=log_directory, producer=producer, **OPTIONS)
+        await config.initialize()
+        shipper = RingShipper(config, rings)
+        shipper.start()
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+        start = time.perf_counter()
+        while len(producer.messages) < workers * RECORDS:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        await shipper.close()
+        await config.close()
+        assert shipper.dropped() == 0
+        return elapsed, producer
+
+    try:
+        elapsed, producer = asyncio.run(ship())
+        cpu_time = sum(results.get() for _ in processes)
+    finally:
+        for process in processes:
+            process.join()
+        for ring in rings:
+            ring.close()
+
+    expected = {f"worker-{index}": 0.0 for index in range(workers)}
+    for payload in producer.messages:
+        record = json.loads(payload)
+        assert record["measurement"] == expected[record["sensor_id"]], record
+        assert record["metadata"]["machine_status"] == Action.START.value
+        expected[record["sensor_id"]] += 1
+    return elapsed, len(producer.messages), cpu_time
+
+
+def read_files(log_directory):
+    """
+    Returns the number of records in the log files (rotated ones included), the number of
+    corrupted record lines and the number of files. Other lines are status messages.
+    """
+    records = corrupted = 0
+    paths = glob.glob(os.path.join(log_directory, "sensor_logs_*.log*"))
+    for path in paths:
+        with open(path, encoding="utf-8") as log_file:
+            for line in log_file:
+                if not line.startswith("{"):
+                    continue
+                try:
+                    json.loads(line)
+                    records += 1
+                except ValueError:
+                    corrupted += 1
+        os.remove(path)
+    return records, corrupted, len(paths)
+
+
+def main():
+    print(f"{RECORDS:,} records per worker process, {os.cpu_count()} CPU(s)\n")
+    for workers in WORKERS:
+        for name, run in (("per process", with_per_process), ("shared ring", with_shared_ring)):
+            with scratch_directory() as log_directory:
+                elapsed, delivered, cpu_time = run(workers, log_directory)
+                records, corrupted, files = read_files(log_directory)
+            expected = workers * RECORDS
+            assert delivered == expected, (name, workers, delivered)
+            if name == "shared ring":
+                assert (records, corrupted) == (expected, 0), (records, corrupted)
+            print(
+                f"{name:>11} {workers} workers: {expected / elapsed:>9,.0f} records/s  "
+                f"worker CPU {cpu_time / expected * 1e6:5.1f} us/record  "
+                f"producers {workers if name == 'per process' else 1}  "
+                f"file records {records:>6,}/{expected:,} in {files} file(s), {corrupted} corrupted lines"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Throughput of the pluggable sinks, alone and fanned out, with a delivery check.
+
+Records are logged without a local file into the in-memory sink, a UDP socket read by a
+receiver thread, stdout (redirected to a buffer), the fake Kafka producer and a fan-out to
+memory, UDP and Kafka. Every configuration has to deliver every record to every sink; the
+fan-out is also run with the Kafka producer failing, so the memory and UDP sinks must keep
+receiving while the failures are counted.
+
+Run from the repository root:
+
+    python -m benchmarks.sinks
+"""
+import asyncio
+import io
+import logging
+import socket
+import threading
+import time
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.transport.sinks.memory_sink import MemorySink
+from log_sdk.transport.sinks.stdout_sink import StdoutSink
+from tests.fakes import FakeProducer
+
+RECORDS = 20000
+
+
+class UdpReceiver:
+    """
+    Counts the datagrams arriving on a local port from a thread.
+    """
+    def __init__(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.settimeout(0.5)
+        self.port = self.socket.getsockname()[1]
+        self.received = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def _run(self):
+        while True:
+            try:
+                self.socket.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.received += 1
+
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.received < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.received
+
+
+    def close(self):
+        self.socket.close()
+
+
+async def run(sinks, fail=False):
+    logger = LoggerConfig(
+        sensor_id="bench-sensor",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=FakeProducer(),
+        sinks=sinks,
+    )
+    if logger.producer is not None:
+        logger.producer.fail = fail
+    # Without a file the logger has no handler; keep the expected send errors off stderr.
+    logger.logger.addHandler(logging.NullHandler())
+    await logger.initialize()
+    logger.update_machine_status(Action.START)
+
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        await logger.log_vibration(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=i * 0.01,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+        if i % 100 == 0:
+            # Let the receiver thread keep up with the socket buffer.
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    snapshot = logger.metrics_snapshot()
+    await logger.close()
+    return elapsed, logger.producer, snapshot
+
+
+async def main():
+    receiver = UdpReceiver()
+    udp = f"udp://127.0.0.1:{receiver.port}"
+    print(f"{RECORDS} records per configuration, no local file")
+
+    configurations = [
+        ("memory", lambda: [MemorySink()], False),
+        ("udp", lambda: [udp], False),
+        ("stdout", lambda: [StdoutSink(io.BytesIO())], False),
+        ("kafka", lambda: ["kafka"], False),
+        ("memory+udp+kafka", lambda: [MemorySink(), udp, "kafka"], False),
+        ("kafka failing", lambda: [MemorySink(), udp, "kafka"], True),
+    ]
+    for name, make_sinks, fail in configurations:
+        sinks = make_sinks()
+        received = receiver.received
+        elapsed, producer, snapshot = await run(sinks, fail=fail)
+        print(f"{name:>16}: {RECORDS / elapsed:>8,.0f} records/s  {elapsed / RECORDS * 1e6:6.2f} us/record")
+
+        for sink in sinks:
+            if isinstance(sink, MemorySink):
+                assert len(sink.payloads) == RECORDS
+                assert sink.records()[-1]["measurement"] == (RECORDS - 1) * 0.01
+            elif isinstance(sink, StdoutSink):
+                assert sink.stream.getvalue().count(b"\n") == RECORDS
+            elif sink == udp:
+                assert receiver.wait_for(received + RECORDS) - received == RECORDS
+        if producer is not None:
+            assert len(producer.messages) == (0 if fail else RECORDS)
+        assert snapshot["send_failures_total"] == (RECORDS if fail else 0), snapshot
+
+    receiver.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,372 @@
+"""
+Fleet soak simulator: how many sensors one gateway process sustains, against latency SLOs.
+
+N virtual sensors spread over every DataCenter x Product pair log through one LoggerHub (as
+a gateway would) into an in-process stand-in broker with a simulated produce round trip.
+Every sensor has its own type, rate and value distribution, taken round robin from the
+profiles, e.g. "vibration:100:gaussian,temperature:1:drift". Distributions:
+
+    gaussian   noise around a level      uniform   uniform around a level
+    sine       a 0.1 Hz wave with noise  drift     a random walk
+    steps      a level stepping rarely   constant  always the same value
+
+Readings are stamped with the time they were due, so end-to-end latency (broker arrival
+minus due time) includes any lag of the gateway behind its schedule. After a warmup every
+step reports the offered and delivered records/s, latency percentiles, RSS growth and CPU
+in % of one core per 1k sensors. A step meets the SLO when it delivers at least 98% of the
+offered rate with a p99 latency within --slo-p99-ms.
+
+With --ramp the sensor count doubles from --sensors until a step misses the SLO, then the
+saturation point is bisected between the last passing and the first failing count.
+
+Run from the repository root:
+
+    python -m benchmarks.soak --sensors 1000 --duration 30
+    python -m benchmarks.soak --ramp --sensors 100 --duration 10 --output results/soak.json
+"""
+import argparse
+import asyncio
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+from benchmarks import harness
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.hub import LoggerHub
+from log_sdk.sensor_logs.base_sensor import parse_timestamp_ns
+from log_sdk.sensor_logs.electrical import ElectricalLogData
+from log_sdk.sensor_logs.humidity import HumidityLogData
+from log_sdk.sensor_logs.pressure import PressureLogData
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.serializers import decode_records
+from tests.fakes import FakeProducer
+
+# Log class and typical level of every sensor type.
+SENSOR_TYPES = {
+    "vibration": (VibrationLogData, 4.5),
+    "temperature": (TemperatureLogData, 70.0),
+    "pressure": (PressureLogData, 2.3),
+    "electrical": (ElectricalLogData, 12.5),
+    "humidity": (HumidityLogData, 55.0),
+}
+DISTRIBUTIONS = ("gaussian", "uniform", "sine", "drift", "steps", "constant")
+DEFAULT_PROFILES = "vibration:10:gaussian,temperature:1:drift,pressure:1:steps,electrical:10:sine,humidity:0.2:uniform"
+
+# Latency samples kept per step; every n-th delivered message is sampled to stay near it.
+LATENCY_SAMPLES = 20000
+# Readings logged before yielding to the send pipeline when the driver is behind.
+MAX_BURST = 1000
+
+
+class SoakBroker(FakeProducer):
+    """
+    Stand-in broker counting messages and keeping the arrival time of every n-th one.
+    """
+    def __init__(self, latency: float, sample_every: int):
+        """
+        :param latency: Simulated produce round trip in seconds.
+        :param sample_every: Keep the payload and arrival time of every n-th message.
+        """
+        super().__init__(latency=latency)
+        self.sample_every = sample_every
+        self.delivered = 0
+        self.samples = []
+
+
+    async def _send(self, data, *args, key=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.delivered += 1
+        if self.delivered % self.sample_every == 0:
+            self.samples.append((time.time_ns(), data))
+
+
+class VirtualSensor:
+    """
+    One simulated sensor: a hub handle, a schedule and the state of its value distribution.
+    """
+    __slots__ = ("handle", "log_cls", "period_ns", "distribution", "level", "noise", "value", "data_center", "product")
+
+    def __init__(self, handle, log_cls, rate: float, distribution: str, level: float, data_center, product):
+        self.handle = handle
+        self.log_cls = log_cls
+        self.period_ns = int(1e9 / rate)
+        self.distribution = distribution
+        self.level = level
+        self.noise = 0.05 * level
+        self.value = level
+        self.data_center = data_center
+        self.product = product
+
+
+    def reading(self, rng: random.Random, due_ns: int) -> float:
+        distribution = self.distribution
+        if distribution == "gaussian":
+            return rng.gauss(self.level, self.noise)
+        if distribution == "uniform":
+            return rng.uniform(self.level - 3 * self.noise, self.level + 3 * self.noise)
+        if distribution == "sine":
+            return self.level + 3 * self.noise * math.sin(2 * math.pi * 0.1 * due_ns / 1e9) + rng.gauss(0.0, 0.1 * self.noise)
+        if distribution == "drift":
+            self.value += rng.gauss(0.0, 0.1 * self.noise)
+        elif distribution == "steps" and rng.random() < 0.01:
+            self.value += rng.choice((-self.noise, self.noise))
+        return self.value
+
+
+    async def log(self, rng: random.Random, due_ns: int):
+        handle = self.handle
+        await handle._log(self.log_cls(
+            sensor_id=handle.sensor_id,
+            channel=Channel.SENSOR,
+            data_center=self.data_center,
+            duration=self.period_ns / 1e9,
+            measurement=self.reading(rng, due_ns),
+            product=self.product,
+            status=Status.NORMAL,
+            metadata=handle._add_machine_metadata(None),
+            timestamp_ns=due_ns,
+        ))
+
+
+def parse_profiles(text: str) -> list:
+    """
+    Parses "type:rate:distribution,..." into (log class, level, rate, distribution) tuples.
+    """
+    profiles = []
+    for item in text.split(","):
+        try:
+            name, rate, distribution = item.strip().split(":")
+            log_cls, level = SENSOR_TYPES[name]
+            rate = float(rate)
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid profile {item!r}, expected type:rate:distribution with a type of {', '.join(SENSOR_TYPES)}")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+        if rate <= 0:
+            raise ValueError(f"The rate of profile {item!r} must be positive")
+        profiles.append((log_cls, level, rate, distribution))
+    return profiles
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def latencies_ms(samples: list, window_start_ns: int, window_end_ns: int) -> list:
+    """
+    Returns the sorted latencies of the sampled records that were due within the window.
+    """
+    latencies = []
+    for arrival_ns, payload in samples:
+        for record in decode_records(payload):
+            due_ns = parse_timestamp_ns(record["timestamp"])
+            if window_start_ns <= due_ns < window_end_ns:
+                latencies.append((arrival_ns - due_ns) / 1e6)
+    latencies.sort()
+    return latencies
+
+
+async def run_step(sensor_count: int, profiles: list, args) -> dict:
+    """
+    Runs sensor_count virtual sensors for the warmup and the measured duration.
+    """
+    rng = random.Random(sensor_count)
+    data_centers, products = list(DataCenter), list(Product)
+    offered_rate = sum(profiles[index % len(profiles)][2] for index in range(sensor_count))
+    expected = offered_rate * (args.warmup + args.duration)
+    broker = SoakBroker(args.broker_latency / 1000, max(1, int(expected / LATENCY_SAMPLES)))
+
+    with scratch_directory() as directory:
+        hub = LoggerHub(
+            KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+            KAFKA_TOPIC="sensor_logs",
+            producer=broker,
+            sinks=["kafka", "file"] if args.file else ["kafka"],
+            log_directory=directory,
+            file_format=args.file or "ndjson",
+            batching=not args.no_batching,
+            serializer=args.serializer,
+            partition_key="sensor_id",
+        )
+        await hub.initialize()
+
+        sensors = []
+        for index in range(sensor_count):
+            log_cls, level, rate, distribution = profiles[index % len(profiles)]
+            handle = hub.sensor(f"sensor-{index:06d}")
+            handle.update_machine_status(Action.START)
+            sensors.append(VirtualSensor(
+                handle, log_cls, rate, distribution, level,
+                data_centers[index % len(data_centers)], products[index % len(products)],
+            ))
+
+        start_ns = time.time_ns()
+        schedule = [(start_ns + rng.randrange(sensor.period_ns), index) for index, sensor in enumerate(sensors)]
+        heapq.heapify(schedule)
+        window_start_ns = start_ns + int(args.warmup * 1e9)
+        window_end_ns = window_start_ns + int(args.duration * 1e9)
+
+        marks = None
+        while True:
+            now = time.time_ns()
+            if marks is None and now >= window_start_ns:
+                marks = (broker.delivered, time.process_time(), rss_bytes(), time.perf_counter())
+            if now >= window_end_ns:
+                break
+            for _ in range(MAX_BURST):
+                due_ns, index = schedule[0]
+                if due_ns > now:
+                    break
+                sensor = sensors[index]
+                await sensor.log(rng, due_ns)
+                heapq.heapreplace(schedule, (due_ns + sensor.period_ns, index))
+            await asyncio.sleep(max(0.0, (schedule[0][0] - time.time_ns()) / 1e9))
+
+        delivered, cpu, rss, wall = broker.delivered, time.process_time(), rss_bytes(), time.perf_counter()
+        lag_ms = max(0, time.time_ns() - schedule[0][0]) / 1e6
+        await hub.close()
+
+    delivered_before, cpu_before, rss_before, wall_before = marks
+    elapsed = wall - wall_before
+    latencies = latencies_ms(broker.samples, window_start_ns, window_end_ns)
+    return {
+        "sensors": sensor_count,
+        "offered_per_s": offered_rate,
+        "delivered_per_s": (delivered - delivered_before) / elapsed,
+        "latency_ms": {
+            "p50": harness.percentile(latencies, 0.5),
+            "p99": harness.percentile(latencies, 0.99),
+            "p99.9": harness.percentile(latencies, 0.999),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "rss_growth_mb": (rss - rss_before) / 1e6,
+        "rss_mb": rss / 1e6,
+        "cpu_percent_per_1k_sensors": 100 * (cpu - cpu_before) / elapsed / (sensor_count / 1000),
+        "schedule_lag_ms": lag_ms,
+    }
+
+
+def meets_slo(result: dict, args) -> bool:
+    return result["delivered_per_s"] >= 0.98 * result["offered_per_s"] and result["latency_ms"]["p99"] <= args.slo_p99_ms
+
+
+def print_header():
+    print(
+        f"{'sensors':>9} {'offered/s':>10} {'delivered/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'max ms':>8} "
+        f"{'RSS MB':>7} {'growth':>7} {'CPU%/1k':>8} {'lag ms':>8}  SLO"
+    )
+
+
+def print_result(result: dict, args):
+    latency = result["latency_ms"]
+    print(
+        f"{result['sensors']:>9,} {result['offered_per_s']:>10,.0f} {result['delivered_per_s']:>11,.0f} "
+        f"{latency['p50']:>8.1f} {latency['p99']:>8.1f} {latency['p99.9']:>9.1f} {latency['max']:>8.1f} "
+        f"{result['rss_mb']:>7.1f} {result['rss_growth_mb']:>+7.1f} {result['cpu_percent_per_1k_sensors']:>8.1f} "
+        f"{result['schedule_lag_ms']:>8.1f}  {'ok' if meets_slo(result, args) else 'MISSED'}",
+        flush=True,
+    )
+
+
+async def ramp(profiles: list, args) -> list:
+    """
+    Doubles the sensor count until a step misses the SLO, then bisects the saturation point.
+    """
+    results = []
+    passing, failing = None, None
+    count = args.sensors
+    while count <= args.max_sensors:
+        result = await run_step(count, profiles, args)
+        results.append(result)
+        print_result(result, args)
+        if not meets_slo(result, args):
+            failing = count
+            break
+        passing = result
+        count *= 2
+
+    if passing is not None and failing is not None:
+        low, high = passing["sensors"], failing
+        for _ in range(args.bisect):
+            count = (low + high) // 2
+            if count in (low, high):
+                break
+            result = await run_step(count, profiles, args)
+            results.append(result)
+            print_result(result, args)
+            if meets_slo(result, args):
+                low, passing = count, result
+            else:
+                high = count
+
+    if passing is None:
+        print(f"\nsaturated below {args.sensors:,} sensors")
+    elif failing is None:
+        print(f"\nnot saturated at {passing['sensors']:,} sensors (--max-sensors)")
+    else:
+        print(
+            f"\nsaturation: about {passing['sensors']:,} sensors, {passing['delivered_per_s']:,.0f} records/s "
+            f"within a p99 of {args.slo_p99_ms:g} ms"
+        )
+    return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sensors", type=int, default=1000, help="number of virtual sensors (the first step with --ramp)")
+    parser.add_argument("--profiles", default=DEFAULT_PROFILES, help="type:rate:distribution,... assigned to the sensors round robin")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds per step before measuring")
+    parser.add_argument("--broker-latency", type=float, default=2.0, help="simulated produce round trip in ms")
+    parser.add_argument("--no-batching", action="store_true", help="send every record directly instead of batching")
+    parser.add_argument("--serializer", default="json", help="record serializer (json, binary, orjson, msgpack)")
+    parser.add_argument("--file", choices=("pretty", "ndjson", "store"), help="also write the local log file in this format")
+    parser.add_argument("--slo-p99-ms", type=float, default=250.0, help="p99 end-to-end latency a step must stay within")
+    parser.add_argument("--ramp", action="store_true", help="find the saturation point by ramping the sensor count")
+    parser.add_argument("--max-sensors", type=int, default=1_000_000, help="largest sensor count tried by --ramp")
+    parser.add_argument("--bisect", type=int, default=3, help="bisection steps after the first failing count")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        profiles = parse_profiles(args.profiles)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    print(
+        f"profiles {args.profiles}, broker round trip {args.broker_latency:g} ms, "
+        f"{'no batching' if args.no_batching else 'batching'}, {args.serializer}, "
+        f"{args.warmup:g} s warmup + {args.duration:g} s per step"
+    )
+    print_header()
+    if args.ramp:
+        results = asyncio.run(ramp(profiles, args))
+    else:
+        result = asyncio.run(run_step(args.sensors, profiles, args))
+        print_result(result, args)
+        results = [result]
+
+    if args.output:
+        harness.save(args.output, {"environment": harness.environment(), "arguments": vars(args), "steps": results})
+
+
+if __name__ == "__main__":
+    main()
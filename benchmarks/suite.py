@@ -0,0 +1,242 @@
+"""
+Microbenchmarks of every stage of the logging hot path, stored as JSON for comparison.
+
+Each stage of a log_vibration call is timed on its own and the whole call end to end:
+
+    construct             building a VibrationLogData
+    add_machine_metadata  SensorLogMethods._add_machine_metadata
+    to_dict               BaseSensorLogData.to_dict
+    json_dumps            JsonSerializer.dumps of the dict
+    binary_dumps          BinarySerializer.dumps of the dict
+    file_write            logger.info of the dict to the NDJSON file (tmpfs if available)
+    kafka_send            _publish of a payload to the in-memory fake producer
+    end_to_end            log_vibration with Kafka and the NDJSON file enabled
+
+For every stage the suite reports ops/sec, p50/p99/p99.9 latency and the memory blocks and
+bytes each call leaves allocated (with its result kept alive). No broker is needed.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output results/baseline.json
+    python -m benchmarks.suite --compare results/baseline.json   # exit status 1 on regression
+    python -m benchmarks.suite compare results/baseline.json results/new.json
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+from benchmarks import harness
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.serializers import get_serializer
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+STAGES = (
+    "construct",
+    "add_machine_metadata",
+    "to_dict",
+    "json_dumps",
+    "binary_dumps",
+    "file_write",
+    "kafka_send",
+    "end_to_end",
+)
+
+
+def scratch_directory():
+    """
+    Returns a temporary directory on tmpfs when available, so file writes measure the
+    logging code rather than the disk.
+    """
+    tmpfs = "/dev/shm"
+    return tempfile.TemporaryDirectory(dir=tmpfs if os.path.isdir(tmpfs) else None)
+
+
+def stage_operations(logger):
+    """
+    Builds the zero-argument operation of every stage around one logger.
+    """
+    record = VibrationLogData(
+        sensor_id=logger.sensor_id,
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=4.5,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start", "uptime": 12.5},
+    )
+    log_data = record.to_dict()
+    json_serializer = get_serializer("json")
+    binary_serializer = get_serializer("binary")
+    payload = json_serializer.dumps(log_data)
+    file_logger = logger.logger
+
+    def construct():
+        return VibrationLogData(
+            sensor_id="bench-sensor",
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=4.5,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+            metadata={"machine_status": "Start", "uptime": 12.5},
+        )
+
+    def add_machine_metadata():
+        return logger._add_machine_metadata(None)
+
+    def to_dict():
+        return record.to_dict()
+
+    def json_dumps():
+        return json_serializer.dumps(log_data)
+
+    def binary_dumps():
+        return binary_serializer.dumps(log_data)
+
+    def file_write():
+        file_logger.info(log_data)
+
+    async def kafka_send():
+        await logger._publish(payload)
+
+    async def end_to_end():
+        await logger.log_vibration(
+            channel=Channel.SENSOR,
+            data_center=DataCenter.FACTORY_1,
+            duration=1.0,
+            measurement=4.5,
+            product=Product.MACHINE_MONITORING,
+            status=Status.NORMAL,
+        )
+
+    return {
+        "construct": construct,
+        "add_machine_metadata": add_machine_metadata,
+        "to_dict": to_dict,
+        "json_dumps": json_dumps,
+        "binary_dumps": binary_dumps,
+        "file_write": file_write,
+        "kafka_send": kafka_send,
+        "end_to_end": end_to_end,
+    }
+
+
+async def run_suite(stages, iterations, rounds, allocation_iterations):
+    overhead = harness.timer_overhead_ns()
+    results = {}
+
+    with scratch_directory() as log_directory:
+        producer = FakeProducer()
+        logger = LoggerConfig(
+            sensor_id="bench-sensor",
+            KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+            KAFKA_TOPIC="sensor_logs",
+            log_directory=log_directory,
+            producer=producer,
+            file_format="ndjson",
+        )
+        await logger.initialize()
+        logger.update_machine_status(Action.START)
+        operations = stage_operations(logger)
+
+        for stage in stages:
+            results[stage] = await harness.measure(
+                operations[stage],
+                iterations=iterations,
+                rounds=rounds,
+                allocation_iterations=allocation_iterations,
+                overhead=overhead,
+            )
+            # The fake producer keeps every payload; drop them so stages do not inherit the memory.
+            producer.messages.clear()
+            print(format_result(stage, results[stage]), flush=True)
+
+        await logger.close()
+
+    return {
+        "environment": harness.environment(),
+        "timer_overhead_ns": overhead,
+        "iterations": iterations,
+        "rounds": rounds,
+        "stages": results,
+    }
+
+
+def format_result(stage, result):
+    return (
+        f"{stage:>21}: {result['ops_per_sec']:>11,.0f} ops/s  "
+        f"p50 {result['p50_ns'] / 1e3:7.2f} us  p99 {result['p99_ns'] / 1e3:7.2f} us  "
+        f"p99.9 {result['p999_ns'] / 1e3:7.2f} us  "
+        f"{result['alloc_blocks_per_op']:5.1f} blocks {result['alloc_bytes_per_op']:7.0f} B/op"
+    )
+
+
+def report_comparison(baseline, current, threshold, tail_threshold):
+    """
+    Prints the changes between two runs and returns True if any metric regressed.
+    """
+    regressions = 0
+    print(f"\nagainst {baseline['environment'].get('revision')} ({baseline['environment'].get('time')}):")
+    for stage, metric, before, after, change, regressed in harness.compare(
+            baseline, current, threshold, tail_threshold):
+        if regressed:
+            regressions += 1
+        print(
+            f"{'REGRESSION' if regressed else '':>10} {stage:>21} {metric:>19}: "
+            f"{before:>14,.1f} -> {after:>14,.1f} ({change:+7.1%})"
+        )
+    print(f"{regressions} regressions")
+    return regressions > 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", help="compare BASELINE CURRENT: compare two saved runs without running")
+    parser.add_argument("--iterations", type=int, default=100000, help="timed calls per round")
+    parser.add_argument("--rounds", type=int, default=3, help="timing rounds per stage, the fastest is kept")
+    parser.add_argument("--allocation-iterations", type=int, default=10000, help="calls per stage under tracemalloc")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma separated stages to run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results with a saved run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed throughput/p50/allocation change")
+    parser.add_argument("--tail-threshold", type=float, default=0.25, help="allowed p99/p99.9 change")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.files:
+        if len(args.files) != 3 or args.files[0] != "compare":
+            sys.exit("usage: python -m benchmarks.suite compare BASELINE CURRENT")
+        regressed = report_comparison(
+            harness.load(args.files[1]), harness.load(args.files[2]), args.threshold, args.tail_threshold
+        )
+        sys.exit(1 if regressed else 0)
+
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run_suite(stages, args.iterations, args.rounds, args.allocation_iterations))
+
+    if args.output:
+        harness.save(args.output, results)
+
+    if args.compare and report_comparison(harness.load(args.compare), results, args.threshold, args.tail_threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
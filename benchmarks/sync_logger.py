@@ -0,0 +1,152 @@
+"""
+Aggregate throughput of sensor driver threads logging through the synchronous front-end.
+
+Every driver thread reads its sensor with a blocking call (time.sleep of READ_PERIOD) and
+logs the reading, for DURATION seconds. Three ways for a thread to log are compared:
+
+    asyncio.run     a new event loop per call, the workaround without a sync API
+    round trip      run_coroutine_threadsafe(...).result() on one shared loop thread
+    SyncLogger      enqueue from the thread, drained by the SyncLogger loop thread
+
+The same threads without the log call give the ideal (sleep overshoot included); the suite
+reports how close each way gets, plus the latency of the log call in the driver thread. Every record logged
+is checked to have reached the fake producer.
+
+Run from the repository root:
+
+    python -m benchmarks.sync_logger
+"""
+import asyncio
+import threading
+import time
+
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sync_logger import SyncLogger
+from tests.fakes import FakeProducer
+
+READ_PERIOD = 0.002
+DURATION = 1.0
+THREADS = (1, 2, 4, 8, 16, 32)
+
+READING = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    duration=1.0,
+    measurement=4.5,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+OPTIONS = dict(
+    KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+    KAFKA_TOPIC="sensor_logs",
+    file_format="ndjson",
+)
+
+
+def drive(log_call, deadline, latencies):
+    count = 0
+    while time.perf_counter() < deadline:
+        time.sleep(READ_PERIOD)
+        start = time.perf_counter()
+        log_call()
+        latencies.append(time.perf_counter() - start)
+        count += 1
+    return count
+
+
+def run_threads(threads, make_log_call):
+    """
+    Runs the driver threads and returns the records they logged and their call latencies.
+    """
+    deadline = time.perf_counter() + DURATION
+    counts = [0] * threads
+    latencies = [[] for _ in range(threads)]
+
+    def target(index):
+        counts[index] = drive(make_log_call(index), deadline, latencies[index])
+
+    workers = [threading.Thread(target=target, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(counts), sorted(latency for thread in latencies for latency in thread)
+
+
+def with_asyncio_run(threads, log_directory):
+    producer = FakeProducer()
+    config = LoggerConfig(sensor_id="bench-sensor", log_directory=log_directory, producer=producer, **OPTIONS)
+    config.update_machine_status(Action.START)
+    records, latencies = run_threads(threads, lambda index: lambda: asyncio.run(config.log_vibration(**READING)))
+    asyncio.run(config.close())
+    return records, latencies, len(producer.messages)
+
+
+def with_round_trip(threads, log_directory):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def create():
+        config = LoggerConfig(sensor_id="bench-sensor", log_directory=log_directory, producer=producer, **OPTIONS)
+        await config.initialize()
+        return config
+
+    producer = FakeProducer()
+    config = asyncio.run_coroutine_threadsafe(create(), loop).result()
+    config.update_machine_status(Action.START)
+
+    def make_log_call(index):
+        return lambda: asyncio.run_coroutine_threadsafe(config.log_vibration(**READING), loop).result()
+
+    records, latencies = run_threads(threads, make_log_call)
+    asyncio.run_coroutine_threadsafe(config.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    return records, latencies, len(producer.messages)
+
+
+def with_sync_logger(threads, log_directory):
+    producer = FakeProducer()
+    logger = SyncLogger("bench-sensor", log_directory=log_directory, producer=producer, **OPTIONS)
+
+    def make_log_call(index):
+        handle = logger.sensor(f"sensor-{index:03d}")
+        handle.update_machine_status(Action.START)
+        return lambda: handle.log_vibration(**READING)
+
+    records, latencies = run_threads(threads, make_log_call)
+    logger.close()
+    return records, latencies, len(producer.messages)
+
+
+def main():
+    print(f"driver threads read every {READ_PERIOD * 1e3:.0f} ms for {DURATION:.0f} s")
+    ideal = {threads: run_threads(threads, lambda index: lambda: None)[0] / DURATION for threads in THREADS}
+    print("  sleep only " + "  ".join(f"{threads}: {ideal[threads]:,.0f}/s" for threads in THREADS) + "\n")
+
+    with scratch_directory() as log_directory:
+        for name, run in (("asyncio.run", with_asyncio_run), ("round trip", with_round_trip), ("SyncLogger", with_sync_logger)):
+            for threads in THREADS:
+                records, latencies, delivered = run(threads, log_directory)
+                assert delivered == records, (name, threads, delivered, records)
+                throughput = records / DURATION
+                print(
+                    f"{name:>11} {threads:3d} threads: {throughput:>8,.0f} records/s  "
+                    f"of ideal {throughput / ideal[threads]:4.0%}  "
+                    f"log call p50 {latencies[len(latencies) // 2] * 1e6:7.1f} us  "
+                    f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us"
+                )
+            print()
+
+
+if __name__ == "__main__":
+    main()
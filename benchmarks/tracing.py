@@ -0,0 +1,118 @@
+"""
+Hot path overhead of sampled tracing, the span breakdown of a log call and the Chrome export.
+
+log_vibration is timed end to end with the fake producer and an NDJSON file on tmpfs, with
+tracing off, sampling 1% and sampling every call, alternating blocks of calls to even out
+machine noise. The traces of every call then give the time spent per stage, and a run with
+batching and log_batch is exported as Chrome trace event JSON and checked.
+
+Run from the repository root:
+
+    python -m benchmarks.tracing
+"""
+import asyncio
+import json
+import os
+import statistics
+
+from benchmarks.metrics import log_one, make_logger, time_blocks
+from benchmarks.suite import scratch_directory
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.metrics.tracing import Tracer
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+BLOCK = 200
+BLOCKS = 150
+MODES = {"off": None, "1%": 0.01, "100%": 1.0}
+
+
+async def compare_overhead():
+    """
+    Alternates blocks of calls of one logger with tracing off, at 1% and at 100%.
+    """
+    with scratch_directory() as log_directory:
+        logger = make_logger(log_directory)
+        await logger.initialize()
+        logger.update_machine_status(Action.START)
+        tracers = {mode: Tracer(rate) if rate else None for mode, rate in MODES.items()}
+        await time_blocks(logger, BLOCK)
+
+        blocks = {mode: [] for mode in MODES}
+        for _ in range(BLOCKS):
+            for mode, tracer in tracers.items():
+                logger.tracer = tracer
+                blocks[mode].append(await time_blocks(logger, BLOCK))
+        await logger.close()
+
+    off = blocks["off"]
+    for mode, durations in blocks.items():
+        per_record = statistics.median(durations) / BLOCK
+        # Neighbouring blocks see the same machine load, so their ratio cancels slow drifts.
+        ratio = statistics.median(on / base for base, on in zip(off, durations))
+        print(f"tracing {mode:>4}: {per_record / 1e3:6.2f} us/record  {ratio - 1:+6.1%} against off")
+    return tracers["100%"]
+
+
+def breakdown(tracer):
+    spans = {}
+    for trace in tracer.traces:
+        for name, start, end in trace.spans:
+            spans.setdefault(name, []).append(end - start)
+    totals = sorted(trace.duration_ns for trace in tracer.traces)
+    print(f"\nspans of {len(totals):,} traced log_vibration calls (median / p99 in us):")
+    for name, durations in spans.items():
+        durations.sort()
+        print(f"  {name:>16}: {durations[len(durations) // 2] / 1e3:6.2f} / {durations[int(len(durations) * 0.99)] / 1e3:6.2f}")
+    print(f"  {'whole call':>16}: {totals[len(totals) // 2] / 1e3:6.2f} / {totals[int(len(totals) * 0.99)] / 1e3:6.2f}")
+
+
+async def check_export():
+    """
+    Traces every call of a batching logger and checks the exported Chrome trace.
+    """
+    received = []
+    with scratch_directory() as log_directory:
+        logger = make_logger(log_directory, batching=True, trace_sample_rate=1.0, trace_callback=received.append)
+        await logger.initialize()
+        for _ in range(50):
+            await log_one(logger)
+        await logger.log_batch(
+            VibrationLogData, [4.5] * 100, durations=0.001,
+            channel=Channel.SENSOR, data_center=DataCenter.FACTORY_1,
+            product=Product.MACHINE_MONITORING, status=Status.NORMAL,
+        )
+        await logger.flush()
+        path = os.path.join(log_directory, "trace.json")
+        logger.export_trace(path)
+        await logger.close()
+
+        with open(path) as source:
+            events = json.load(source)["traceEvents"]
+
+    names = [trace.name for trace in received]
+    assert names.count("VibrationLogData") == 50 and names.count("log_batch") == 1 and "send_batch" in names, names
+    roots = [event for event in events if event["name"] in ("VibrationLogData", "log_batch", "send_batch")]
+    assert len(roots) == len(received)
+    for root in roots:
+        children = [
+            event for event in events
+            if event is not root and event["tid"] == root["tid"] and root["ts"] <= event["ts"] <= root["ts"] + root["dur"]
+        ]
+        assert all(child["ts"] + child["dur"] <= root["ts"] + root["dur"] + 1e-3 for child in children), root
+    batch = next(trace for trace in received if trace.name == "log_batch").to_dict()
+    print(f"\nexported {len(events)} events of {len(received)} traces on {len({event['tid'] for event in events})} rows")
+    print(f"log_batch of 100 samples: {[(span['name'], round(span['duration_us'], 1)) for span in batch['spans']]}")
+
+
+async def main():
+    tracer = await compare_overhead()
+    breakdown(tracer)
+    await check_export()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,12 @@
+import logging
+import signal
+import sys
+
 from confluent_kafka import Consumer
 
+from log_sdk.consumer.runner import ConsumerRunner
+from log_sdk.consumer.sinks import NdjsonFileSink, SQLiteSink
+
 KAFKA_BOOTSTRAP_SERVERS = "localhost:9094"
 KAFKA_TOPIC = "sensor_logs"
 
@@ -7,25 +14,26 @@ consumer_config = {
     "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
     "group.id": "sensor_group",
     "auto.offset.reset": "earliest",
+    # Offsets are committed by the runner once the sinks have been flushed.
+    "enable.auto.commit": False,
 }
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
 consumer = Consumer(consumer_config)
 consumer.subscribe([KAFKA_TOPIC])
 
+# JSON, orjson, MessagePack and binary payloads are all recognized automatically.
+sink = SQLiteSink(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].endswith(".db") else \
+    NdjsonFileSink(sys.argv[1] if len(sys.argv) > 1 else "./consumed/sensor_logs.ndjson")
+runner = ConsumerRunner(consumer, [sink], batch_size=1000, executor="thread", workers=4)
+signal.signal(signal.SIGTERM, lambda *_: runner.stop())
+
 print(f"Listening for messages on topic: {KAFKA_TOPIC}")
 
 try:
-    while True:
-        msg = consumer.poll(1.0)
-        if msg is None:
-            continue
-        if msg.error():
-            print(f"Error: {msg.error()}")
-            continue
-
-        print(f"Received Message: {msg.value().decode('utf-8')}")
-
+    runner.run()
 except KeyboardInterrupt:
     print("\n Stopping Kafka Consumer...")
 finally:
-    consumer.close()
+    runner.close()
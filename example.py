@@ -1,5 +1,4 @@
 import asyncio
-import time
 
 from log_sdk.logger_config import LoggerConfig
 from log_sdk.common.action import Action
@@ -22,7 +21,7 @@ async def main():
     await logger.initialize()
 
     logger.update_machine_status(Action.START)
-    time.sleep(5)
+    await asyncio.sleep(5)
 
     await logger.log_vibration(
         channel=Channel.SENSOR,
@@ -33,7 +32,7 @@ async def main():
         status=Status.NORMAL
     )
 
-    time.sleep(5)
+    await asyncio.sleep(5)
 
     await logger.log_temperature(
         channel=Channel.SENSOR,
@@ -45,7 +44,7 @@ async def main():
     )
 
     logger.update_machine_status(Action.MAINTENANCE)
-    time.sleep(3)
+    await asyncio.sleep(3)
 
     await logger.log_pressure(
         channel=Channel.SENSOR,
@@ -57,7 +56,7 @@ async def main():
     )
 
     logger.update_machine_status(Action.STOP)
-    time.sleep(2)
+    await asyncio.sleep(2)
 
     await logger.log_electrical(
         channel=Channel.SENSOR,
@@ -68,7 +67,7 @@ async def main():
         status=Status.CRITICAL
     )
 
-    time.sleep(5)
+    await asyncio.sleep(5)
 
     await logger.log_humidity(
         channel=Channel.SENSOR,
@@ -0,0 +1,402 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from log_sdk.sensor_logs.base_sensor import parse_timestamp_ns
+from log_sdk.serializers.base import Serializer
+from log_sdk.storage.readers import iter_records, log_files
+
+
+def _to_ns(value: Union[datetime, str, None]) -> Optional[int]:
+    """
+    Converts a bound of the time filter to epoch nanoseconds; naive values are local time, like record timestamps.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def load_file(
+        path: str,
+        skip: int,
+        since_ns: Optional[int],
+        until_ns: Optional[int],
+        sensor_ids: Optional[frozenset],
+        serializer: Serializer,
+        partition_key: Optional[Callable[[dict], Optional[bytes]]],
+    ) -> Tuple[List[Tuple[bytes, Optional[bytes]]], int, int]:
+    """
+    Parses one log file and serializes the records matching the filters.
+
+    Module-level so a process pool can pickle it.
+
+    :param skip: Number of matching records to leave out at the start (already published).
+    :return: The (payload, key) pairs, the number of records that did not match the filters and
+        the number of torn records skipped.
+    """
+    messages = []
+    filtered = corrupted = 0
+    dumps = serializer.dumps
+
+    def count_corrupted(text: str):
+        nonlocal corrupted
+        corrupted += 1
+
+    for record in iter_records(path, on_corrupt=count_corrupted):
+        if sensor_ids is not None and record.get("sensor_id") not in sensor_ids:
+            filtered += 1
+            continue
+        if since_ns is not None or until_ns is not None:
+            timestamp = record.get("timestamp")
+            timestamp_ns = parse_timestamp_ns(timestamp) if timestamp else None
+            if timestamp_ns is None or (since_ns is not None and timestamp_ns < since_ns) or \
+                    (until_ns is not None and timestamp_ns >= until_ns):
+                filtered += 1
+                continue
+        if skip:
+            skip -= 1
+            continue
+        messages.append((dumps(record), partition_key(record) if partition_key is not None else None))
+    return messages, filtered, corrupted
+
+
+class BackfillStats:
+    """
+    Running totals of a Backfill.
+    """
+    __slots__ = ("files", "records", "bytes", "filtered", "corrupted", "resumed", "started")
+
+    def __init__(self):
+        self.files = 0
+        self.records = 0
+        self.bytes = 0
+        self.filtered = 0
+        self.corrupted = 0
+        self.resumed = 0
+        self.started = time.monotonic()
+
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+    @property
+    def rate(self) -> float:
+        """
+        Average number of records published per second since the start.
+        """
+        return self.records / max(self.elapsed, 1e-9)
+
+
+    def as_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "records": self.records,
+            "bytes": self.bytes,
+            "filtered": self.filtered,
+            "corrupted": self.corrupted,
+            "resumed": self.resumed,
+            "elapsed": self.elapsed,
+            "rate": self.rate,
+        }
+
+
+class Backfill:
+    """
+    Re-publishes the records of local log files through the sinks of a LoggerConfig.
+
+    Files are parsed, filtered and serialized in a pool of workers (with the serializer and
+    partition key of the config), a few files ahead of the one being published, and published
+    oldest first through the config's send path: its batching, overload policy, spool and
+    metrics apply. The config should not include the "file" sink, which the records came from.
+
+    With a checkpoint file, progress is saved every checkpoint_interval seconds after the
+    config was flushed, so an interrupted backfill resumes after the last saved record
+    (records sent after it are published again: at-least-once). Files are identified by path,
+    so a checkpoint is only valid for files that are no longer written or rotated.
+    """
+    def __init__(
+            self,
+            config,
+            paths: Iterable[str],
+            since: Union[datetime, str, None] = None,
+            until: Union[datetime, str, None] = None,
+            sensor_ids: Optional[Iterable[str]] = None,
+            executor: Optional[str] = "process",
+            workers: int = 4,
+            max_rate: Optional[float] = None,
+            checkpoint: Optional[str] = None,
+            checkpoint_interval: float = 5.0,
+            report_interval: Optional[float] = 10.0,
+            on_report: Optional[Callable[[BackfillStats], None]] = None,
+        ):
+        """
+        :param config: The initialized LoggerConfig publishing the records.
+        :param paths: Log files and directories of log files (sensor_logs_*.log*, oldest first).
+        :param since: Only records at or after this time (datetime or ISO 8601 string, naive values are local time).
+        :param until: Only records before this time.
+        :param sensor_ids: Only records of these sensors.
+        :param executor: "process", "thread" or None to parse on the event loop thread.
+        :param workers: Number of files parsed in parallel.
+        :param max_rate: Maximum number of records published per second (None publishes as fast as the sinks accept).
+        :param checkpoint: Path of the JSON checkpoint file to resume from and save progress to.
+        :param checkpoint_interval: Minimum time in seconds between two checkpoint saves.
+        :param report_interval: Seconds between throughput reports (None disables them).
+        :param on_report: Callback receiving the stats at every report; by default they are logged.
+        """
+        self.config = config
+        self.paths = list(paths)
+        self.since_ns = _to_ns(since)
+        self.until_ns = _to_ns(until)
+        self.sensor_ids = frozenset(sensor_ids) if sensor_ids is not None else None
+        self.workers = workers
+        self.max_rate = max_rate
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.report_interval = report_interval
+        self.on_report = on_report
+        self.logger = logging.getLogger("sensor_backfill")
+        self.stats = BackfillStats()
+
+        if executor is None:
+            self._executor: Optional[Executor] = None
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self._filters = {
+            "since_ns": self.since_ns,
+            "until_ns": self.until_ns,
+            "sensor_ids": sorted(self.sensor_ids) if self.sensor_ids is not None else None,
+        }
+        # Records published so far per file; True once a file is complete.
+        self._progress = self._load_checkpoint()
+        self._stop = False
+        self._rate_start = None
+        self._last_checkpoint = time.monotonic()
+        self._last_report = time.monotonic()
+
+
+    def files(self) -> List[str]:
+        """
+        Returns the files to publish, oldest first within every directory.
+        """
+        files = []
+        for path in self.paths:
+            files.extend(log_files(path) if os.path.isdir(path) else [path])
+        return [os.path.abspath(path) for path in files]
+
+
+    def _load_checkpoint(self) -> dict:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return {}
+        with open(self.checkpoint, encoding="utf-8") as checkpoint_file:
+            state = json.load(checkpoint_file)
+        if state.get("filters") != self._filters:
+            raise ValueError(f"Checkpoint {self.checkpoint} was written with other filters: {state.get('filters')}")
+        return state["files"]
+
+
+    async def _save_checkpoint(self):
+        """
+        Flushes the config, then atomically replaces the checkpoint file.
+        """
+        await self.config.flush()
+        self._last_checkpoint = time.monotonic()
+        if self.checkpoint is None:
+            return
+        temporary = self.checkpoint + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"filters": self._filters, "files": self._progress}, checkpoint_file)
+        os.replace(temporary, self.checkpoint)
+
+
+    def _load(self, loop, path: str):
+        skip = self._progress.get(path, 0)
+        arguments = (
+            path,
+            skip,
+            self.since_ns,
+            self.until_ns,
+            self.sensor_ids,
+            self.config.serializer,
+            self.config.partition_key,
+        )
+        if self._executor is None:
+            future = loop.create_future()
+            future.set_result(load_file(*arguments))
+            return future
+        return loop.run_in_executor(self._executor, load_file, *arguments)
+
+
+    async def run(self) -> BackfillStats:
+        """
+        Publishes every remaining record, saving a last checkpoint before returning (also after stop()).
+        """
+        loop = asyncio.get_event_loop()
+        pending = [path for path in self.files() if self._progress.get(path) is not True]
+        loads = []
+        try:
+            for index, path in enumerate(pending):
+                # Keep the workers busy with the next files while this one is published.
+                while len(loads) < self.workers and index + len(loads) < len(pending):
+                    loads.append(self._load(loop, pending[index + len(loads)]))
+                messages, filtered, corrupted = await loads.pop(0)
+
+                self.stats.filtered += filtered
+                self.stats.corrupted += corrupted
+                self.stats.resumed += self._progress.get(path, 0)
+                if not await self._publish(path, messages):
+                    break
+                self._progress[path] = True
+                self.stats.files += 1
+        finally:
+            for load in loads:
+                load.cancel()
+            await self._save_checkpoint()
+
+        if self.report_interval is not None:
+            self._report()
+        return self.stats
+
+
+    async def _publish(self, path: str, messages: Sequence[Tuple[bytes, Optional[bytes]]]) -> bool:
+        """
+        Publishes the records of one file.
+
+        :return: False if stop() was called before the file was complete.
+        """
+        publish = self.config._publish
+        stats = self.stats
+        published = self._progress.get(path, 0)
+        if self._rate_start is None:
+            self._rate_start = (time.monotonic(), stats.records)
+        for count, (payload, key) in enumerate(messages, 1):
+            await publish(payload, None, None, key)
+            stats.records += 1
+            stats.bytes += len(payload)
+
+            if count % 100 == 0:
+                self._progress[path] = published + count
+                if not await self._pace():
+                    return False
+
+        self._progress[path] = published + len(messages)
+        return await self._pace()
+
+
+    async def _pace(self) -> bool:
+        """
+        Waits as long as the rate limit requires, saves a checkpoint and reports when due.
+
+        :return: False if stop() was called.
+        """
+        if self.max_rate is not None:
+            started, records = self._rate_start
+            delay = (self.stats.records - records) / self.max_rate - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        if now - self._last_checkpoint >= self.checkpoint_interval:
+            await self._save_checkpoint()
+        if self.report_interval is not None and now - self._last_report >= self.report_interval:
+            self._last_report = now
+            self._report()
+        return not self._stop
+
+
+    def _report(self):
+        if self.on_report is not None:
+            self.on_report(self.stats)
+            return
+
+        self.logger.info(
+            f"Backfilled {self.stats.records} records from {self.stats.files} files "
+            f"({self.stats.rate:.0f} rec/s, {self.stats.filtered} filtered out, {self.stats.corrupted} corrupted, "
+            f"{self.stats.resumed} already published)"
+        )
+
+
+    def stop(self):
+        """
+        Asks run() to return after saving a checkpoint; the next run resumes from it.
+        """
+        self._stop = True
+
+
+    def close(self):
+        """
+        Shuts down the parsing workers (the config is closed by its owner).
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+async def _main(arguments):
+    from log_sdk.logger_config import LoggerConfig
+
+    config = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS=arguments.bootstrap_servers,
+        KAFKA_TOPIC=arguments.topic,
+        sinks=["kafka"],
+        partition_key=arguments.partition_key,
+        batching=True,
+        batch_size=arguments.batch_size,
+        serializer=arguments.serializer,
+    )
+    await config.initialize()
+    backfill = Backfill(
+        config,
+        arguments.paths,
+        since=arguments.since,
+        until=arguments.until,
+        sensor_ids=arguments.sensor or None,
+        workers=arguments.workers,
+        max_rate=arguments.rate,
+        checkpoint=arguments.checkpoint,
+    )
+    try:
+        stats = await backfill.run()
+    finally:
+        backfill.close()
+        await config.close()
+    print(json.dumps(stats.as_dict()))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m log_sdk.backfill", description="Re-publish local sensor log files to Kafka.")
+    parser.add_argument("paths", nargs="+", help="log files or directories of sensor_logs_*.log* files")
+    parser.add_argument("--topic", default="sensor_logs")
+    parser.add_argument("--bootstrap-servers", default="localhost:9094")
+    parser.add_argument("--since", help="only records at or after this local ISO 8601 time")
+    parser.add_argument("--until", help="only records before this local ISO 8601 time")
+    parser.add_argument("--sensor", action="append", help="only records of this sensor (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="files parsed in parallel")
+    parser.add_argument("--rate", type=float, help="maximum records per second")
+    parser.add_argument("--checkpoint", help="JSON file to resume from and save progress to")
+    parser.add_argument("--serializer", default="json", choices=["json", "orjson", "msgpack", "binary"])
+    parser.add_argument("--partition-key", choices=["sensor_id", "data_center", "product"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    arguments = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(_main(arguments))
+
+
+if __name__ == "__main__":
+    main()
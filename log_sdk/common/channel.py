@@ -8,6 +8,7 @@ class Channel(Enum):
     SENSOR = "Sensor"
     SYSTEM = "System"
     MANUAL_INPUT = "Manual Input"
+    ALERT = "Alert"
 
 
     def __str__(self):
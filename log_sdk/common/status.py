@@ -13,4 +13,14 @@ class Status(Enum):
 
     def __str__(self):
         return self.value
-    
\ No newline at end of file
+
+
+    @property
+    def severity(self) -> int:
+        """
+        Rank of the status, higher is worse (NORMAL is 0).
+        """
+        return _SEVERITY[self]
+
+
+_SEVERITY = {status: rank for rank, status in enumerate(Status)}
@@ -0,0 +1,289 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import logging
+import threading
+import time
+
+from log_sdk.consumer.sinks import RecordSink
+from log_sdk.serializers import decode_records
+
+
+def decode_payloads(payloads: List[bytes]) -> Tuple[List[dict], List[str]]:
+    """
+    Decodes a chunk of payloads (column blocks into all their records), collecting the errors
+    of the ones that cannot be decoded.
+
+    Module-level so a process pool can pickle it.
+    """
+    records, errors = [], []
+    for payload in payloads:
+        try:
+            records.extend(decode_records(payload))
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    return records, errors
+
+
+class ConsumerStats:
+    """
+    Running totals of a ConsumerRunner.
+    """
+    __slots__ = ("messages", "records", "errors", "commits", "started", "_window_start", "_window_records")
+
+    def __init__(self):
+        self.messages = 0
+        self.records = 0
+        self.errors = 0
+        self.commits = 0
+        self.started = time.monotonic()
+        self._window_start = self.started
+        self._window_records = 0
+
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+    @property
+    def rate(self) -> float:
+        """
+        Average number of records delivered per second since the start.
+        """
+        return self.records / max(self.elapsed, 1e-9)
+
+
+    def interval_rate(self) -> float:
+        """
+        Records delivered per second since the previous call.
+        """
+        now = time.monotonic()
+        rate = (self.records - self._window_records) / max(now - self._window_start, 1e-9)
+        self._window_start, self._window_records = now, self.records
+        return rate
+
+
+    def as_dict(self) -> dict:
+        return {
+            "messages": self.messages,
+            "records": self.records,
+            "errors": self.errors,
+            "commits": self.commits,
+            "elapsed": self.elapsed,
+            "rate": self.rate,
+        }
+
+
+class ConsumerRunner:
+    """
+    Consumes sensor records in batches, decodes them in parallel and delivers them to sinks.
+
+    The consumer must be configured with "enable.auto.commit": False. Offsets are committed
+    synchronously only after every sink has been flushed, so a crash replays records
+    (at-least-once) instead of losing them. Once a sink raised in write() or flush(), the
+    runner never commits again, since the consumer already moved past the failed batch:
+    the error propagates and a new runner replays from the last commit.
+
+    Works with any object exposing the confluent_kafka Consumer methods consume(num_messages,
+    timeout), commit(asynchronous) and close(), whose messages expose value(), error(),
+    topic(), partition() and offset().
+    """
+    def __init__(
+            self,
+            consumer,
+            sinks: Sequence[RecordSink],
+            batch_size: int = 1000,
+            poll_timeout: float = 1.0,
+            executor: Optional[str] = "thread",
+            workers: int = 4,
+            commit_interval: float = 1.0,
+            commit_records: int = 50000,
+            report_interval: Optional[float] = 10.0,
+            on_report: Optional[Callable[[ConsumerStats], None]] = None,
+        ):
+        """
+        :param consumer: A subscribed confluent_kafka Consumer (or a compatible fake).
+        :param sinks: Sinks receiving every decoded batch, in order.
+        :param batch_size: Maximum number of messages fetched per consume() call.
+        :param poll_timeout: Maximum time in seconds consume() waits for messages.
+        :param executor: "thread", "process" or None to decode on the calling thread.
+        :param workers: Number of decoding workers; a batch is split into this many chunks.
+        :param commit_interval: Maximum time in seconds between sink flushes and offset commits.
+        :param commit_records: Maximum number of records delivered between offset commits.
+        :param report_interval: Seconds between throughput reports (None disables them).
+        :param on_report: Callback receiving the stats at every report; by default they are logged.
+        """
+        self.consumer = consumer
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+        self.workers = workers
+        self.commit_interval = commit_interval
+        self.commit_records = commit_records
+        self.report_interval = report_interval
+        self.on_report = on_report
+        self.logger = logging.getLogger("sensor_consumer")
+        self.stats = ConsumerStats()
+
+        if executor is None:
+            self._executor: Optional[Executor] = None
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self._stop = threading.Event()
+        # Next offset to read of every (topic, partition) delivered so far.
+        self.positions = {}
+        # Set when delivering to the sinks failed; nothing is committed afterwards.
+        self.failed = False
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._last_report = time.monotonic()
+
+
+    def _decode(self, payloads: List[bytes]) -> Tuple[List[dict], List[str]]:
+        if self._executor is None or len(payloads) < 2 * self.workers:
+            return decode_payloads(payloads)
+
+        size = -(-len(payloads) // self.workers)
+        chunks = [payloads[i:i + size] for i in range(0, len(payloads), size)]
+        records, errors = [], []
+        for chunk_records, chunk_errors in self._executor.map(decode_payloads, chunks):
+            records.extend(chunk_records)
+            errors.extend(chunk_errors)
+        return records, errors
+
+
+    def poll_once(self) -> int:
+        """
+        Fetches, decodes and delivers one batch, committing when a commit is due.
+
+        :return: The number of messages fetched.
+        :raises RuntimeError: If a previous batch failed to reach the sinks.
+        """
+        if self.failed:
+            raise RuntimeError("A sink failed; create a new ConsumerRunner to replay from the last commit")
+        messages = self.consumer.consume(num_messages=self.batch_size, timeout=self.poll_timeout)
+
+        payloads = []
+        positions = {}
+        for message in messages:
+            if message.error():
+                self.stats.errors += 1
+                self.logger.error(f"Kafka Error: {message.error()}")
+                continue
+            payloads.append(message.value())
+            positions[(message.topic(), message.partition())] = message.offset() + 1
+
+        self.stats.messages += len(messages)
+        self._uncommitted += len(messages)
+
+        if payloads:
+            try:
+                records, errors = self._decode(payloads)
+                for error in errors:
+                    self.logger.error(f"Decode Error: {error}")
+                self.stats.errors += len(errors)
+
+                if records:
+                    for sink in self.sinks:
+                        sink.write(records)
+                    self.stats.records += len(records)
+            except BaseException as e:
+                self._fail(e)
+                raise
+        self.positions.update(positions)
+
+        now = time.monotonic()
+        if self._uncommitted and (
+                self._uncommitted >= self.commit_records or now - self._last_commit >= self.commit_interval):
+            self.commit()
+
+        if self.report_interval is not None and now - self._last_report >= self.report_interval:
+            self._last_report = now
+            self._report()
+
+        return len(messages)
+
+
+    def _fail(self, e: BaseException):
+        self.failed = True
+        self.logger.error(f"Sink Error: {type(e).__name__}: {e}")
+
+
+    def commit(self):
+        """
+        Flushes every sink, then synchronously commits the offsets of everything consumed so far
+        and reports them to the sinks. Does nothing once delivering to the sinks failed.
+        """
+        if self.failed:
+            return
+        try:
+            for sink in self.sinks:
+                sink.flush()
+        except BaseException as e:
+            self._fail(e)
+            raise
+
+        if self._uncommitted:
+            self.consumer.commit(asynchronous=False)
+            self.stats.commits += 1
+            self._uncommitted = 0
+            for sink in self.sinks:
+                sink.committed(dict(self.positions))
+        self._last_commit = time.monotonic()
+
+
+    def _report(self):
+        if self.on_report is not None:
+            self.on_report(self.stats)
+            return
+
+        self.logger.info(
+            f"Consumed {self.stats.messages} messages, {self.stats.records} records "
+            f"({self.stats.interval_rate():.0f} rec/s, {self.stats.errors} errors, {self.stats.commits} commits)"
+        )
+
+
+    def run(self, max_messages: Optional[int] = None, idle_timeout: Optional[float] = None):
+        """
+        Consumes until stop() is called, max_messages were fetched or no message arrived for idle_timeout seconds.
+
+        Pending records are flushed and committed before returning, also when stopped by an
+        exception between batches; an exception raised by a sink is re-raised without committing.
+        """
+        idle_since = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                if self.poll_once():
+                    idle_since = time.monotonic()
+                elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                    break
+                if max_messages is not None and self.stats.messages >= max_messages:
+                    break
+        finally:
+            self.commit()
+
+
+    def stop(self):
+        """
+        Asks run() to return after the current batch; safe to call from another thread or a signal handler.
+        """
+        self._stop.set()
+
+
+    def close(self):
+        """
+        Commits pending records (unless a sink failed), then closes the sinks, the decoding
+        workers and the consumer.
+        """
+        self.commit()
+        for sink in self.sinks:
+            sink.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self.consumer.close()
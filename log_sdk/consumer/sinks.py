@@ -0,0 +1,156 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import json
+import os
+import sqlite3
+
+
+class RecordSink:
+    """
+    Destination of the records decoded by a ConsumerRunner.
+
+    write() may buffer; offsets are only committed after flush() returned, so a sink must
+    have made every written record durable (or handed it on) by then.
+    """
+    def write(self, records: List[dict]):
+        raise NotImplementedError
+
+
+    def flush(self):
+        pass
+
+
+    def committed(self, offsets: Dict[Tuple[str, int], int]):
+        """
+        Called after the offsets of every flushed record were committed, with the next offset
+        to read of every (topic, partition) consumed so far.
+        """
+        pass
+
+
+    def close(self):
+        self.flush()
+
+
+class NdjsonFileSink(RecordSink):
+    """
+    Appends records to a file as one compact JSON object per line.
+    """
+    def __init__(self, path: str, fsync: bool = False, buffer_size: int = 1024 * 1024):
+        """
+        :param path: File to append to; its directory is created if needed.
+        :param fsync: Boolean flag forcing an fsync on every flush.
+        :param buffer_size: Size of the write buffer in bytes.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        self._encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+    def write(self, records: List[dict]):
+        encode = self._encoder.encode
+        self._file.write("".join(encode(record) + "\n" for record in records))
+
+
+    def flush(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class SQLiteSink(RecordSink):
+    """
+    Inserts records into a SQLite table with one column per record field.
+
+    The metadata dict is stored as JSON text. Rows written since the last flush are
+    committed in a single transaction.
+    """
+    COLUMNS = (
+        "timestamp", "sensor_id", "channel", "data_center", "duration",
+        "measurement", "product", "status", "type", "unit", "metadata",
+    )
+
+    def __init__(self, path: str, table: str = "sensor_logs", synchronous: str = "NORMAL"):
+        """
+        :param path: SQLite database file.
+        :param table: Table name; it is created if it does not exist.
+        :param synchronous: SQLite synchronous pragma ("OFF", "NORMAL" or "FULL").
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self.path = path
+        self.table = table
+        # The runner may be driven from another thread than the one that created it.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "timestamp TEXT, sensor_id TEXT, channel TEXT, data_center TEXT, duration REAL, "
+            "measurement REAL, product TEXT, status TEXT, type TEXT, unit TEXT, metadata TEXT)"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_sensor_time ON {table} (sensor_id, timestamp)"
+        )
+        self._connection.commit()
+        self._insert = f"INSERT INTO {table} VALUES ({', '.join('?' * len(self.COLUMNS))})"
+
+
+    def write(self, records: List[dict]):
+        self._connection.executemany(self._insert, (
+            (
+                record.get("timestamp"),
+                record.get("sensor_id"),
+                record.get("channel"),
+                record.get("data_center"),
+                record.get("duration"),
+                record.get("measurement"),
+                record.get("product"),
+                record.get("status"),
+                record.get("type"),
+                record.get("unit"),
+                json.dumps(record.get("metadata") or {}, separators=(',', ':')),
+            )
+            for record in records
+        ))
+
+
+    def flush(self):
+        self._connection.commit()
+
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+
+class CallbackSink(RecordSink):
+    """
+    Hands every batch of records to a callable, e.g. to feed an application or a queue.
+    """
+    def __init__(self, callback: Callable[[List[dict]], None], on_flush: Optional[Callable[[], None]] = None):
+        """
+        :param callback: Called with each list of decoded records.
+        :param on_flush: Optional callable run before offsets are committed.
+        """
+        self.callback = callback
+        self.on_flush = on_flush
+
+
+    def write(self, records: List[dict]):
+        self.callback(records)
+
+
+    def flush(self):
+        if self.on_flush is not None:
+            self.on_flush()
@@ -0,0 +1,300 @@
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import gzip
+import json
+import os
+import threading
+import time
+
+from log_sdk.common.status import Status
+from log_sdk.consumer.sinks import RecordSink
+from log_sdk.sensor_logs.base_sensor import parse_timestamp_ns
+
+
+SNAPSHOT_VERSION = 1
+
+_STATUSES = {status.value: status for status in Status}
+
+
+def _value(member):
+    return member.value if isinstance(member, Enum) else member
+
+
+class SensorState:
+    """
+    Latest record of one (sensor_id, type).
+    """
+    __slots__ = (
+        "sensor_id", "type", "data_center", "product", "channel", "unit",
+        "measurement", "status", "timestamp", "timestamp_ns",
+        "machine_status", "uptime", "downtime",
+    )
+
+    # Field order of the snapshot rows.
+    FIELDS = __slots__
+
+    def __init__(self, sensor_id: str, type: str):
+        self.sensor_id = sensor_id
+        self.type = type
+        self.data_center = None
+        self.product = None
+        self.channel = None
+        self.unit = None
+        self.measurement = None
+        self.status = None
+        self.timestamp = None
+        self.timestamp_ns = 0
+        self.machine_status = None
+        self.uptime = None
+        self.downtime = None
+
+
+    def status_duration(self, now_ns: Optional[int] = None) -> Optional[float]:
+        """
+        Returns the seconds the machine has been in its current machine status at now_ns (default now),
+        extrapolated from the uptime or downtime of the latest record; None if the record had neither.
+        """
+        elapsed = self.uptime if self.uptime is not None else self.downtime
+        if elapsed is None:
+            return None
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        return elapsed + max(0, now_ns - self.timestamp_ns) / 1e9
+
+
+    def to_dict(self) -> dict:
+        state = {field: getattr(self, field) for field in self.FIELDS}
+        state["status"] = self.status.value if self.status is not None else None
+        del state["timestamp_ns"]
+        return state
+
+
+class LatestStateTable(RecordSink):
+    """
+    Consumer sink keeping the latest measurement, status and machine state of every (sensor_id, type).
+
+    get() is a dict lookup; scan() filters by data_center and product through secondary indexes.
+    Records older than the stored one are ignored, so replays and records arriving out of order
+    across partitions never move a sensor back in time.
+
+    With a snapshot path the table is restored from it on creation, and rewritten (gzip JSON,
+    atomically) at most every snapshot_interval seconds after the ConsumerRunner committed,
+    together with the committed offsets. Seeking the consumer to those offsets (see on_assign)
+    replays only the records consumed after the snapshot instead of the whole topic.
+
+    Safe to read from other threads while a ConsumerRunner writes to it.
+    """
+    def __init__(self, snapshot_path: Optional[str] = None, snapshot_interval: Optional[float] = 60.0):
+        """
+        :param snapshot_path: File of the snapshot to restore from and write to (None keeps the table in memory only).
+        :param snapshot_interval: Minimum time in seconds between two snapshots after commits (None only
+            writes one on close()).
+        """
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.offsets: Dict[Tuple[str, int], int] = {}
+        self.stale = 0
+        self.invalid = 0
+        self.snapshots = 0
+
+        self._states: Dict[Tuple[str, str], SensorState] = {}
+        self._by_sensor: Dict[str, set] = {}
+        self._by_data_center: Dict[str, set] = {}
+        self._by_product: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._last_snapshot = time.monotonic()
+
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self.load(snapshot_path)
+
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+    def _index(self, index: Dict[str, set], value: Optional[str], old: Optional[str], key: tuple):
+        if old is not None:
+            keys = index.get(old)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[old]
+        if value is not None:
+            index.setdefault(value, set()).add(key)
+
+
+    def write(self, records: List[dict]):
+        states = self._states
+        with self._lock:
+            for record in records:
+                try:
+                    key = (record["sensor_id"], record["type"])
+                    timestamp = record["timestamp"]
+                    timestamp_ns = parse_timestamp_ns(timestamp)
+                except (KeyError, TypeError, ValueError):
+                    self.invalid += 1
+                    continue
+
+                state = states.get(key)
+                if state is None:
+                    state = states[key] = SensorState(*key)
+                    self._by_sensor.setdefault(key[0], set()).add(key)
+                elif timestamp_ns < state.timestamp_ns:
+                    self.stale += 1
+                    continue
+
+                data_center = record.get("data_center")
+                if data_center != state.data_center:
+                    self._index(self._by_data_center, data_center, state.data_center, key)
+                    state.data_center = data_center
+                product = record.get("product")
+                if product != state.product:
+                    self._index(self._by_product, product, state.product, key)
+                    state.product = product
+
+                state.channel = record.get("channel")
+                state.unit = record.get("unit")
+                state.measurement = record.get("measurement")
+                state.status = _STATUSES.get(record.get("status"))
+                state.timestamp = timestamp
+                state.timestamp_ns = timestamp_ns
+                metadata = record.get("metadata") or {}
+                state.machine_status = metadata.get("machine_status")
+                state.uptime = metadata.get("uptime")
+                state.downtime = metadata.get("downtime")
+
+
+    def get(self, sensor_id: str, type) -> Optional[SensorState]:
+        """
+        Returns the latest state of a sensor and type (SensorType or its value), or None.
+        """
+        return self._states.get((sensor_id, _value(type)))
+
+
+    def sensor(self, sensor_id: str) -> List[SensorState]:
+        """
+        Returns the latest state of every type reported by a sensor.
+        """
+        with self._lock:
+            return [self._states[key] for key in self._by_sensor.get(sensor_id, ())]
+
+
+    def scan(self, data_center=None, product=None, type=None, status: Optional[Status] = None) -> List[SensorState]:
+        """
+        Returns the states matching every given filter (enums or their values), using the
+        data_center and product indexes to only visit matching sensors.
+        """
+        data_center, product, type = _value(data_center), _value(product), _value(type)
+        with self._lock:
+            candidates = None
+            for index, value in ((self._by_data_center, data_center), (self._by_product, product)):
+                if value is not None:
+                    keys = index.get(value, set())
+                    candidates = keys if candidates is None else candidates & keys
+            if candidates is None:
+                states = list(self._states.values())
+            else:
+                states = [self._states[key] for key in candidates]
+
+        if type is None and status is None:
+            return states
+        return [
+            state for state in states
+            if (type is None or state.type == type) and (status is None or state.status is status)
+        ]
+
+
+    def __iter__(self) -> Iterator[SensorState]:
+        with self._lock:
+            return iter(list(self._states.values()))
+
+
+    def committed(self, offsets: Dict[Tuple[str, int], int]):
+        self.offsets.update(offsets)
+        if self.snapshot_path is None or self.snapshot_interval is None:
+            return
+        if time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+
+    def snapshot(self, path: Optional[str] = None):
+        """
+        Atomically writes the table and the committed offsets to path (default snapshot_path).
+        """
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError("snapshot() requires a path or snapshot_path")
+        with self._lock:
+            document = {
+                "version": SNAPSHOT_VERSION,
+                "offsets": [[topic, partition, offset] for (topic, partition), offset in self.offsets.items()],
+                "fields": list(SensorState.FIELDS),
+                "rows": [
+                    [
+                        state.sensor_id, state.type, state.data_center, state.product, state.channel, state.unit,
+                        state.measurement, state.status.value if state.status is not None else None,
+                        state.timestamp, state.timestamp_ns, state.machine_status, state.uptime, state.downtime,
+                    ]
+                    for state in self._states.values()
+                ],
+            }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as snapshot_file:
+            snapshot_file.write(gzip.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"), compresslevel=1))
+        os.replace(temporary, path)
+        self._last_snapshot = time.monotonic()
+        self.snapshots += 1
+
+
+    def load(self, path: str):
+        """
+        Replaces the table and the offsets with the content of a snapshot.
+        """
+        with open(path, "rb") as snapshot_file:
+            document = json.loads(gzip.decompress(snapshot_file.read()))
+        if document.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported state snapshot version: {document.get('version')}")
+        if document["fields"] != list(SensorState.FIELDS):
+            raise ValueError(f"State snapshot {path} has other fields: {document['fields']}")
+
+        with self._lock:
+            self._states.clear()
+            self._by_sensor.clear()
+            self._by_data_center.clear()
+            self._by_product.clear()
+            for row in document["rows"]:
+                key = (row[0], row[1])
+                state = self._states[key] = SensorState(*key)
+                (
+                    _, _, state.data_center, state.product, state.channel, state.unit,
+                    state.measurement, status, state.timestamp, state.timestamp_ns,
+                    state.machine_status, state.uptime, state.downtime,
+                ) = row
+                state.status = _STATUSES.get(status)
+                self._by_sensor.setdefault(key[0], set()).add(key)
+                self._index(self._by_data_center, state.data_center, None, key)
+                self._index(self._by_product, state.product, None, key)
+            self.offsets = {(topic, partition): offset for topic, partition, offset in document["offsets"]}
+
+
+    def on_assign(self, consumer, partitions):
+        """
+        confluent_kafka on_assign callback starting every assigned partition at the snapshot offset,
+        so the records consumed after the snapshot are replayed:
+
+            consumer.subscribe([topic], on_assign=table.on_assign)
+        """
+        for partition in partitions:
+            offset = self.offsets.get((partition.topic, partition.partition))
+            if offset is not None:
+                partition.offset = offset
+        consumer.assign(partitions)
+
+
+    def close(self):
+        if self.snapshot_path is not None:
+            self.snapshot()
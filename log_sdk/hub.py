@@ -0,0 +1,142 @@
+from typing import Dict, Iterator
+
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_methods import SensorLogMethods
+
+
+class SensorHandle(SensorLogMethods):
+    """
+    Lightweight per-sensor logger handed out by a LoggerHub.
+
+    A handle only keeps the sensor id and its machine status; records go through the
+    producer, batching pipeline and file sink owned by the hub.
+    """
+    __slots__ = ("sensor_id", "machine_status", "status_timestamp", "_config")
+
+    def __init__(self, config: LoggerConfig, sensor_id: str):
+        """
+        :param config: The shared LoggerConfig owning the transport.
+        :param sensor_id: Unique identifier for the sensor.
+        """
+        self.sensor_id = sensor_id
+        self.machine_status = None
+        self.status_timestamp = None
+        self._config = config
+
+
+    @property
+    def logger(self):
+        return self._config.logger
+
+
+    @property
+    def tracer(self):
+        return self._config.tracer
+
+
+    def _log(self, log_object):
+        return self._config._log(log_object)
+
+
+    def _log_batch(self, template, measurements, timestamps, durations):
+        return self._config._log_batch(template, measurements, timestamps, durations)
+
+
+class LoggerHub:
+    """
+    Registry of sensors sharing one Kafka producer and one file sink.
+
+    Every LoggerConfig owns a producer and reconfigures the "sensor_logger" file logger,
+    so a gateway with many sensors should create one hub and a handle per sensor instead.
+    """
+    def __init__(self, KAFKA_BOOTSTRAP_SERVERS: str, KAFKA_TOPIC: str, **options):
+        """
+        :param KAFKA_BOOTSTRAP_SERVERS: Kafka bootstrap servers.
+        :param KAFKA_TOPIC: Kafka topic to publish logs to.
+        :param options: Any other LoggerConfig option (kafka_enabled, log_directory, batching, ...).
+        """
+        self.config = LoggerConfig(
+            sensor_id=None,
+            KAFKA_BOOTSTRAP_SERVERS=KAFKA_BOOTSTRAP_SERVERS,
+            KAFKA_TOPIC=KAFKA_TOPIC,
+            **options,
+        )
+        self._sensors: Dict[str, SensorHandle] = {}
+
+
+    def sensor(self, sensor_id: str) -> SensorHandle:
+        """
+        Returns the handle of a sensor, creating it on first use.
+        """
+        handle = self._sensors.get(sensor_id)
+        if handle is None:
+            handle = self._sensors[sensor_id] = SensorHandle(self.config, sensor_id)
+        return handle
+
+
+    def remove(self, sensor_id: str):
+        """
+        Forgets a sensor; an existing handle keeps working but is no longer tracked.
+        """
+        self._sensors.pop(sensor_id, None)
+
+
+    def __contains__(self, sensor_id: str) -> bool:
+        return sensor_id in self._sensors
+
+
+    def __iter__(self) -> Iterator[SensorHandle]:
+        return iter(self._sensors.values())
+
+
+    def __len__(self) -> int:
+        return len(self._sensors)
+
+
+    def query(self, sensor_id=None, start=None, end=None, type=None):
+        """
+        Streams records of any sensor from the shared local store (see LoggerConfig.query).
+        """
+        return self.config.query(sensor_id=sensor_id, start=start, end=end, type=type)
+
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Returns the runtime metrics of the shared transport (see LoggerConfig.metrics_snapshot).
+        """
+        return self.config.metrics_snapshot()
+
+
+    def metrics_text(self) -> str:
+        """
+        Returns the runtime metrics of the shared transport in the Prometheus text format.
+        """
+        return self.config.metrics_text()
+
+
+    def export_trace(self, path: str):
+        """
+        Writes the traces of sampled log calls of every sensor as Chrome trace event JSON (see LoggerConfig.export_trace).
+        """
+        self.config.export_trace(path)
+
+
+    async def initialize(self):
+        """
+        Initialize the shared Kafka producer and background tasks.
+        """
+        await self.config.initialize()
+
+
+    async def flush(self):
+        """
+        Waits until every record logged by any sensor has been handed to the producer and file.
+        """
+        await self.config.flush()
+
+
+    async def close(self):
+        """
+        Flush pending records and close the shared producer and file sink.
+        """
+        await self.config.close()
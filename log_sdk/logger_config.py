@@ -1,30 +1,45 @@
 from logging.handlers import RotatingFileHandler
-from typing import Optional, Type
 from datetime import datetime, timezone
+from typing import Optional
 
-import json
+import asyncio
 import logging
 import os
-
-from fogverse import KafkaProducer
+import queue
+import time
 
 # Import Enums and Log Classes
-from log_sdk.common.action import Action
-from log_sdk.common.channel import Channel
-from log_sdk.common.data_center import DataCenter
-from log_sdk.common.product import Product
-from log_sdk.common.status import Status
+from log_sdk.metrics.exposition import MetricsReporter, MetricsServer, render
+from log_sdk.metrics.registry import LoggerMetrics
+from log_sdk.metrics.tracing import ACTIVE_TRACE, Tracer
+from log_sdk.processing.aggregation import WindowAggregator
+from log_sdk.processing.anomaly import AnomalyDetector
+from log_sdk.processing.deadband import DeadbandFilter
 from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
-from log_sdk.sensor_logs.electrical import ElectricalLogData
-from log_sdk.sensor_logs.humidity import HumidityLogData
-from log_sdk.sensor_logs.pressure import PressureLogData
-from log_sdk.sensor_logs.temperature import TemperatureLogData
-from log_sdk.sensor_logs.vibration import VibrationLogData
-
-
-class LoggerConfig:
+from log_sdk.sensor_logs.batch import batch_columns, batch_objects, batch_records, format_batch
+from log_sdk.sensor_methods import SensorLogMethods
+from log_sdk.serializers import decode_records, get_serializer
+from log_sdk.serializers.json_serializer import JsonSerializer
+from log_sdk.storage.compression import SegmentCompressor
+from log_sdk.storage.file_sink import (
+    BufferedRotatingFileHandler,
+    CompressingRotatingFileHandler,
+    FileWriterListener,
+    RecordFormatter,
+    RecordQueueHandler,
+)
+from log_sdk.storage.partitioned_store import PartitionedLogStore, PartitionedStoreHandler, RecordLines, index_path
+from log_sdk.transport.backpressure import OVERLOAD_POLICIES
+from log_sdk.transport.batch_sender import BatchSender
+from log_sdk.transport.partitioning import key_function
+from log_sdk.transport.sinks import create_sink
+from log_sdk.transport.sinks.base import FanOutSink, SinkError
+from log_sdk.transport.spool import DiskSpool, SpoolReplayer
+
+
+class LoggerConfig(SensorLogMethods):
     """
-    Logger configuration that supports Kafka-based logging and optional file backup.
+    Logger configuration that sends records to Kafka or other sinks, with optional file backup.
     """
     def __init__(
             self, 
@@ -33,6 +48,41 @@ class LoggerConfig:
             KAFKA_TOPIC: str,
             kafka_enabled=True,
             log_directory="./logs",
+            producer=None,
+            sinks=None,
+            partition_key=None,
+            batching=False,
+            batch_size=500,
+            linger_ms=5.0,
+            max_queue_size=10000,
+            max_queue_bytes=64*1024*1024,
+            overload_policy="block",
+            block_timeout=None,
+            file_format="pretty",
+            async_file_sink=False,
+            flush_interval=1.0,
+            fsync=False,
+            serializer="json",
+            columnar_batches=False,
+            spool_directory=None,
+            spool_max_bytes=512*1024*1024,
+            spool_segment_bytes=16*1024*1024,
+            replay_rate=1000.0,
+            aggregation=None,
+            deadband=None,
+            anomaly=None,
+            compression=None,
+            retention_bytes=None,
+            retention_seconds=None,
+            metrics=True,
+            metrics_port=None,
+            metrics_host="127.0.0.1",
+            metrics_callback=None,
+            metrics_interval=10.0,
+            metrics_sample_every=16,
+            trace_sample_rate=0.0,
+            trace_callback=None,
+            trace_buffer=10000,
         ):
         """
         Initializes the logger.
@@ -40,8 +90,67 @@ class LoggerConfig:
         :param sensor_id: Unique identifier for the sensor.
         :param KAFKA_BOOTSTRAP_SERVERS: Kafka bootstrap servers.
         :param KAFKA_TOPIC: Kafka topic to publish logs to.
-        :param kafka_enabled: Boolean flag indicating whether to send logs to Kafka.
+        :param kafka_enabled: Boolean flag indicating whether to send logs to Kafka (when sinks is not given).
         :param log_directory: Directory path for local log backups.
+        :param producer: Optional producer exposing start/stop/_send, used instead of the fogverse KafkaProducer.
+        :param sinks: Destinations of the records, any of "kafka", "file" (the local log file), "stdout",
+            "memory", "udp://host:port" or Sink instances; several are fanned out to. Defaults to
+            ["kafka", "file"], or ["file"] with kafka_enabled=False. Sinks are imported only when selected,
+            so fogverse is never imported without "kafka".
+        :param partition_key: Message key of every record, so the producer keeps the records of a key in one
+            partition and in order: "sensor_id", "data_center", "product" or a callable receiving the record dict
+            and returning the key as str or bytes (None sends unkeyed records, spread over all partitions).
+        :param batching: Boolean flag enabling the background batching send pipeline.
+        :param batch_size: Maximum number of records per batched send.
+        :param linger_ms: Maximum time in milliseconds to wait for a batch to fill up.
+        :param max_queue_size: Maximum number of records waiting to be sent, and waiting for the file writer
+            thread (async_file_sink). Log calls never wait for the writer thread: when its queue is full the
+            newest record (the oldest with overload_policy "drop_oldest") is left out of the file and counted
+            in file_dropped().
+        :param max_queue_bytes: Maximum memory in bytes of the records waiting to be sent.
+        :param overload_policy: What batching does when the send buffer is full: "block" (log calls wait),
+            "drop_newest", "drop_oldest" or "drop_priority" (NORMAL records are shed first, CRITICAL/FAULT
+            records and Channel.ALERT traffic last). Shed records are counted per status, see shed_counters().
+        :param block_timeout: With "block", seconds a log call waits for space before its record is shed
+            (None waits forever).
+        :param file_format: Local file format, "pretty" (indented JSON), "ndjson" (one compact line per record)
+            or "store" (time-partitioned NDJSON segments with a sensor/time index, see query()).
+        :param async_file_sink: Boolean flag moving JSON formatting and disk writes to a writer thread.
+        :param flush_interval: Maximum time in seconds records stay buffered in the writer thread.
+        :param fsync: Boolean flag forcing an fsync on every writer thread flush.
+        :param serializer: Wire format of the sinks: "json", "orjson", "msgpack", "binary" or a Serializer instance.
+        :param columnar_batches: Boolean flag sending every log_batch call as one compressed column block
+            (see serializers.columnar) instead of one message per sample. The block is keyed by the batch
+            template and counts as one sent record; stages, if configured, still receive every sample.
+        :param spool_directory: Directory of the durable spool for records the sinks did not accept (None disables it).
+        :param spool_max_bytes: Maximum size of the spool; the oldest segment is dropped beyond it.
+        :param spool_segment_bytes: Size of a single spool segment file.
+        :param replay_rate: Maximum number of spooled records replayed per second once the sinks are reachable.
+        :param aggregation: Optional dict of SensorType to WindowAggregation; readings of these types
+            are replaced by one rollup record per window.
+        :param deadband: Optional dict of log data class (e.g. PressureLogData) to Deadband; readings
+            of these classes are only sent when they change, plus periodic heartbeats.
+        :param anomaly: Optional dict of SensorType to AnomalyRule; readings of these types are raised to
+            WARNING or CRITICAL when they cross thresholds or leave their moving baseline, and may be
+            moved to Channel.ALERT. Runs before deadband and aggregation, which then see the derived status.
+        :param compression: "gzip" or "zstd" to compress rotated log files and closed store segments
+            in a background thread (None keeps them uncompressed).
+        :param retention_bytes: Maximum size on disk of the rotated files or closed segments; the oldest are deleted beyond it.
+        :param retention_seconds: Rotated files or closed segments older than this are deleted.
+            Without any retention limit the 12 newest rotated log files (and every store segment) are kept.
+        :param metrics: Boolean flag keeping runtime counters and latency histograms (see metrics_snapshot()).
+        :param metrics_port: Optional port of a local HTTP endpoint serving the metrics in the Prometheus
+            text format on /metrics, started by initialize().
+        :param metrics_host: Interface the metrics endpoint binds to.
+        :param metrics_callback: Optional function or coroutine function receiving a metrics snapshot
+            every metrics_interval seconds after initialize(), and once more on close().
+        :param metrics_interval: Seconds between two metrics_callback calls.
+        :param metrics_sample_every: The send and file write latency of one in every this many records is
+            timed (1 times every record); counters are always exact.
+        :param trace_sample_rate: Fraction of log calls (and batched sends) traced span by span, e.g. 0.01;
+            0 disables tracing, which then costs one attribute check per call (see export_trace()).
+        :param trace_callback: Optional function receiving every finished Trace (see metrics.tracing).
+        :param trace_buffer: Number of most recent traces kept for export_trace().
         """
         self.sensor_id = sensor_id
 
@@ -50,234 +159,670 @@ class LoggerConfig:
         self.KAFKA_BOOTSTRAP_SERVERS = KAFKA_BOOTSTRAP_SERVERS
         self.KAFKA_TOPIC = KAFKA_TOPIC
 
-        self.kafka_enabled = kafka_enabled
-        self.logger = self._init_log_file(log_directory)
+        if sinks is None:
+            sinks = ["kafka", "file"] if kafka_enabled else ["file"]
+        self.file_enabled = "file" in sinks
+        if file_format == "store" and not self.file_enabled:
+            raise ValueError('file_format="store" requires the "file" sink')
+
+        self.serializer = get_serializer(serializer)
+        self.encode_block = None
+        if columnar_batches:
+            from log_sdk.serializers.columnar import encode_block
+
+            self.encode_block = encode_block
+        self.partition_key = key_function(partition_key) if partition_key is not None else None
+        # The built-in keys only depend on fields every sample of a log_batch call shares.
+        self._batch_keyed_once = isinstance(partition_key, str)
+
+        if overload_policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unknown overload policy: {overload_policy}")
+        if not batching and (overload_policy != "block" or block_timeout is not None):
+            raise ValueError("overload_policy and block_timeout apply to the send buffer and require batching=True")
+
+        self.store = None
+        self.compressor = None
+        if self.file_enabled and (compression is not None or retention_bytes is not None or retention_seconds is not None):
+            if file_format == "store":
+                patterns = [os.path.join(log_directory, "sensor_logs_*.ndjson*")]
+            else:
+                patterns = [os.path.join(log_directory, "sensor_logs_*.log.*")]
+            self.compressor = SegmentCompressor(
+                codec=compression,
+                patterns=patterns,
+                max_bytes=retention_bytes,
+                max_age_seconds=retention_seconds,
+                # Rotated log files were capped by backupCount=12; store segments were never deleted.
+                max_files=12 if file_format != "store" and retention_bytes is None and retention_seconds is None else None,
+                related=lambda path: [index_path(path)] if file_format == "store" else [],
+                exclude=lambda path: self.store is not None and path == self.store.active_path,
+                on_error=lambda e: self.logger.error(f"Compression Error: {str(e)}"),
+            )
+
+        if file_format == "store":
+            self.store = PartitionedLogStore(
+                log_directory,
+                flush_interval=flush_interval,
+                fsync=fsync,
+                on_segment_closed=self.compressor.submit if self.compressor is not None else None,
+            )
+        self.logger, self.file_writer = self._init_log_file(
+            log_directory,
+            file_format=file_format,
+            store=self.store,
+            compressor=self.compressor,
+            async_file_sink=async_file_sink,
+            flush_interval=flush_interval,
+            fsync=fsync,
+            max_queue_size=max_queue_size,
+            file_overload_policy="drop_oldest" if overload_policy == "drop_oldest" else "drop_newest",
+            file_enabled=self.file_enabled,
+        )
         self.machine_status = None
         self.status_timestamp = None
 
-        if self.kafka_enabled:
-            self.producer = KafkaProducer(
-                topic= KAFKA_TOPIC,
-                bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS
+        selected = [
+            create_sink(spec, topic=KAFKA_TOPIC, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, producer=producer)
+            for spec in sinks if spec != "file"
+        ]
+        # Kept for callers reaching the producer directly; None without a Kafka sink.
+        self.producer = next((sink.producer for sink in selected if hasattr(sink, "producer")), None)
+        self.kafka_enabled = self.producer is not None
+        self.sink = None
+        if len(selected) == 1:
+            self.sink = selected[0]
+        elif selected:
+            self.sink = FanOutSink(selected)
+
+        self.batch_sender = None
+        if self.sink is not None and batching:
+            self.batch_sender = BatchSender(
+                self._send_batch,
+                batch_size=batch_size,
+                linger_ms=linger_ms,
+                max_queue_size=max_queue_size,
+                max_queue_bytes=max_queue_bytes,
+                overload_policy=overload_policy,
+                block_timeout=block_timeout,
             )
 
+        self.spool = None
+        self.spool_replayer = None
+        if self.sink is not None and spool_directory is not None:
+            self.spool = DiskSpool(spool_directory, segment_bytes=spool_segment_bytes, max_bytes=spool_max_bytes)
+            self.spool_replayer = SpoolReplayer(
+                self.spool,
+                self.sink.send if self.partition_key is None else self._send_spooled,
+                rate=replay_rate,
+                on_error=self._log_sink_error,
+            )
+
+        # Processing stages applied in order to every record before it is sent.
+        self.stages = []
+        if anomaly:
+            self.stages.append(AnomalyDetector(anomaly))
+        if deadband:
+            self.stages.append(DeadbandFilter(deadband))
+        if aggregation:
+            self.stages.append(WindowAggregator(aggregation))
+
+        self.metrics = None
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.metrics_server = None
+        self.metrics_reporter = None
+        if metrics:
+            self.metrics = LoggerMetrics(self._metric_sources(), sample_every=metrics_sample_every)
+            if metrics_callback is not None:
+                self.metrics_reporter = MetricsReporter(
+                    self.metrics_snapshot,
+                    metrics_callback,
+                    interval=metrics_interval,
+                    on_error=lambda e: self.logger.error(f"Metrics Error: {str(e)}"),
+                )
+        elif metrics_port is not None or metrics_callback is not None:
+            raise ValueError("metrics_port and metrics_callback require metrics=True")
+
+        self.tracer = None
+        if trace_sample_rate:
+            self.tracer = Tracer(
+                trace_sample_rate,
+                callback=trace_callback,
+                max_traces=trace_buffer,
+                on_error=lambda e: self.logger.error(f"Tracing Error: {str(e)}"),
+            )
+        elif trace_callback is not None:
+            raise ValueError("trace_callback requires trace_sample_rate > 0")
+
+
+    def _metric_sources(self) -> dict:
+        """
+        Returns the callables the metrics snapshot reads from the other components.
+        """
+        sources = {
+            "records_suppressed_total": lambda: sum(
+                sum(stage.counters().get("suppressed", {}).values()) for stage in self.stages
+            ),
+        }
+        if self.batch_sender is not None:
+            sources["send_queue_depth"] = self.batch_sender.qsize
+            sources["send_queue_bytes"] = lambda: self.batch_sender.nbytes
+            sources["records_shed_total"] = self.shed_counters
+        if self.file_writer is not None:
+            sources["file_queue_depth"] = self.file_writer.queue.qsize
+            sources["file_records_dropped_total"] = self.file_dropped
+        if self.spool is not None:
+            # Records the spool dropped when it was full count towards records_dropped_total.
+            sources["records_dropped"] = lambda: self.spool.dropped
+            sources["spool_pending_records"] = lambda: self.spool.pending
+            sources["spool_bytes"] = lambda: self.spool.size
+        return sources
+
 
     @staticmethod
-    def _init_log_file(directory):
+    def _init_log_file(
+            directory,
+            file_format="pretty",
+            async_file_sink=False,
+            flush_interval=1.0,
+            fsync=False,
+            store=None,
+            compressor=None,
+            max_queue_size=None,
+            file_overload_policy="drop_newest",
+            file_enabled=True,
+        ):
         """
         Initializes file-based logging (optional fallback).
-        """
-        if not os.path.exists(directory):
-            os.makedirs(directory)
 
-        log_file = os.path.join(directory, f"sensor_logs_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.log")
+        With async_file_sink the logger only enqueues records (dropping one by file_overload_policy
+        once max_queue_size records are queued); a writer thread formats them and writes them in
+        buffered chunks.
+        Without file_enabled the logger gets no handler and only reports errors.
 
-        file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=12)
-        file_formatter = logging.Formatter('%(message)s')
-        file_handler.setFormatter(file_formatter)
+        :return: The logger and the writer thread listener (None for synchronous writes).
+        """
+        if file_format not in {"pretty", "ndjson", "store"}:
+            raise ValueError(f"Unknown file format: {file_format}")
 
         logger = logging.getLogger("sensor_logger")
         logger.setLevel(logging.INFO)
 
         logger.handlers.clear()
 
-        logger.addHandler(file_handler)
+        if not file_enabled:
+            return logger, None
 
-        return logger
-    
+        if not os.path.exists(directory):
+            os.makedirs(directory)
 
-    def _calculate_time_difference(self) -> float:
-        """
-        Calculates the time difference between now and the last status change.
+        log_file = os.path.join(directory, f"sensor_logs_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.log")
+        file_formatter = RecordFormatter(pretty=file_format == "pretty")
+
+        if store is not None:
+            if not async_file_sink:
+                logger.addHandler(PartitionedStoreHandler(store))
+                return logger, None
+
+            record_queue = queue.Queue(maxsize=max_queue_size or 0)
+            logger.addHandler(RecordQueueHandler(record_queue, file_overload_policy))
+            file_writer = FileWriterListener(record_queue, PartitionedStoreHandler(store), flush_interval=flush_interval)
+            file_writer.start()
+            return logger, file_writer
+
+        if compressor is not None:
+            # Without the writer thread every record is flushed, like RotatingFileHandler does.
+            file_handler = CompressingRotatingFileHandler(
+                log_file,
+                compressor,
+                maxBytes=10*1024*1024,
+                buffer_size=64*1024 if async_file_sink else 0,
+                flush_interval=flush_interval,
+                fsync=fsync,
+            )
+        elif not async_file_sink:
+            file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=12)
+        else:
+            file_handler = BufferedRotatingFileHandler(
+                log_file,
+                maxBytes=10*1024*1024,
+                backupCount=12,
+                flush_interval=flush_interval,
+                fsync=fsync,
+            )
 
-        :return: The difference in seconds.
-        """
-        if self.status_timestamp is None:
-            return 0.0 
-            
-        return (datetime.now(timezone.utc) - self.status_timestamp).total_seconds()
-    
-    
-    def _add_machine_metadata(self, metadata: Optional[dict]) -> dict:
-        """
-        Adds machine status, uptime, or downtime to metadata.
+        if not async_file_sink:
+            file_handler.setFormatter(file_formatter)
+            logger.addHandler(file_handler)
+            return logger, None
 
-        :param metadata: The existing metadata dictionary.
-        :return: The updated metadata dictionary.
-        """
-        if metadata is None:
-            metadata = {}
+        file_handler.setFormatter(file_formatter)
 
-        metadata["machine_status"] = self.machine_status.value if self.machine_status else "UNKNOWN"
-        time_difference = self._calculate_time_difference()
+        record_queue = queue.Queue(maxsize=max_queue_size or 0)
+        logger.addHandler(RecordQueueHandler(record_queue, file_overload_policy))
 
-        if self.machine_status == Action.START:
-            metadata["uptime"] = time_difference
-        elif self.machine_status in {Action.STOP, Action.MAINTENANCE, Action.CALIBRATION}:
-            metadata["downtime"] = time_difference
+        file_writer = FileWriterListener(record_queue, file_handler, flush_interval=flush_interval)
+        file_writer.start()
 
-        return metadata
+        return logger, file_writer
     
 
-    async def _send_to_kafka(self, log_data):
+    async def _send_payload(self, payload: bytes, key: Optional[bytes] = None):
         """
-        Sends log data to Kafka.
+        Sends a serialized payload to the sinks, spooling it to disk if they are unavailable.
+
+        The spool only keeps the payload; its key is computed again when it is replayed.
         """
+        metrics = self.metrics
+        if self.spool_replayer is not None and not self.spool_replayer.healthy:
+            self.spool.append(payload)
+            if metrics is not None:
+                metrics.records_spooled += 1
+            return
+
+        timed = metrics is not None and metrics.records_sent % metrics.sample_every == 0
+        if timed:
+            start = time.perf_counter()
         try:
-            await self.producer._send(json.dumps(log_data).encode('utf-8'))
+            if key is None:
+                await self.sink.send(payload)
+            else:
+                await self.sink.send(payload, key=key)
         except Exception as e:
-            self.logger.error(f"Kafka Error: {str(e)}")
+            self._log_sink_error(e)
+            if metrics is not None:
+                metrics.send_failures += 1
+                if self.spool is not None:
+                    metrics.records_spooled += 1
+                else:
+                    metrics.records_dropped += 1
+            if self.spool is not None:
+                self.spool.append(payload)
+                self.spool_replayer.healthy = False
+            return
+
+        if metrics is not None:
+            metrics.records_sent += 1
+            if timed:
+                metrics.send_latency.observe(time.perf_counter() - start)
+
+
+    def _log_sink_error(self, e: Exception):
+        label = e.label if isinstance(e, SinkError) else self.sink.label
+        self.logger.error(f"{label} Error: {str(e)}")
+
+
+    async def _send_spooled(self, payload: bytes):
+        """
+        Replays a spooled payload with the key of its record.
+        """
+        await self.sink.send(payload, key=self.partition_key(decode_records(payload)[0]))
+
+
+    async def _send_batch(self, messages: list):
+        """
+        Sends a batch of (serialized payload, key) pairs to the sinks concurrently.
+        """
+        tracer = self.tracer
+        trace = tracer.start("send_batch", records=len(messages)) if tracer is not None and tracer.sampled() else None
+        await asyncio.gather(*(self._send_payload(payload, key) for payload, key in messages))
+        if trace is not None:
+            trace.lap("send")
+            tracer.finish(trace)
 
 
     async def _log(self, log_object: BaseSensorLogData):
         """
-        Logs data to Kafka and optionally to a file.
+        Logs data to the sinks and optionally to a file.
         
         :param log_object: A log instance (BaseSensorLog, VibrationLog, TemperatureLog, etc.)
         """
-        log_data = log_object.to_dict()
+        if self.metrics is not None:
+            self.metrics.records_logged += 1
 
-        if self.kafka_enabled:
-            await self._send_to_kafka(log_data)
+        if not self.stages:
+            await self._emit(log_object)
+            return
 
-        self.logger.info(json.dumps(log_data, indent=4))
+        log_objects = self._run_stages([log_object])
+        if self.tracer is not None:
+            trace = ACTIVE_TRACE.get()
+            if trace is not None:
+                trace.lap("stages")
+        for log_object in log_objects:
+            await self._emit(log_object)
 
 
-    async def _generic_sensor_log(
-            self,
-            log_cls: Type[BaseSensorLogData],
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None,
-        ):
+    def _run_stages(self, log_objects: list, start: int = 0) -> list:
         """
-        A generic method to log sensor data, reducing redundancy across log methods.
-
-        :param log_cls: The log data class to instantiate (e.g., ElectricalLogData).
-        :param channel: The channel of the sensor.
-        :param data_center: The data center.
-        :param duration: Duration of the measurement.
-        :param measurement: The sensor measurement.
-        :param product: The product associated with the measurement.
-        :param status: The status of the sensor.
-        :param metadata: Optional additional metadata.
-        """
-        metadata = self._add_machine_metadata(metadata)
-        log = log_cls(
-            sensor_id=self.sensor_id,
-            measurement=measurement,
-            channel=channel,
-            data_center=data_center,
-            duration=duration,
-            product=product,
-            status=status,
-            metadata=metadata,
-        )
-        await self._log(log)
+        Passes records through the processing stages from the given stage index onwards.
+        """
+        for stage in self.stages[start:]:
+            log_objects = stage.process_batch(log_objects)
+        return log_objects
 
-    async def log_electrical(
-            self, 
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None
-        ):
+
+    async def _flush_stages(self):
         """
-        Logs electrical sensor data (unit: Ampere).
+        Emits the records held back by the processing stages (e.g. open aggregation windows).
         """
-        await self._generic_sensor_log(ElectricalLogData, channel, data_center, duration, measurement, product, status, metadata)
+        for index, stage in enumerate(self.stages):
+            for log_object in self._run_stages(stage.flush(), index + 1):
+                await self._emit(log_object)
 
-    async def log_humidity(
-            self, 
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None
-        ):
+
+    def shed_counters(self) -> dict:
         """
-        Logs humidity sensor data (unit: Percent).
+        Returns the number of records the overload policy shed, keyed by status, e.g. {"Normal": 120}.
         """
-        await self._generic_sensor_log(HumidityLogData, channel, data_center, duration, measurement, product, status, metadata)
+        return dict(self.batch_sender.shed) if self.batch_sender is not None else {}
 
-    async def log_pressure(
-            self, 
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None
-        ):
+
+    def file_dropped(self) -> int:
         """
-        Logs pressure sensor data (unit: Bar).
+        Returns the number of records left out of the file because the writer thread's queue was full.
         """
-        await self._generic_sensor_log(PressureLogData, channel, data_center, duration, measurement, product, status, metadata)
+        return sum(handler.dropped for handler in self.logger.handlers if isinstance(handler, RecordQueueHandler))
 
-    async def log_temperature(
-            self, 
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None
-        ):
+
+    def processing_counters(self) -> dict:
         """
-        Logs temperature sensor data (unit: °C).
+        Returns the counters of the processing stages, e.g. {"deadband": {"suppressed": {...}, ...}}.
         """
-        await self._generic_sensor_log(TemperatureLogData, channel, data_center, duration, measurement, product, status, metadata)
+        return {stage.name: stage.counters() for stage in self.stages}
 
-    async def log_vibration(
-            self, 
-            channel: Channel,
-            data_center: DataCenter,
-            duration: float,
-            measurement: float, 
-            product: Product,
-            status: Status,
-            metadata: Optional[dict] = None
-        ):
+
+    async def _emit(self, log_object: BaseSensorLogData):
         """
-        Logs vibration sensor data (unit: Hz).
+        Serializes a processed record and hands it to the sinks and the file.
         """
-        await self._generic_sensor_log(VibrationLogData, channel, data_center, duration, measurement, product, status, metadata)
+        if self.tracer is not None:
+            trace = ACTIVE_TRACE.get()
+            if trace is not None:
+                await self._traced_emit(log_object, trace)
+                return
 
-        
-    def update_machine_status(self, action: Action):
+        log_data = log_object.to_dict()
+        metrics = self.metrics
+
+        key = self.partition_key(log_data) if self.partition_key is not None else None
+        if metrics is None:
+            if self.sink is not None:
+                await self._publish(self.serializer.dumps(log_data), log_object.status, log_object.channel, key)
+            if self.file_enabled:
+                self.logger.info(log_data)
+            return
+
+        metrics.records_emitted += 1
+        if self.sink is not None:
+            payload = self.serializer.dumps(log_data)
+            metrics.bytes_serialized += len(payload)
+            await self._publish(payload, log_object.status, log_object.channel, key)
+
+        if not self.file_enabled:
+            return
+        if metrics.records_emitted % metrics.sample_every:
+            self.logger.info(log_data)
+            return
+
+        start = time.perf_counter()
+        self.logger.info(log_data)
+        metrics.file_write_latency.observe(time.perf_counter() - start)
+
+
+    async def _traced_emit(self, log_object: BaseSensorLogData, trace):
+        """
+        _emit of a record of a sampled log call, timing every step into its trace.
+        """
+        log_data = log_object.to_dict()
+        trace.lap("to_dict")
+        key = None
+        if self.partition_key is not None:
+            key = self.partition_key(log_data)
+            trace.lap("partition_key")
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.records_emitted += 1
+        if self.sink is not None:
+            payload = self.serializer.dumps(log_data)
+            trace.lap("serialize")
+            if metrics is not None:
+                metrics.bytes_serialized += len(payload)
+            await self._publish(payload, log_object.status, log_object.channel, key)
+            trace.lap("publish")
+
+        if self.file_enabled:
+            self.logger.info(log_data)
+            trace.lap("file_write")
+
+
+    async def _log_batch(self, template: BaseSensorLogData, measurements, timestamps, durations):
         """
-        Updates the machine status and records the timestamp.
+        Serializes a batch of samples sharing one record template and hands it to the sinks and the file.
 
-        :param action: The new machine status (e.g., Start, Stop, Maintenance, Calibration).
+        With processing stages configured every sample goes through them as a separate record.
         """
-        if self.machine_status != action:
-            self.machine_status = action
-            self.status_timestamp = datetime.now(timezone.utc)
-            self.logger.info(f"Machine status updated: {self.machine_status.value} at {self.status_timestamp}")
+        trace = ACTIVE_TRACE.get() if self.tracer is not None else None
+        columns = batch_columns(template, measurements, timestamps, durations)
+        if trace is not None:
+            trace.lap("columns")
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.records_logged += len(columns["timestamp_ns"])
+
+        if self.stages:
+            log_objects = self._run_stages(batch_objects(template, columns))
+            if trace is not None:
+                trace.lap("stages")
+            for log_object in log_objects:
+                await self._emit(log_object)
+            return
+
+        records = format_batch(template, columns)
+        if trace is not None:
+            trace.lap("format")
+        if not records:
+            return
+
+        if self.sink is not None:
+            if self.encode_block is not None:
+                shared = template.to_dict()
+                payloads = [self.encode_block(shared, columns["timestamp_ns"], columns["duration"], columns["measurement"])]
+                keys = [self.partition_key(shared) if self.partition_key is not None else None]
+            else:
+                payloads, keys = self._batch_payloads(template, columns, records)
+            if trace is not None:
+                trace.lap("serialize")
+
+            if metrics is not None:
+                metrics.bytes_serialized += sum(len(payload) for payload in payloads)
+            if self.batch_sender is not None:
+                for payload, key in zip(payloads, keys):
+                    await self.batch_sender.put(payload, template.status, template.channel, key)
+            else:
+                await self._send_batch(list(zip(payloads, keys)))
+            if trace is not None:
+                trace.lap("publish")
+
+        if metrics is not None:
+            metrics.records_emitted += len(records)
+        if not self.file_enabled:
+            return
+
+        if metrics is not None:
+            start = time.perf_counter()
+
+        if self.store is not None:
+            self.logger.info(RecordLines(template.sensor_id, template.type._value_, columns["timestamp_ns"], records))
+        else:
+            self.logger.info("\n".join(records))
+
+        if metrics is not None:
+            metrics.file_write_latency.observe(time.perf_counter() - start)
+        if trace is not None:
+            trace.lap("file_write")
+
+
+    def _batch_payloads(self, template: BaseSensorLogData, columns: dict, records: list) -> tuple:
+        """
+        Serializes the samples of a batch into one payload each, with their message keys.
+        """
+        dicts = None
+        if isinstance(self.serializer, JsonSerializer):
+            payloads = [record.encode('utf-8') for record in records]
+        else:
+            dicts = batch_records(template, columns)
+            payloads = [self.serializer.dumps(record) for record in dicts]
+
+        if self.partition_key is None:
+            keys = [None] * len(payloads)
+        elif self._batch_keyed_once:
+            keys = [self.partition_key(template.to_dict())] * len(payloads)
+        else:
+            keys = [self.partition_key(record) for record in dicts or batch_records(template, columns)]
+        return payloads, keys
+
+
+    async def _publish(self, payload: bytes, status=None, channel=None, key=None):
+        """
+        Hands a serialized payload to the batching pipeline, or sends it directly when batching is disabled.
+
+        Status and channel decide which payloads the overload policy sheds first; key is the message key.
+        """
+        if self.batch_sender is not None:
+            await self.batch_sender.put(payload, status, channel, key)
+        else:
+            await self._send_payload(payload, key)
 
 
     async def initialize(self):
         """
-        Initialize the Kafka producer.
+        Initialize the sinks, the background send and spool replay tasks and the metrics endpoint.
         """
-        if self.kafka_enabled:
-            await self.producer.start()
+        if self.sink is not None:
+            await self.sink.start()
+
+        if self.batch_sender is not None:
+            self.batch_sender.start()
+
+        if self.spool_replayer is not None:
+            self.spool_replayer.start()
+
+        if self.metrics_port is not None and self.metrics_server is None:
+            self.metrics_server = MetricsServer(
+                self.metrics_text,
+                self.metrics_port,
+                host=self.metrics_host,
+                loop=asyncio.get_event_loop(),
+            )
+
+        if self.metrics_reporter is not None:
+            self.metrics_reporter.start()
+
+
+    async def flush(self):
+        """
+        Waits until every record logged so far has been handed to the sinks and written to the local file.
+
+        Records held back by processing stages are emitted first, so open aggregation windows are closed early.
+        """
+        await self._flush_stages()
+
+        if self.batch_sender is not None:
+            await self.batch_sender.flush()
+
+        if self.file_writer is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self.file_writer.flush)
+
+        if self.store is not None:
+            self.store.flush()
 
 
     async def close(self):
         """
-        Close the Kafka producer.
+        Flush pending batched records, stop the sinks and the file writer thread.
+
+        Records still in the spool stay on disk and are replayed after the next initialize().
+        """
+        await self._flush_stages()
+
+        if self.batch_sender is not None:
+            await self.batch_sender.close()
+
+        if self.spool_replayer is not None:
+            await self.spool_replayer.close()
+            self.spool.close()
+
+        if self.sink is not None:
+            await self.sink.stop()
+
+        if self.file_writer is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._stop_file_writer)
+
+        if self.store is not None:
+            self.store.close()
+
+        if self.compressor is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self.compressor.close)
+
+        if self.metrics_reporter is not None:
+            await self.metrics_reporter.close()
+
+        if self.metrics_server is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self.metrics_server.close)
+            self.metrics_server = None
+
+
+    def query(self, sensor_id=None, start=None, end=None, type=None):
+        """
+        Streams records from the local store (file_format="store") matching every given filter.
+
+        Call flush() first so records still queued for the writer thread are included.
+
+        :param sensor_id: Only records of this sensor.
+        :param start: Inclusive lower time bound: datetime, epoch seconds or record timestamp string.
+        :param end: Exclusive upper time bound.
+        :param type: Only records of this SensorType.
+        :return: A generator of record dicts.
+        """
+        if self.store is None:
+            raise ValueError('query() requires file_format="store"')
+        return self.store.query(sensor_id=sensor_id, start=start, end=end, type=type)
+
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Returns the runtime metrics as a dict, e.g. {"records_logged_total": 10, ...,
+        "send_latency_seconds": {"count": 10, "sum": 0.01, "buckets": {0.001: 10, ...}}}.
+        """
+        if self.metrics is None:
+            raise ValueError("metrics_snapshot() requires metrics=True")
+        return self.metrics.snapshot()
+
+
+    def metrics_text(self) -> str:
+        """
+        Returns the runtime metrics in the Prometheus text exposition format.
+        """
+        return render(self.metrics_snapshot())
+
+
+    def export_trace(self, path: str):
+        """
+        Writes the kept traces of sampled log calls as Chrome trace event JSON, for chrome://tracing
+        or https://ui.perfetto.dev.
+        """
+        if self.tracer is None:
+            raise ValueError("export_trace() requires trace_sample_rate > 0")
+        self.tracer.export_chrome_trace(path)
+
+
+    def _stop_file_writer(self):
+        """
+        Stops the writer thread once the queued records are written and closes its handlers.
         """
-        if self.kafka_enabled:
-            await self.producer.stop()
+        self.file_writer.stop()
+        for handler in self.file_writer.handlers:
+            handler.close()
+        self.file_writer = None
@@ -0,0 +1,227 @@
+from typing import Awaitable, Callable, Dict, Optional
+
+import asyncio
+import math
+import threading
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HELP = {
+    "records_logged_total": "Records handed to the logger, including every sample of a batch.",
+    "records_emitted_total": "Records serialized and sent after the processing stages.",
+    "records_sent_total": "Payloads the sinks accepted.",
+    "bytes_serialized_total": "Bytes of serialized sink payloads.",
+    "send_failures_total": "Sink sends that raised an error.",
+    "records_spooled_total": "Payloads written to the disk spool instead of the sinks.",
+    "records_dropped_total": "Payloads lost: failed sends without a spool and records dropped by a full spool.",
+    "records_suppressed_total": "Records held back by processing stages: deadband filtering and readings absorbed into aggregation rollups.",
+    "records_shed_total": "Records shed by the overload policy of the send buffer, by status.",
+    "send_queue_depth": "Payloads waiting in the batching pipeline.",
+    "send_queue_bytes": "Approximate memory held by the payloads waiting in the batching pipeline.",
+    "file_queue_depth": "Records waiting for the file writer thread.",
+    "file_records_dropped_total": "Records left out of the file because the writer thread's queue was full.",
+    "spool_pending_records": "Spooled payloads not replayed yet.",
+    "spool_bytes": "Size of the disk spool in bytes.",
+    "send_latency_seconds": "Time from handing a payload to the sinks until it was accepted (sampled).",
+    "file_write_seconds": "Time spent writing (or, with the writer thread, enqueueing) a file record (sampled).",
+}
+
+# Label of the metrics whose snapshot value is a dict of per-label values.
+LABELS = {
+    "records_shed_total": "status",
+}
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    merged = dict(labels)
+    if extra:
+        merged.update(extra)
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in merged.items()) + "}"
+
+
+def render(snapshot: dict, prefix: str = "sensor_logger", labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Formats a LoggerMetrics snapshot in the Prometheus text exposition format.
+
+    :param snapshot: Dict returned by LoggerMetrics.snapshot().
+    :param prefix: Prefix of every metric name.
+    :param labels: Optional labels added to every sample, e.g. {"gateway": "line-3"}.
+    """
+    labels = labels or {}
+    lines = []
+    for name, value in snapshot.items():
+        metric = f"{prefix}_{name}"
+        if name in HELP:
+            lines.append(f"# HELP {metric} {HELP[name]}")
+
+        kind = "counter" if name.endswith("_total") else "gauge"
+        if isinstance(value, dict) and "buckets" not in value:
+            lines.append(f"# TYPE {metric} {kind}")
+            label = LABELS.get(name, "key")
+            for key, count in value.items():
+                lines.append(f"{metric}{_format_labels(labels, {label: key})} {_format_value(count)}")
+            continue
+
+        if isinstance(value, dict):
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in value["buckets"].items():
+                lines.append(f"{metric}_bucket{_format_labels(labels, {'le': _format_value(float(bound))})} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {value['count']}")
+            continue
+
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint serving the Prometheus text format on GET /metrics from a daemon thread.
+
+    When a loop is given the text is rendered on that loop, so the snapshot never races
+    with the logging code mutating the counters.
+    """
+    def __init__(
+            self,
+            render_text: Callable[[], str],
+            port: int,
+            host: str = "127.0.0.1",
+            loop: Optional[asyncio.AbstractEventLoop] = None,
+            timeout: float = 5.0,
+        ):
+        """
+        :param render_text: Callable returning the exposition text.
+        :param port: Port to listen on (0 picks a free one, see the port attribute).
+        :param host: Interface to bind; the default only accepts local scrapes.
+        :param loop: Optional event loop to render the text on.
+        :param timeout: Seconds to wait for the loop before answering 503.
+        """
+        # Imported here: http.server pulls in email and socketserver, which only an endpoint needs.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.render_text = render_text
+        self.loop = loop
+        self.timeout = timeout
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                try:
+                    body = server.text().encode("utf-8")
+                except Exception as e:
+                    self.send_error(503, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+
+    def text(self) -> str:
+        if self.loop is None or not self.loop.is_running():
+            return self.render_text()
+
+        async def render_on_loop():
+            return self.render_text()
+
+        return asyncio.run_coroutine_threadsafe(render_on_loop(), self.loop).result(self.timeout)
+
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+
+class MetricsReporter:
+    """
+    Background task handing a snapshot to a callback at a fixed interval.
+    """
+    def __init__(
+            self,
+            snapshot: Callable[[], dict],
+            callback: Callable[[dict], Optional[Awaitable[None]]],
+            interval: float = 10.0,
+            on_error: Optional[Callable[[Exception], None]] = None,
+        ):
+        """
+        :param snapshot: Callable returning the current snapshot.
+        :param callback: Function or coroutine function receiving every snapshot.
+        :param interval: Seconds between two reports.
+        :param on_error: Optional callback receiving errors raised by the callback.
+        """
+        self.snapshot = snapshot
+        self.callback = callback
+        self.interval = interval
+        self.on_error = on_error
+
+        self._task = None
+
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+
+    async def report(self):
+        """
+        Hands one snapshot to the callback.
+        """
+        try:
+            result = self.callback(self.snapshot())
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+
+
+    async def close(self):
+        """
+        Stops the task after a last report, so the final counters are not lost.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.report()
+
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.report()
@@ -0,0 +1,149 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Optional
+
+
+# Upper bounds in seconds, from 10 microseconds (an in-memory send) to 10 seconds (a stalled broker).
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; observe() is a bisect and two additions.
+    """
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS):
+        """
+        :param bounds: Increasing bucket upper bounds; values above the last one fall into +Inf.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket containing it (inf if beyond the last bound).
+        """
+        total = self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+    def snapshot(self) -> dict:
+        """
+        Returns {"count", "sum", "buckets"} with cumulative bucket counts keyed by upper bound.
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum": self.sum, "buckets": buckets}
+
+
+class LoggerMetrics:
+    """
+    Runtime counters and latency histograms of a LoggerConfig.
+
+    Counters are plain attributes incremented on the event loop. Timing a call costs about
+    as much as all counters together, so the histograms only receive a sample of one in
+    every sample_every operations. Values owned by other components (queue depths, spool
+    drops, stage counters) are only read from the sources callables when a snapshot is
+    taken, so they cost nothing while logging.
+    """
+    __slots__ = (
+        "records_logged",
+        "records_emitted",
+        "records_sent",
+        "bytes_serialized",
+        "send_failures",
+        "records_spooled",
+        "records_dropped",
+        "send_latency",
+        "file_write_latency",
+        "sample_every",
+        "sources",
+    )
+
+    COUNTERS = (
+        "records_logged",
+        "records_emitted",
+        "records_sent",
+        "bytes_serialized",
+        "send_failures",
+        "records_spooled",
+        "records_dropped",
+    )
+
+    def __init__(
+            self,
+            sources: Optional[Dict[str, Callable[[], float]]] = None,
+            buckets: Iterable[float] = LATENCY_BUCKETS,
+            sample_every: int = 16,
+        ):
+        """
+        :param sources: Extra snapshot values by name, each read from a callable.
+            Values of the counters above are added to the attribute of the same name.
+        :param buckets: Bucket upper bounds in seconds of the latency histograms.
+        :param sample_every: The caller times one in every this many operations into the histograms.
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+
+        self.records_logged = 0
+        self.records_emitted = 0
+        self.records_sent = 0
+        self.bytes_serialized = 0
+        self.send_failures = 0
+        self.records_spooled = 0
+        self.records_dropped = 0
+
+        self.send_latency = Histogram(buckets)
+        self.file_write_latency = Histogram(buckets)
+        self.sample_every = sample_every
+        self.sources = dict(sources or {})
+
+
+    def snapshot(self) -> dict:
+        """
+        Returns every metric as a plain dict, e.g.
+        {"records_logged_total": 10, ..., "send_queue_depth": 0, "send_latency_seconds": {"count": 10, ...}}.
+
+        Counter names end in _total and everything else is a gauge. Histograms are dicts with
+        "buckets"; other dicts hold one value per label (e.g. records shed per status).
+        """
+        values = {name: getattr(self, name) for name in self.COUNTERS}
+        gauges = {}
+        for name, source in self.sources.items():
+            if name in values:
+                values[name] += source()
+            else:
+                gauges[name] = source()
+
+        snapshot = {f"{name}_total": value for name, value in values.items()}
+        snapshot.update(gauges)
+        snapshot["send_latency_seconds"] = self.send_latency.snapshot()
+        snapshot["file_write_seconds"] = self.file_write_latency.snapshot()
+        return snapshot
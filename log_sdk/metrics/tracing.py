@@ -0,0 +1,175 @@
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+import json
+import os
+import time
+
+
+# Trace of the log call running in the current task, set only while a sampled call runs.
+ACTIVE_TRACE: ContextVar = ContextVar("log_sdk_active_trace", default=None)
+
+
+class Trace:
+    """
+    Spans of one sampled log call, as consecutive laps on perf_counter_ns.
+    """
+    __slots__ = ("name", "args", "start_ns", "end_ns", "spans", "_mark")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.start_ns = self._mark = time.perf_counter_ns()
+        self.end_ns = None
+        self.spans = []
+
+
+    def lap(self, name: str):
+        """
+        Closes a span named name from the end of the previous span (or the trace start) until now.
+        """
+        now = time.perf_counter_ns()
+        self.spans.append((name, self._mark, now))
+        self._mark = now
+
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.perf_counter_ns()) - self.start_ns
+
+
+    def to_dict(self) -> dict:
+        """
+        Returns the trace with span offsets and durations in microseconds from its start.
+        """
+        return {
+            "name": self.name,
+            "args": dict(self.args),
+            "duration_us": self.duration_ns / 1000,
+            "spans": [
+                {"name": name, "start_us": (start - self.start_ns) / 1000, "duration_us": (end - start) / 1000}
+                for name, start, end in self.spans
+            ],
+        }
+
+
+class Tracer:
+    """
+    Samples log calls and keeps the traces of the sampled ones for a Chrome trace export.
+
+    A call is sampled with probability sample_rate; unsampled calls only pay for sampled(), a random draw.
+    Finished traces go to a bounded buffer and, if given, to a callback.
+    """
+    def __init__(
+            self,
+            sample_rate: float = 0.01,
+            callback: Optional[Callable[[Trace], None]] = None,
+            max_traces: int = 10000,
+            on_error: Optional[Callable[[Exception], None]] = None,
+        ):
+        """
+        :param sample_rate: Fraction of log calls traced, from 0 (none) to 1 (every call).
+        :param callback: Optional function receiving every finished Trace.
+        :param max_traces: Number of most recent traces kept for export.
+        :param on_error: Optional callback receiving errors raised by the callback.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.callback = callback
+        self.on_error = on_error
+        self.traces = deque(maxlen=max_traces)
+        self.finished = 0
+
+        # Imported here: random pulls in hashlib and friends, which only an enabled tracer needs.
+        from random import random
+
+        self._random = random
+        # Maps perf_counter_ns to epoch nanoseconds for the exported timestamps.
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+
+    def sampled(self) -> bool:
+        """
+        Draws whether the current call is traced.
+        """
+        return self._random() < self.sample_rate
+
+
+    def start(self, name: str, **args) -> Trace:
+        """
+        Starts the trace of a sampled call; args are shown with it (e.g. the sensor id).
+        """
+        return Trace(name, args)
+
+
+    def finish(self, trace: Trace):
+        trace.end_ns = time.perf_counter_ns()
+        self.traces.append(trace)
+        self.finished += 1
+        if self.callback is None:
+            return
+        try:
+            self.callback(trace)
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+
+
+    def chrome_trace(self) -> dict:
+        """
+        Returns the kept traces in the Chrome trace event format (chrome://tracing, Perfetto).
+
+        Every trace is a complete event with its spans nested inside. Traces that overlapped in
+        time (concurrent log calls) are put on separate thread rows so the nesting stays valid.
+        """
+        pid = os.getpid()
+        events = []
+        lane_ends = []
+        for trace in sorted(self.traces, key=lambda trace: trace.start_ns):
+            end_ns = trace.end_ns or trace.start_ns
+            for lane, lane_end in enumerate(lane_ends):
+                if lane_end <= trace.start_ns:
+                    lane_ends[lane] = end_ns
+                    break
+            else:
+                lane = len(lane_ends)
+                lane_ends.append(end_ns)
+
+            events.append(self._event(trace.name, trace.start_ns, end_ns, pid, lane + 1, trace.args))
+            for name, start, end in trace.spans:
+                events.append(self._event(name, start, end, pid, lane + 1))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+    def _event(self, name: str, start_ns: int, end_ns: int, pid: int, tid: int, args: Optional[dict] = None) -> dict:
+        event = {
+            "name": name,
+            "cat": "log_sdk",
+            "ph": "X",
+            "ts": (start_ns + self._epoch_offset_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        return event
+
+
+    def export_chrome_trace(self, path: str):
+        """
+        Writes the kept traces to a Chrome trace event JSON file.
+        """
+        with open(path, "w") as out:
+            json.dump(self.chrome_trace(), out)
+
+
+    def clear(self) -> List[Trace]:
+        """
+        Empties the trace buffer and returns the traces it held.
+        """
+        traces = list(self.traces)
+        self.traces.clear()
+        return traces
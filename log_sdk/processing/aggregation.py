@@ -0,0 +1,221 @@
+from collections import deque
+from typing import Dict, List, Optional
+
+import math
+
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.processing.base import ProcessingStage
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData, format_timestamp_ns
+
+
+class WindowAggregation:
+    """
+    Aggregation policy of one sensor type.
+    """
+    def __init__(
+            self,
+            window_seconds: float = 60.0,
+            slide_seconds: Optional[float] = None,
+            passthrough_status: Optional[Status] = Status.WARNING,
+        ):
+        """
+        :param window_seconds: Length of a window in seconds.
+        :param slide_seconds: Distance between the starts of consecutive windows; None (or the
+            window length) gives tumbling windows, a smaller value gives sliding windows.
+            The window length must be a multiple of it.
+        :param passthrough_status: Readings with this status or worse are also sent immediately
+            (None disables the pass-through).
+        """
+        slide_seconds = slide_seconds or window_seconds
+        panes = window_seconds / slide_seconds
+        if slide_seconds <= 0 or panes < 1 or abs(panes - round(panes)) > 1e-9:
+            raise ValueError("window_seconds must be a positive multiple of slide_seconds")
+
+        self.window_seconds = window_seconds
+        self.slide_seconds = slide_seconds
+        self.passthrough_status = passthrough_status
+        self.panes = int(round(panes))
+        self.slide_ns = int(slide_seconds * 1_000_000_000)
+
+
+class _Pane:
+    """
+    Running statistics of the readings in one slide-long pane (Welford's algorithm).
+    """
+    __slots__ = ("index", "count", "mean", "m2", "min", "max", "last", "status", "record")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = None
+        self.status = Status.NORMAL
+        self.record = None
+
+
+    def add(self, log_object: BaseSensorLogData):
+        value = log_object.measurement
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+        if log_object.status.severity > self.status.severity:
+            self.status = log_object.status
+        self.record = log_object
+
+
+    def merge(self, other: "_Pane"):
+        """
+        Combines the statistics of a later pane into this one (Chan et al.).
+        """
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.last = other.last
+        if other.status.severity > self.status.severity:
+            self.status = other.status
+        self.record = other.record
+
+
+class WindowAggregator(ProcessingStage):
+    """
+    Replaces the raw readings of selected sensor types with one rollup record per window.
+
+    Each (sensor_id, type) keeps at most one pane per slide in its window, so the state per
+    sensor is constant regardless of the reading rate. Windows follow the record timestamps
+    and are closed by the first reading after their end (or by flush()).
+
+    A rollup is a record of the same class whose measurement is the window mean, whose status
+    is the worst status seen, whose duration is the window length and whose timestamp is the
+    window end. Its metadata is the last reading's metadata plus an "aggregation" entry with
+    window_start, window_end, count, min, max, mean, variance and last.
+
+    The counters count the rollups and the readings held back (not passed through) per log data class.
+    """
+    name = "aggregation"
+
+    def __init__(self, policies: Dict[SensorType, WindowAggregation]):
+        """
+        :param policies: Aggregation policy per sensor type; other types pass through unchanged.
+        """
+        self.policies = policies
+        self.suppressed = {}
+        self.rollups = {}
+        self._windows = {}
+
+
+    def process(self, log_object: BaseSensorLogData) -> List[BaseSensorLogData]:
+        policy = self.policies.get(log_object.type)
+        if policy is None:
+            return [log_object]
+
+        output = []
+        key = (log_object.sensor_id, log_object.type)
+        panes = self._windows.get(key)
+        if panes is None:
+            panes = self._windows[key] = deque(maxlen=policy.panes)
+
+        index = log_object.timestamp_ns // policy.slide_ns
+        if panes and index > panes[-1].index:
+            output.extend(self._close_windows(panes, policy, index))
+        if not panes or index > panes[-1].index:
+            panes.append(_Pane(index))
+
+        # Late readings are counted in the current pane.
+        panes[-1].add(log_object)
+
+        if policy.passthrough_status is not None and \
+                log_object.status.severity >= policy.passthrough_status.severity:
+            output.append(log_object)
+        else:
+            name = type(log_object).__name__
+            self.suppressed[name] = self.suppressed.get(name, 0) + 1
+
+        return output
+
+
+    def flush(self) -> List[BaseSensorLogData]:
+        output = []
+        for (_, sensor_type), panes in self._windows.items():
+            if panes:
+                output.append(self._rollup(panes, self.policies[sensor_type], panes[-1].index + 1))
+        self._windows.clear()
+        return output
+
+
+    def counters(self) -> dict:
+        return {
+            "suppressed": dict(self.suppressed),
+            "rollups": dict(self.rollups),
+        }
+
+
+    def _close_windows(self, panes: deque, policy: WindowAggregation, index: int) -> List[BaseSensorLogData]:
+        """
+        Emits every window ending between the newest pane and the pane of a new reading.
+        """
+        output = []
+        end = panes[-1].index + 1
+        while end <= index:
+            if not any(pane.index >= end - policy.panes for pane in panes):
+                break
+            output.append(self._rollup(panes, policy, end))
+            end += 1
+
+        while panes and panes[0].index <= index - policy.panes:
+            panes.popleft()
+        return output
+
+
+    def _rollup(self, panes: deque, policy: WindowAggregation, end: int) -> BaseSensorLogData:
+        """
+        Builds the rollup record of the window ending at the start of pane `end`.
+        """
+        stats = _Pane(end - policy.panes)
+        for pane in panes:
+            if end - policy.panes <= pane.index < end:
+                stats.merge(pane)
+
+        window_end = end * policy.slide_ns
+        window_start = window_end - policy.panes * policy.slide_ns
+        last = stats.record
+        name = type(last).__name__
+        self.rollups[name] = self.rollups.get(name, 0) + 1
+        metadata = dict(last.metadata)
+        metadata["aggregation"] = {
+            "window_start": format_timestamp_ns(window_start),
+            "window_end": format_timestamp_ns(window_end),
+            "count": stats.count,
+            "min": stats.min,
+            "max": stats.max,
+            "mean": stats.mean,
+            "variance": stats.m2 / stats.count,
+            "last": stats.last,
+        }
+
+        return type(last)(
+            sensor_id=last.sensor_id,
+            channel=last.channel,
+            data_center=last.data_center,
+            duration=policy.window_seconds,
+            measurement=stats.mean,
+            product=last.product,
+            status=stats.status,
+            type=last.type,
+            unit=last.unit,
+            metadata=metadata,
+            timestamp_ns=window_end,
+        )
@@ -0,0 +1,290 @@
+from typing import Dict, List, Optional
+
+import math
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.processing.base import ProcessingStage
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+
+
+# Runs of at least this many readings of one sensor are evaluated with NumPy when it is installed.
+NUMPY_MIN_READINGS = 64
+
+_STATUS_OF_SEVERITY = {status.severity: status for status in Status}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Batch anomaly evaluation requires the numpy package: pip install numpy") from e
+    return numpy
+
+
+class AnomalyRule:
+    """
+    Anomaly detection policy of one sensor type.
+
+    A reading is WARNING or CRITICAL when it crosses a fixed threshold, or when it deviates from
+    the sensor's exponentially weighted moving average by more than warning_z or critical_z
+    exponentially weighted standard deviations. Every reading updates the average, so a lasting
+    change of level stops being anomalous for the z-score; fixed thresholds cover levels.
+    """
+    def __init__(
+            self,
+            warning_above: Optional[float] = None,
+            critical_above: Optional[float] = None,
+            warning_below: Optional[float] = None,
+            critical_below: Optional[float] = None,
+            alpha: float = 0.05,
+            warning_z: Optional[float] = 3.0,
+            critical_z: Optional[float] = 5.0,
+            warmup: int = 30,
+            min_deviation: float = 0.0,
+            alert_status: Optional[Status] = Status.CRITICAL,
+        ):
+        """
+        :param warning_above: Readings at or above this value are at least WARNING.
+        :param critical_above: Readings at or above this value are CRITICAL.
+        :param warning_below: Readings at or below this value are at least WARNING.
+        :param critical_below: Readings at or below this value are CRITICAL.
+        :param alpha: Weight of a new reading in the moving average and variance (0 < alpha <= 1);
+            the average follows roughly the last 2 / alpha readings.
+        :param warning_z: Z-score above which a reading is WARNING (None disables the z-score rules).
+        :param critical_z: Z-score above which a reading is CRITICAL (None disables it).
+        :param warmup: Number of readings of a sensor before the z-score rules apply.
+        :param min_deviation: Deviations from the average up to this value are never anomalous,
+            e.g. the resolution of the sensor, so a flat signal does not alert on its first step.
+        :param alert_status: Records the detector raises to this status or worse are moved to
+            Channel.ALERT (None never changes the channel).
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if warning_z is not None and critical_z is not None and critical_z < warning_z:
+            raise ValueError("critical_z must not be below warning_z")
+
+        self.warning_above = math.inf if warning_above is None else warning_above
+        self.critical_above = math.inf if critical_above is None else critical_above
+        self.warning_below = -math.inf if warning_below is None else warning_below
+        self.critical_below = -math.inf if critical_below is None else critical_below
+        self.alpha = alpha
+        self.warning_z = warning_z
+        self.critical_z = critical_z
+        self.warmup = warmup
+        self.min_deviation = min_deviation
+        self.alert_status = alert_status
+
+        # Squared limits, so a reading is compared without a square root.
+        self.warning_z2 = math.inf if warning_z is None else warning_z * warning_z
+        self.critical_z2 = math.inf if critical_z is None else critical_z * critical_z
+        self.alert_severity = math.inf if alert_status is None else alert_status.severity
+
+
+class _Baseline:
+    """
+    Moving average and variance of one sensor: the whole per-sensor state of the detector.
+    """
+    __slots__ = ("mean", "variance", "count")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+
+def _linear_scan(numpy, inputs, decay: float, initial: float):
+    """
+    Returns y[0..n-1] of the recurrence y[i] = decay * y[i - 1] + inputs[i], with y[-1] = initial.
+
+    Uses y[i] = decay**i * (decay * initial + cumsum(inputs[j] / decay**j)), in chunks short
+    enough for decay**-j to stay far from overflowing.
+    """
+    if decay == 0:
+        return inputs.copy()
+
+    output = numpy.empty(len(inputs))
+    step = max(1, int(300 / -math.log(decay)))
+    for start in range(0, len(inputs), step):
+        chunk = inputs[start:start + step]
+        powers = decay ** numpy.arange(len(chunk), dtype=numpy.float64)
+        values = powers * (decay * initial + numpy.cumsum(chunk / powers))
+        output[start:start + len(chunk)] = values
+        initial = values[-1]
+    return output
+
+
+class AnomalyDetector(ProcessingStage):
+    """
+    Derives the status of readings at the edge from per-sensor baselines and fixed thresholds.
+
+    The status a caller passes is only ever raised: a reading the rules of its SensorType find
+    anomalous becomes WARNING or CRITICAL, and may be moved to Channel.ALERT. Each
+    (sensor_id, type) keeps a moving average, variance and count, so memory per sensor is
+    constant and a reading costs a few float operations.
+
+    process_batch evaluates runs of readings of one sensor (e.g. a log_batch call) with NumPy
+    when it is installed, with the same results as one reading at a time.
+    """
+    name = "anomaly"
+
+    def __init__(self, rules: Dict[SensorType, AnomalyRule]):
+        """
+        :param rules: Detection rule per sensor type; other types pass through unchanged.
+        """
+        self.rules = rules
+        self.warnings = {sensor_type._value_: 0 for sensor_type in rules}
+        self.criticals = {sensor_type._value_: 0 for sensor_type in rules}
+        self.alerts = {sensor_type._value_: 0 for sensor_type in rules}
+        self._baselines = {}
+
+
+    def process(self, log_object: BaseSensorLogData) -> List[BaseSensorLogData]:
+        rule = self.rules.get(log_object.type)
+        if rule is None:
+            return [log_object]
+
+        key = (log_object.sensor_id, log_object.type)
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            baseline = self._baselines[key] = _Baseline()
+
+        value = log_object.measurement
+        if value >= rule.critical_above or value <= rule.critical_below:
+            severity = 2
+        elif value >= rule.warning_above or value <= rule.warning_below:
+            severity = 1
+        else:
+            severity = 0
+
+        if not math.isfinite(value):
+            # Never part of the baseline.
+            self._apply(log_object, severity, rule)
+            return [log_object]
+
+        if baseline.count == 0:
+            baseline.mean = value
+        deviation = value - baseline.mean
+        if severity < 2 and baseline.count >= rule.warmup and abs(deviation) > rule.min_deviation:
+            squared = deviation * deviation
+            if squared > rule.critical_z2 * baseline.variance:
+                severity = 2
+            elif severity < 1 and squared > rule.warning_z2 * baseline.variance:
+                severity = 1
+
+        increment = rule.alpha * deviation
+        baseline.mean += increment
+        baseline.variance = (1.0 - rule.alpha) * (baseline.variance + deviation * increment)
+        baseline.count += 1
+
+        if severity:
+            self._apply(log_object, severity, rule)
+        return [log_object]
+
+
+    def _apply(self, log_object: BaseSensorLogData, severity: int, rule: AnomalyRule):
+        if severity <= log_object.status.severity:
+            return
+
+        log_object.status = _STATUS_OF_SEVERITY[severity]
+        type_name = log_object.type._value_
+        if severity == 2:
+            self.criticals[type_name] += 1
+        else:
+            self.warnings[type_name] += 1
+        if severity >= rule.alert_severity and log_object.channel is not Channel.ALERT:
+            log_object.channel = Channel.ALERT
+            self.alerts[type_name] += 1
+
+
+    def process_batch(self, log_objects: List[BaseSensorLogData]) -> List[BaseSensorLogData]:
+        if len(log_objects) < NUMPY_MIN_READINGS:
+            return super().process_batch(log_objects)
+        try:
+            numpy = _numpy()
+        except ImportError:
+            return super().process_batch(log_objects)
+
+        start = 0
+        while start < len(log_objects):
+            first = log_objects[start]
+            end = start + 1
+            while end < len(log_objects) and log_objects[end].sensor_id == first.sensor_id \
+                    and log_objects[end].type is first.type:
+                end += 1
+
+            run = log_objects[start:end]
+            rule = self.rules.get(first.type)
+            if rule is not None and len(run) >= NUMPY_MIN_READINGS:
+                measurements = numpy.array([log_object.measurement for log_object in run], dtype=numpy.float64)
+                if numpy.isfinite(measurements).all():
+                    severities = self._evaluate(numpy, first.sensor_id, first.type, rule, measurements)
+                    for index in numpy.flatnonzero(severities).tolist():
+                        self._apply(run[index], int(severities[index]), rule)
+                else:
+                    super().process_batch(run)
+            elif rule is not None:
+                super().process_batch(run)
+            start = end
+        return log_objects
+
+
+    def evaluate(self, sensor_id: str, sensor_type: SensorType, measurements):
+        """
+        Evaluates an array of consecutive readings of one sensor with NumPy, updating its baseline.
+
+        :param measurements: Finite readings, oldest first (any sequence NumPy accepts).
+        :return: A NumPy array with the derived severity of every reading: 0 (NORMAL),
+            1 (WARNING) or 2 (CRITICAL); statuses passed by callers are not taken into account.
+        """
+        numpy = _numpy()
+        rule = self.rules[sensor_type]
+        measurements = numpy.asarray(measurements, dtype=numpy.float64)
+        if not numpy.isfinite(measurements).all():
+            raise ValueError("evaluate() only accepts finite readings")
+        return self._evaluate(numpy, sensor_id, sensor_type, rule, measurements)
+
+
+    def _evaluate(self, numpy, sensor_id: str, sensor_type: SensorType, rule: AnomalyRule, measurements):
+        key = (sensor_id, sensor_type)
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            baseline = self._baselines[key] = _Baseline()
+        if not len(measurements):
+            return numpy.zeros(0, dtype=numpy.int8)
+
+        alpha, decay = rule.alpha, 1.0 - rule.alpha
+        mean = measurements[0] if baseline.count == 0 else baseline.mean
+
+        means = _linear_scan(numpy, alpha * measurements, decay, mean)
+        means_before = numpy.concatenate(([mean], means[:-1]))
+        deviations = measurements - means_before
+        variances = _linear_scan(numpy, alpha * decay * deviations * deviations, decay, baseline.variance)
+        variances_before = numpy.concatenate(([baseline.variance], variances[:-1]))
+
+        severities = numpy.where(
+            (measurements >= rule.critical_above) | (measurements <= rule.critical_below), 2,
+            numpy.where((measurements >= rule.warning_above) | (measurements <= rule.warning_below), 1, 0),
+        ).astype(numpy.int8)
+
+        counts_before = baseline.count + numpy.arange(len(measurements))
+        squared = deviations * deviations
+        eligible = (counts_before >= rule.warmup) & (numpy.abs(deviations) > rule.min_deviation)
+        severities = numpy.maximum(severities, numpy.where(
+            eligible & (squared > rule.critical_z2 * variances_before), 2,
+            numpy.where(eligible & (squared > rule.warning_z2 * variances_before), 1, 0),
+        ).astype(numpy.int8))
+
+        baseline.mean = float(means[-1])
+        baseline.variance = float(variances[-1])
+        baseline.count += len(measurements)
+        return severities
+
+
+    def counters(self) -> dict:
+        return {
+            "warnings": dict(self.warnings),
+            "criticals": dict(self.criticals),
+            "alerts": dict(self.alerts),
+        }
@@ -0,0 +1,37 @@
+from typing import List
+
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+
+
+class ProcessingStage:
+    """
+    Base class for stages that transform, hold back or add records before they are sent.
+    """
+    name = "stage"
+
+    def process(self, log_object: BaseSensorLogData) -> List[BaseSensorLogData]:
+        """
+        Receives one record and returns the records to pass on (possibly none).
+        """
+        return [log_object]
+
+
+    def process_batch(self, log_objects: List[BaseSensorLogData]) -> List[BaseSensorLogData]:
+        """
+        Receives consecutive records and returns the records to pass on, as process() one by one would.
+        """
+        return [output for log_object in log_objects for output in self.process(log_object)]
+
+
+    def flush(self) -> List[BaseSensorLogData]:
+        """
+        Returns every record the stage is still holding back.
+        """
+        return []
+
+
+    def counters(self) -> dict:
+        """
+        Returns the counters the stage keeps (e.g. suppressed records), keyed by name.
+        """
+        return {}
@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Type
+
+from log_sdk.processing.base import ProcessingStage
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+
+
+class Deadband:
+    """
+    Report-by-exception policy of one sensor class.
+    """
+    def __init__(
+            self,
+            absolute: float = 0.0,
+            percent: float = 0.0,
+            max_silence_seconds: Optional[float] = 60.0,
+        ):
+        """
+        :param absolute: Minimum change from the last sent measurement, in the unit of the sensor.
+        :param percent: Minimum change relative to the last sent measurement, in percent.
+            With both thresholds set the larger one applies, so absolute acts as a floor near zero.
+        :param max_silence_seconds: A reading is sent regardless of the thresholds once this much
+            time has passed since the last sent record of the sensor (None disables heartbeats).
+        """
+        if absolute < 0 or percent < 0:
+            raise ValueError("Deadband thresholds must not be negative")
+
+        self.absolute = absolute
+        self.percent = percent
+        self.max_silence_seconds = max_silence_seconds
+        self.max_silence_ns = None if max_silence_seconds is None else int(max_silence_seconds * 1_000_000_000)
+
+
+class _LastSent:
+    __slots__ = ("measurement", "status", "timestamp_ns")
+
+    def __init__(self, log_object: BaseSensorLogData):
+        self.update(log_object)
+
+
+    def update(self, log_object: BaseSensorLogData):
+        self.measurement = log_object.measurement
+        self.status = log_object.status
+        self.timestamp_ns = log_object.timestamp_ns
+
+
+class DeadbandFilter(ProcessingStage):
+    """
+    Suppresses readings that did not move past a deadband since the last sent record.
+
+    A reading is sent when its measurement moved past the threshold or its status changed
+    since the last sent record of the same (sensor_id, type), or as a heartbeat when the
+    sensor has been silent for max_silence_seconds. Heartbeats are driven by incoming
+    readings, so a sensor that stops reporting altogether stays silent.
+
+    The state per sensor is the last sent measurement, status and timestamp.
+    """
+    name = "deadband"
+
+    def __init__(self, policies: Dict[Type[BaseSensorLogData], Deadband]):
+        """
+        :param policies: Deadband policy per log data class (e.g. PressureLogData);
+            other classes pass through unchanged.
+        """
+        self.policies = policies
+        self.suppressed = {log_cls.__name__: 0 for log_cls in policies}
+        self.heartbeats = {log_cls.__name__: 0 for log_cls in policies}
+        self._last_sent = {}
+
+
+    def process(self, log_object: BaseSensorLogData) -> List[BaseSensorLogData]:
+        log_cls = type(log_object)
+        policy = self.policies.get(log_cls)
+        if policy is None:
+            return [log_object]
+
+        key = (log_object.sensor_id, log_object.type)
+        last = self._last_sent.get(key)
+        if last is None:
+            self._last_sent[key] = _LastSent(log_object)
+            return [log_object]
+
+        if log_object.status is not last.status:
+            last.update(log_object)
+            return [log_object]
+
+        threshold = max(policy.absolute, policy.percent / 100.0 * abs(last.measurement))
+        if abs(log_object.measurement - last.measurement) > threshold:
+            last.update(log_object)
+            return [log_object]
+
+        if policy.max_silence_ns is not None and \
+                log_object.timestamp_ns - last.timestamp_ns >= policy.max_silence_ns:
+            self.heartbeats[log_cls.__name__] += 1
+            last.update(log_object)
+            return [log_object]
+
+        self.suppressed[log_cls.__name__] += 1
+        return []
+
+
+    def counters(self) -> dict:
+        return {
+            "suppressed": dict(self.suppressed),
+            "heartbeats": dict(self.heartbeats),
+        }
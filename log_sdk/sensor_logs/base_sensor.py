@@ -1,4 +1,8 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import time
+
 from log_sdk.common.channel import Channel
 from log_sdk.common.data_center import DataCenter
 from log_sdk.common.product import Product
@@ -7,10 +11,128 @@ from log_sdk.common.type import SensorType
 from log_sdk.common.unit import UnitOfMeasurement
 
 
+_second_cache = (None, None)
+
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """
+    Formats an epoch timestamp in nanoseconds as a local-time ISO 8601 string without offset.
+
+    The result matches datetime.now(timezone.utc).astimezone().replace(tzinfo=None).isoformat().
+    The date and time part of the last formatted second is cached, so records logged within
+    the same second only format their microseconds.
+    """
+    global _second_cache
+
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    cached_seconds, prefix = _second_cache
+    if cached_seconds != seconds:
+        prefix = datetime.fromtimestamp(seconds).isoformat()
+        _second_cache = (seconds, prefix)
+
+    microseconds = nanoseconds // 1000
+    if microseconds:
+        return "%s.%06d" % (prefix, microseconds)
+    return prefix
+
+
+_parse_cache = (None, None)
+
+
+def parse_timestamp_ns(timestamp: str) -> int:
+    """
+    Inverse of format_timestamp_ns, caching the epoch seconds of the last parsed second.
+    """
+    global _parse_cache
+
+    prefix, _, fraction = timestamp.partition(".")
+    cached_prefix, seconds = _parse_cache
+    if cached_prefix != prefix:
+        seconds = int(datetime.fromisoformat(prefix).timestamp())
+        _parse_cache = (prefix, seconds)
+
+    microseconds = int(fraction.ljust(6, "0")) if fraction else 0
+    return seconds * 1_000_000_000 + microseconds * 1000
+
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_offset_parse_cache = (None, None, None)
+_offset_format_cache = (None, None)
+
+
+def parse_timestamp_offset(timestamp: str) -> Tuple[int, int]:
+    """
+    Parses a record timestamp into epoch nanoseconds and the UTC offset in seconds of the local
+    time it is written in (the offset of this machine's time zone at that time).
+
+    Together they reproduce the timestamp string with format_timestamp_offset in any time zone.
+    """
+    global _offset_parse_cache
+
+    prefix, _, fraction = timestamp.partition(".")
+    cached_prefix, seconds, offset = _offset_parse_cache
+    if cached_prefix != prefix:
+        wall_clock = datetime.fromisoformat(prefix)
+        seconds = int(wall_clock.timestamp())
+        offset = (wall_clock.replace(tzinfo=None) - _EPOCH) // _SECOND - seconds
+        _offset_parse_cache = (prefix, seconds, offset)
+
+    microseconds = int(fraction.ljust(6, "0")) if fraction else 0
+    return seconds * 1_000_000_000 + microseconds * 1000, offset
+
+
+def local_offset(timestamp_ns: int) -> int:
+    """
+    Returns the UTC offset in seconds of this machine's local time at an epoch timestamp in nanoseconds.
+    """
+    seconds = timestamp_ns // 1_000_000_000
+    return (datetime.fromtimestamp(seconds) - _EPOCH) // _SECOND - seconds
+
+
+def format_timestamp_offset(timestamp_ns: int, offset: int) -> str:
+    """
+    Formats an epoch timestamp in nanoseconds as an ISO 8601 string without offset in the local
+    time of a UTC offset in seconds, like format_timestamp_ns on a machine at that offset.
+    """
+    global _offset_format_cache
+
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    seconds += offset
+    cached_seconds, prefix = _offset_format_cache
+    if cached_seconds != seconds:
+        prefix = (_EPOCH + timedelta(seconds=seconds)).isoformat()
+        _offset_format_cache = (seconds, prefix)
+
+    microseconds = nanoseconds // 1000
+    if microseconds:
+        return "%s.%06d" % (prefix, microseconds)
+    return prefix
+
+
 class BaseSensorLogData:
     """
     Base class for all sensor logs (e.g., Vibration, Temperature, Pressure)
+
+    Subclasses set SENSOR_TYPE and UNIT so their constant fields are not passed per record.
     """
+    __slots__ = (
+        "timestamp_ns",
+        "sensor_id",
+        "channel",
+        "data_center",
+        "duration",
+        "measurement",
+        "product",
+        "status",
+        "type",
+        "unit",
+        "metadata",
+    )
+
+    SENSOR_TYPE: Optional[SensorType] = None
+    UNIT: Optional[UnitOfMeasurement] = None
+
     def __init__(
             self,
             sensor_id: str,
@@ -20,9 +142,10 @@ class BaseSensorLogData:
             measurement: float,
             product: Product,
             status: Status,
-            type: SensorType,
-            unit: UnitOfMeasurement,
-            metadata=None
+            type: Optional[SensorType] = None,
+            unit: Optional[UnitOfMeasurement] = None,
+            metadata=None,
+            timestamp_ns: Optional[int] = None,
         ):
         """
         :param sensor_id: Unique identifier for the sensor
@@ -32,11 +155,12 @@ class BaseSensorLogData:
         :param measurement: The actual value recorded by the sensor
         :param product: The product line or business unit
         :param status: The status of the sensor data
-        :param type: Type of sensor used for the measurement.
-        :param unit: The unit of the measurement (e.g., Hz, °C, Bar)
+        :param type: Type of sensor used for the measurement (defaults to the class SENSOR_TYPE).
+        :param unit: The unit of the measurement, e.g. Hz, °C, Bar (defaults to the class UNIT).
         :param metadata: Additional sensor-specific metadata (JSON field)
+        :param timestamp_ns: Epoch timestamp in nanoseconds (defaults to now); formatted only on serialization.
         """
-        self.timestamp = datetime.now(timezone.utc).astimezone().replace(tzinfo=None).isoformat()
+        self.timestamp_ns = time.time_ns() if timestamp_ns is None else timestamp_ns
         self.sensor_id = sensor_id
         self.channel = channel
         self.data_center = data_center
@@ -44,25 +168,33 @@ class BaseSensorLogData:
         self.measurement = measurement
         self.product = product
         self.status = status
-        self.type = type
-        self.unit = unit
+        self.type = self.SENSOR_TYPE if type is None else type
+        self.unit = self.UNIT if unit is None else unit
         self.metadata = metadata if metadata else {}
 
 
+    @property
+    def timestamp(self) -> str:
+        """
+        The record timestamp as a local-time ISO 8601 string.
+        """
+        return format_timestamp_ns(self.timestamp_ns)
+
+
     def to_dict(self):
         """
         Converts the log object to a dictionary, ensuring Enums are serialized as strings.
         """
         return {
-            "timestamp": self.timestamp,
+            "timestamp": format_timestamp_ns(self.timestamp_ns),
             "sensor_id": self.sensor_id,
-            "channel": self.channel.value,
-            "data_center": self.data_center.value,
+            "channel": self.channel._value_,
+            "data_center": self.data_center._value_,
             "duration": self.duration,
             "measurement": self.measurement,
-            "product": self.product.value,
-            "status": self.status.value,
-            "type": self.type.value,
-            "unit": self.unit.value,
+            "product": self.product._value_,
+            "status": self.status._value_,
+            "type": self.type._value_,
+            "unit": self.unit._value_,
             "metadata": self.metadata
         }
@@ -0,0 +1,157 @@
+from numbers import Real
+from typing import List, Optional, Sequence
+
+import json
+
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData, format_timestamp_ns
+
+
+_PER_SAMPLE_FIELDS = ("timestamp", "duration", "measurement")
+
+
+def column_to_list(values) -> list:
+    """
+    Converts a column of samples (NumPy array, array.array, memoryview or any sequence) to a list.
+
+    NumPy arrays, array.array and memoryview all expose tolist(), so no NumPy import is needed.
+    """
+    if hasattr(values, "tolist"):
+        return values.tolist()
+
+    try:
+        return memoryview(values).tolist()
+    except TypeError:
+        return list(values)
+
+
+def _json_column(values: list) -> List[str]:
+    """
+    Serializes every value of a column in a single json.dumps call.
+    """
+    if not values:
+        return []
+    return json.dumps(values)[1:-1].split(", ")
+
+
+def batch_columns(
+        template: BaseSensorLogData,
+        measurements,
+        timestamps: Optional[Sequence[float]] = None,
+        durations=0.0,
+    ) -> dict:
+    """
+    Normalizes the per-sample columns of a batch into equally long lists.
+
+    :param template: A record holding the fields shared by every sample.
+    :param measurements: Column of measurement values.
+    :param timestamps: Column of epoch timestamps in seconds; None stamps every sample with the template timestamp.
+    :param durations: Column of durations, or a single duration shared by every sample.
+    :return: The "timestamp_ns", "duration" and "measurement" columns.
+    """
+    measurements = column_to_list(measurements)
+    count = len(measurements)
+
+    if timestamps is None:
+        timestamp_column = [template.timestamp_ns] * count
+    else:
+        timestamps = column_to_list(timestamps)
+        if len(timestamps) != count:
+            raise ValueError(f"Expected {count} timestamps, got {len(timestamps)}")
+        timestamp_column = [round(ts * 1_000_000) * 1000 for ts in timestamps]
+
+    if isinstance(durations, Real):
+        # NumPy scalars (e.g. np.float32) are Real but not float, and not JSON serializable.
+        if not isinstance(durations, (int, float)):
+            durations = float(durations)
+        duration_column = [durations] * count
+    else:
+        durations = column_to_list(durations)
+        if len(durations) != count:
+            raise ValueError(f"Expected {count} durations, got {len(durations)}")
+        duration_column = durations
+
+    return {
+        "timestamp_ns": timestamp_column,
+        "duration": duration_column,
+        "measurement": measurements,
+    }
+
+
+def batch_objects(template: BaseSensorLogData, columns: dict) -> List[BaseSensorLogData]:
+    """
+    Expands batch columns into one log object per sample, all sharing the template's metadata.
+    """
+    log_cls = type(template)
+    return [
+        log_cls(
+            sensor_id=template.sensor_id,
+            channel=template.channel,
+            data_center=template.data_center,
+            duration=duration,
+            measurement=measurement,
+            product=template.product,
+            status=template.status,
+            type=template.type,
+            unit=template.unit,
+            metadata=template.metadata,
+            timestamp_ns=timestamp_ns,
+        )
+        for timestamp_ns, duration, measurement in zip(
+            columns["timestamp_ns"], columns["duration"], columns["measurement"]
+        )
+    ]
+
+
+def batch_records(template: BaseSensorLogData, columns: dict) -> List[dict]:
+    """
+    Expands batch columns into one record dict per sample, all sharing the template's metadata dict.
+    """
+    shared = template.to_dict()
+    records = []
+    for timestamp_ns, duration, measurement in zip(
+            columns["timestamp_ns"], columns["duration"], columns["measurement"]
+        ):
+        record = dict(shared)
+        record["timestamp"] = format_timestamp_ns(timestamp_ns)
+        record["duration"] = duration
+        record["measurement"] = measurement
+        records.append(record)
+    return records
+
+
+def format_batch(template: BaseSensorLogData, columns: dict) -> List[str]:
+    """
+    Serializes batch columns into the same JSON records the per-call API produces.
+
+    The shared part of the record (sensor id, enums, metadata) is serialized once from the
+    template; only the timestamp, duration and measurement columns are formatted per sample,
+    each with a single json.dumps call.
+
+    :param template: A record holding the fields shared by every sample.
+    :param columns: Columns as returned by batch_columns().
+    :return: One JSON string per sample.
+    """
+    json_columns = {
+        "timestamp": _json_column([format_timestamp_ns(ns) for ns in columns["timestamp_ns"]]),
+        "duration": _json_column(columns["duration"]),
+        "measurement": _json_column(columns["measurement"]),
+    }
+
+    # Serialize the shared fields once with markers in place of the per-sample values,
+    # then split the result into the constant fragments surrounding them.
+    record = template.to_dict()
+    for field in _PER_SAMPLE_FIELDS:
+        record[field] = f"\x00{field}"
+    order = [field for field in record if field in json_columns]
+    shared = json.dumps(record)
+
+    fragments = []
+    for field in order:
+        head, shared = shared.split(json.dumps(f"\x00{field}"), 1)
+        fragments.append(head)
+    fragments.append(shared)
+
+    a, b, c, d = fragments
+    first, second, third = (json_columns[field] for field in order)
+
+    return [f"{a}{x}{b}{y}{c}{z}{d}" for x, y, z in zip(first, second, third)]
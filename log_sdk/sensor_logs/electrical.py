@@ -6,14 +6,10 @@ from log_sdk.common.unit import UnitOfMeasurement
 class ElectricalLogData(BaseSensorLogData):
     """
     Logs electrical sensor data
+
+    Unit: Ampere (A) for Electrical measurement
     """
+    __slots__ = ()
 
-    def __init__(self, **kwargs):
-        """
-        Unit: Ampere (A) for Electrical measurement
-        """
-        super().__init__(
-            unit = UnitOfMeasurement.AMPERE, 
-            type = SensorType.ELECTRICAL,
-            **kwargs
-        )
+    SENSOR_TYPE = SensorType.ELECTRICAL
+    UNIT = UnitOfMeasurement.AMPERE
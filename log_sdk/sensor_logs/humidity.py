@@ -6,14 +6,10 @@ from log_sdk.common.unit import UnitOfMeasurement
 class HumidityLogData(BaseSensorLogData):
     """
     Logs humidity sensor data
+
+    Unit: Percent (%) for humidity measurement
     """
+    __slots__ = ()
 
-    def __init__(self, **kwargs):
-        """
-        Unit: Percent (%) for humidity measurement
-        """
-        super().__init__(
-            unit = UnitOfMeasurement.PERCENT, 
-            type = SensorType.HUMIDITY,
-            **kwargs
-        )
+    SENSOR_TYPE = SensorType.HUMIDITY
+    UNIT = UnitOfMeasurement.PERCENT
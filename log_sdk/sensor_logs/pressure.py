@@ -6,14 +6,10 @@ from log_sdk.common.unit import UnitOfMeasurement
 class PressureLogData(BaseSensorLogData):
     """
     Logs pressure sensor data
+
+    Unit: Bar for pressure measurement
     """
+    __slots__ = ()
 
-    def __init__(self, **kwargs):
-        """
-        Unit: Bar for pressure measurement
-        """
-        super().__init__(
-            unit = UnitOfMeasurement.BAR, 
-            type = SensorType.PRESSURE,
-            **kwargs
-        )
+    SENSOR_TYPE = SensorType.PRESSURE
+    UNIT = UnitOfMeasurement.BAR
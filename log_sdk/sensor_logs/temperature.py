@@ -6,14 +6,10 @@ from log_sdk.common.unit import UnitOfMeasurement
 class TemperatureLogData(BaseSensorLogData):
     """
     Logs temperature sensor data
+
+    Unit: Celsius (°C) for temperature measurement
     """
+    __slots__ = ()
 
-    def __init__(self, **kwargs):
-        """
-        Unit: Celsius (°C) for temperature measurement
-        """
-        super().__init__(
-            unit = UnitOfMeasurement.CELSIUS, 
-            type = SensorType.TEMPERATURE,
-            **kwargs
-        )
+    SENSOR_TYPE = SensorType.TEMPERATURE
+    UNIT = UnitOfMeasurement.CELSIUS
@@ -6,14 +6,10 @@ from log_sdk.common.unit import UnitOfMeasurement
 class VibrationLogData(BaseSensorLogData):
     """
     Logs vibration sensor data
+
+    Unit: Hertz (Hz) for vibration frequency measurement
     """
+    __slots__ = ()
 
-    def __init__(self, **kwargs):
-        """
-        Unit: Hertz (Hz) for vibration frequency measurement
-        """
-        super().__init__(
-            unit = UnitOfMeasurement.HERTZ, 
-            type = SensorType.VIBRATION,
-            **kwargs
-        )
+    SENSOR_TYPE = SensorType.VIBRATION
+    UNIT = UnitOfMeasurement.HERTZ
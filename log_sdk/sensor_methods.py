@@ -0,0 +1,307 @@
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Optional, Type
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.metrics.tracing import ACTIVE_TRACE, Trace
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+from log_sdk.sensor_logs.electrical import ElectricalLogData
+from log_sdk.sensor_logs.humidity import HumidityLogData
+from log_sdk.sensor_logs.pressure import PressureLogData
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+
+def synchronous(method):
+    """
+    Turns a SensorLogMethods coroutine into a plain method.
+
+    Only for classes whose _log and _log_batch never suspend (they just enqueue the record):
+    the coroutine then runs to completion on its first step, in the calling thread, without
+    an event loop.
+    """
+    @wraps(method)
+    def run(self, *args, **kwargs):
+        coroutine = method(self, *args, **kwargs)
+        try:
+            coroutine.send(None)
+        except StopIteration:
+            return
+        coroutine.close()
+        raise RuntimeError(f"{method.__name__} suspended outside the event loop")
+    return run
+
+
+class SensorLogMethods:
+    """
+    Per-sensor logging API shared by LoggerConfig and the sensor handles of a LoggerHub.
+
+    Subclasses provide the sensor_id, machine_status, status_timestamp and logger attributes
+    and the _log and _log_batch coroutines that hand records to the transport.
+    """
+    __slots__ = ()
+
+    # Tracer sampling log calls (see LoggerConfig trace_sample_rate); None disables tracing.
+    tracer = None
+
+    def _calculate_time_difference(self) -> float:
+        """
+        Calculates the time difference between now and the last status change.
+
+        :return: The difference in seconds.
+        """
+        if self.status_timestamp is None:
+            return 0.0 
+            
+        return (datetime.now(timezone.utc) - self.status_timestamp).total_seconds()
+    
+    
+    def _add_machine_metadata(self, metadata: Optional[dict]) -> dict:
+        """
+        Adds machine status, uptime, or downtime to metadata.
+
+        :param metadata: The existing metadata dictionary.
+        :return: The updated metadata dictionary.
+        """
+        if metadata is None:
+            metadata = {}
+
+        metadata["machine_status"] = self.machine_status.value if self.machine_status else "UNKNOWN"
+        time_difference = self._calculate_time_difference()
+
+        if self.machine_status == Action.START:
+            metadata["uptime"] = time_difference
+        elif self.machine_status in {Action.STOP, Action.MAINTENANCE, Action.CALIBRATION}:
+            metadata["downtime"] = time_difference
+
+        return metadata
+
+    async def _generic_sensor_log(
+            self,
+            log_cls: Type[BaseSensorLogData],
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None,
+        ):
+        """
+        A generic method to log sensor data, reducing redundancy across log methods.
+
+        :param log_cls: The log data class to instantiate (e.g., ElectricalLogData).
+        :param channel: The channel of the sensor.
+        :param data_center: The data center.
+        :param duration: Duration of the measurement.
+        :param measurement: The sensor measurement.
+        :param product: The product associated with the measurement.
+        :param status: The status of the sensor.
+        :param metadata: Optional additional metadata.
+        """
+        tracer = self.tracer
+        if tracer is not None and tracer.sampled():
+            trace = tracer.start(log_cls.__name__, sensor_id=self.sensor_id)
+            await self._traced_sensor_log(trace, log_cls, channel, data_center, duration, measurement, product, status, metadata)
+            return
+
+        metadata = self._add_machine_metadata(metadata)
+        log = log_cls(
+            sensor_id=self.sensor_id,
+            measurement=measurement,
+            channel=channel,
+            data_center=data_center,
+            duration=duration,
+            product=product,
+            status=status,
+            metadata=metadata,
+        )
+        await self._log(log)
+
+
+    async def _traced_sensor_log(
+            self,
+            trace: Trace,
+            log_cls: Type[BaseSensorLogData],
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float,
+            product: Product,
+            status: Status,
+            metadata: Optional[dict],
+        ):
+        """
+        _generic_sensor_log of a sampled call, timing every step into its trace.
+        """
+        metadata = self._add_machine_metadata(metadata)
+        trace.lap("machine_metadata")
+        log = log_cls(
+            sensor_id=self.sensor_id,
+            measurement=measurement,
+            channel=channel,
+            data_center=data_center,
+            duration=duration,
+            product=product,
+            status=status,
+            metadata=metadata,
+        )
+        trace.lap("construct")
+
+        token = ACTIVE_TRACE.set(trace)
+        try:
+            await self._log(log)
+        finally:
+            ACTIVE_TRACE.reset(token)
+            self.tracer.finish(trace)
+
+    async def log_electrical(
+            self, 
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None
+        ):
+        """
+        Logs electrical sensor data (unit: Ampere).
+        """
+        await self._generic_sensor_log(ElectricalLogData, channel, data_center, duration, measurement, product, status, metadata)
+
+    async def log_humidity(
+            self, 
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None
+        ):
+        """
+        Logs humidity sensor data (unit: Percent).
+        """
+        await self._generic_sensor_log(HumidityLogData, channel, data_center, duration, measurement, product, status, metadata)
+
+    async def log_pressure(
+            self, 
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None
+        ):
+        """
+        Logs pressure sensor data (unit: Bar).
+        """
+        await self._generic_sensor_log(PressureLogData, channel, data_center, duration, measurement, product, status, metadata)
+
+    async def log_temperature(
+            self, 
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None
+        ):
+        """
+        Logs temperature sensor data (unit: °C).
+        """
+        await self._generic_sensor_log(TemperatureLogData, channel, data_center, duration, measurement, product, status, metadata)
+
+    async def log_vibration(
+            self, 
+            channel: Channel,
+            data_center: DataCenter,
+            duration: float,
+            measurement: float, 
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None
+        ):
+        """
+        Logs vibration sensor data (unit: Hz).
+        """
+        await self._generic_sensor_log(VibrationLogData, channel, data_center, duration, measurement, product, status, metadata)
+
+
+    async def log_batch(
+            self,
+            log_cls: Type[BaseSensorLogData],
+            measurements,
+            timestamps=None,
+            durations=0.0,
+            *,
+            channel: Channel,
+            data_center: DataCenter,
+            product: Product,
+            status: Status,
+            metadata: Optional[dict] = None,
+        ):
+        """
+        Logs a whole array of samples from one sensor in a single call.
+
+        The enum fields and machine metadata are shared by every sample and serialized once;
+        each sample becomes the same record the matching log_* method would produce. In the
+        local file the batch is written as one compact JSON line per sample.
+
+        :param log_cls: The log data class of the samples (e.g., VibrationLogData).
+        :param measurements: NumPy array, array.array or any sequence of measurement values.
+        :param timestamps: Optional sequence of epoch timestamps in seconds, one per sample.
+            Without it every sample is stamped with the time of the call.
+        :param durations: A sequence of durations, one per sample, or a single shared duration.
+        :param channel: The channel of the sensor.
+        :param data_center: The data center.
+        :param product: The product associated with the measurements.
+        :param status: The status shared by every sample.
+        :param metadata: Optional additional metadata shared by every sample.
+        """
+        tracer = self.tracer
+        trace = None
+        if tracer is not None and tracer.sampled():
+            trace = tracer.start("log_batch", sensor_id=self.sensor_id, samples=len(measurements))
+
+        metadata = self._add_machine_metadata(metadata)
+        template = log_cls(
+            sensor_id=self.sensor_id,
+            measurement=0.0,
+            channel=channel,
+            data_center=data_center,
+            duration=0.0,
+            product=product,
+            status=status,
+            metadata=metadata,
+        )
+        if trace is None:
+            await self._log_batch(template, measurements, timestamps, durations)
+            return
+
+        trace.lap("construct")
+        token = ACTIVE_TRACE.set(trace)
+        try:
+            await self._log_batch(template, measurements, timestamps, durations)
+        finally:
+            ACTIVE_TRACE.reset(token)
+            tracer.finish(trace)
+
+        
+    def update_machine_status(self, action: Action):
+        """
+        Updates the machine status and records the timestamp.
+
+        :param action: The new machine status (e.g., Start, Stop, Maintenance, Calibration).
+        """
+        if self.machine_status != action:
+            self.machine_status = action
+            self.status_timestamp = datetime.now(timezone.utc)
+            self.logger.info(f"Machine status updated: {self.machine_status.value} at {self.status_timestamp}")
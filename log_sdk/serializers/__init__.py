@@ -0,0 +1,67 @@
+from importlib import import_module
+from typing import List, Union
+
+from log_sdk.serializers.base import Serializer
+
+
+# Serializers are imported only when selected, so optional dependencies stay optional.
+SERIALIZERS = {
+    "json": ("log_sdk.serializers.json_serializer", "JsonSerializer"),
+    "orjson": ("log_sdk.serializers.orjson_serializer", "OrjsonSerializer"),
+    "msgpack": ("log_sdk.serializers.msgpack_serializer", "MsgpackSerializer"),
+    "binary": ("log_sdk.serializers.binary", "BinarySerializer"),
+}
+
+_instances = {}
+
+
+def get_serializer(serializer: Union[str, Serializer] = "json") -> Serializer:
+    """
+    Returns the serializer registered under the given name, or the given instance unchanged.
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {serializer}")
+
+    if serializer not in _instances:
+        module, cls = SERIALIZERS[serializer]
+        _instances[serializer] = getattr(import_module(module), cls)()
+
+    return _instances[serializer]
+
+
+def detect_serializer(payload: bytes) -> Serializer:
+    """
+    Picks the serializer that produced a payload from its first bytes.
+
+    JSON payloads start with "{", binary records with their magic header and anything
+    else is treated as MessagePack.
+    """
+    from log_sdk.serializers.binary import MAGIC
+
+    if payload[:1] == b"{":
+        return get_serializer("json")
+    if payload[:len(MAGIC)] == MAGIC:
+        return get_serializer("binary")
+    return get_serializer("msgpack")
+
+
+def decode(payload: bytes) -> dict:
+    """
+    Decodes a payload written by any of the built-in serializers.
+    """
+    return detect_serializer(payload).loads(payload)
+
+
+def decode_records(payload: bytes) -> List[dict]:
+    """
+    Decodes a payload into its records: every record of a column block (see columnar.encode_block),
+    or the single record of any other payload.
+    """
+    from log_sdk.serializers.columnar import BLOCK_MAGIC, decode_block
+
+    if payload[:len(BLOCK_MAGIC)] == BLOCK_MAGIC:
+        return decode_block(payload)
+    return [decode(payload)]
@@ -0,0 +1,18 @@
+class Serializer:
+    """
+    Base class for wire serializers turning record dicts into Kafka message payloads and back.
+    """
+    name = None
+
+    def dumps(self, record: dict) -> bytes:
+        """
+        Encodes a record dict (as returned by BaseSensorLogData.to_dict) into a payload.
+        """
+        raise NotImplementedError
+
+
+    def loads(self, payload: bytes) -> dict:
+        """
+        Decodes a payload produced by dumps back into a record dict.
+        """
+        raise NotImplementedError
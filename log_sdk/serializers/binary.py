@@ -0,0 +1,194 @@
+import json
+import struct
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.common.unit import UnitOfMeasurement
+from log_sdk.sensor_logs.base_sensor import format_timestamp_offset, parse_timestamp_offset
+from log_sdk.serializers.base import Serializer
+
+
+MAGIC = b"LS"
+SCHEMA_VERSION = 1
+
+# Integer codes of the enum members on the wire: the position in these tuples.
+# Codes are part of the schema, so new members are only ever appended.
+ENUM_CODES = {
+    "channel": (Channel.SENSOR, Channel.SYSTEM, Channel.MANUAL_INPUT, Channel.ALERT),
+    "data_center": (
+        DataCenter.FACTORY_1,
+        DataCenter.FACTORY_2,
+        DataCenter.WAREHOUSE,
+        DataCenter.POWER_PLANT,
+        DataCenter.CHEMICAL_PLANT,
+        DataCenter.OIL_REFINERY,
+    ),
+    "product": (
+        Product.MACHINE_MONITORING,
+        Product.FACTORY_AUTOMATION,
+        Product.POWER_PLANT,
+        Product.OIL_AND_GAS,
+        Product.CHEMICAL_PROCESSING,
+        Product.HEAVY_EQUIPMENT,
+        Product.METAL_PRODUCTION,
+    ),
+    "status": (Status.NORMAL, Status.WARNING, Status.CRITICAL, Status.FAULT),
+    "type": (
+        SensorType.VIBRATION,
+        SensorType.TEMPERATURE,
+        SensorType.PRESSURE,
+        SensorType.HUMIDITY,
+        SensorType.FLOW,
+        SensorType.ELECTRICAL,
+        SensorType.CURRENT,
+        SensorType.GAS,
+        SensorType.SPEED,
+        SensorType.TORQUE,
+        SensorType.LIGHT,
+        SensorType.PH,
+    ),
+    "unit": (
+        UnitOfMeasurement.HERTZ,
+        UnitOfMeasurement.CELSIUS,
+        UnitOfMeasurement.FAHRENHEIT,
+        UnitOfMeasurement.BAR,
+        UnitOfMeasurement.PASCAL,
+        UnitOfMeasurement.LITERS_PER_SECOND,
+        UnitOfMeasurement.AMPERE,
+        UnitOfMeasurement.VOLTAGE,
+        UnitOfMeasurement.PERCENT,
+        UnitOfMeasurement.METERS_PER_SECOND,
+        UnitOfMeasurement.NEWTON_METER,
+        UnitOfMeasurement.LUX,
+        UnitOfMeasurement.PH_VALUE,
+    ),
+}
+ENUM_FIELDS = ("channel", "data_center", "product", "status", "type", "unit")
+
+# Machine status codes: 0 = no machine_status key, 1 = "UNKNOWN", then the Action members.
+MACHINE_STATUS_CODES = (None, "UNKNOWN") + tuple(action.value for action in (
+    Action.START,
+    Action.STOP,
+    Action.MAINTENANCE,
+    Action.CALIBRATION,
+))
+STATUS_TIME_FIELDS = (None, "uptime", "downtime")
+
+_ENCODE = {
+    field: {member.value: code for code, member in enumerate(members)}
+    for field, members in ENUM_CODES.items()
+}
+_DECODE = {
+    field: tuple(member.value for member in members)
+    for field, members in ENUM_CODES.items()
+}
+_MACHINE_STATUS_ENCODE = {value: code for code, value in enumerate(MACHINE_STATUS_CODES) if value}
+
+# magic, version, timestamp_ns, UTC offset, duration, measurement, six enum codes,
+# machine status code, status time field code, status time, sensor_id length
+_HEADER = struct.Struct("<2sBqidd6BBBdB")
+_EXTRA_LENGTH = struct.Struct("<H")
+
+class BinarySerializer(Serializer):
+    """
+    Compact fixed-layout binary record format.
+
+    Layout (little endian, schema version 1):
+
+        2s  magic b"LS"
+        B   schema version
+        q   timestamp, epoch nanoseconds
+        i   UTC offset in seconds of the local time the timestamp string was written in
+        d   duration
+        d   measurement
+        6B  channel, data_center, product, status, type and unit codes (see ENUM_CODES)
+        B   metadata machine_status code (see MACHINE_STATUS_CODES)
+        B   metadata uptime/downtime field code (see STATUS_TIME_FIELDS)
+        d   uptime/downtime value
+        B   sensor_id length, followed by the UTF-8 sensor_id
+        H   length of the remaining metadata as compact JSON, followed by the JSON (may be empty)
+
+    The offset makes the decoded timestamp string the producer's, whatever the time zone of the
+    consumer and also around DST changes.
+    """
+    name = "binary"
+
+    def dumps(self, record: dict) -> bytes:
+        metadata = dict(record.get("metadata") or {})
+
+        status_code = _MACHINE_STATUS_ENCODE.get(metadata.get("machine_status"), 0)
+        if status_code:
+            del metadata["machine_status"]
+
+        time_code, status_time = 0, 0.0
+        for code in (1, 2):
+            field = STATUS_TIME_FIELDS[code]
+            if field in metadata:
+                time_code, status_time = code, metadata.pop(field)
+                break
+
+        sensor_id = record["sensor_id"].encode('utf-8')
+        if len(sensor_id) > 255:
+            raise ValueError("The binary format supports sensor ids of at most 255 bytes")
+        extra = json.dumps(metadata, separators=(',', ':')).encode('utf-8') if metadata else b""
+
+        return b"".join((
+            _HEADER.pack(
+                MAGIC,
+                SCHEMA_VERSION,
+                *parse_timestamp_offset(record["timestamp"]),
+                record["duration"],
+                record["measurement"],
+                *(_ENCODE[field][record[field]] for field in ENUM_FIELDS),
+                status_code,
+                time_code,
+                status_time,
+                len(sensor_id),
+            ),
+            sensor_id,
+            _EXTRA_LENGTH.pack(len(extra)),
+            extra,
+        ))
+
+
+    def loads(self, payload: bytes) -> dict:
+        (
+            magic, version, timestamp_ns, utc_offset, duration, measurement,
+            channel, data_center, product, status, type_, unit,
+            status_code, time_code, status_time, id_length,
+        ) = _HEADER.unpack_from(payload)
+
+        if magic != MAGIC:
+            raise ValueError("Not a binary sensor record")
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported binary schema version: {version}")
+
+        offset = _HEADER.size
+        sensor_id = payload[offset:offset + id_length].decode('utf-8')
+        offset += id_length
+        (extra_length,) = _EXTRA_LENGTH.unpack_from(payload, offset)
+        offset += _EXTRA_LENGTH.size
+
+        metadata = json.loads(payload[offset:offset + extra_length]) if extra_length else {}
+        if status_code:
+            metadata["machine_status"] = MACHINE_STATUS_CODES[status_code]
+        if time_code:
+            metadata[STATUS_TIME_FIELDS[time_code]] = status_time
+
+        return {
+            "timestamp": format_timestamp_offset(timestamp_ns, utc_offset),
+            "sensor_id": sensor_id,
+            "channel": _DECODE["channel"][channel],
+            "data_center": _DECODE["data_center"][data_center],
+            "duration": duration,
+            "measurement": measurement,
+            "product": _DECODE["product"][product],
+            "status": _DECODE["status"][status],
+            "type": _DECODE["type"][type_],
+            "unit": _DECODE["unit"][unit],
+            "metadata": metadata,
+        }
@@ -0,0 +1,467 @@
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import json
+import struct
+
+from log_sdk.sensor_logs.base_sensor import (
+    format_timestamp_offset,
+    local_offset,
+    parse_timestamp_offset,
+)
+from log_sdk.serializers.binary import ENUM_CODES, ENUM_FIELDS
+
+
+BLOCK_MAGIC = b"LC"
+BLOCK_VERSION = 1
+
+# magic, version, record count, six enum codes (see the binary serializer), sensor_id length,
+# metadata length, UTC offset in seconds of the first record, then the first timestamp
+# (epoch microseconds), duration and measurement
+_BLOCK_HEADER = struct.Struct("<2sBI6BBHiqdd")
+_COLUMNS = 5
+_COLUMN_LENGTH = struct.Struct("<I")
+# Index of the first record with a new UTC offset (a DST change inside the block) and the offset.
+_OFFSET_CHANGE = struct.Struct("<Ii")
+
+_ENCODE = {
+    field: {member.value: code for code, member in enumerate(members)}
+    for field, members in ENUM_CODES.items()
+}
+_DECODE = {
+    field: tuple(member.value for member in members)
+    for field, members in ENUM_CODES.items()
+}
+
+_SHARED_FIELDS = ("sensor_id",) + ENUM_FIELDS + ("metadata",)
+_MASK64 = (1 << 64) - 1
+
+
+class _BitWriter:
+    """
+    Appends big-endian bit fields to a byte buffer, moving whole bytes out of the accumulator.
+    """
+    __slots__ = ("buffer", "acc", "bits")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.acc = 0
+        self.bits = 0
+
+
+    def write(self, value: int, width: int):
+        acc = (self.acc << width) | value
+        bits = self.bits + width
+        if bits >= 64:
+            spare = bits & 7
+            self.buffer += (acc >> spare).to_bytes((bits - spare) >> 3, "big")
+            acc &= (1 << spare) - 1
+            bits = spare
+        self.acc = acc
+        self.bits = bits
+
+
+    def getvalue(self) -> bytes:
+        pad = -self.bits & 7
+        return bytes(self.buffer) + (self.acc << pad).to_bytes((self.bits + pad) >> 3, "big")
+
+
+class _BitReader:
+    """
+    Reads big-endian bit fields; reads past the end return zero bits.
+    """
+    __slots__ = ("data", "position")
+
+    def __init__(self, data: bytes):
+        self.data = bytes(data) + bytes(9)
+        self.position = 0
+
+
+    def peek(self, width: int) -> int:
+        position = self.position
+        start = position >> 3
+        end = (position + width + 7) >> 3
+        return (int.from_bytes(self.data[start:end], "big") >> ((end << 3) - position - width)) & ((1 << width) - 1)
+
+
+    def read(self, width: int) -> int:
+        value = self.peek(width)
+        self.position += width
+        return value
+
+
+def _encode_timestamps(timestamps_us: Sequence[int]) -> bytes:
+    """
+    Delta-of-delta encodes the timestamps after the first one.
+
+    A regular series costs one bit per timestamp; jitter costs 10, 15 or 24 bits up to
+    +-128 us, +-2 ms and +-0.5 s, anything else 68 bits.
+    """
+    writer = _BitWriter()
+    write = writer.write
+    previous = timestamps_us[0]
+    previous_delta = 0
+    for timestamp in timestamps_us[1:]:
+        delta = timestamp - previous
+        dod = delta - previous_delta
+        previous, previous_delta = timestamp, delta
+        if dod == 0:
+            write(0, 1)
+        elif -127 <= dod <= 128:
+            write((0b10 << 8) | (dod + 127), 10)
+        elif -2047 <= dod <= 2048:
+            write((0b110 << 12) | (dod + 2047), 15)
+        elif -524287 <= dod <= 524288:
+            write((0b1110 << 20) | (dod + 524287), 24)
+        else:
+            write(0b1111, 4)
+            write(dod & _MASK64, 64)
+    return writer.getvalue()
+
+
+def _decode_timestamps(data: bytes, first: int, count: int) -> List[int]:
+    reader = _BitReader(data)
+    peek, read = reader.peek, reader.read
+    timestamps = [first]
+    previous = first
+    delta = 0
+    for _ in range(count - 1):
+        prefix = peek(4)
+        if prefix < 0b1000:
+            reader.position += 1
+        elif prefix < 0b1100:
+            reader.position += 2
+            delta += read(8) - 127
+        elif prefix < 0b1110:
+            reader.position += 3
+            delta += read(12) - 2047
+        elif prefix == 0b1110:
+            reader.position += 4
+            delta += read(20) - 524287
+        else:
+            reader.position += 4
+            dod = read(64)
+            delta += dod - (1 << 64) if dod >> 63 else dod
+        previous += delta
+        timestamps.append(previous)
+    return timestamps
+
+
+def _encode_nanoseconds(nanoseconds: Sequence[int]) -> bytes:
+    """
+    Packs the sub-microsecond part (0-999) of every timestamp into 10 bits, or nothing if it is all zero.
+    """
+    if not any(nanoseconds):
+        return b""
+    writer = _BitWriter()
+    for value in nanoseconds:
+        writer.write(value, 10)
+    return writer.getvalue()
+
+
+def _decode_nanoseconds(data: bytes, count: int) -> List[int]:
+    read = _BitReader(data).read
+    return [read(10) for _ in range(count)]
+
+
+def _float_words(values: Sequence[float]) -> array:
+    words = array("Q")
+    words.frombytes(array("d", values).tobytes())
+    return words
+
+
+def _encode_floats(values: Sequence[float]) -> bytes:
+    """
+    XOR encodes the values after the first one against their predecessor (Gorilla).
+
+    A repeated value costs one bit. Otherwise the meaningful bits of the XOR are written,
+    reusing the previous leading/trailing zero window when they fit in it.
+    """
+    words = _float_words(values)
+    writer = _BitWriter()
+    write = writer.write
+    previous = words[0]
+    leading, trailing = 64, 0
+    for word in words[1:]:
+        xor = word ^ previous
+        previous = word
+        if not xor:
+            write(0, 1)
+            continue
+
+        new_leading = min(64 - xor.bit_length(), 31)
+        new_trailing = (xor & -xor).bit_length() - 1
+        if new_leading >= leading and new_trailing >= trailing:
+            width = 64 - leading - trailing
+            write((0b10 << width) | (xor >> trailing), width + 2)
+        else:
+            leading, trailing = new_leading, new_trailing
+            width = 64 - leading - trailing
+            write((0b11 << 11) | (leading << 6) | (width - 1), 13)
+            write(xor >> trailing, width)
+    return writer.getvalue()
+
+
+def _decode_floats(data: bytes, first: float, count: int) -> List[float]:
+    reader = _BitReader(data)
+    peek, read = reader.peek, reader.read
+    words = array("Q", [_float_words([first])[0]])
+    word = words[0]
+    leading = trailing = 0
+    for _ in range(count - 1):
+        prefix = peek(2)
+        if prefix < 0b10:
+            reader.position += 1
+        elif prefix == 0b10:
+            reader.position += 2
+            word ^= read(64 - leading - trailing) << trailing
+        else:
+            reader.position += 2
+            header = read(11)
+            leading = header >> 6
+            width = (header & 0x3F) + 1
+            trailing = 64 - leading - width
+            word ^= read(width) << trailing
+        words.append(word)
+    return array("d", words.tobytes()).tolist()
+
+
+def _local_offsets(timestamps_ns: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Returns the (index, UTC offset) of the first record and of every record whose local time has
+    another UTC offset than the record before it.
+    """
+    first = local_offset(timestamps_ns[0])
+    # UTC offsets never change twice within a day, so equal offsets at both ends mean none in between.
+    if timestamps_ns[-1] - timestamps_ns[0] < 86400 * 1_000_000_000 and local_offset(timestamps_ns[-1]) == first:
+        return [(0, first)]
+
+    changes = [(0, first)]
+    offset, second = first, timestamps_ns[0] // 1_000_000_000
+    for index, timestamp in enumerate(timestamps_ns):
+        if timestamp // 1_000_000_000 != second:
+            second = timestamp // 1_000_000_000
+            new = local_offset(timestamp)
+            if new != offset:
+                offset = new
+                changes.append((index, offset))
+    return changes
+
+
+def encode_block(
+        shared: dict,
+        timestamps_ns: Sequence[int],
+        durations: Sequence[float],
+        measurements: Sequence[float],
+        utc_offsets: Optional[Sequence[Tuple[int, int]]] = None,
+    ) -> bytes:
+    """
+    Encodes records of one sensor sharing their enum fields and metadata into one column block.
+
+    Layout (little endian, version 1): the header (see _BLOCK_HEADER) with the shared fields
+    and the first sample, the UTF-8 sensor_id and compact JSON metadata, then five columns,
+    each prefixed with its length (I): timestamps in microseconds, durations, measurements,
+    the sub-microsecond part of the timestamps (empty if it is zero for every record) and
+    the UTC offset changes after the first record (see _OFFSET_CHANGE, usually empty).
+
+    Timestamps are epoch nanoseconds, and decoded timestamp strings are the local time of the
+    producer at the recorded UTC offsets, whatever the time zone of the consumer.
+
+    :param shared: Record dict (as returned by BaseSensorLogData.to_dict) holding the shared fields.
+    :param timestamps_ns: Column of epoch timestamps in nanoseconds.
+    :param durations: Column of durations.
+    :param measurements: Column of measurements.
+    :param utc_offsets: (index, UTC offset in seconds) of the first record and of every record
+        whose local time has another offset than the one before; by default this machine's.
+    """
+    count = len(timestamps_ns)
+    if not count:
+        raise ValueError("A column block needs at least one record")
+    if len(durations) != count or len(measurements) != count:
+        raise ValueError("The columns of a block must have the same length")
+
+    sensor_id = shared["sensor_id"].encode("utf-8")
+    if len(sensor_id) > 255:
+        raise ValueError("Column blocks support sensor ids of at most 255 bytes")
+    metadata = json.dumps(shared["metadata"], separators=(",", ":")).encode("utf-8") if shared.get("metadata") else b""
+
+    offsets = list(utc_offsets) if utc_offsets is not None else _local_offsets(timestamps_ns)
+    if not offsets or offsets[0][0] != 0:
+        raise ValueError("utc_offsets must start with the offset of the first record")
+    timestamps_us = [timestamp // 1000 for timestamp in timestamps_ns]
+    nanoseconds = [timestamp % 1000 for timestamp in timestamps_ns]
+    columns = (
+        _encode_timestamps(timestamps_us),
+        _encode_floats(durations),
+        _encode_floats(measurements),
+        _encode_nanoseconds(nanoseconds),
+        b"".join(_OFFSET_CHANGE.pack(index, offset) for index, offset in offsets[1:]),
+    )
+    parts = [
+        _BLOCK_HEADER.pack(
+            BLOCK_MAGIC,
+            BLOCK_VERSION,
+            count,
+            *(_ENCODE[field][shared[field]] for field in ENUM_FIELDS),
+            len(sensor_id),
+            len(metadata),
+            offsets[0][1],
+            timestamps_us[0],
+            durations[0],
+            measurements[0],
+        ),
+        sensor_id,
+        metadata,
+    ]
+    for column in columns:
+        parts.append(_COLUMN_LENGTH.pack(len(column)))
+        parts.append(column)
+    return b"".join(parts)
+
+
+def encode_records(records: Iterable[dict]) -> List[bytes]:
+    """
+    Encodes record dicts into column blocks, one per run of consecutive records sharing
+    their sensor, enum fields and metadata.
+    """
+    blocks = []
+    shared = None
+    columns = ([], [], [], [])
+    for record in records:
+        if shared is None or any(record[field] != shared[field] for field in _SHARED_FIELDS):
+            if shared is not None:
+                blocks.append(encode_block(shared, *columns))
+            shared = record
+            columns = ([], [], [], [])
+        timestamp_ns, offset = parse_timestamp_offset(record["timestamp"])
+        offsets = columns[3]
+        if not offsets or offsets[-1][1] != offset:
+            offsets.append((len(columns[0]), offset))
+        columns[0].append(timestamp_ns)
+        columns[1].append(record["duration"])
+        columns[2].append(record["measurement"])
+    if shared is not None:
+        blocks.append(encode_block(shared, *columns))
+    return blocks
+
+
+def is_block(payload: bytes) -> bool:
+    return payload[:len(BLOCK_MAGIC)] == BLOCK_MAGIC
+
+
+def _block_columns(header: tuple, sensor_id: bytes, metadata: bytes, columns: Sequence[bytes]) -> dict:
+    (
+        magic, version, count,
+        channel, data_center, product, status, type_, unit,
+        _, _, utc_offset, first_timestamp, first_duration, first_measurement,
+    ) = header
+    if magic != BLOCK_MAGIC:
+        raise ValueError("Not a sensor record column block")
+    if version != BLOCK_VERSION:
+        raise ValueError(f"Unsupported column block version: {version}")
+
+    timestamps_ns = [timestamp * 1000 for timestamp in _decode_timestamps(columns[0], first_timestamp, count)]
+    if columns[3]:
+        nanoseconds = _decode_nanoseconds(columns[3], count)
+        timestamps_ns = [timestamp + extra for timestamp, extra in zip(timestamps_ns, nanoseconds)]
+
+    return {
+        "sensor_id": sensor_id.decode("utf-8"),
+        "channel": _DECODE["channel"][channel],
+        "data_center": _DECODE["data_center"][data_center],
+        "product": _DECODE["product"][product],
+        "status": _DECODE["status"][status],
+        "type": _DECODE["type"][type_],
+        "unit": _DECODE["unit"][unit],
+        "metadata": json.loads(metadata) if metadata else {},
+        "timestamp_ns": timestamps_ns,
+        "utc_offsets": [(0, utc_offset)] + list(_OFFSET_CHANGE.iter_unpack(columns[4])),
+        "duration": _decode_floats(columns[1], first_duration, count),
+        "measurement": _decode_floats(columns[2], first_measurement, count),
+    }
+
+
+def _block_records(block: dict) -> Iterator[dict]:
+    changes = dict(block["utc_offsets"])
+    offset = None
+    metadata = block["metadata"]
+    for index, (timestamp_ns, duration, measurement) in enumerate(zip(block["timestamp_ns"], block["duration"], block["measurement"])):
+        offset = changes.get(index, offset)
+        yield {
+            "timestamp": format_timestamp_offset(timestamp_ns, offset),
+            "sensor_id": block["sensor_id"],
+            "channel": block["channel"],
+            "data_center": block["data_center"],
+            "duration": duration,
+            "measurement": measurement,
+            "product": block["product"],
+            "status": block["status"],
+            "type": block["type"],
+            "unit": block["unit"],
+            "metadata": dict(metadata),
+        }
+
+
+def decode_block_columns(payload: bytes) -> dict:
+    """
+    Decodes a column block into its shared fields and its columns without building record dicts:
+    "timestamp_ns" (epoch nanoseconds as encoded), "duration", "measurement" and "utc_offsets"
+    ((index, UTC offset in seconds) pairs, see encode_block).
+    """
+    header = _BLOCK_HEADER.unpack_from(payload)
+    offset = _BLOCK_HEADER.size
+    id_length, metadata_length = header[9], header[10]
+    sensor_id = payload[offset:offset + id_length]
+    offset += id_length
+    metadata = payload[offset:offset + metadata_length]
+    offset += metadata_length
+
+    columns = []
+    for _ in range(_COLUMNS):
+        (length,) = _COLUMN_LENGTH.unpack_from(payload, offset)
+        offset += _COLUMN_LENGTH.size
+        columns.append(payload[offset:offset + length])
+        offset += length
+    return _block_columns(header, sensor_id, metadata, columns)
+
+
+def iter_block(payload: bytes) -> Iterator[dict]:
+    """
+    Yields the record dicts of one column block, in the order they were encoded.
+    """
+    return _block_records(decode_block_columns(payload))
+
+
+def decode_block(payload: bytes) -> List[dict]:
+    """
+    Decodes a column block into its record dicts.
+    """
+    return list(iter_block(payload))
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated column block")
+    return data
+
+
+def iter_blocks(stream: BinaryIO) -> Iterator[dict]:
+    """
+    Streams the records of column blocks written back to back to a binary file or stream,
+    reading one block at a time.
+    """
+    while True:
+        data = stream.read(_BLOCK_HEADER.size)
+        if not data:
+            return
+        if len(data) != _BLOCK_HEADER.size:
+            raise ValueError("Truncated column block")
+        header = _BLOCK_HEADER.unpack(data)
+        sensor_id = _read_exactly(stream, header[9])
+        metadata = _read_exactly(stream, header[10])
+        columns = []
+        for _ in range(_COLUMNS):
+            (length,) = _COLUMN_LENGTH.unpack(_read_exactly(stream, _COLUMN_LENGTH.size))
+            columns.append(_read_exactly(stream, length))
+        yield from _block_records(_block_columns(header, sensor_id, metadata, columns))
@@ -0,0 +1,17 @@
+import json
+
+from log_sdk.serializers.base import Serializer
+
+
+class JsonSerializer(Serializer):
+    """
+    Standard library JSON, the default wire format.
+    """
+    name = "json"
+
+    def dumps(self, record: dict) -> bytes:
+        return json.dumps(record).encode('utf-8')
+
+
+    def loads(self, payload: bytes) -> dict:
+        return json.loads(payload)
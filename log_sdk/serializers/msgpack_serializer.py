@@ -0,0 +1,25 @@
+from log_sdk.serializers.base import Serializer
+
+
+class MsgpackSerializer(Serializer):
+    """
+    MessagePack encoding of the record dict.
+    """
+    name = "msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("The msgpack serializer requires the msgpack package: pip install msgpack") from e
+
+        self._packer = msgpack.Packer(use_bin_type=True)
+        self._unpackb = msgpack.unpackb
+
+
+    def dumps(self, record: dict) -> bytes:
+        return self._packer.pack(record)
+
+
+    def loads(self, payload: bytes) -> dict:
+        return self._unpackb(payload, raw=False)
@@ -0,0 +1,27 @@
+from log_sdk.serializers.base import Serializer
+
+
+class OrjsonSerializer(Serializer):
+    """
+    JSON encoded with orjson; compact output that any JSON decoder can read.
+
+    Note that orjson writes NaN and infinite measurements as null.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError("The orjson serializer requires the orjson package: pip install orjson") from e
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+
+    def dumps(self, record: dict) -> bytes:
+        return self._dumps(record)
+
+
+    def loads(self, payload: bytes) -> dict:
+        return self._loads(payload)
@@ -0,0 +1,223 @@
+from typing import Callable, Iterable, List, Optional
+
+import glob
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+import time
+
+
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+_STOP = object()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the zstandard package: pip install zstandard") from e
+    return zstandard
+
+
+def compression_of(path: str) -> Optional[str]:
+    """
+    Returns the codec a file was compressed with, judging by its suffix (None if uncompressed).
+    """
+    for codec, suffix in COMPRESSED_SUFFIXES.items():
+        if path.endswith(suffix):
+            return codec
+    return None
+
+
+def open_segment(path: str) -> io.BufferedIOBase:
+    """
+    Opens a plain, gzip or zstd file for binary reading, decompressing transparently.
+
+    Compressed streams only support reading forward.
+    """
+    codec = compression_of(path)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "zstd":
+        raw = open(path, "rb")
+        return io.BufferedReader(_zstandard().ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, "rb")
+
+
+def compress_file(path: str, codec: str = "gzip", level: Optional[int] = None) -> str:
+    """
+    Compresses a file next to itself and removes the original.
+
+    The compressed file is written under a temporary name and renamed once complete, so
+    readers never see a partial file.
+
+    :return: The path of the compressed file.
+    """
+    target = path + COMPRESSED_SUFFIXES[codec]
+    partial = target + ".tmp"
+
+    with open(path, "rb") as source, open(partial, "wb") as raw:
+        if codec == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6 if level is None else level) as out:
+                shutil.copyfileobj(source, out, 1024 * 1024)
+        else:
+            compressor = _zstandard().ZstdCompressor(level=3 if level is None else level)
+            with compressor.stream_writer(raw, closefd=False) as out:
+                shutil.copyfileobj(source, out, 1024 * 1024)
+
+    os.replace(partial, target)
+    os.remove(path)
+    return target
+
+
+class SegmentCompressor:
+    """
+    Background thread compressing finished log segments and enforcing retention.
+
+    Segments are handed over with submit() after they have been closed; logging never waits
+    for compression. After every compressed segment the retention policy deletes the oldest
+    finished segments matching the retention patterns beyond max_bytes, max_age_seconds or
+    max_files.
+    """
+    def __init__(
+            self,
+            codec: Optional[str] = "gzip",
+            level: Optional[int] = None,
+            patterns: Iterable[str] = (),
+            max_bytes: Optional[int] = None,
+            max_age_seconds: Optional[float] = None,
+            max_files: Optional[int] = None,
+            related: Optional[Callable[[str], List[str]]] = None,
+            exclude: Optional[Callable[[str], bool]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+        ):
+        """
+        :param codec: "gzip", "zstd" or None to only apply retention.
+        :param level: Compression level (codec default if None).
+        :param patterns: Glob patterns of the finished segments subject to retention.
+        :param max_bytes: Maximum total size of the finished segments on disk.
+        :param max_age_seconds: Finished segments last modified longer ago than this are deleted.
+        :param max_files: Maximum number of finished segments.
+        :param related: Optional callable returning files to delete together with a segment (e.g. its index).
+        :param exclude: Optional predicate protecting matching files from retention (e.g. the segment being written).
+        :param on_error: Optional callback receiving compression and deletion errors.
+        """
+        if codec is not None and codec not in COMPRESSED_SUFFIXES:
+            raise ValueError(f"Unknown compression: {codec}")
+        if codec == "zstd":
+            _zstandard()
+
+        self.codec = codec
+        self.level = level
+        self.patterns = list(patterns)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.max_files = max_files
+        self.related = related
+        self.exclude = exclude
+        self.on_error = on_error
+        self.compressed = 0
+        self.deleted = 0
+
+        # Submitted segments not compressed yet; retention leaves them alone until they are.
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="segment-compressor", daemon=True)
+        self._thread.start()
+
+        # Apply retention to what earlier runs left behind without waiting for the first rotation.
+        self._queue.put(None)
+
+
+    def submit(self, path: str):
+        """
+        Queues a closed segment for compression.
+        """
+        self._pending.add(path)
+        self._queue.put(path)
+
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                if path is _STOP:
+                    return
+                try:
+                    if path is not None and self.codec is not None and os.path.exists(path):
+                        compress_file(path, self.codec, self.level)
+                        self.compressed += 1
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
+                self._pending.discard(path)
+
+                try:
+                    self.apply_retention()
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
+            finally:
+                self._queue.task_done()
+
+
+    def finished_segments(self) -> List[str]:
+        """
+        Returns the finished segments matching the retention patterns, oldest first.
+        """
+        paths = {
+            path
+            for pattern in self.patterns
+            for path in glob.glob(pattern)
+            if not path.endswith(".tmp")
+            and path not in self._pending
+            and not (self.exclude is not None and self.exclude(path))
+        }
+        return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+
+
+    def apply_retention(self):
+        """
+        Deletes the oldest finished segments until the retention limits hold.
+        """
+        if self.max_bytes is None and self.max_age_seconds is None and self.max_files is None:
+            return
+
+        segments = [(path, os.path.getsize(path), os.path.getmtime(path)) for path in self.finished_segments()]
+        total = sum(size for _, size, _ in segments)
+        count = len(segments)
+        now = time.time()
+
+        for path, size, modified in segments:
+            if not (
+                    (self.max_bytes is not None and total > self.max_bytes)
+                    or (self.max_files is not None and count > self.max_files)
+                    or (self.max_age_seconds is not None and now - modified > self.max_age_seconds)):
+                break
+            for victim in [path] + (self.related(path) if self.related is not None else []):
+                try:
+                    os.remove(victim)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            count -= 1
+            self.deleted += 1
+
+
+    def flush(self):
+        """
+        Blocks until every submitted segment has been compressed.
+        """
+        self._queue.join()
+
+
+    def close(self):
+        """
+        Compresses the remaining submitted segments and stops the thread.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,232 @@
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import json
+import logging
+import os
+import queue
+import time
+
+
+class RecordFormatter(logging.Formatter):
+    """
+    Formats sensor records as JSON, either pretty-printed or as one compact NDJSON line.
+    """
+    def __init__(self, pretty: bool = True):
+        """
+        :param pretty: Boolean flag selecting indented JSON instead of compact one-line JSON.
+        """
+        super().__init__('%(message)s')
+        self.pretty = pretty
+
+
+    def format(self, record):
+        """
+        Serializes dict messages as JSON and falls back to plain text for everything else.
+        """
+        if isinstance(record.msg, dict):
+            if self.pretty:
+                return json.dumps(record.msg, indent=4)
+            return json.dumps(record.msg, separators=(',', ':'))
+
+        return super().format(record)
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Size-rotating file handler that writes in buffered chunks instead of flushing every record.
+    """
+    def __init__(
+            self,
+            filename: str,
+            maxBytes: int = 0,
+            backupCount: int = 0,
+            buffer_size: int = 64 * 1024,
+            flush_interval: float = 1.0,
+            fsync: bool = False,
+        ):
+        """
+        :param filename: Path of the active log file.
+        :param maxBytes: Size in bytes after which the file is rotated (0 disables rotation).
+        :param backupCount: Number of rotated files to keep.
+        :param buffer_size: Number of buffered bytes that triggers a flush.
+        :param flush_interval: Maximum time in seconds a written record may stay buffered.
+        :param fsync: Boolean flag forcing an os.fsync after every flush.
+        """
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8')
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._size = self.stream.tell()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+    def emit(self, record):
+        """
+        Formats the record once, rotates if needed and appends it to the write buffer.
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes, buffer_size and the stream position count UTF-8 bytes, not characters.
+            size = len(msg) if msg.isascii() else len(msg.encode('utf-8'))
+
+            if self.maxBytes > 0 and self._size and self._size + size >= self.maxBytes:
+                self.doRollover()
+                self._size = 0
+                self._pending = 0
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            self.stream.write(msg)
+            self._size += size
+            self._pending += size
+
+            if self._pending >= self.buffer_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+    def flush(self):
+        """
+        Flushes buffered records to the OS and, if configured, to disk.
+        """
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+                if self.fsync:
+                    os.fsync(self.stream.fileno())
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+
+class CompressingRotatingFileHandler(BufferedRotatingFileHandler):
+    """
+    Buffered rotating handler that hands finished files to a SegmentCompressor.
+
+    Instead of shifting numbered backups, a full file is renamed with a UTC timestamp suffix
+    (e.g. sensor_logs_2025-03-01.log.20250301T130501123456Z) and queued for compression; how
+    many finished files are kept is decided by the compressor's retention policy.
+    """
+    def __init__(self, filename: str, compressor, maxBytes: int = 0, **kwargs):
+        """
+        :param filename: Path of the active log file.
+        :param compressor: SegmentCompressor receiving every finished file.
+        :param maxBytes: Size in bytes after which the file is rotated (0 disables rotation).
+        :param kwargs: Any other BufferedRotatingFileHandler option (buffer_size, flush_interval, fsync).
+        """
+        super().__init__(filename, maxBytes=maxBytes, **kwargs)
+        self.compressor = compressor
+
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename):
+            finished = f"{self.baseFilename}.{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}"
+            os.rename(self.baseFilename, finished)
+            self.compressor.submit(finished)
+
+        if not self.delay:
+            self.stream = self._open()
+
+
+class RecordQueueHandler(QueueHandler):
+    """
+    Queue handler that hands records to the writer thread without formatting them first.
+
+    Logging runs on the event loop, so it never waits for the writer thread: when a bounded
+    queue is full because the disk falls behind, a record is dropped and counted in dropped.
+    """
+    def __init__(self, queue_, overload_policy: str = "drop_newest"):
+        """
+        :param queue_: Queue drained by a FileWriterListener.
+        :param overload_policy: Record dropped when the queue is full: "drop_newest" (the one being
+            logged) or "drop_oldest" (the oldest queued one).
+        """
+        if overload_policy not in ("drop_newest", "drop_oldest"):
+            raise ValueError(f"Unknown overload policy for the file queue: {overload_policy}")
+        super().__init__(queue_)
+        self.overload_policy = overload_policy
+        self.dropped = 0
+
+
+    def prepare(self, record):
+        # The writer thread formats the record later; a metadata dict the caller passed in
+        # may be changed again by then.
+        message = record.msg
+        if isinstance(message, dict) and message.get("metadata"):
+            record.msg = {**message, "metadata": dict(message["metadata"])}
+        return record
+
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.overload_policy == "drop_newest":
+                self.dropped += 1
+                return
+
+        try:
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            self.queue.put_nowait(record)
+        except (queue.Empty, queue.Full):
+            self.dropped += 1
+
+
+class FileWriterListener(QueueListener):
+    """
+    Writer thread draining queued records into file handlers, flushing them while idle.
+    """
+    def __init__(self, queue_, *handlers, flush_interval: float = 1.0):
+        """
+        :param queue_: Queue filled by a RecordQueueHandler.
+        :param handlers: Handlers that write the records.
+        :param flush_interval: Idle time in seconds after which the handlers are flushed.
+        """
+        super().__init__(queue_, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+
+    def dequeue(self, block):
+        """
+        Waits for the next record, flushing the handlers whenever the queue stays idle.
+        """
+        if not block:
+            return self.queue.get(False)
+
+        while True:
+            try:
+                return self.queue.get(True, self.flush_interval)
+            except queue.Empty:
+                self.flush_handlers()
+
+
+    def enqueue_sentinel(self):
+        # Called from the closing thread, which may wait for room in a bounded queue.
+        self.queue.put(self._sentinel)
+
+
+    def flush_handlers(self):
+        for handler in self.handlers:
+            handler.flush()
+
+
+    def flush(self):
+        """
+        Blocks until every queued record has been written, then flushes the handlers.
+        """
+        self.queue.join()
+        self.flush_handlers()
@@ -0,0 +1,492 @@
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import json
+import logging
+import os
+import threading
+import time
+
+from log_sdk.sensor_logs.base_sensor import format_timestamp_ns, parse_timestamp_ns
+from log_sdk.storage.compression import COMPRESSED_SUFFIXES, compression_of, open_segment
+
+
+SEGMENT_SUFFIX = ".ndjson"
+INDEX_SUFFIX = ".idx"
+
+_NS = 1_000_000_000
+
+# Every file a segment may leave behind, compressed or not.
+_SEGMENT_FILE_SUFFIXES = [INDEX_SUFFIX, SEGMENT_SUFFIX] + [SEGMENT_SUFFIX + suffix for suffix in COMPRESSED_SUFFIXES.values()]
+
+TimeBound = Union[None, int, float, str, datetime]
+
+
+def to_timestamp_ns(value: TimeBound) -> Optional[int]:
+    """
+    Converts a query bound (datetime, epoch seconds or record timestamp string) to epoch nanoseconds.
+
+    Naive datetimes and strings are local time, like the record timestamps.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1_000_000) * 1000
+    if isinstance(value, str):
+        return parse_timestamp_ns(value)
+    return int(value * 1_000_000) * 1000
+
+
+def index_path(segment_path: str) -> str:
+    """
+    Returns the index file of a plain or compressed segment.
+    """
+    compressed = compression_of(segment_path)
+    if compressed is not None:
+        segment_path = segment_path[:-len(COMPRESSED_SUFFIXES[compressed])]
+    return segment_path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+
+class RecordLines(NamedTuple):
+    """
+    Already serialized records of one sensor and type, as logged by log_batch in store mode.
+    """
+    sensor_id: str
+    type: str
+    timestamps_ns: Sequence[int]
+    lines: Sequence[str]
+
+
+class _IndexEntry:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+
+class PartitionedLogStore:
+    """
+    Local record store split into time-partitioned NDJSON segments with a sparse index.
+
+    Records are appended as compact JSON lines to the segment of the partition their
+    timestamp falls into; a segment is also rolled once it reaches segment_bytes. Next to
+    every segment an index file maps each (sensor_id, type, time bucket) to the byte range
+    holding its records, so a query only reads the ranges of the matching sensors and time.
+
+    Index entries are appended on every flush together with the covered segment size;
+    bytes written after the last flush (e.g. before a crash) are found by scanning the tail.
+    """
+    def __init__(
+            self,
+            directory: str,
+            partition_seconds: int = 3600,
+            bucket_seconds: int = 60,
+            segment_bytes: int = 64 * 1024 * 1024,
+            flush_interval: float = 1.0,
+            fsync: bool = False,
+            prefix: str = "sensor_logs",
+            on_segment_closed: Optional[Callable[[str], None]] = None,
+        ):
+        """
+        :param directory: Directory holding the segment and index files.
+        :param partition_seconds: Length of a time partition; records of different partitions never share a segment.
+        :param bucket_seconds: Time resolution of the index.
+        :param segment_bytes: Size in bytes after which a new segment of the same partition is started.
+        :param flush_interval: Maximum time in seconds appended records stay buffered.
+        :param fsync: Boolean flag forcing an fsync on every flush.
+        :param prefix: File name prefix of the segments.
+        :param on_segment_closed: Optional callable receiving the path of every finished segment,
+            e.g. SegmentCompressor.submit.
+        """
+        self.directory = directory
+        self.partition_seconds = partition_seconds
+        self.bucket_seconds = bucket_seconds
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.prefix = prefix
+        self.on_segment_closed = on_segment_closed
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+        self._segment = None
+        self._segment_name = None
+        self._partition = None
+        self._offset = 0
+        self._index: Dict[Tuple[str, str, int], _IndexEntry] = {}
+        self._dirty = set()
+        self._min_ns = None
+        self._max_ns = None
+        self._last_flush = time.monotonic()
+
+
+    @property
+    def active_path(self) -> Optional[str]:
+        """
+        Path of the segment currently written to (None before the first record).
+        """
+        segment_name = self._segment_name
+        return None if segment_name is None else os.path.join(self.directory, segment_name + SEGMENT_SUFFIX)
+
+
+    def _segment_base(self, partition: int) -> str:
+        start = datetime.fromtimestamp(partition * self.partition_seconds, timezone.utc)
+        return f"{self.prefix}_{start.strftime('%Y%m%dT%H%M%SZ')}"
+
+
+    def _open_segment(self, partition: int):
+        self._close_segment()
+
+        base = self._segment_base(partition)
+        sequence = 1
+        while any(
+                os.path.exists(os.path.join(self.directory, f"{base}_{sequence:04d}{suffix}"))
+                for suffix in _SEGMENT_FILE_SUFFIXES):
+            sequence += 1
+
+        self._segment_name = f"{base}_{sequence:04d}"
+        self._segment = open(os.path.join(self.directory, self._segment_name + SEGMENT_SUFFIX), "ab")
+        self._partition = partition
+        self._offset = 0
+        self._index = {}
+        self._dirty = set()
+        self._min_ns = None
+        self._max_ns = None
+
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        self._flush()
+        self._segment.close()
+        if self.on_segment_closed is not None:
+            self.on_segment_closed(os.path.join(self.directory, self._segment_name + SEGMENT_SUFFIX))
+        self._segment = None
+        self._segment_name = None
+
+
+    def append(self, record: dict, timestamp_ns: Optional[int] = None):
+        """
+        Appends one record.
+
+        :param record: A record dict as produced by BaseSensorLogData.to_dict().
+        :param timestamp_ns: The record timestamp if already known; parsed from the record otherwise.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = parse_timestamp_ns(record["timestamp"])
+        line = (self._encoder.encode(record) + "\n").encode('utf-8')
+
+        with self._lock:
+            self._append_line(line, record.get("sensor_id"), record.get("type"), timestamp_ns)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+
+    def append_lines(self, batch: RecordLines):
+        """
+        Appends records of one sensor that are already serialized as JSON, one per line.
+        """
+        with self._lock:
+            for line, timestamp_ns in zip(batch.lines, batch.timestamps_ns):
+                self._append_line((line + "\n").encode('utf-8'), batch.sensor_id, batch.type, timestamp_ns)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+
+    def _append_line(self, line: bytes, sensor_id: Optional[str], type_value: Optional[str], timestamp_ns: int):
+        partition = timestamp_ns // (self.partition_seconds * _NS)
+
+        # Late records stay in the current segment; the index keeps their real time bucket.
+        if self._segment is None or partition > self._partition or self._offset >= self.segment_bytes:
+            self._open_segment(partition if self._partition is None else max(partition, self._partition))
+
+        key = (sensor_id, type_value, timestamp_ns // (self.bucket_seconds * _NS))
+        entry = self._index.get(key)
+        end = self._offset + len(line)
+        if entry is None:
+            self._index[key] = _IndexEntry(self._offset, end)
+        else:
+            entry.end = end
+        self._dirty.add(key)
+
+        self._segment.write(line)
+        self._offset = end
+        if self._min_ns is None or timestamp_ns < self._min_ns:
+            self._min_ns = timestamp_ns
+        if self._max_ns is None or timestamp_ns > self._max_ns:
+            self._max_ns = timestamp_ns
+
+
+    def flush(self):
+        """
+        Writes buffered records and their index entries to disk.
+        """
+        with self._lock:
+            self._flush()
+
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if self._segment is None:
+            return
+
+        self._segment.flush()
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+        if not self._dirty:
+            return
+
+        lines = [
+            self._encoder.encode({
+                "sensor_id": key[0],
+                "type": key[1],
+                "bucket": key[2],
+                "start": self._index[key].start,
+                "end": self._index[key].end,
+            })
+            for key in self._dirty
+        ]
+        lines.append(self._encoder.encode({"covered": self._offset, "min_ns": self._min_ns, "max_ns": self._max_ns}))
+        with open(os.path.join(self.directory, self._segment_name + INDEX_SUFFIX), "a", encoding="utf-8") as index:
+            index.write("\n".join(lines) + "\n")
+            index.flush()
+            if self.fsync:
+                os.fsync(index.fileno())
+        self._dirty = set()
+
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+
+    def query(
+            self,
+            sensor_id: Optional[str] = None,
+            start: TimeBound = None,
+            end: TimeBound = None,
+            type=None,
+        ) -> Iterator[dict]:
+        """
+        Flushes pending records and returns a lazy query over the store (see LogStoreReader.query).
+        """
+        self.flush()
+        return LogStoreReader(self.directory, self.bucket_seconds, self.prefix).query(
+            sensor_id=sensor_id, start=start, end=end, type=type,
+        )
+
+
+class _SegmentIndex:
+    """
+    Index of one segment as loaded from its index file.
+    """
+    __slots__ = ("ranges", "covered", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.ranges: Dict[Tuple[str, str, int], List[int]] = {}
+        self.covered = 0
+        self.min_ns = None
+        self.max_ns = None
+
+
+    @classmethod
+    def load(cls, path: str) -> "_SegmentIndex":
+        index = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as lines:
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line of an index written during a crash.
+                        break
+                    if "covered" in entry:
+                        index.covered = entry["covered"]
+                        index.min_ns = entry["min_ns"]
+                        index.max_ns = entry["max_ns"]
+                        continue
+                    key = (entry["sensor_id"], entry["type"], entry["bucket"])
+                    current = index.ranges.get(key)
+                    if current is None:
+                        index.ranges[key] = [entry["start"], entry["end"]]
+                    else:
+                        current[0] = min(current[0], entry["start"])
+                        current[1] = max(current[1], entry["end"])
+        except FileNotFoundError:
+            pass
+        return index
+
+
+class LogStoreReader:
+    """
+    Read-only access to the segments of a PartitionedLogStore, usable from any process.
+    """
+    def __init__(self, directory: str, bucket_seconds: int = 60, prefix: str = "sensor_logs"):
+        """
+        :param directory: Directory of the store.
+        :param bucket_seconds: Index bucket length the store was written with.
+        :param prefix: File name prefix of the segments.
+        """
+        self.directory = directory
+        self.bucket_seconds = bucket_seconds
+        self.prefix = prefix
+
+
+    def segments(self) -> List[Tuple[str, str]]:
+        """
+        Returns (name without suffix, path) of every segment in time order.
+
+        A segment being compressed is returned once, preferring the uncompressed file.
+        """
+        found = {}
+        for suffix in [SEGMENT_SUFFIX + compressed for compressed in COMPRESSED_SUFFIXES.values()] + [SEGMENT_SUFFIX]:
+            for name in os.listdir(self.directory):
+                if name.startswith(self.prefix + "_") and name.endswith(suffix):
+                    found[name[:-len(suffix)]] = os.path.join(self.directory, name)
+        return sorted(found.items())
+
+
+    def query(
+            self,
+            sensor_id: Optional[str] = None,
+            start: TimeBound = None,
+            end: TimeBound = None,
+            type=None,
+        ) -> Iterator[dict]:
+        """
+        Streams the records matching every given filter, segment by segment.
+
+        Only the byte ranges the index lists for the matching (sensor_id, type, bucket) keys are
+        read, plus any tail of a segment not covered by its index yet.
+
+        :param sensor_id: Only records of this sensor (None matches every sensor).
+        :param start: Inclusive lower time bound: datetime, epoch seconds or record timestamp string.
+        :param end: Exclusive upper time bound, same forms as start.
+        :param type: Only records of this SensorType (or its string value).
+        :return: A generator of record dicts, in file order within each segment.
+        """
+        type_value = getattr(type, "value", type)
+        start_ns = to_timestamp_ns(start)
+        end_ns = to_timestamp_ns(end)
+        bucket_ns = self.bucket_seconds * _NS
+        first_bucket = None if start_ns is None else start_ns // bucket_ns
+        last_bucket = None if end_ns is None else (end_ns - 1) // bucket_ns
+
+        for name, path in self.segments():
+            index = _SegmentIndex.load(os.path.join(self.directory, name + INDEX_SUFFIX))
+
+            # Compressed segments were closed, so their index covers them completely.
+            size = index.covered if compression_of(path) else os.path.getsize(path)
+
+            # Segments wholly outside the time range are skipped unless they have an unindexed tail.
+            if index.covered >= size and index.min_ns is not None and (
+                    (end_ns is not None and index.min_ns >= end_ns)
+                    or (start_ns is not None and index.max_ns < start_ns)):
+                continue
+
+            ranges = sorted(
+                (byte_range[0], byte_range[1])
+                for (key_sensor, key_type, bucket), byte_range in index.ranges.items()
+                if (sensor_id is None or key_sensor == sensor_id)
+                and (type_value is None or key_type == type_value)
+                and (first_bucket is None or bucket >= first_bucket)
+                and (last_bucket is None or bucket <= last_bucket)
+            )
+            if index.covered < size:
+                ranges.append((index.covered, size))
+
+            yield from self._read_ranges(path, _merge_ranges(ranges), sensor_id, type_value, start_ns, end_ns)
+
+
+    @staticmethod
+    def _read_ranges(path, ranges, sensor_id, type_value, start_ns, end_ns) -> Iterator[dict]:
+        if not ranges:
+            return
+
+        compressed = compression_of(path) is not None
+        with open_segment(path) as segment:
+            position = 0
+            for range_start, range_end in ranges:
+                if compressed:
+                    # Decompressing streams only move forward; ranges are sorted, so skip ahead.
+                    while position < range_start:
+                        skipped = len(segment.read(min(range_start - position, 1024 * 1024)))
+                        if not skipped:
+                            return
+                        position += skipped
+                else:
+                    segment.seek(range_start)
+                position = range_end
+                remaining = range_end - range_start
+                while remaining > 0:
+                    line = segment.readline(remaining)
+                    if not line:
+                        break
+                    remaining -= len(line)
+                    if not line.endswith(b"\n"):
+                        # Partially written last record.
+                        break
+
+                    record = json.loads(line)
+                    if sensor_id is not None and record.get("sensor_id") != sensor_id:
+                        continue
+                    if type_value is not None and record.get("type") != type_value:
+                        continue
+                    if start_ns is not None or end_ns is not None:
+                        timestamp_ns = parse_timestamp_ns(record["timestamp"])
+                        if (start_ns is not None and timestamp_ns < start_ns) or \
+                                (end_ns is not None and timestamp_ns >= end_ns):
+                            continue
+                    yield record
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class PartitionedStoreHandler(logging.Handler):
+    """
+    Logging handler writing sensor records into a PartitionedLogStore.
+
+    Dict messages are stored as records and RecordLines (from log_batch) as one record per
+    line; any other message, such as a machine status update, is stored as a record with
+    only a timestamp and the message text.
+    """
+    def __init__(self, store: PartitionedLogStore):
+        super().__init__()
+        self.store = store
+
+
+    def emit(self, record):
+        try:
+            message = record.msg
+            if isinstance(message, dict):
+                self.store.append(message)
+            elif isinstance(message, RecordLines):
+                self.store.append_lines(message)
+            else:
+                timestamp_ns = int(record.created * 1_000_000) * 1000
+                self.store.append(
+                    {"timestamp": format_timestamp_ns(timestamp_ns), "message": record.getMessage()},
+                    timestamp_ns,
+                )
+        except Exception:
+            self.handleError(record)
+
+
+    def flush(self):
+        self.store.flush()
+
+
+    def close(self):
+        self.store.close()
+        super().close()
@@ -0,0 +1,122 @@
+from typing import Callable, Iterator, List, Optional
+
+import codecs
+import glob
+import json
+import os
+import re
+
+from log_sdk.storage.compression import compression_of, open_segment
+
+
+_CHUNK = 256 * 1024
+# Rotated file suffixes: numbered backups (.1) or UTC rotation timestamps (.20250301T130501123456Z).
+_ROTATED = re.compile(r"\.log\.(\d+|\d{8}T\d{12}Z)(\.gz|\.zst)?$")
+# Start of the next line beginning a record or a text line; the inner lines of a pretty
+# record are indented or close it.
+_NEXT_LINE = re.compile(r"\n(?=[^\s}\]])")
+
+
+def iter_records(
+        path: str,
+        include_text: bool = False,
+        on_corrupt: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[dict]:
+    """
+    Streams the records of one log file, decompressing .gz and .zst files on the fly.
+
+    Works for both pretty (indented, multi-line) and NDJSON files without loading the file
+    into memory. Lines that are not JSON objects, such as machine status updates, are skipped
+    unless include_text is set, in which case they are returned as {"message": line}.
+
+    A record that cannot be decoded (torn by a crash) is skipped up to the next line starting
+    a record or a text line, and the records after it are still returned.
+
+    :param path: Plain, gzip or zstd compressed log file.
+    :param include_text: Boolean flag returning plain text lines as well.
+    :param on_corrupt: Optional callback receiving the text of every skipped record.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+
+    with open_segment(path) as stream:
+        while True:
+            chunk = stream.read(_CHUNK)
+            buffer = buffer[position:] + text_decoder.decode(chunk, final=not chunk)
+            position = 0
+
+            while True:
+                # Skip the whitespace between records.
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position >= len(buffer):
+                    break
+
+                if buffer[position] != "{":
+                    newline = buffer.find("\n", position)
+                    if newline < 0 and chunk:
+                        break
+                    end = len(buffer) if newline < 0 else newline
+                    if include_text:
+                        yield {"message": buffer[position:end].rstrip("\r")}
+                    position = end
+                    continue
+
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    following = _NEXT_LINE.search(buffer, position)
+                    if following is None and chunk:
+                        # The record continues in the next chunk.
+                        break
+                    # Torn record, or the truncated last record of a file written during a crash.
+                    end = len(buffer) if following is None else following.start()
+                    if on_corrupt is not None:
+                        on_corrupt(buffer[position:end])
+                    position = end
+                    continue
+                yield record
+
+            if not chunk:
+                return
+
+
+def log_files(directory: str, prefix: str = "sensor_logs") -> List[str]:
+    """
+    Returns the log files of a directory oldest first.
+
+    Files are grouped by their date-named base file; within a group numbered backups
+    (.log.1 is the newest) come first, then timestamped (possibly compressed) rotations,
+    then the base file itself.
+    """
+    files = []
+    for path in glob.glob(os.path.join(directory, f"{prefix}_*.log*")):
+        if path.endswith(".tmp"):
+            continue
+        if path.endswith(".log"):
+            files.append((path[:-len(".log")], 2, "", path))
+            continue
+        match = _ROTATED.search(path)
+        if match is None:
+            continue
+        suffix = match.group(1)
+        # An uncompressed file waiting for compression and its finished .gz are the same data.
+        if compression_of(path) is None and any(os.path.exists(path + ext) for ext in (".gz", ".zst")):
+            continue
+        stem = path[:match.start()]
+        if len(suffix) < 8:
+            files.append((stem, 0, -int(suffix), path))
+        else:
+            files.append((stem, 1, suffix, path))
+
+    return [path for *_, path in sorted(files)]
+
+
+def iter_directory(directory: str, prefix: str = "sensor_logs", include_text: bool = False) -> Iterator[dict]:
+    """
+    Streams the records of every log file in a directory, oldest file first.
+    """
+    for path in log_files(directory, prefix):
+        yield from iter_records(path, include_text=include_text)
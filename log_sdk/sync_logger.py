@@ -0,0 +1,293 @@
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional
+
+import asyncio
+import threading
+
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+from log_sdk.sensor_logs.batch import column_to_list
+from log_sdk.sensor_methods import SensorLogMethods, synchronous
+
+
+# The loop yields to the other tasks (batching, spool replay, metrics) after this many records.
+_DRAIN_CHUNK = 64
+
+
+class SyncSensorHandle(SensorLogMethods):
+    """
+    Synchronous per-sensor logging API of a SyncLogger, safe to call from any thread.
+
+    Records are built in the calling thread (so they carry the time of the call) and handed
+    to the logger's event loop thread through a queue; the log_* methods return immediately.
+    """
+    __slots__ = ("sensor_id", "machine_status", "status_timestamp", "_owner")
+
+    def __init__(self, owner: "SyncLogger", sensor_id: str):
+        """
+        :param owner: The SyncLogger owning the event loop thread and the transport.
+        :param sensor_id: Unique identifier for the sensor.
+        """
+        self.sensor_id = sensor_id
+        self.machine_status = None
+        self.status_timestamp = None
+        self._owner = owner
+
+
+    @property
+    def logger(self):
+        return self._owner.config.logger
+
+
+    async def _log(self, log_object: BaseSensorLogData):
+        self._owner._put(log_object)
+
+
+    async def _log_batch(self, template, measurements, timestamps, durations):
+        # Copied now: the caller may reuse its arrays as soon as log_batch returns.
+        self._owner._put((
+            template,
+            column_to_list(measurements),
+            None if timestamps is None else column_to_list(timestamps),
+            durations if isinstance(durations, (int, float)) else column_to_list(durations),
+        ))
+
+
+    log_electrical = synchronous(SensorLogMethods.log_electrical)
+    log_humidity = synchronous(SensorLogMethods.log_humidity)
+    log_pressure = synchronous(SensorLogMethods.log_pressure)
+    log_temperature = synchronous(SensorLogMethods.log_temperature)
+    log_vibration = synchronous(SensorLogMethods.log_vibration)
+    log_batch = synchronous(SensorLogMethods.log_batch)
+
+
+class SyncLogger(SyncSensorHandle):
+    """
+    Thread-safe synchronous front-end of a LoggerConfig running on a dedicated event loop thread.
+
+    log_* calls append the record to a deque (an atomic operation, no lock) and only wake the
+    loop when it is idle, so a busy loop drains records from any number of threads without a
+    round trip per call. Once max_pending records are queued, callers wait for the loop.
+
+    Other sensors share the loop and transport through sensor(); call close() before exiting,
+    records still queued are lost otherwise.
+    """
+    def __init__(
+            self,
+            sensor_id: Optional[str],
+            KAFKA_BOOTSTRAP_SERVERS: str,
+            KAFKA_TOPIC: str,
+            max_pending: int = 100000,
+            **options,
+        ):
+        """
+        Starts the event loop thread and initializes the LoggerConfig on it.
+
+        :param sensor_id: Sensor logged by the log_* methods of this object (None if only handles from sensor() are used).
+        :param KAFKA_BOOTSTRAP_SERVERS: Kafka bootstrap servers.
+        :param KAFKA_TOPIC: Kafka topic to publish logs to.
+        :param max_pending: Maximum number of records queued for the loop thread before log calls wait.
+        :param options: Any other LoggerConfig option (sinks, batching, log_directory, ...).
+        """
+        super().__init__(self, sensor_id)
+        self.max_pending = max_pending
+        self.config = None
+
+        self._records = deque()
+        self._idle = False
+        self._blocked = False
+        self._space = threading.Event()
+        self._wakeup = None
+        self._drain_task = None
+        self._closed = False
+        self._sensors = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="sensor-logger-loop", daemon=True)
+        self._thread.start()
+        try:
+            self._call(self._start(sensor_id, KAFKA_BOOTSTRAP_SERVERS, KAFKA_TOPIC, options))
+        except BaseException:
+            self._stop_loop()
+            raise
+
+
+    async def _start(self, sensor_id, bootstrap_servers, topic, options):
+        # Created on the loop thread, so the producer binds to this loop.
+        self.config = LoggerConfig(
+            sensor_id=sensor_id,
+            KAFKA_BOOTSTRAP_SERVERS=bootstrap_servers,
+            KAFKA_TOPIC=topic,
+            **options,
+        )
+        await self.config.initialize()
+        self._wakeup = asyncio.Event()
+        self._drain_task = asyncio.ensure_future(self._drain())
+
+
+    def _call(self, coroutine, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+
+    def sensor(self, sensor_id: str) -> SyncSensorHandle:
+        """
+        Returns the handle of another sensor sharing this logger, creating it on first use.
+        """
+        handle = self._sensors.get(sensor_id)
+        if handle is None:
+            handle = self._sensors.setdefault(sensor_id, SyncSensorHandle(self, sensor_id))
+        return handle
+
+
+    def pending(self) -> int:
+        """
+        Number of records waiting for the loop thread.
+        """
+        return len(self._records)
+
+
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError("SyncLogger is closed")
+        self._append(item)
+
+
+    def _append(self, item):
+        records = self._records
+        if len(records) >= self.max_pending:
+            self._wait_for_space()
+        records.append(item)
+        if self._idle:
+            self._idle = False
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+
+    def _wait_for_space(self):
+        self._blocked = True
+        while len(self._records) >= self.max_pending:
+            self._space.clear()
+            if self._idle:
+                self._idle = False
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            # The timeout covers a wakeup missed between the check and clear().
+            self._space.wait(0.01)
+
+
+    async def _drain(self):
+        """
+        Hands queued records to the LoggerConfig until the logger is closed.
+        """
+        records = self._records
+        config = self.config
+        drained = 0
+        while True:
+            if not records:
+                # Publish idleness before the last check; a producer appending after the check sees it.
+                self._idle = True
+                if not records:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                self._idle = False
+                continue
+
+            item = records.popleft()
+            try:
+                if isinstance(item, BaseSensorLogData):
+                    await config._log(item)
+                elif isinstance(item, Future):
+                    await config.flush()
+                    item.set_result(True)
+                else:
+                    await config._log_batch(*item)
+            except Exception as e:
+                config.logger.error(f"SyncLogger Error: {str(e)}")
+
+            if self._blocked and len(records) <= self.max_pending // 2:
+                self._blocked = False
+                self._space.set()
+
+            drained += 1
+            if drained % _DRAIN_CHUNK == 0:
+                await asyncio.sleep(0)
+
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every record logged so far (by any thread) has been handed to the sinks and the file.
+
+        :param timeout: Maximum number of seconds to wait (None waits until done).
+        :return: False if the timeout expired first.
+        """
+        done = Future()
+        self._put(done)
+        try:
+            return done.result(timeout)
+        except FutureTimeoutError:
+            return False
+
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Flushes the queued records, closes the LoggerConfig and stops the loop thread.
+
+        :param timeout: Maximum number of seconds to wait for the queued records.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        done = Future()
+        self._append(done)
+        try:
+            done.result(timeout)
+        except FutureTimeoutError:
+            pass
+        try:
+            self._call(self._stop())
+        finally:
+            self._stop_loop()
+
+
+    async def _stop(self):
+        self._drain_task.cancel()
+        try:
+            await self._drain_task
+        except asyncio.CancelledError:
+            pass
+        await self.config.close()
+
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Returns the runtime metrics of the LoggerConfig (see LoggerConfig.metrics_snapshot).
+        """
+        return self._call(self._snapshot())
+
+
+    def metrics_text(self) -> str:
+        """
+        Returns the runtime metrics in the Prometheus text format.
+        """
+        return self._call(self._text())
+
+
+    async def _snapshot(self) -> dict:
+        return self.config.metrics_snapshot()
+
+
+    async def _text(self) -> str:
+        return self.config.metrics_text()
+
+
+    def __enter__(self) -> "SyncLogger":
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,135 @@
+from collections import deque
+from typing import List, Optional, Tuple
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.status import Status
+
+
+OVERLOAD_POLICIES = ("block", "drop_newest", "drop_oldest", "drop_priority")
+
+# Alert channel traffic ranks above every status.
+ALERT_PRIORITY = len(Status)
+
+# Approximate bookkeeping cost of a buffered payload (bytes object header, entry tuple, deque slot).
+ENTRY_OVERHEAD = 96
+
+
+def priority_of(status: Optional[Status], channel: Optional[Channel] = None) -> int:
+    """
+    Shedding priority of a record: its status severity (NORMAL 0 ... FAULT 3), or ALERT_PRIORITY
+    for the alert channel. Higher priorities are shed last.
+    """
+    if channel is Channel.ALERT:
+        return ALERT_PRIORITY
+    return status.severity if status is not None else 0
+
+
+class SheddingBuffer:
+    """
+    FIFO of serialized payloads bounded by an item count and a byte budget.
+
+    When a payload does not fit, make_room() applies the overload policy: drop_oldest evicts
+    the oldest payloads, drop_priority evicts the oldest payloads of the lowest priority not
+    above the incoming one, and drop_newest (like block, whose waiting is left to the caller)
+    keeps the buffer as it is. Every shed payload is counted per status in shed.
+
+    The buffer is not synchronized; it is used from a single event loop.
+    """
+    def __init__(self, policy: str = "block", max_items: int = 10000, max_bytes: int = 64*1024*1024):
+        """
+        :param policy: One of OVERLOAD_POLICIES.
+        :param max_items: Maximum number of buffered payloads.
+        :param max_bytes: Maximum size of the buffered payloads including ENTRY_OVERHEAD each.
+        """
+        if policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unknown overload policy: {policy}")
+
+        self.policy = policy
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.shed = {}
+
+        # One deque of (sequence, payload, status, key) per priority; sequences restore arrival order.
+        self._queues = [deque() for _ in range(ALERT_PRIORITY + 1)]
+        self._items = 0
+        self._sequence = 0
+
+
+    def __len__(self) -> int:
+        return self._items
+
+
+    def fits(self, size: int) -> bool:
+        """
+        Whether a payload of size bytes (including ENTRY_OVERHEAD) can be added without shedding.
+
+        A payload larger than the whole budget fits into an empty buffer.
+        """
+        if self._items == 0:
+            return True
+        return self._items < self.max_items and self.nbytes + size <= self.max_bytes
+
+
+    def push(
+            self,
+            payload: bytes,
+            size: int,
+            status: Optional[Status] = None,
+            priority: int = 0,
+            key: Optional[bytes] = None,
+        ):
+        self._queues[priority].append((self._sequence, payload, status, key))
+        self._sequence += 1
+        self._items += 1
+        self.nbytes += size
+
+
+    def pop_many(self, count: int) -> List[Tuple[bytes, Optional[bytes]]]:
+        """
+        Removes and returns up to count (payload, key) pairs, oldest first.
+        """
+        payloads = []
+        while self._items and len(payloads) < count:
+            queue = self._oldest_queue()
+            # Take the whole run of this queue that is older than the head of every other queue.
+            limit = min((other[0][0] for other in self._queues if other and other is not queue), default=None)
+            while queue and len(payloads) < count and (limit is None or queue[0][0] < limit):
+                _, payload, _, key = self._remove(queue)
+                payloads.append((payload, key))
+        return payloads
+
+
+    def make_room(self, size: int, priority: int = 0) -> bool:
+        """
+        Evicts payloads according to the policy until one of size bytes fits.
+
+        :return: True if the payload fits now, False if it has to be shed (or waited for with block).
+        """
+        while not self.fits(size):
+            if self.policy == "drop_oldest":
+                victim = self._oldest_queue()
+            elif self.policy == "drop_priority":
+                victim = next((queue for queue in self._queues[:priority + 1] if queue), None)
+                if victim is None:
+                    return False
+            else:
+                return False
+            self.count_shed(self._remove(victim)[2])
+        return True
+
+
+    def count_shed(self, status: Optional[Status]):
+        key = status.value if status is not None else "Unknown"
+        self.shed[key] = self.shed.get(key, 0) + 1
+
+
+    def _oldest_queue(self) -> deque:
+        return min((queue for queue in self._queues if queue), key=lambda queue: queue[0][0])
+
+
+    def _remove(self, queue: deque) -> tuple:
+        entry = queue.popleft()
+        self._items -= 1
+        self.nbytes -= len(entry[1]) + ENTRY_OVERHEAD
+        return entry
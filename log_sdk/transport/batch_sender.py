@@ -0,0 +1,229 @@
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import asyncio
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.status import Status
+from log_sdk.transport.backpressure import ENTRY_OVERHEAD, SheddingBuffer, priority_of
+
+
+class BatchSender:
+    """
+    Bounded in-memory buffer drained by a background task into batched sends.
+
+    The buffer is bounded by max_queue_size payloads and max_queue_bytes. When it is full
+    the overload policy decides: "block" waits for space (at most block_timeout seconds,
+    after which the new payload is shed), "drop_newest" sheds the new payload, "drop_oldest"
+    evicts the oldest ones and "drop_priority" evicts the oldest payloads of the lowest
+    priority first, so CRITICAL/FAULT records and alert traffic are shed last.
+    """
+    def __init__(
+            self,
+            send_batch: Callable[[List[Tuple[bytes, Optional[bytes]]]], Awaitable[None]],
+            batch_size: int = 500,
+            linger_ms: float = 5.0,
+            max_queue_size: int = 10000,
+            max_queue_bytes: int = 64*1024*1024,
+            overload_policy: str = "block",
+            block_timeout: Optional[float] = None,
+        ):
+        """
+        :param send_batch: Coroutine function receiving a list of (serialized payload, message key) pairs.
+        :param batch_size: Maximum number of payloads handed to a single send_batch call.
+        :param linger_ms: How long to wait for a batch to fill up before sending it anyway.
+        :param max_queue_size: Maximum number of buffered payloads.
+        :param max_queue_bytes: Maximum size of the buffered payloads in bytes (approximate per-payload overhead included).
+        :param overload_policy: "block", "drop_newest", "drop_oldest" or "drop_priority".
+        :param block_timeout: With "block", seconds to wait for space before shedding the payload (None waits forever).
+        """
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self.block_timeout = block_timeout
+
+        self._buffer = SheddingBuffer(overload_policy, max_items=max_queue_size, max_bytes=max_queue_bytes)
+        self._has_items = None
+        self._has_space = None
+        self._idle = None
+        self._closing = False
+        self._task = None
+
+
+    @property
+    def overload_policy(self) -> str:
+        return self._buffer.policy
+
+
+    @property
+    def shed(self) -> dict:
+        """
+        Number of payloads shed under overload, keyed by status value (e.g. {"Normal": 120}).
+        """
+        return self._buffer.shed
+
+
+    def start(self):
+        """
+        Creates the events and starts the background drain task on the running loop.
+        """
+        if self._task is None:
+            self._has_items = asyncio.Event()
+            self._has_space = asyncio.Event()
+            self._idle = asyncio.Event()
+            # Payloads put before start() are drained right away.
+            if not self._buffer:
+                self._idle.set()
+            self._closing = False
+            self._task = asyncio.ensure_future(self._run())
+
+
+    async def put(
+            self,
+            payload: bytes,
+            status: Optional[Status] = None,
+            channel: Optional[Channel] = None,
+            key: Optional[bytes] = None,
+        ) -> bool:
+        """
+        Buffers a payload, applying the overload policy if the buffer is full.
+
+        :param payload: Serialized record.
+        :param status: Status of the record, used by drop_priority and to count shed payloads.
+        :param channel: Channel of the record; alert traffic is shed last by drop_priority.
+        :param key: Optional message key handed to send_batch with the payload.
+        :return: False if the payload was shed.
+
+        Payloads put before start() are kept and sent once the sender is started.
+        """
+        buffer = self._buffer
+        size = len(payload) + ENTRY_OVERHEAD
+        priority = priority_of(status, channel) if buffer.policy == "drop_priority" else 0
+
+        if not buffer.fits(size) and not buffer.make_room(size, priority):
+            if buffer.policy != "block" or not await self._wait_for_space(size):
+                buffer.count_shed(status)
+                return False
+
+        buffer.push(payload, size, status, priority, key)
+        if self._idle is not None:
+            self._idle.clear()
+            self._has_items.set()
+        return True
+
+
+    async def _wait_for_space(self, size: int) -> bool:
+        """
+        Waits until a payload of size bytes fits, at most block_timeout seconds.
+        """
+        if self._has_space is None:
+            # Nothing drains the buffer before start().
+            return False
+        loop = asyncio.get_event_loop()
+        deadline = None if self.block_timeout is None else loop.time() + self.block_timeout
+
+        while not self._buffer.fits(size):
+            self._has_space.clear()
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._has_space.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+
+    def qsize(self) -> int:
+        """
+        Number of payloads waiting to be sent.
+        """
+        return len(self._buffer)
+
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the buffered payloads.
+        """
+        return self._buffer.nbytes
+
+
+    async def flush(self):
+        """
+        Waits until every payload buffered so far has been handed to send_batch (or shed).
+        """
+        if self._idle is not None:
+            await self._idle.wait()
+
+
+    async def close(self):
+        """
+        Sends everything still pending and stops the drain task.
+        """
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._has_items.set()
+        await self._task
+        self._task = None
+
+
+    def _take(self, count: int) -> list:
+        payloads = self._buffer.pop_many(count)
+        if payloads:
+            self._has_space.set()
+        return payloads
+
+
+    async def _next_batch(self) -> list:
+        """
+        Collects up to batch_size payloads, waiting at most linger seconds after the first one.
+
+        Returns an empty list once the sender is closing and the buffer is empty.
+        """
+        while not self._buffer:
+            if self._closing:
+                return []
+            self._has_items.clear()
+            await self._has_items.wait()
+
+        loop = asyncio.get_event_loop()
+        batch = self._take(self.batch_size)
+        deadline = loop.time() + self.linger
+
+        while len(batch) < self.batch_size and not self._closing:
+            if self._buffer:
+                batch.extend(self._take(self.batch_size - len(batch)))
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            self._has_items.clear()
+            try:
+                await asyncio.wait_for(self._has_items.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+
+    async def _run(self):
+        """
+        Drains the buffer until the sender is closed.
+        """
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                self._idle.set()
+                return
+
+            try:
+                await self.send_batch(batch)
+            finally:
+                # Only one batch is in flight, so an empty buffer means everything was handed over.
+                if not self._buffer:
+                    self._idle.set()
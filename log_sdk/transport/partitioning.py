@@ -0,0 +1,84 @@
+from functools import partial
+from typing import Callable, Optional, Union
+
+import struct
+
+
+# Strategies keying every record by one of its fields.
+KEY_FIELDS = ("sensor_id", "data_center", "product")
+
+_SEED = 0x9747B28C
+_M = 0x5BD1E995
+_MASK = 0xFFFFFFFF
+
+
+def murmur2(data: bytes) -> int:
+    """
+    32-bit murmur2 hash as computed by Kafka's Java client (Utils.murmur2), as a signed int.
+    """
+    length = len(data)
+    h = _SEED ^ length
+    for k in struct.unpack_from(f"<{length // 4}I", data):
+        k = (k * _M) & _MASK
+        k ^= k >> 24
+        k = (k * _M) & _MASK
+        h = ((h * _M) & _MASK) ^ k
+
+    tail = length & ~3
+    extra = length & 3
+    if extra == 3:
+        h ^= data[tail + 2] << 16
+    if extra >= 2:
+        h ^= data[tail + 1] << 8
+    if extra >= 1:
+        h ^= data[tail]
+        h = (h * _M) & _MASK
+
+    h ^= h >> 13
+    h = (h * _M) & _MASK
+    h ^= h >> 15
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+def partition_for(key: Union[bytes, str], partitions: int) -> int:
+    """
+    Partition the default partitioner of the Java and aiokafka clients assigns a key to (librdkafka
+    needs partitioner=murmur2_random to match), so a consumer can predict which partition holds a sensor.
+
+    :param key: Message key; str keys are UTF-8 encoded like the logger encodes them.
+    :param partitions: Number of partitions of the topic.
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return (murmur2(key) & 0x7FFFFFFF) % partitions
+
+
+def _encode_key(key: Union[bytes, str, None]) -> Optional[bytes]:
+    if key is None or isinstance(key, bytes):
+        return key
+    return str(key).encode("utf-8")
+
+
+def _field_key(field: str, record: dict) -> bytes:
+    return record[field].encode("utf-8")
+
+
+def _callable_key(strategy: Callable[[dict], Union[bytes, str, None]], record: dict) -> Optional[bytes]:
+    return _encode_key(strategy(record))
+
+
+def key_function(strategy: Union[str, Callable[[dict], Union[bytes, str, None]]]) -> Callable[[dict], Optional[bytes]]:
+    """
+    Returns the function computing the message key of a record dict.
+
+    The function can be pickled (for a process pool) if the strategy can.
+
+    :param strategy: One of KEY_FIELDS, or a callable receiving the record dict (as returned
+        by BaseSensorLogData.to_dict) and returning the key as bytes or str (None for no key).
+    """
+    if callable(strategy):
+        return partial(_callable_key, strategy)
+
+    if strategy not in KEY_FIELDS:
+        raise ValueError(f"Unknown partition key: {strategy}")
+    return partial(_field_key, strategy)
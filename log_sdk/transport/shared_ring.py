@@ -0,0 +1,523 @@
+from typing import Dict, List, Optional
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+from log_sdk.sensor_logs.base_sensor import BaseSensorLogData
+from log_sdk.sensor_logs.batch import batch_columns, batch_objects
+from log_sdk.sensor_logs.electrical import ElectricalLogData
+from log_sdk.sensor_logs.humidity import HumidityLogData
+from log_sdk.sensor_logs.pressure import PressureLogData
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.sensor_methods import SensorLogMethods, synchronous
+from log_sdk.serializers.binary import ENUM_CODES, ENUM_FIELDS, MACHINE_STATUS_CODES, STATUS_TIME_FIELDS
+
+
+SENSOR_ID_BYTES = 32
+
+# sequence, crc32, timestamp_ns, duration, measurement, six enum codes (see the binary serializer),
+# machine status code, uptime/downtime field code, uptime/downtime, sensor_id length, sensor_id
+_SLOT = struct.Struct(f"<QIqdd6BBBdB{SENSOR_ID_BYTES}s11x")
+SLOT_SIZE = _SLOT.size
+_BODY = struct.Struct(f"<qdd6BBBdB{SENSOR_ID_BYTES}s")
+_CRC = struct.Struct("<I")
+
+# Header words (8 bytes each): capacity and slot size, the read index on its own cache
+# line (written by the shipper), and on another one the words written by the worker: the
+# dropped counter, the write index and the pid of the process writing.
+_HEADER_SIZE = 192
+_CAPACITY, _SLOT_WORD, _READ_INDEX, _DROPPED, _WRITE_INDEX, _WRITER = 0, 1, 8, 16, 17, 18
+
+_ENCODE = {field: {member: code for code, member in enumerate(members)} for field, members in ENUM_CODES.items()}
+_DECODE = {field: members for field, members in ENUM_CODES.items()}
+_MACHINE_STATUS_ENCODE = {value: code for code, value in enumerate(MACHINE_STATUS_CODES) if value}
+_LOG_CLASSES = {
+    log_cls.SENSOR_TYPE: log_cls
+    for log_cls in (ElectricalLogData, HumidityLogData, PressureLogData, TemperatureLogData, VibrationLogData)
+}
+
+
+def _shared_memory(name: Optional[str], size: int = 0):
+    from multiprocessing import shared_memory
+
+    if name is None:
+        return shared_memory.SharedMemory(create=True, size=size)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Before Python 3.13 attaching registers the segment with the resource tracker, which
+    # unlinks it when the tracker exits. Children started by multiprocessing share the
+    # creator's tracker, where the name is already registered; any other process starts
+    # its own tracker, so the registration is withdrawn there.
+    from multiprocessing import resource_tracker
+
+    inherited = getattr(resource_tracker._resource_tracker, "_fd", None) is not None
+    memory = shared_memory.SharedMemory(name=name)
+    if not inherited:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name != "posix":
+        # os.kill would terminate the process on Windows; assume the previous writer is gone.
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedRing:
+    """
+    Single-producer, single-consumer ring of fixed-size sensor records in shared memory.
+
+    Every slot holds the record fields, the machine status metadata and a sequence number,
+    all covered by a CRC32. The consumer only accepts a slot whose sequence is the one it
+    expects and whose CRC matches, so it never reads a half-written or reordered slot without
+    any lock or memory barrier. The writer only reads the consumer's index when its cached
+    copy says the ring is full.
+
+    One writing process per ring: attach_writer() claims the ring and resumes at the write index
+    kept in the header, so a restarted worker continues where the previous one stopped. Within
+    the process the RingLoggers of a ring share one handle and serialise on its write_lock.
+    Needs Python 3.8+ (multiprocessing.shared_memory).
+    """
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536):
+        """
+        :param name: Name of an existing ring to attach to; None creates a new ring.
+        :param capacity: Number of slots of a new ring.
+        """
+        self._memory = _shared_memory(name, _HEADER_SIZE + capacity * SLOT_SIZE)
+        self.owner = name is None
+        self._header = self._memory.buf[:_HEADER_SIZE].cast("Q")
+        if self.owner:
+            self._header[_CAPACITY] = capacity
+            self._header[_SLOT_WORD] = SLOT_SIZE
+        elif self._header[_SLOT_WORD] != SLOT_SIZE:
+            raise ValueError(f"Shared ring {name} has slots of {self._header[_SLOT_WORD]} bytes, expected {SLOT_SIZE}")
+
+        self.capacity = self._header[_CAPACITY]
+        self._slots = self._memory.buf[_HEADER_SIZE:_HEADER_SIZE + self.capacity * SLOT_SIZE]
+        self._sequences = self._slots.cast("Q")
+        self._words_per_slot = SLOT_SIZE // 8
+
+        # Writer side: next index to write and the last read index seen, set by attach_writer().
+        self._write_index = self._header[_WRITE_INDEX]
+        self._read_seen = self._header[_READ_INDEX]
+        self._writers = 0
+        self._close_on_detach = False
+        self.write_lock = threading.Lock()
+        # Reader side: next index to read, and decoded sensor ids.
+        self._read_index = self._header[_READ_INDEX]
+        self._sensor_ids = {}
+
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of records the writer dropped because the ring was full.
+        """
+        return self._header[_DROPPED]
+
+
+    def count_dropped(self):
+        self._header[_DROPPED] += 1
+
+
+    def attach_writer(self):
+        """
+        Claims the writer side of the ring for this process, or adds a writer of this process to
+        the claim. The first claim resumes at the write index in the header, after any record a
+        crashed writer completed without publishing the index.
+
+        :raises RuntimeError: If another live process writes into the ring, or another handle of
+            this process does.
+        """
+        with _WRITERS_LOCK:
+            if self._writers:
+                self._writers += 1
+                return
+            claimed = _WRITERS.get(self.name)
+            if claimed is not None and claimed is not self:
+                raise RuntimeError(f"Shared ring {self.name} is already written through another handle of this process")
+            pid = self._header[_WRITER]
+            if pid and pid != os.getpid() and _process_alive(pid):
+                raise RuntimeError(f"Shared ring {self.name} is already written by process {pid}")
+
+            self._header[_WRITER] = os.getpid()
+            read_index = self._header[_READ_INDEX]
+            index = max(self._header[_WRITE_INDEX], read_index)
+            while index - read_index < self.capacity and self._complete(index):
+                index += 1
+            self._header[_WRITE_INDEX] = self._write_index = index
+            self._read_seen = read_index
+            self._writers = 1
+            _WRITERS[self.name] = self
+
+
+    def detach_writer(self) -> bool:
+        """
+        Removes a writer added by attach_writer(); the last one releases the claim.
+
+        :return: True if the claim was released.
+        """
+        with _WRITERS_LOCK:
+            if not self._writers:
+                return False
+            self._writers -= 1
+            if self._writers:
+                return False
+            self._header[_WRITER] = 0
+            if _WRITERS.get(self.name) is self:
+                del _WRITERS[self.name]
+            return True
+
+
+    def _complete(self, index: int) -> bool:
+        slot = index % self.capacity
+        sequence = index + 1
+        if self._sequences[slot * self._words_per_slot] != sequence:
+            return False
+        offset = slot * SLOT_SIZE
+        body = bytes(self._slots[offset + 12:offset + 12 + _BODY.size])
+        return zlib.crc32(body, sequence & 0xFFFFFFFF) == _CRC.unpack_from(self._slots, offset + 8)[0]
+
+
+    def pending(self) -> int:
+        """
+        Number of records waiting for the consumer (as seen by the writer).
+        """
+        return self._write_index - self._header[_READ_INDEX]
+
+
+    def write(self, log_object: BaseSensorLogData) -> bool:
+        """
+        Appends a record.
+
+        :return: False if the ring is full.
+        :raises ValueError: If the record cannot be encoded in a slot (custom metadata, long sensor id).
+        """
+        index = self._write_index
+        if index - self._read_seen >= self.capacity:
+            self._read_seen = self._header[_READ_INDEX]
+            if index - self._read_seen >= self.capacity:
+                return False
+
+        body = _encode(log_object)
+        sequence = index + 1
+        _SLOT.pack_into(
+            self._slots,
+            (index % self.capacity) * SLOT_SIZE,
+            sequence,
+            zlib.crc32(body, sequence & 0xFFFFFFFF),
+            *_BODY.unpack(body),
+        )
+        self._write_index = self._header[_WRITE_INDEX] = sequence
+        return True
+
+
+    def read_many(self, count: int) -> List[BaseSensorLogData]:
+        """
+        Removes and returns up to count records, oldest first.
+        """
+        records = []
+        index = self._read_index
+        capacity = self.capacity
+        while len(records) < count:
+            slot = index % capacity
+            sequence = index + 1
+            if self._sequences[slot * self._words_per_slot] != sequence:
+                break
+            offset = slot * SLOT_SIZE
+            body = bytes(self._slots[offset + 12:offset + 12 + _BODY.size])
+            if zlib.crc32(body, sequence & 0xFFFFFFFF) != _CRC.unpack_from(self._slots, offset + 8)[0]:
+                # Still being written.
+                break
+            records.append(self._decode(body))
+            index = sequence
+
+        if index != self._read_index:
+            self._read_index = index
+            self._header[_READ_INDEX] = index
+        return records
+
+
+    def _decode(self, body: bytes) -> BaseSensorLogData:
+        (
+            timestamp_ns, duration, measurement,
+            channel, data_center, product, status, type_, unit,
+            status_code, time_code, status_time, id_length, sensor_id,
+        ) = _BODY.unpack(body)
+
+        raw_id = sensor_id[:id_length]
+        sensor_id = self._sensor_ids.get(raw_id)
+        if sensor_id is None:
+            sensor_id = self._sensor_ids[raw_id] = raw_id.decode("utf-8")
+
+        metadata = {}
+        if status_code:
+            metadata["machine_status"] = MACHINE_STATUS_CODES[status_code]
+        if time_code:
+            metadata[STATUS_TIME_FIELDS[time_code]] = status_time
+
+        sensor_type = _DECODE["type"][type_]
+        return _LOG_CLASSES.get(sensor_type, BaseSensorLogData)(
+            sensor_id=sensor_id,
+            channel=_DECODE["channel"][channel],
+            data_center=_DECODE["data_center"][data_center],
+            duration=duration,
+            measurement=measurement,
+            product=_DECODE["product"][product],
+            status=_DECODE["status"][status],
+            type=sensor_type,
+            unit=_DECODE["unit"][unit],
+            metadata=metadata,
+            timestamp_ns=timestamp_ns,
+        )
+
+
+    def close(self):
+        """
+        Detaches from the ring; the creator also removes it.
+        """
+        if self._writers:
+            self._writers = 1
+            self.detach_writer()
+        self._sequences.release()
+        self._slots.release()
+        self._header.release()
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
+
+
+# Rings this process writes into, by name, so every RingLogger of a ring shares one handle.
+_WRITERS: Dict[str, SharedRing] = {}
+_WRITERS_LOCK = threading.RLock()
+
+
+def _encode(log_object: BaseSensorLogData) -> bytes:
+    metadata = log_object.metadata
+    status_code, time_code, status_time = 0, 0, 0.0
+    if metadata:
+        remaining = len(metadata)
+        machine_status = metadata.get("machine_status")
+        if machine_status is not None:
+            status_code = _MACHINE_STATUS_ENCODE[machine_status]
+            remaining -= 1
+        for code in (1, 2):
+            if STATUS_TIME_FIELDS[code] in metadata:
+                time_code, status_time = code, metadata[STATUS_TIME_FIELDS[code]]
+                remaining -= 1
+                break
+        if remaining:
+            raise ValueError("Shared ring records only carry the machine status metadata")
+
+    sensor_id = log_object.sensor_id.encode("utf-8")
+    if len(sensor_id) > SENSOR_ID_BYTES:
+        raise ValueError(f"Shared ring records support sensor ids of at most {SENSOR_ID_BYTES} bytes")
+
+    return _BODY.pack(
+        log_object.timestamp_ns,
+        log_object.duration,
+        log_object.measurement,
+        *(_ENCODE[field][getattr(log_object, field)] for field in ENUM_FIELDS),
+        status_code,
+        time_code,
+        status_time,
+        len(sensor_id),
+        sensor_id,
+    )
+
+
+class RingLogger(SensorLogMethods):
+    """
+    Synchronous logging API of a worker process, writing records into a SharedRing that a
+    RingShipper in another process drains.
+
+    The worker needs no producer, file handler or event loop. Records carry the standard
+    fields and the machine status metadata; other metadata is rejected. Every RingLogger of a
+    ring in a process writes through the same SharedRing handle and lock.
+    """
+    __slots__ = ("sensor_id", "machine_status", "status_timestamp", "ring", "overload_policy")
+
+    def __init__(self, ring_name: str, sensor_id: str, overload_policy: str = "block", ring: Optional[SharedRing] = None):
+        """
+        :param ring_name: Name of the SharedRing created by the shipper process.
+        :param sensor_id: Unique identifier for the sensor.
+        :param overload_policy: "block" (wait for the shipper when the ring is full) or "drop_newest"
+            (drop the record and count it in the ring's dropped counter).
+        :param ring: An already attached ring to write into instead of attaching to ring_name.
+        :raises RuntimeError: If another process writes into the ring.
+        """
+        if overload_policy not in ("block", "drop_newest"):
+            raise ValueError(f"Unknown overload policy for a shared ring: {overload_policy}")
+
+        self.sensor_id = sensor_id
+        self.machine_status = None
+        self.status_timestamp = None
+        self.overload_policy = overload_policy
+        with _WRITERS_LOCK:
+            if ring is None:
+                ring = _WRITERS.get(ring_name)
+            if ring is None:
+                ring = SharedRing(ring_name)
+                # Attached here, so the last RingLogger writing into it closes it.
+                ring._close_on_detach = True
+            try:
+                ring.attach_writer()
+            except Exception:
+                if ring._close_on_detach and not ring._writers:
+                    ring.close()
+                raise
+        self.ring = ring
+
+
+    @property
+    def logger(self):
+        return logging.getLogger("sensor_logger")
+
+
+    def sensor(self, sensor_id: str) -> "RingLogger":
+        """
+        Returns a logger of another sensor of this worker writing into the same ring.
+        """
+        return RingLogger(self.ring.name, sensor_id, self.overload_policy, ring=self.ring)
+
+
+    def _write(self, log_object: BaseSensorLogData):
+        ring = self.ring
+        with ring.write_lock:
+            while not ring.write(log_object):
+                if self.overload_policy == "drop_newest":
+                    ring.count_dropped()
+                    return
+                time.sleep(0.0005)
+
+
+    async def _log(self, log_object: BaseSensorLogData):
+        self._write(log_object)
+
+
+    async def _log_batch(self, template, measurements, timestamps, durations):
+        for log_object in batch_objects(template, batch_columns(template, measurements, timestamps, durations)):
+            self._write(log_object)
+
+
+    def close(self):
+        """
+        Stops writing; the last RingLogger of the process detaches from the ring (the shipper
+        keeps draining it).
+        """
+        with _WRITERS_LOCK:
+            if self.ring.detach_writer() and self.ring._close_on_detach:
+                self.ring.close()
+
+
+    log_electrical = synchronous(SensorLogMethods.log_electrical)
+    log_humidity = synchronous(SensorLogMethods.log_humidity)
+    log_pressure = synchronous(SensorLogMethods.log_pressure)
+    log_temperature = synchronous(SensorLogMethods.log_temperature)
+    log_vibration = synchronous(SensorLogMethods.log_vibration)
+    log_batch = synchronous(SensorLogMethods.log_batch)
+
+
+class RingShipper:
+    """
+    Drains the rings of the worker processes into a LoggerConfig on the running event loop.
+
+    The shipper process owns the only producer connection and file handler, so records of
+    every worker go through one set of sinks, processing stages and metrics. Workers cannot
+    wake the loop, so empty rings are polled every poll_interval seconds.
+    """
+    def __init__(self, config, rings: List[SharedRing], batch_size: int = 256, poll_interval: float = 0.001):
+        """
+        :param config: The initialized LoggerConfig receiving the records.
+        :param rings: The rings to drain, one per worker process.
+        :param batch_size: Maximum number of records taken from one ring before moving to the next.
+        :param poll_interval: Seconds to sleep when every ring was empty.
+        """
+        self.config = config
+        self.rings = list(rings)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.shipped = 0
+
+        self._closing = False
+        self._task = None
+
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.ensure_future(self._run())
+
+
+    def dropped(self) -> int:
+        """
+        Records the workers dropped because their ring was full.
+        """
+        return sum(ring.dropped for ring in self.rings)
+
+
+    async def drain(self) -> int:
+        """
+        Hands every record currently in the rings to the LoggerConfig.
+
+        :return: Number of records shipped.
+        """
+        shipped = 0
+        while True:
+            count = await self._drain_once()
+            if not count:
+                return shipped
+            shipped += count
+
+
+    async def _drain_once(self) -> int:
+        count = 0
+        log = self.config._log
+        for ring in self.rings:
+            records = ring.read_many(self.batch_size)
+            for log_object in records:
+                await log(log_object)
+            count += len(records)
+        self.shipped += count
+        return count
+
+
+    async def _run(self):
+        while not self._closing:
+            if await self._drain_once():
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+
+    async def close(self):
+        """
+        Stops polling after shipping the records still in the rings.
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        await self._task
+        self._task = None
+        await self.drain()
@@ -0,0 +1,61 @@
+from importlib import import_module
+from typing import Optional, Union
+
+from log_sdk.transport.sinks.base import FanOutSink, Sink
+
+
+# Sinks are imported only when selected, so e.g. fogverse is never imported without Kafka.
+SINKS = {
+    "kafka": ("log_sdk.transport.sinks.kafka_sink", "KafkaSink"),
+    "stdout": ("log_sdk.transport.sinks.stdout_sink", "StdoutSink"),
+    "udp": ("log_sdk.transport.sinks.udp_sink", "UdpSink"),
+    "memory": ("log_sdk.transport.sinks.memory_sink", "MemorySink"),
+}
+
+
+def create_sink(
+        spec: Union[str, Sink],
+        topic: Optional[str] = None,
+        bootstrap_servers: Optional[str] = None,
+        producer=None,
+    ) -> Sink:
+    """
+    Creates the sink registered under a name, or returns the given instance unchanged.
+
+    :param spec: "kafka", "stdout", "memory", "udp://host:port" or a Sink instance.
+    :param topic: Kafka topic, used by the Kafka sink.
+    :param bootstrap_servers: Kafka bootstrap servers, used by the Kafka sink.
+    :param producer: Optional producer used by the Kafka sink instead of the fogverse KafkaProducer.
+    """
+    if isinstance(spec, Sink):
+        return spec
+
+    name, _, address = spec.partition("://")
+    if name not in SINKS:
+        raise ValueError(f"Unknown sink: {spec}")
+
+    module, cls = SINKS[name]
+    sink_class = getattr(import_module(module), cls)
+
+    if name == "kafka":
+        return sink_class(topic, bootstrap_servers, producer=producer)
+    if name == "udp":
+        host, _, port = address.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"UDP sink needs an address like udp://host:port, got {spec}")
+        return sink_class(host.strip("[]"), int(port))
+    return sink_class()
+
+
+def create_sinks(specs: list, **options) -> Optional[Sink]:
+    """
+    Creates the sinks for a list of specs (see create_sink) and combines several into a FanOutSink.
+
+    :return: The single sink, a FanOutSink, or None for an empty list.
+    """
+    sinks = [create_sink(spec, **options) for spec in specs]
+    if not sinks:
+        return None
+    if len(sinks) == 1:
+        return sinks[0]
+    return FanOutSink(sinks)
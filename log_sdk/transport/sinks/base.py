@@ -0,0 +1,81 @@
+from typing import List, Optional
+
+import asyncio
+
+
+class SinkError(Exception):
+    """
+    Raised by a FanOutSink for a payload one of its sinks did not accept.
+    """
+    def __init__(self, label: str, error: Exception):
+        """
+        :param label: Label of the failed sink.
+        :param error: The error the sink raised.
+        """
+        super().__init__(str(error))
+        self.label = label
+        self.error = error
+
+
+class Sink:
+    """
+    Destination of the serialized payloads of a LoggerConfig.
+
+    send() raises when a payload was not accepted; the logger then spools it (if a spool is
+    configured) and replays it through send() later. The key is only passed when the logger
+    has a partition_key; sinks without partitions ignore it. label names the sink in error
+    messages.
+    """
+    label = "Sink"
+
+    async def start(self):
+        pass
+
+
+    async def send(self, payload: bytes, key: Optional[bytes] = None):
+        raise NotImplementedError
+
+
+    async def stop(self):
+        pass
+
+
+class FanOutSink(Sink):
+    """
+    Sends every payload to several sinks.
+
+    A payload is offered to every sink even if one of them fails; the first error is raised
+    afterwards as a SinkError naming the failed sink. Since the spool replays a failed payload to all sinks, the sinks that had
+    accepted it receive it twice (delivery is at least once, like Kafka retries).
+    """
+    def __init__(self, sinks: List[Sink]):
+        """
+        :param sinks: The sinks to send to, in order.
+        """
+        self.sinks = list(sinks)
+        self.label = "+".join(sink.label for sink in self.sinks)
+
+
+    async def start(self):
+        for sink in self.sinks:
+            await sink.start()
+
+
+    async def send(self, payload: bytes, key: Optional[bytes] = None):
+        error = None
+        for sink in self.sinks:
+            try:
+                if key is None:
+                    await sink.send(payload)
+                else:
+                    await sink.send(payload, key=key)
+            except Exception as e:
+                if error is None:
+                    error = SinkError(sink.label, e)
+                    error.__cause__ = e
+        if error is not None:
+            raise error
+
+
+    async def stop(self):
+        await asyncio.gather(*(sink.stop() for sink in self.sinks))
@@ -0,0 +1,33 @@
+from collections import deque
+from typing import List, Optional
+
+from log_sdk.serializers import decode_records
+from log_sdk.transport.sinks.base import Sink
+
+
+class MemorySink(Sink):
+    """
+    Keeps the payloads in memory, for tests and for inspecting recent records in place.
+    """
+    label = "Memory"
+
+    def __init__(self, max_records: Optional[int] = None):
+        """
+        :param max_records: Number of most recent payloads to keep (None keeps all of them).
+        """
+        self.payloads = deque(maxlen=max_records)
+
+
+    async def send(self, payload: bytes, key: Optional[bytes] = None):
+        self.payloads.append(payload)
+
+
+    def records(self) -> List[dict]:
+        """
+        Returns the kept payloads decoded back into record dicts, oldest first.
+        """
+        return [record for payload in self.payloads for record in decode_records(payload)]
+
+
+    def clear(self):
+        self.payloads.clear()
@@ -0,0 +1,25 @@
+from typing import Optional
+
+import sys
+
+from log_sdk.transport.sinks.base import Sink
+
+
+class StdoutSink(Sink):
+    """
+    Writes every payload followed by a newline to standard output, e.g. for a container log
+    collector. Pair it with a text serializer (json or orjson).
+    """
+    label = "Stdout"
+
+    def __init__(self, stream=None):
+        """
+        :param stream: Binary stream to write to instead of sys.stdout.buffer.
+        """
+        self.stream = stream
+
+
+    async def send(self, payload: bytes, key: Optional[bytes] = None):
+        stream = self.stream or sys.stdout.buffer
+        stream.write(payload + b"\n")
+        stream.flush()
@@ -0,0 +1,59 @@
+from typing import Optional
+
+import asyncio
+
+from log_sdk.transport.sinks.base import Sink
+
+
+class UdpSink(Sink):
+    """
+    Sends every payload as one UDP datagram, fire and forget.
+
+    Only errors the local socket reports are raised (e.g. a payload too large for a
+    datagram); lost datagrams go unnoticed.
+    """
+    label = "UDP"
+
+    def __init__(self, host: str, port: int):
+        """
+        :param host: Receiver host name or address.
+        :param port: Receiver port.
+        """
+        self.host = host
+        self.port = port
+        self._transport = None
+        self._protocol = None
+
+
+    async def start(self):
+        if self._transport is None:
+            loop = asyncio.get_event_loop()
+            self._transport, self._protocol = await loop.create_datagram_endpoint(
+                _DatagramProtocol, remote_addr=(self.host, self.port)
+            )
+
+
+    async def send(self, payload: bytes, key: Optional[bytes] = None):
+        if self._transport is None:
+            raise RuntimeError("UdpSink.start() was not awaited")
+        error = self._protocol.error
+        if error is not None:
+            self._protocol.error = None
+            raise error
+        self._transport.sendto(payload)
+
+
+    async def stop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.error = None
+
+
+    def error_received(self, exc):
+        # Reported asynchronously (e.g. ICMP port unreachable); raised by the next send.
+        self.error = exc
@@ -0,0 +1,341 @@
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import asyncio
+import json
+import os
+import struct
+import zlib
+
+
+_FRAME = struct.Struct("<II")
+_CHECKPOINT = "checkpoint.json"
+_SUFFIX = ".seg"
+
+
+class DiskSpool:
+    """
+    Append-only, segment-based local spool for payloads that could not be sent.
+
+    Payloads are appended to buffered segment files as length and CRC32 framed records.
+    A reader cursor (segment, offset) is checkpointed to disk so replay resumes where it
+    stopped after a restart. When the spool exceeds max_bytes the oldest segment is dropped.
+    """
+    def __init__(
+            self,
+            directory: str,
+            segment_bytes: int = 16 * 1024 * 1024,
+            max_bytes: int = 512 * 1024 * 1024,
+            fsync: bool = False,
+        ):
+        """
+        :param directory: Directory holding the segment files and the checkpoint.
+        :param segment_bytes: Size in bytes after which a new segment is started.
+        :param max_bytes: Maximum total size of all segments; the oldest segment is dropped beyond it.
+        :param fsync: Boolean flag forcing an fsync after every append.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.dropped = 0
+        # Dropped segments the last read() may have returned positions in: number -> [records committed, records].
+        self._dropped_segments = {}
+
+        os.makedirs(directory, exist_ok=True)
+
+        # segment number -> [size in bytes, number of records]
+        self._segments = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(_SUFFIX):
+                number = int(name[:-len(_SUFFIX)])
+                self._segments[number] = list(self._scan(number))
+
+        self._cursor = self._load_checkpoint()
+        self._consumed = self._scan(self._cursor[0], self._cursor[1])[1] if self._cursor[0] in self._segments else 0
+
+        # Appends continue the last segment of a previous run, after its last valid frame.
+        self._writer = None
+        self._writer_number = max(self._segments, default=0)
+        if self._writer_number:
+            # A corrupt frame would stop read() before every record appended after it.
+            _, count = self._segments[self._writer_number]
+            self._segments[self._writer_number] = list(self._scan(self._writer_number, verify=True))
+            self.dropped += count - self._segments[self._writer_number][1]
+            with open(self._path(self._writer_number), "r+b") as tail:
+                tail.truncate(self._segments[self._writer_number][0])
+            self._writer = open(self._path(self._writer_number), "ab")
+        else:
+            self._open_segment(1)
+
+
+    def _path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{number:010d}{_SUFFIX}")
+
+
+    def _scan(self, number: int, limit: int = None, verify: bool = False) -> Tuple[int, int]:
+        """
+        Walks the complete frames of a segment, up to an optional byte offset.
+
+        :param verify: Boolean flag also stopping at the first frame failing its CRC.
+        :return: The offset after the last valid frame and the number of frames.
+        """
+        offset, count = 0, 0
+        with open(self._path(number), "rb") as segment:
+            while limit is None or offset < limit:
+                header = segment.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    break
+                length, crc = _FRAME.unpack(header)
+                payload = segment.read(length)
+                if len(payload) < length or (verify and zlib.crc32(payload) != crc):
+                    break
+                offset += _FRAME.size + length
+                count += 1
+        return offset, count
+
+
+    def _load_checkpoint(self) -> Tuple[int, int]:
+        first = min(self._segments, default=1)
+        try:
+            with open(os.path.join(self.directory, _CHECKPOINT), "r") as checkpoint:
+                state = json.load(checkpoint)
+        except (OSError, ValueError):
+            return first, 0
+
+        if state["segment"] not in self._segments:
+            return first, 0
+        return state["segment"], state["offset"]
+
+
+    def _save_checkpoint(self):
+        path = os.path.join(self.directory, _CHECKPOINT)
+        with open(path + ".tmp", "w") as checkpoint:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, checkpoint)
+        os.replace(path + ".tmp", path)
+
+
+    def _open_segment(self, number: int):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = open(self._path(number), "ab")
+        self._writer_number = number
+        self._segments[number] = [0, 0]
+
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of spooled records not yet confirmed by commit().
+        """
+        return sum(count for number, (_, count) in self._segments.items() if number >= self._cursor[0]) - self._consumed
+
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of all segments in bytes.
+        """
+        return sum(size for size, _ in self._segments.values())
+
+
+    def append(self, payload: bytes):
+        """
+        Appends a payload, rolling to a new segment and enforcing max_bytes as needed.
+        """
+        segment = self._segments[self._writer_number]
+        if segment[0] >= self.segment_bytes:
+            self._open_segment(self._writer_number + 1)
+            segment = self._segments[self._writer_number]
+
+        self._writer.write(_FRAME.pack(len(payload), zlib.crc32(payload)))
+        self._writer.write(payload)
+        self._writer.flush()
+        if self.fsync:
+            os.fsync(self._writer.fileno())
+
+        segment[0] += _FRAME.size + len(payload)
+        segment[1] += 1
+
+        while self.size > self.max_bytes and len(self._segments) > 1:
+            self._drop_oldest()
+
+
+    def _drop_oldest(self):
+        number = min(self._segments)
+        _, count = self._segments.pop(number)
+        os.remove(self._path(number))
+
+        if number >= self._cursor[0]:
+            # Records read but not yet committed count as dropped unless a commit() reports them sent.
+            self.dropped += count - self._consumed
+            self._dropped_segments[number] = [self._consumed, count]
+            self._cursor = (min(self._segments), 0)
+            self._consumed = 0
+            self._save_checkpoint()
+
+
+    def read(self, max_records: int) -> List[Tuple[bytes, Tuple[int, int, int]]]:
+        """
+        Reads up to max_records payloads from the cursor without consuming them.
+
+        :return: Pairs of payload and the position to pass to commit() once it has been sent.
+        """
+        records = []
+        number, offset = self._cursor
+        consumed = self._consumed
+        # Positions of an earlier read() are committed before the next one.
+        self._dropped_segments.clear()
+
+        while len(records) < max_records and number in self._segments:
+            if number == self._writer_number:
+                self._writer.flush()
+
+            with open(self._path(number), "rb") as segment:
+                segment.seek(offset)
+                while len(records) < max_records:
+                    header = segment.read(_FRAME.size)
+                    if len(header) < _FRAME.size:
+                        break
+                    length, crc = _FRAME.unpack(header)
+                    payload = segment.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        # Torn or corrupt tail left by a crash: the rest of this segment is unusable.
+                        self.dropped += self._segments[number][1] - consumed
+                        self._segments[number][1] = consumed
+                        break
+                    offset += _FRAME.size + length
+                    consumed += 1
+                    records.append((payload, (number, offset, consumed)))
+
+            if len(records) >= max_records or number == self._writer_number:
+                break
+
+            later = [n for n in self._segments if n > number]
+            if not later:
+                break
+            number, offset, consumed = min(later), 0, 0
+
+        return records
+
+
+    def commit(self, position: Tuple[int, int, int]):
+        """
+        Marks every record up to a position returned by read() as sent and checkpoints it.
+
+        A position in a segment dropped for max_bytes since it was read leaves the cursor where
+        the drop moved it, and only takes the records sent from the dropped count.
+        """
+        number, offset, consumed = position
+        for dropped in sorted(self._dropped_segments):
+            if dropped > number:
+                break
+            committed, count = self._dropped_segments.pop(dropped)
+            self.dropped -= max(0, (consumed if dropped == number else count) - committed)
+            if dropped == number and consumed < count:
+                self._dropped_segments[number] = [consumed, count]
+        if number not in self._segments or (number, offset) <= self._cursor:
+            return
+
+        self._cursor = (number, offset)
+        self._consumed = consumed
+
+        for old in [n for n in self._segments if n < number]:
+            del self._segments[old]
+            os.remove(self._path(old))
+
+        self._save_checkpoint()
+
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SpoolReplayer:
+    """
+    Background task replaying spooled payloads in order at a bounded rate.
+
+    The replayer also tracks producer health: a failed send marks it unhealthy, and the
+    first successful replay (or an empty spool) marks it healthy again.
+    """
+    def __init__(
+            self,
+            spool: DiskSpool,
+            send: Callable[[bytes], Awaitable[None]],
+            rate: float = 1000.0,
+            batch_size: int = 100,
+            retry_interval: float = 1.0,
+            on_error: Optional[Callable[[Exception], None]] = None,
+        ):
+        """
+        :param spool: The spool to replay.
+        :param send: Coroutine function sending one payload and raising on failure.
+        :param rate: Maximum number of replayed records per second.
+        :param batch_size: Number of records read from the spool at a time.
+        :param retry_interval: Seconds to wait after a failed send or while the spool is empty.
+        :param on_error: Optional callback receiving send errors.
+        """
+        self.spool = spool
+        self.send = send
+        self.rate = rate
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.on_error = on_error
+        self.healthy = True
+        self.replayed = 0
+
+        self._task = None
+
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+
+    async def close(self):
+        """
+        Stops replaying; progress up to the last sent record is already checkpointed.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+    async def _run(self):
+        while True:
+            records = self.spool.read(self.batch_size)
+            if not records:
+                self.healthy = True
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            sent = None
+            failed = False
+            try:
+                for payload, position in records:
+                    await self.send(payload)
+                    sent = position
+                    self.replayed += 1
+            except Exception as e:
+                failed = True
+                self.healthy = False
+                if self.on_error is not None:
+                    self.on_error(e)
+            finally:
+                if sent is not None:
+                    self.spool.commit(sent)
+
+            # Records sent before a failure stay committed, but the sink is still failing.
+            if failed:
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            self.healthy = True
+            await asyncio.sleep(len(records) / self.rate)
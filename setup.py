@@ -11,10 +11,16 @@ setup(
     description="A standardized logging SDK",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*", "tests", "tests.*"]),
     install_requires=[
        "fogverse @ git+https://github.com/naufalweise/fogverse.git@refactoring#egg=fogverse"
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "msgpack": ["msgpack"],
+        "zstd": ["zstandard"],
+        "numpy": ["numpy"],
+    },
     url="https://github.com/anindyalkwr/log-sdk.git",
     classifiers=[
         "Programming Language :: Python :: 3",
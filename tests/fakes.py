@@ -0,0 +1,152 @@
+import asyncio
+import random
+
+from log_sdk.transport.partitioning import partition_for
+
+
+class FakeProducer:
+    """
+    In-process stand-in for the fogverse KafkaProducer used by the tests and benchmarks.
+    """
+    def __init__(self, latency: float = 0.0):
+        """
+        :param latency: Simulated produce round trip in seconds for every _send call.
+        """
+        self.latency = latency
+        self.messages = []
+        self.keys = []
+        # Set to True to make every _send raise, simulating a broker outage.
+        self.fail = False
+
+
+    async def start(self):
+        pass
+
+
+    async def stop(self):
+        pass
+
+
+    async def _send(self, data, *args, key=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError("Simulated broker outage")
+        self.messages.append(data)
+        self.keys.append(key)
+
+
+class FakeBroker(FakeProducer):
+    """
+    Fake producer appending every message to one of several partition logs, assigning keyed
+    messages like Kafka's default partitioner and unkeyed ones to a random partition.
+    """
+    def __init__(self, partitions: int, latency: float = 0.0):
+        """
+        :param partitions: Number of partitions of the simulated topic.
+        :param latency: Simulated produce round trip in seconds for every _send call.
+        """
+        super().__init__(latency=latency)
+        self.partitions = [[] for _ in range(partitions)]
+        self._random = random.Random(0)
+
+
+    async def _send(self, data, *args, key=None, **kwargs):
+        await super()._send(data, *args, key=key, **kwargs)
+        if key is None:
+            partition = self._random.randrange(len(self.partitions))
+        else:
+            partition = partition_for(key, len(self.partitions))
+        self.partitions[partition].append((key, data))
+
+
+class FakeMessage:
+    """
+    Minimal stand-in for a confluent_kafka Message.
+    """
+    __slots__ = ("_value", "_offset", "_error", "_topic", "_partition")
+
+    def __init__(self, value: bytes, offset: int, error=None, topic: str = "sensor_logs", partition: int = 0):
+        self._value = value
+        self._offset = offset
+        self._error = error
+        self._topic = topic
+        self._partition = partition
+
+
+    def value(self):
+        return self._value
+
+
+    def offset(self):
+        return self._offset
+
+
+    def topic(self):
+        return self._topic
+
+
+    def partition(self):
+        return self._partition
+
+
+    def error(self):
+        return self._error
+
+
+class FakeTopicPartition:
+    """
+    Minimal stand-in for a confluent_kafka TopicPartition.
+    """
+    # confluent_kafka.OFFSET_INVALID: no offset set, the committed one is used.
+    OFFSET_INVALID = -1001
+
+    def __init__(self, topic: str, partition: int, offset: int = OFFSET_INVALID):
+        self.topic = topic
+        self.partition = partition
+        self.offset = offset
+
+
+class FakeConsumer:
+    """
+    In-process stand-in for a subscribed confluent_kafka Consumer over a fixed list of payloads.
+
+    A None payload is delivered as an error message. commit() records how many messages had
+    been consumed, so callers can check what would have been acknowledged to the broker.
+    """
+    def __init__(self, payloads: list):
+        self.messages = [
+            FakeMessage(payload, offset, None if payload is not None else "Simulated broker error")
+            for offset, payload in enumerate(payloads)
+        ]
+        self.position = 0
+        self.committed = 0
+        self.commits = []
+        self.assigned = []
+        self.closed = False
+
+
+    def consume(self, num_messages: int = 1, timeout: float = -1):
+        batch = self.messages[self.position:self.position + num_messages]
+        self.position += len(batch)
+        return batch
+
+
+    def assign(self, partitions: list):
+        """
+        Records the assignment and seeks to the offset set on partition 0 of sensor_logs (the
+        partition every message is in), if any.
+        """
+        self.assigned = list(partitions)
+        for partition in self.assigned:
+            if (partition.topic, partition.partition) == ("sensor_logs", 0) and partition.offset >= 0:
+                self.position = partition.offset
+
+
+    def commit(self, message=None, offsets=None, asynchronous=True):
+        self.committed = self.position
+        self.commits.append(self.position)
+
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,135 @@
+import statistics
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.processing.aggregation import WindowAggregation, WindowAggregator
+from log_sdk.sensor_logs.base_sensor import format_timestamp_ns
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+SECOND = 1_000_000_000
+START_NS = 1_767_225_600 * SECOND
+
+
+def reading(second, measurement, status=Status.NORMAL, sensor_id="sensor-001", log_class=VibrationLogData):
+    return log_class(
+        sensor_id,
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=measurement,
+        product=Product.MACHINE_MONITORING,
+        status=status,
+        metadata={"machine_status": "Start"},
+        timestamp_ns=START_NS + int(second * SECOND),
+    )
+
+
+def run(aggregator, readings):
+    output = []
+    for log_object in readings:
+        output.extend(aggregator.process(log_object))
+    return output
+
+
+def assert_rollup(rollup, values, window_start, window_end):
+    stats = rollup.metadata["aggregation"]
+    assert stats["count"] == len(values)
+    assert stats["min"] == min(values)
+    assert stats["max"] == max(values)
+    assert stats["last"] == values[-1]
+    assert stats["mean"] == pytest.approx(statistics.fmean(values))
+    assert stats["variance"] == pytest.approx(statistics.pvariance(values))
+    assert stats["window_start"] == format_timestamp_ns(START_NS + window_start * SECOND)
+    assert stats["window_end"] == format_timestamp_ns(START_NS + window_end * SECOND)
+    assert rollup.measurement == pytest.approx(statistics.fmean(values))
+    assert rollup.timestamp_ns == START_NS + window_end * SECOND
+
+
+def test_tumbling_windows():
+    aggregator = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0)})
+    values = [float((i * 7) % 11) for i in range(25)]
+
+    rollups = run(aggregator, [reading(i, value) for i, value in enumerate(values)])
+    # The first reading of a window closes the previous one.
+    assert len(rollups) == 2
+    assert_rollup(rollups[0], values[:10], 0, 10)
+    assert_rollup(rollups[1], values[10:20], 10, 20)
+    assert type(rollups[0]) is VibrationLogData
+    assert rollups[0].duration == 10.0
+    assert rollups[0].status is Status.NORMAL
+    assert rollups[0].metadata["machine_status"] == "Start"
+
+    # flush() emits the open window and forgets it.
+    flushed = aggregator.flush()
+    assert len(flushed) == 1
+    assert_rollup(flushed[0], values[20:], 20, 30)
+    assert aggregator.flush() == []
+    assert aggregator.counters() == {"suppressed": {"VibrationLogData": 25}, "rollups": {"VibrationLogData": 3}}
+
+
+def test_sliding_windows():
+    aggregator = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0, slide_seconds=5.0)})
+    values = [float(i) for i in range(20)]
+
+    rollups = run(aggregator, [reading(i, value) for i, value in enumerate(values)])
+    # One rollup per slide; the first window only holds the readings of its last pane.
+    assert len(rollups) == 3
+    assert_rollup(rollups[0], values[:5], -5, 5)
+    assert_rollup(rollups[1], values[:10], 0, 10)
+    assert_rollup(rollups[2], values[5:15], 5, 15)
+    assert_rollup(aggregator.flush()[0], values[10:], 10, 20)
+
+
+def test_gaps_do_not_produce_empty_windows():
+    tumbling = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0)})
+    rollups = run(tumbling, [reading(0, 1.0), reading(1, 3.0), reading(100, 5.0)])
+    assert len(rollups) == 1
+    assert_rollup(rollups[0], [1.0, 3.0], 0, 10)
+
+    sliding = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0, slide_seconds=5.0)})
+    rollups = run(sliding, [reading(0, 1.0), reading(100, 5.0)])
+    # The lone reading is in the two windows covering its pane, and nothing after them.
+    assert [rollup.metadata["aggregation"]["count"] for rollup in rollups] == [1, 1]
+    assert_rollup(sliding.flush()[0], [5.0], 95, 105)
+
+
+def test_worst_status_and_passthrough():
+    aggregator = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0)})
+    readings = [reading(0, 1.0), reading(1, 9.0, Status.CRITICAL), reading(2, 2.0, Status.WARNING), reading(10, 1.0)]
+
+    output = run(aggregator, readings)
+    # WARNING and worse are sent right away, and still counted in the rollup.
+    assert output[:2] == readings[1:3]
+    assert output[2].status is Status.CRITICAL
+    assert_rollup(output[2], [1.0, 9.0, 2.0], 0, 10)
+    assert aggregator.suppressed == {"VibrationLogData": 2}
+
+    silent = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0, passthrough_status=None)})
+    output = run(silent, readings)
+    assert len(output) == 1
+    assert output[0].status is Status.CRITICAL
+
+
+def test_windows_are_kept_per_sensor_and_other_types_pass_through():
+    aggregator = WindowAggregator({SensorType.VIBRATION: WindowAggregation(window_seconds=10.0)})
+    temperature = reading(0, 20.0, log_class=TemperatureLogData)
+    output = run(aggregator, [reading(0, 1.0, sensor_id="a"), reading(0, 3.0, sensor_id="b"), temperature])
+    assert output == [temperature]
+
+    rollups = {rollup.sensor_id: rollup for rollup in aggregator.flush()}
+    assert_rollup(rollups["a"], [1.0], 0, 10)
+    assert_rollup(rollups["b"], [3.0], 0, 10)
+
+
+def test_window_must_be_a_multiple_of_the_slide():
+    with pytest.raises(ValueError):
+        WindowAggregation(window_seconds=10.0, slide_seconds=3.0)
+    with pytest.raises(ValueError):
+        WindowAggregation(window_seconds=5.0, slide_seconds=10.0)
+    assert WindowAggregation(window_seconds=10.0, slide_seconds=2.5).panes == 4
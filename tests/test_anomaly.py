@@ -0,0 +1,165 @@
+import math
+import random
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.processing.anomaly import NUMPY_MIN_READINGS, AnomalyDetector, AnomalyRule
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+
+def reading(measurement, status=Status.NORMAL, sensor_id="sensor-001", log_class=VibrationLogData):
+    return log_class(
+        sensor_id,
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=measurement,
+        product=Product.MACHINE_MONITORING,
+        status=status,
+    )
+
+
+def signal(count, seed, spikes=()):
+    """
+    Noisy readings around 10 with a level shift halfway and a spike at each index in spikes.
+    """
+    generator = random.Random(seed)
+    values = [10.0 + generator.gauss(0.0, 0.5) + (3.0 if i >= count // 2 else 0.0) for i in range(count)]
+    for index in spikes:
+        values[index] += 8.0
+    return values
+
+
+def statuses(log_objects):
+    return [(log_object.status, log_object.channel) for log_object in log_objects]
+
+
+def test_thresholds_raise_the_status_and_move_criticals_to_the_alert_channel():
+    detector = AnomalyDetector({SensorType.VIBRATION: AnomalyRule(
+        warning_above=50.0, critical_above=80.0, warning_below=5.0, critical_below=1.0, warning_z=None)})
+    readings = [reading(10.0), reading(60.0), reading(90.0), reading(4.0), reading(0.5), reading(10.0, Status.FAULT)]
+    for log_object in readings:
+        assert detector.process(log_object) == [log_object]
+
+    assert statuses(readings) == [
+        (Status.NORMAL, Channel.SENSOR),
+        (Status.WARNING, Channel.SENSOR),
+        (Status.CRITICAL, Channel.ALERT),
+        (Status.WARNING, Channel.SENSOR),
+        (Status.CRITICAL, Channel.ALERT),
+        # The status a caller passes is never lowered.
+        (Status.FAULT, Channel.SENSOR),
+    ]
+    assert detector.counters() == {
+        "warnings": {"Vibration Sensor": 2},
+        "criticals": {"Vibration Sensor": 2},
+        "alerts": {"Vibration Sensor": 2},
+    }
+
+    # Other sensor types pass through unchanged.
+    temperature = reading(1000.0, log_class=TemperatureLogData)
+    assert detector.process(temperature) == [temperature]
+    assert temperature.status is Status.NORMAL
+
+
+def test_z_score_after_warmup():
+    rule = AnomalyRule(alpha=0.1, warmup=30, alert_status=None)
+    detector = AnomalyDetector({SensorType.VIBRATION: rule})
+    steady = [reading(value) for value in signal(100, seed=1)[:50]]
+    for log_object in steady:
+        detector.process(log_object)
+
+    spike = reading(20.0)
+    detector.process(spike)
+    assert spike.status is Status.CRITICAL
+    assert spike.channel is Channel.SENSOR
+
+    # A spike during the warmup is not anomalous for the z-score.
+    early = AnomalyDetector({SensorType.VIBRATION: rule})
+    readings = [reading(value) for value in signal(100, seed=1)[:20]] + [reading(20.0)]
+    for log_object in readings:
+        early.process(log_object)
+    assert readings[-1].status is Status.NORMAL
+
+
+def test_min_deviation_keeps_a_flat_signal_from_alerting_on_its_first_step():
+    readings = [reading(5.0) for _ in range(40)] + [reading(5.1)]
+    for min_deviation, expected in ((0.0, Status.CRITICAL), (0.2, Status.NORMAL)):
+        detector = AnomalyDetector({SensorType.VIBRATION: AnomalyRule(warmup=10, min_deviation=min_deviation)})
+        for log_object in readings:
+            log_object.status = Status.NORMAL
+            detector.process(log_object)
+        assert readings[-1].status is expected
+
+
+@pytest.mark.parametrize("alpha", [0.05, 1.0])
+def test_batch_evaluation_matches_one_reading_at_a_time(alpha):
+    pytest.importorskip("numpy")
+    rule = AnomalyRule(warning_above=30.0, critical_below=2.0, alpha=alpha, warmup=20)
+    count = 5 * NUMPY_MIN_READINGS
+
+    def readings():
+        # Two sensors in runs long enough for NumPy, a short run, and a run holding a NaN.
+        values = {sensor_id: signal(count, seed, spikes=(100, 200, 250)) for seed, sensor_id in enumerate("ab")}
+        values["b"][150] = 31.0
+        values["b"][160] = 1.0
+        runs = [("a", 0, 128), ("b", 0, 200), ("a", 128, 140), ("a", 140, count), ("b", 200, count)]
+        batch = [reading(value, sensor_id=sensor_id) for sensor_id, start, end in runs for value in values[sensor_id][start:end]]
+        batch.insert(len(batch) - 10, reading(math.nan, sensor_id="b"))
+        return batch
+
+    scalar = AnomalyDetector({SensorType.VIBRATION: rule})
+    expected = readings()
+    for log_object in expected:
+        scalar.process(log_object)
+
+    vectorized = AnomalyDetector({SensorType.VIBRATION: rule})
+    batch = readings()
+    assert vectorized.process_batch(batch) is batch
+
+    assert statuses(batch) == statuses(expected)
+    assert vectorized.counters() == scalar.counters()
+    assert scalar.counters()["criticals"]["Vibration Sensor"] >= 6
+    for key, baseline in scalar._baselines.items():
+        assert vectorized._baselines[key].count == baseline.count
+        assert vectorized._baselines[key].mean == pytest.approx(baseline.mean)
+        assert vectorized._baselines[key].variance == pytest.approx(baseline.variance)
+
+
+def test_evaluate_returns_severities_and_continues_the_baseline():
+    numpy = pytest.importorskip("numpy")
+    rule = AnomalyRule(warning_above=30.0, warmup=20)
+    values = signal(300, seed=3, spikes=(120,))
+    values[200] = 31.0
+
+    scalar = AnomalyDetector({SensorType.VIBRATION: rule})
+    expected = []
+    for value in values:
+        log_object = reading(value)
+        scalar.process(log_object)
+        expected.append(log_object.status.severity)
+
+    detector = AnomalyDetector({SensorType.VIBRATION: rule})
+    severities = numpy.concatenate([
+        detector.evaluate("sensor-001", SensorType.VIBRATION, values[:100]),
+        detector.evaluate("sensor-001", SensorType.VIBRATION, numpy.array(values[100:])),
+    ])
+    assert severities.tolist() == expected
+    assert severities[120] == 2
+    assert severities[200] >= 1
+
+    with pytest.raises(ValueError):
+        detector.evaluate("sensor-001", SensorType.VIBRATION, [1.0, math.inf])
+
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        AnomalyRule(alpha=0.0)
+    with pytest.raises(ValueError):
+        AnomalyRule(warning_z=5.0, critical_z=3.0)
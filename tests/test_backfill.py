@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+
+from log_sdk.backfill import Backfill
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+SENSORS = 4
+# Samples per sensor in each of the two log files.
+SAMPLES = 50
+START_NS = 1_767_225_600 * 1_000_000_000
+
+
+class StoppingProducer(FakeProducer):
+    """
+    Fake producer stopping the backfill once it received stop_after messages.
+    """
+    def __init__(self, stop_after):
+        super().__init__()
+        self.stop_after = stop_after
+        self.backfill = None
+
+
+    async def _send(self, data, *args, key=None, **kwargs):
+        await super()._send(data, *args, key=key, **kwargs)
+        if len(self.messages) == self.stop_after:
+            self.backfill.stop()
+
+
+def record(sensor, sample):
+    return VibrationLogData(
+        f"sensor-{sensor}",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=float(sample),
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start"},
+        timestamp_ns=START_NS + sample * 1_000_000_000,
+    ).to_dict()
+
+
+@pytest.fixture
+def log_directory(tmp_path):
+    """
+    Two pretty-printed log files, the backup (older) one first, like those left by an outage;
+    the newer one holds a record torn by a crash.
+    """
+    for name, samples in (("sensor_logs_2026-01-01.log.1", range(SAMPLES)), ("sensor_logs_2026-01-01.log", range(SAMPLES, 2 * SAMPLES))):
+        with open(tmp_path / name, "w", encoding="utf-8") as log_file:
+            log_file.write("Machine status updated: Start at 2026-01-01 00:00:00\n")
+            for sample in samples:
+                for sensor in range(SENSORS):
+                    log_file.write(json.dumps(record(sensor, sample), indent=4) + "\n")
+                if sample == SAMPLES + 10:
+                    log_file.write(json.dumps(record(0, -1), indent=4)[:80] + "\n")
+                    log_file.write("Kafka Error: Simulated broker outage\n")
+    return tmp_path
+
+
+def measurements(messages):
+    per_sensor = {}
+    for payload in messages:
+        message = json.loads(payload)
+        per_sensor.setdefault(message["sensor_id"], []).append(message["measurement"])
+    return per_sensor
+
+
+async def backfill(log_directory, producer=None, **options):
+    producer = producer or FakeProducer()
+    config = LoggerConfig(
+        sensor_id=None,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=producer,
+        sinks=["kafka"],
+        # Unbatched, so the producer sees every record before the next one is published.
+        batching=False,
+        partition_key="sensor_id",
+    )
+    await config.initialize()
+    runner = Backfill(config, [str(log_directory)], report_interval=None, **options)
+    if isinstance(producer, StoppingProducer):
+        producer.backfill = runner
+    try:
+        stats = await runner.run()
+    finally:
+        runner.close()
+        await config.close()
+    return stats, producer
+
+
+@pytest.mark.parametrize("executor", [None, "process"])
+def test_stopped_backfill_resumes_from_the_checkpoint(log_directory, executor, tmp_path_factory):
+    checkpoint = str(tmp_path_factory.mktemp("checkpoint") / "backfill.json")
+    total = SENSORS * 2 * SAMPLES
+
+    first, stopped = asyncio.run(backfill(
+        log_directory, producer=StoppingProducer(total * 3 // 4), executor=executor, checkpoint=checkpoint))
+    assert first.files == 1
+    assert first.records < total
+
+    second, resumed = asyncio.run(backfill(log_directory, executor=executor, checkpoint=checkpoint))
+    assert second.resumed == first.records - SENSORS * SAMPLES
+    assert first.records + second.records == total
+    # The torn record is skipped in both runs, without losing the records after it.
+    assert first.corrupted == second.corrupted == 1
+    expected = [float(sample) for sample in range(2 * SAMPLES)]
+    assert measurements(stopped.messages + resumed.messages) == {f"sensor-{sensor}": expected for sensor in range(SENSORS)}
+    assert all(key == json.loads(payload)["sensor_id"].encode() for payload, key in zip(resumed.messages, resumed.keys))
+
+    # Everything is published: another run has nothing left to do.
+    third, producer = asyncio.run(backfill(log_directory, executor=executor, checkpoint=checkpoint))
+    assert third.records == 0
+    assert producer.messages == []
+
+
+def test_checkpoint_of_other_filters_is_rejected(log_directory, tmp_path_factory):
+    checkpoint = str(tmp_path_factory.mktemp("checkpoint") / "backfill.json")
+    asyncio.run(backfill(log_directory, producer=StoppingProducer(100), executor=None, checkpoint=checkpoint))
+
+    with pytest.raises(ValueError):
+        asyncio.run(backfill(log_directory, executor=None, checkpoint=checkpoint, sensor_ids=["sensor-0"]))
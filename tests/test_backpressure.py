@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.status import Status
+from log_sdk.transport.backpressure import ALERT_PRIORITY, ENTRY_OVERHEAD, SheddingBuffer, priority_of
+from log_sdk.transport.batch_sender import BatchSender
+
+
+def offer(buffer, payload, status=Status.NORMAL, channel=None):
+    """
+    Adds a payload the way BatchSender.put does without blocking; returns False if it was shed.
+    """
+    size = len(payload) + ENTRY_OVERHEAD
+    priority = priority_of(status, channel)
+    if not buffer.fits(size) and not buffer.make_room(size, priority):
+        buffer.count_shed(status)
+        return False
+    buffer.push(payload, size, status, priority)
+    return True
+
+
+def payloads(buffer):
+    return [payload for payload, _ in buffer.pop_many(len(buffer))]
+
+
+def test_priority_of():
+    assert [priority_of(status) for status in Status] == [0, 1, 2, 3]
+    assert priority_of(None) == 0
+    assert priority_of(Status.NORMAL, Channel.ALERT) == ALERT_PRIORITY
+    assert priority_of(Status.FAULT, Channel.SENSOR) == 3
+    with pytest.raises(ValueError):
+        SheddingBuffer("drop_random")
+
+
+def test_drop_newest_keeps_the_buffer():
+    buffer = SheddingBuffer("drop_newest", max_items=3)
+    assert [offer(buffer, b"%d" % i) for i in range(5)] == [True, True, True, False, False]
+    assert buffer.shed == {"Normal": 2}
+    assert payloads(buffer) == [b"0", b"1", b"2"]
+    assert buffer.nbytes == 0
+
+
+def test_drop_oldest_evicts_the_head():
+    buffer = SheddingBuffer("drop_oldest", max_items=3)
+    assert all(offer(buffer, b"%d" % i) for i in range(5))
+    assert buffer.shed == {"Normal": 2}
+    assert payloads(buffer) == [b"2", b"3", b"4"]
+
+
+def test_byte_budget():
+    buffer = SheddingBuffer("drop_oldest", max_bytes=2 * (10 + ENTRY_OVERHEAD))
+    for i in range(3):
+        offer(buffer, b"%010d" % i)
+    assert len(buffer) == 2
+    assert buffer.nbytes == 2 * (10 + ENTRY_OVERHEAD)
+
+    # A payload larger than the whole budget evicts everything, then fits into the empty buffer.
+    assert offer(buffer, b"x" * 1000)
+    assert buffer.shed == {"Normal": 3}
+    assert payloads(buffer) == [b"x" * 1000]
+
+
+def test_drop_priority_evicts_the_oldest_of_the_lowest_priority():
+    buffer = SheddingBuffer("drop_priority", max_items=4)
+    for payload, status in ((b"n0", Status.NORMAL), (b"f1", Status.FAULT), (b"n2", Status.NORMAL), (b"w3", Status.WARNING)):
+        assert offer(buffer, payload, status)
+
+    assert offer(buffer, b"c4", Status.CRITICAL)  # evicts n0
+    assert offer(buffer, b"w5", Status.WARNING)  # evicts n2
+    assert offer(buffer, b"w6", Status.WARNING)  # no NORMAL left: evicts w3
+    assert not offer(buffer, b"n7", Status.NORMAL)  # nothing of priority 0 to evict: shed
+    assert offer(buffer, b"a8", Status.NORMAL, Channel.ALERT)  # alerts rank above FAULT: evicts w5
+
+    assert buffer.shed == {"Normal": 3, "Warning": 2}
+    # Eviction does not disturb the arrival order of what is left.
+    assert payloads(buffer) == [b"f1", b"c4", b"w6", b"a8"]
+
+
+def test_drop_priority_never_evicts_above_the_incoming_priority():
+    buffer = SheddingBuffer("drop_priority", max_items=2)
+    offer(buffer, b"c0", Status.CRITICAL)
+    offer(buffer, b"f1", Status.FAULT)
+    assert not offer(buffer, b"w2", Status.WARNING)
+    assert offer(buffer, b"f3", Status.FAULT)
+    assert buffer.shed == {"Warning": 1, "Critical": 1}
+    assert payloads(buffer) == [b"f1", b"f3"]
+
+
+def test_block_waits_for_space_and_sheds_after_the_timeout():
+    sent = []
+
+    async def run(block_timeout):
+        released = asyncio.Event()
+
+        async def send_batch(batch):
+            await released.wait()
+            sent.extend(payload for payload, _ in batch)
+
+        sender = BatchSender(send_batch, batch_size=1, linger_ms=0, max_queue_size=2, block_timeout=block_timeout)
+        sender.start()
+        assert await sender.put(b"a", Status.NORMAL)
+        # Let the drain task take "a"; its send then waits for the release.
+        while sender.qsize():
+            await asyncio.sleep(0)
+        assert await sender.put(b"b", Status.NORMAL)
+        assert await sender.put(b"c", Status.NORMAL)
+
+        put = asyncio.ensure_future(sender.put(b"d", Status.NORMAL))
+        await asyncio.sleep(0.05)
+        # Without a timeout the put is still waiting for the stalled send.
+        assert put.done() == (block_timeout is not None)
+        released.set()
+        accepted = await put
+        await sender.close()
+        return accepted, sender.shed
+
+    assert asyncio.run(run(None)) == (True, {})
+    assert sent == [b"a", b"b", b"c", b"d"]
+
+    sent.clear()
+    assert asyncio.run(run(0.01)) == (False, {"Normal": 1})
+    assert sent == [b"a", b"b", b"c"]
@@ -0,0 +1,43 @@
+from array import array
+
+import json
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.sensor_logs.batch import batch_columns
+from log_sdk.sensor_logs.vibration import VibrationLogData
+
+
+def make_template():
+    return VibrationLogData(
+        sensor_id="sensor-001",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=0.0,
+        measurement=0.0,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+    )
+
+
+def test_duration_columns_and_scalars():
+    template = make_template()
+    columns = batch_columns(template, array("d", [1.0, 2.0]), timestamps=[10.5, 11.000001], durations=array("d", [0.5, 0.25]))
+    assert columns == {"timestamp_ns": [10_500_000_000, 11_000_001_000], "duration": [0.5, 0.25], "measurement": [1.0, 2.0]}
+    assert batch_columns(template, [1.0, 2.0], durations=2)["duration"] == [2, 2]
+
+    with pytest.raises(ValueError):
+        batch_columns(template, [1.0, 2.0], durations=[0.5])
+
+
+def test_numpy_scalar_duration_is_shared_by_every_sample():
+    np = pytest.importorskip("numpy")
+    template = make_template()
+    for duration in (np.float32(0.5), np.float64(0.5), np.int64(2)):
+        columns = batch_columns(template, np.arange(3, dtype=np.float32), durations=duration)
+        assert columns["duration"] == [float(duration)] * 3
+        json.dumps(columns["duration"])
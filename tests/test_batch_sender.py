@@ -0,0 +1,62 @@
+import asyncio
+import json
+import logging
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.transport.batch_sender import BatchSender
+from tests.fakes import FakeProducer
+
+
+def test_records_logged_before_initialize_are_sent_once_started():
+    logger = LoggerConfig(
+        sensor_id="sensor-001",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=FakeProducer(),
+        sinks=["kafka"],
+        batching=True,
+    )
+    logger.logger.addHandler(logging.NullHandler())
+
+    async def run():
+        logger.update_machine_status(Action.START)
+        for measurement in range(3):
+            await logger.log_vibration(
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                duration=1.0,
+                measurement=float(measurement),
+                product=Product.MACHINE_MONITORING,
+                status=Status.NORMAL,
+            )
+        assert logger.batch_sender.qsize() == 3
+        await logger.initialize()
+        await logger.flush()
+        assert [json.loads(payload)["measurement"] for payload in logger.producer.messages] == [0.0, 1.0, 2.0]
+        await logger.close()
+
+    asyncio.run(run())
+
+
+def test_full_blocking_buffer_sheds_before_start():
+    batches = []
+
+    async def send_batch(batch):
+        batches.append(batch)
+
+    async def run():
+        sender = BatchSender(send_batch, max_queue_size=2, overload_policy="block")
+        assert await sender.put(b"first")
+        assert await sender.put(b"second")
+        # No drain task runs before start(), so waiting for space would never end.
+        assert not await sender.put(b"third")
+        sender.start()
+        await sender.close()
+
+    asyncio.run(run())
+    assert [payload for batch in batches for payload, _ in batch] == [b"first", b"second"]
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from log_sdk.consumer.runner import ConsumerRunner
+from log_sdk.consumer.sinks import CallbackSink, RecordSink
+from tests.fakes import FakeConsumer
+
+
+def payloads(count):
+    return [json.dumps({"sensor_id": "sensor-1", "measurement": float(i)}).encode() for i in range(count)]
+
+
+class FailingSink(RecordSink):
+    """
+    Keeps the written records and raises error on the write (or flush) number fail_at.
+    """
+    def __init__(self, error, fail_at=2, on_flush=False):
+        self.error = error
+        self.fail_at = fail_at
+        self.on_flush = on_flush
+        self.records = []
+        self.offsets = []
+        self.calls = 0
+
+
+    def _call(self):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise self.error
+
+
+    def write(self, records):
+        if not self.on_flush:
+            self._call()
+        self.records.extend(records)
+
+
+    def flush(self):
+        if self.on_flush:
+            self._call()
+
+
+    def committed(self, offsets):
+        self.offsets.append(offsets)
+
+
+def make_runner(consumer, sink, **options):
+    return ConsumerRunner(consumer, [sink], batch_size=10, executor=None, report_interval=None, **options)
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), KeyboardInterrupt()])
+def test_failed_write_is_not_committed(error):
+    consumer = FakeConsumer(payloads(30))
+    sink = FailingSink(error)
+    runner = make_runner(consumer, sink)
+
+    with pytest.raises(type(error)):
+        runner.run(idle_timeout=0)
+    runner.close()
+
+    assert len(sink.records) == 10
+    assert consumer.commits == [] and sink.offsets == []
+    assert runner.positions == {("sensor_logs", 0): 10}
+    assert consumer.closed
+    with pytest.raises(RuntimeError):
+        runner.poll_once()
+
+
+def test_batches_before_a_failure_are_committed_when_due():
+    consumer = FakeConsumer(payloads(30))
+    sink = FailingSink(OSError("disk full"), fail_at=3)
+    runner = make_runner(consumer, sink, commit_records=10)
+
+    with pytest.raises(OSError):
+        runner.run(idle_timeout=0)
+
+    assert consumer.commits == [10, 20]
+    assert sink.offsets[-1] == {("sensor_logs", 0): 20}
+
+
+def test_failed_flush_is_not_committed():
+    consumer = FakeConsumer(payloads(30))
+    sink = FailingSink(OSError("disk full"), fail_at=1, on_flush=True)
+    runner = make_runner(consumer, sink)
+
+    with pytest.raises(OSError):
+        runner.run(idle_timeout=0)
+    runner.close()
+
+    assert consumer.commits == [] and sink.offsets == []
+
+
+def test_clean_exit_commits_every_delivered_record():
+    consumer = FakeConsumer(payloads(25) + [None])
+    received = []
+    runner = make_runner(consumer, CallbackSink(received.extend))
+
+    runner.run(idle_timeout=0)
+
+    assert [record["measurement"] for record in received] == [float(i) for i in range(25)]
+    assert consumer.committed == 26
+    assert runner.stats.errors == 1
@@ -0,0 +1,87 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+from log_sdk.storage.file_sink import BufferedRotatingFileHandler, FileWriterListener, RecordQueueHandler
+
+
+def make_record(message):
+    return logging.LogRecord("sensor_logger", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_full_queue_drops_the_newest_record_without_waiting():
+    record_queue = queue.Queue(maxsize=2)
+    handler = RecordQueueHandler(record_queue)
+    for i in range(5):
+        handler.emit(make_record({"measurement": i}))
+
+    assert handler.dropped == 3
+    assert [record_queue.get_nowait().msg["measurement"] for _ in range(2)] == [0, 1]
+
+
+def test_full_queue_drops_the_oldest_record():
+    record_queue = queue.Queue(maxsize=2)
+    handler = RecordQueueHandler(record_queue, "drop_oldest")
+    for i in range(5):
+        handler.emit(make_record({"measurement": i}))
+
+    assert handler.dropped == 3
+    assert [record_queue.get_nowait().msg["measurement"] for _ in range(2)] == [3, 4]
+    # Dropped records are marked done, so flushing the writer does not wait for them.
+    record_queue.task_done()
+    record_queue.task_done()
+    record_queue.join()
+
+
+def test_metadata_is_copied_before_the_writer_thread_formats_it():
+    record_queue = queue.Queue()
+    handler = RecordQueueHandler(record_queue)
+    metadata = {"machine_status": "Machine Started", "batch": 1}
+    handler.emit(make_record({"measurement": 1.0, "metadata": metadata}))
+    metadata["batch"] = 2
+
+    assert record_queue.get_nowait().msg["metadata"] == {"machine_status": "Machine Started", "batch": 1}
+
+
+def test_writer_stops_with_a_full_queue():
+    record_queue = queue.Queue(maxsize=1)
+    release = threading.Event()
+    written = []
+
+    class SlowHandler(logging.Handler):
+        def emit(self, record):
+            release.wait()
+            written.append(record.msg["measurement"])
+
+    handler = RecordQueueHandler(record_queue)
+    listener = FileWriterListener(record_queue, SlowHandler(), flush_interval=0.01)
+    listener.start()
+    handler.emit(make_record({"measurement": 0}))
+    while not record_queue.empty():
+        time.sleep(0.001)
+    handler.emit(make_record({"measurement": 1}))
+
+    stopping = threading.Thread(target=listener.stop)
+    stopping.start()
+    time.sleep(0.01)
+    release.set()
+    stopping.join(timeout=5)
+
+    assert not stopping.is_alive()
+    assert written == [0, 1]
+
+
+def test_rotation_counts_bytes_of_non_ascii_records(tmp_path):
+    path = str(tmp_path / "sensor_logs.log")
+    handler = BufferedRotatingFileHandler(path, maxBytes=1000, backupCount=20, buffer_size=200)
+    # 50 characters, 99 bytes in UTF-8.
+    line = "Temperature: 21.5 °C " + "°" * 29
+    for _ in range(40):
+        handler.emit(make_record(line))
+    handler.close()
+
+    sizes = [os.path.getsize(os.path.join(tmp_path, name)) for name in os.listdir(tmp_path)]
+    assert sum(sizes) == 40 * (len(line.encode("utf-8")) + 1)
+    assert max(sizes) <= 1000
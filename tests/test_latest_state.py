@@ -0,0 +1,120 @@
+import gzip
+import json
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.consumer.runner import ConsumerRunner
+from log_sdk.consumer.state import LatestStateTable
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeConsumer, FakeTopicPartition
+
+SECOND = 1_000_000_000
+START_NS = 1_767_225_600 * SECOND
+
+
+def record(
+        sensor_id, second, measurement=None, status=Status.NORMAL, data_center=DataCenter.FACTORY_1,
+        log_class=VibrationLogData):
+    return log_class(
+        sensor_id,
+        channel=Channel.SENSOR,
+        data_center=data_center,
+        duration=1.0,
+        measurement=float(second) if measurement is None else measurement,
+        product=Product.MACHINE_MONITORING,
+        status=status,
+        metadata={"machine_status": "Start", "uptime": float(second)},
+        timestamp_ns=START_NS + second * SECOND,
+    ).to_dict()
+
+
+def states(table):
+    return sorted((state.to_dict() for state in table), key=lambda state: (state["sensor_id"], state["type"]))
+
+
+def consume(table, consumer):
+    runner = ConsumerRunner(consumer, [table], batch_size=10, executor=None, commit_records=10, report_interval=None)
+    runner.run(idle_timeout=0)
+    runner.close()
+
+
+def test_stale_records_are_ignored():
+    table = LatestStateTable()
+    table.write([record("sensor-0", 10), record("sensor-0", 5), record("sensor-0", 10, measurement=-1.0)])
+    # An equal timestamp replaces the state, an older one does not.
+    state = table.get("sensor-0", SensorType.VIBRATION)
+    assert (state.measurement, state.uptime, table.stale) == (-1.0, 10.0, 1)
+    assert state.status_duration(START_NS + 15 * SECOND) == 15.0
+
+    # Late records of another type or sensor are not stale.
+    table.write([record("sensor-0", 1, log_class=TemperatureLogData), record("sensor-1", 1), {"sensor_id": "sensor-2"}])
+    assert {state.type for state in table.sensor("sensor-0")} == {SensorType.VIBRATION.value, SensorType.TEMPERATURE.value}
+    assert (len(table), table.stale, table.invalid) == (3, 1, 1)
+
+
+def test_scan_follows_data_center_changes():
+    table = LatestStateTable()
+    table.write([record("sensor-0", 1), record("sensor-1", 1, status=Status.CRITICAL)])
+    table.write([record("sensor-0", 2, data_center=DataCenter.POWER_PLANT)])
+
+    assert [state.sensor_id for state in table.scan(data_center=DataCenter.POWER_PLANT)] == ["sensor-0"]
+    assert [state.sensor_id for state in table.scan(data_center=DataCenter.FACTORY_1, product=Product.MACHINE_MONITORING)] == ["sensor-1"]
+    assert [state.sensor_id for state in table.scan(status=Status.CRITICAL)] == ["sensor-1"]
+    assert table.scan(data_center=DataCenter.FACTORY_1, type=SensorType.TEMPERATURE) == []
+
+
+def test_snapshot_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "state" / "latest.json.gz")
+    table = LatestStateTable(path, snapshot_interval=None)
+    table.write([record(f"sensor-{i}", i, status=list(Status)[i % 4]) for i in range(8)])
+    table.write([record("sensor-0", 20, log_class=TemperatureLogData)])
+    table.committed({("sensor_logs", 0): 9, ("sensor_logs", 1): 4})
+    # Without a snapshot_interval only close() writes a snapshot.
+    assert table.snapshots == 0
+    table.close()
+
+    restored = LatestStateTable(path)
+    assert states(restored) == states(table)
+    assert restored.offsets == {("sensor_logs", 0): 9, ("sensor_logs", 1): 4}
+    assert restored.get("sensor-3", SensorType.VIBRATION.value).status is Status.FAULT
+    # The secondary indexes are rebuilt.
+    assert len(restored.scan(data_center=DataCenter.FACTORY_1, product=Product.MACHINE_MONITORING)) == 9
+
+    with open(path, "rb") as snapshot_file:
+        document = json.loads(gzip.decompress(snapshot_file.read()))
+    document["version"] += 1
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(gzip.compress(json.dumps(document).encode()))
+    with pytest.raises(ValueError):
+        LatestStateTable(path)
+
+
+def test_restart_replays_the_records_after_the_snapshot(tmp_path):
+    path = str(tmp_path / "latest.json.gz")
+    records = [record(f"sensor-{i % 4}", i, log_class=VibrationLogData if i % 3 else TemperatureLogData) for i in range(45)]
+    payloads = [json.dumps(item).encode() for item in records]
+
+    # The first run stops after 25 records, with a snapshot after every commit.
+    table = LatestStateTable(path, snapshot_interval=0.0)
+    consume(table, FakeConsumer(payloads[:25]))
+    assert table.snapshots >= 2
+
+    restarted = LatestStateTable(path, snapshot_interval=None)
+    assert restarted.offsets == {("sensor_logs", 0): 25}
+    consumer = FakeConsumer(payloads)
+    restarted.on_assign(consumer, [FakeTopicPartition("sensor_logs", 0), FakeTopicPartition("sensor_logs", 1)])
+    # Partitions without a snapshot offset keep the committed one.
+    assert consumer.assigned[1].offset == FakeTopicPartition.OFFSET_INVALID
+    assert consumer.position == 25
+
+    consume(restarted, consumer)
+    rebuilt = LatestStateTable()
+    rebuilt.write(records)
+    assert states(restarted) == states(rebuilt)
+    assert restarted.offsets == {("sensor_logs", 0): 45}
@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+
+import json
+import os
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.sensor_logs.base_sensor import format_timestamp_ns
+from log_sdk.sensor_logs.temperature import TemperatureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.storage.compression import compress_file
+from log_sdk.storage.partitioned_store import INDEX_SUFFIX, LogStoreReader, PartitionedLogStore, RecordLines
+
+SECOND = 1_000_000_000
+START_NS = 1_767_225_600 * SECOND
+SENSORS = ["sensor-0", "sensor-1", "sensor-2"]
+
+
+def record(sensor_id, second, log_class=VibrationLogData):
+    return log_class(
+        sensor_id,
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=1.0,
+        measurement=float(second),
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        timestamp_ns=START_NS + second * SECOND,
+    ).to_dict()
+
+
+def fill(store):
+    """
+    Three hours of readings every 30 s of three vibration sensors and one temperature sensor,
+    the temperature readings appended as serialized lines like log_batch does; returns them all.
+    """
+    records = []
+    for second in range(0, 3 * 3600, 30):
+        for sensor_id in SENSORS:
+            records.append(record(sensor_id, second))
+            store.append(records[-1], START_NS + second * SECOND)
+        temperature = record("sensor-0", second, TemperatureLogData)
+        records.append(temperature)
+        store.append_lines(RecordLines(
+            "sensor-0", temperature["type"], [START_NS + second * SECOND], [json.dumps(temperature)]))
+    return records
+
+
+def expected(records, sensor_id=None, type=None, start=None, end=None):
+    return [
+        record for record in records
+        if (sensor_id is None or record["sensor_id"] == sensor_id)
+        and (type is None or record["type"] == type)
+        and (start is None or record["measurement"] >= start)
+        and (end is None or record["measurement"] < end)
+    ]
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_query_filters_by_sensor_type_and_time(tmp_path, compressed):
+    store = PartitionedLogStore(
+        str(tmp_path), partition_seconds=3600, bucket_seconds=60, segment_bytes=64 * 1024, flush_interval=3600,
+        on_segment_closed=compress_file if compressed else None,
+    )
+    records = fill(store)
+    if compressed:
+        store.close()
+    reader = LogStoreReader(str(tmp_path))
+    # One segment per hour at least; an hour of records is larger than segment_bytes.
+    assert len(reader.segments()) > 3
+    query = reader.query if compressed else store.query
+
+    # A query of an open store sees the records appended before it.
+    assert list(query()) == records
+    vibration = SensorType.VIBRATION.value
+    assert list(query(sensor_id="sensor-1")) == expected(records, sensor_id="sensor-1")
+    assert list(query(sensor_id="sensor-0", type=SensorType.TEMPERATURE)) == \
+        expected(records, sensor_id="sensor-0", type=SensorType.TEMPERATURE.value)
+    assert list(query(type=vibration, start=START_NS / SECOND + 3590, end=START_NS / SECOND + 3700)) == \
+        expected(records, type=vibration, start=3590, end=3700)
+
+    # Bounds may also be datetimes and record timestamp strings; the end is exclusive.
+    start = datetime.fromtimestamp(START_NS / SECOND + 7200, timezone.utc)
+    end = format_timestamp_ns(START_NS + 7230 * SECOND)
+    assert list(query(sensor_id="sensor-2", start=start, end=end)) == expected(records, sensor_id="sensor-2", start=7200, end=7230)
+    assert list(query(start=START_NS / SECOND + 4 * 3600)) == []
+    assert list(query(sensor_id="sensor-9")) == []
+    store.close()
+
+
+def test_query_only_reads_the_indexed_ranges(tmp_path):
+    store = PartitionedLogStore(str(tmp_path), flush_interval=3600)
+    # Each sensor logs a minute of readings at once, like log_batch does.
+    for minute in range(10):
+        for sensor_id in SENSORS:
+            for second in range(minute * 60, minute * 60 + 60, 10):
+                store.append(record(sensor_id, second))
+    store.close()
+
+    (name, path), = LogStoreReader(str(tmp_path)).segments()
+    with open(os.path.join(str(tmp_path), name + INDEX_SUFFIX), encoding="utf-8") as index:
+        entries = [json.loads(line) for line in index]
+    # One entry per sensor, type and minute, and the covered size.
+    assert sorted((entry["sensor_id"], entry["bucket"]) for entry in entries if "bucket" in entry) == \
+        sorted((sensor_id, START_NS // (60 * SECOND) + minute) for sensor_id in SENSORS for minute in range(10))
+    assert entries[-1]["covered"] == os.path.getsize(path)
+
+    # Overwrite every sensor-1 line with garbage: queries of the other sensors never read it.
+    with open(path, "rb") as segment:
+        lines = segment.readlines()
+    with open(path, "wb") as segment:
+        segment.writelines(b"x" * (len(line) - 1) + b"\n" if b'"sensor-1"' in line else line for line in lines)
+
+    reader = LogStoreReader(str(tmp_path))
+    assert [record["measurement"] for record in reader.query(sensor_id="sensor-2", start=START_NS / SECOND + 300)] == \
+        [float(second) for second in range(300, 600, 10)]
+    with pytest.raises(ValueError):
+        list(reader.query(sensor_id="sensor-1"))
+
+
+def test_unindexed_tail_and_late_records(tmp_path):
+    store = PartitionedLogStore(str(tmp_path), flush_interval=3600)
+    records = [record("sensor-0", second) for second in range(0, 300, 10)]
+    for item in records[:10]:
+        store.append(item)
+    store.flush()
+    for item in records[10:]:
+        store.append(item)
+    # A late record stays in the current segment under its own time bucket.
+    late = record("sensor-1", -3600)
+    store.append(late)
+    store._segment.flush()
+
+    # Records written after the last index flush are found by scanning the tail.
+    reader = LogStoreReader(str(tmp_path))
+    assert list(reader.query(sensor_id="sensor-0")) == records
+    assert list(reader.query(end=START_NS / SECOND)) == [late]
+
+    # A record torn by a crash is skipped.
+    store._segment.write(json.dumps(record("sensor-0", 500)).encode()[:40])
+    store._segment.flush()
+    assert list(reader.query(sensor_id="sensor-0")) == records
+    store.close()
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.common.type import SensorType
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.processing.aggregation import WindowAggregation
+from log_sdk.processing.deadband import Deadband
+from log_sdk.sensor_logs.pressure import PressureLogData
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from tests.fakes import FakeProducer
+
+START = 1_767_225_600
+
+
+def test_readings_absorbed_by_aggregation_count_as_suppressed():
+    logger = LoggerConfig(
+        sensor_id="sensor-001",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=FakeProducer(),
+        sinks=["kafka"],
+        aggregation={SensorType.VIBRATION: WindowAggregation(window_seconds=10.0)},
+        deadband={PressureLogData: Deadband(absolute=1.0)},
+    )
+    logger.logger.addHandler(logging.NullHandler())
+    reading = dict(channel=Channel.SENSOR, data_center=DataCenter.FACTORY_1, product=Product.MACHINE_MONITORING)
+
+    async def run():
+        await logger.initialize()
+        logger.update_machine_status(Action.START)
+        # Three 10 s windows at 10 Hz; the last reading of the first two is a WARNING, passed through immediately.
+        for window in range(3):
+            for first, count, status in ((0, 99, Status.NORMAL), (99, 1, Status.WARNING if window < 2 else Status.NORMAL)):
+                await logger.log_batch(
+                    VibrationLogData,
+                    [float(i % 7) for i in range(first, first + count)],
+                    timestamps=[START + window * 10 + i / 10 for i in range(first, first + count)],
+                    durations=0.1,
+                    status=status,
+                    **reading,
+                )
+        # The first pressure reading is sent, the other four are within the deadband.
+        for i in range(5):
+            await logger.log_pressure(duration=1.0, measurement=2.0, status=Status.NORMAL, **reading)
+        await logger.close()
+        return logger.metrics_snapshot()
+
+    snapshot = asyncio.run(run())
+    counters = logger.processing_counters()
+    assert counters["aggregation"] == {"suppressed": {"VibrationLogData": 298}, "rollups": {"VibrationLogData": 3}}
+    assert counters["deadband"]["suppressed"] == {"PressureLogData": 4}
+    assert snapshot["records_suppressed_total"] == 298 + 4
+    # Two pass-through readings, three rollups and one pressure reading.
+    assert snapshot["records_emitted_total"] == 6
@@ -0,0 +1,64 @@
+import gzip
+import json
+
+import pytest
+
+from log_sdk.storage import readers
+from log_sdk.storage.readers import iter_records
+
+
+def record(i):
+    return {"sensor_id": f"sensor-{i}", "measurement": float(i), "metadata": {"machine_status": "Machine Started"}}
+
+
+@pytest.fixture(params=[64, readers._CHUNK])
+def chunk(request, monkeypatch):
+    # Small chunks put record boundaries and torn records across reads.
+    monkeypatch.setattr(readers, "_CHUNK", request.param)
+    return request.param
+
+
+def write(path, text, compressed=False):
+    opener = gzip.open if compressed else open
+    with opener(path, "wt", encoding="utf-8") as log_file:
+        log_file.write(text)
+    return path
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_torn_ndjson_record_mid_file_is_skipped(tmp_path, chunk, compressed):
+    lines = [json.dumps(record(i)) for i in range(1001)]
+    lines[500] = lines[500][:25]
+    path = write(tmp_path / ("sensor_logs.log" + (".gz" if compressed else "")), "\n".join(lines) + "\n", compressed)
+    corrupted = []
+
+    records = list(iter_records(str(path), on_corrupt=corrupted.append))
+
+    assert [r["measurement"] for r in records] == [float(i) for i in range(1001) if i != 500]
+    assert corrupted == [lines[500]]
+
+
+def test_torn_pretty_record_keeps_text_lines_and_following_records(tmp_path, chunk):
+    torn = json.dumps(record(1), indent=4)
+    text = "\n".join([
+        json.dumps(record(0), indent=4),
+        torn[:len(torn) // 2],
+        "2026-01-01 00:00:00 - Machine status updated",
+        json.dumps(record(2), indent=4),
+    ]) + "\n"
+    path = write(tmp_path / "sensor_logs.log", text)
+    corrupted = []
+
+    records = list(iter_records(str(path), include_text=True, on_corrupt=corrupted.append))
+
+    assert records == [record(0), {"message": "2026-01-01 00:00:00 - Machine status updated"}, record(2)]
+    assert len(corrupted) == 1
+
+
+def test_truncated_last_record_is_skipped(tmp_path, chunk):
+    text = json.dumps(record(0)) + "\n" + json.dumps(record(1))[:-3]
+    path = write(tmp_path / "sensor_logs.log", text)
+    corrupted = []
+
+    assert list(iter_records(str(path), on_corrupt=corrupted.append)) == [record(0)]
+    assert len(corrupted) == 1
@@ -0,0 +1,91 @@
+import io
+import os
+import time
+
+import pytest
+
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.sensor_logs import base_sensor
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.serializers import columnar, get_serializer
+
+# 2025-11-02 01:30 in New York happens twice; 2025-03-09 02:30 never does.
+DST_TIMESTAMPS_NS = (1762061400_000000000, 1762065000_250000000, 1741503600_000001000, 1741505400_999999000)
+
+
+@pytest.fixture
+def time_zone(monkeypatch):
+    original = os.environ.get("TZ")
+
+    def set_zone(name):
+        os.environ["TZ"] = name
+        time.tzset()
+        # The formatting caches assume the time zone of a process never changes.
+        for cache in ("_second_cache", "_parse_cache", "_offset_parse_cache", "_offset_format_cache"):
+            monkeypatch.setattr(base_sensor, cache, (None,) * len(getattr(base_sensor, cache)))
+
+    yield set_zone
+    if original is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = original
+    time.tzset()
+
+
+def make_record(timestamp_ns):
+    return VibrationLogData(
+        sensor_id="sensor-001",
+        channel=Channel.SENSOR,
+        data_center=DataCenter.FACTORY_1,
+        duration=2.0,
+        measurement=4.5,
+        product=Product.MACHINE_MONITORING,
+        status=Status.NORMAL,
+        metadata={"machine_status": "Start", "uptime": 2.010275, "line": 3},
+        timestamp_ns=timestamp_ns,
+    ).to_dict()
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+@pytest.mark.parametrize("timestamp_ns", DST_TIMESTAMPS_NS)
+def test_binary_timestamp_survives_a_consumer_in_another_time_zone(time_zone, timestamp_ns):
+    serializer = get_serializer("binary")
+    time_zone("America/New_York")
+    record = make_record(timestamp_ns)
+    payload = serializer.dumps(record)
+
+    for consumer_zone in ("UTC", "Asia/Kolkata", "America/New_York"):
+        time_zone(consumer_zone)
+        assert serializer.loads(payload) == record
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+def test_column_block_timestamps_survive_a_consumer_in_another_time_zone(time_zone):
+    time_zone("America/New_York")
+    records = [make_record(timestamp_ns) for timestamp_ns in sorted(DST_TIMESTAMPS_NS)]
+    blocks = columnar.encode_records(records)
+    assert len(blocks) == 1
+
+    for consumer_zone in ("UTC", "Asia/Kolkata", "America/New_York"):
+        time_zone(consumer_zone)
+        assert columnar.decode_block(blocks[0]) == records
+        assert list(columnar.iter_blocks(io.BytesIO(blocks[0] * 2))) == records * 2
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+def test_column_block_keeps_nanoseconds_and_local_offsets(time_zone):
+    time_zone("America/New_York")
+    timestamps = sorted(DST_TIMESTAMPS_NS) + [DST_TIMESTAMPS_NS[1] + 7]
+    block = columnar.encode_block(make_record(timestamps[0]), timestamps, [2.0] * 5, [4.5] * 5)
+
+    time_zone("UTC")
+    columns = columnar.decode_block_columns(block)
+    assert columns["timestamp_ns"] == timestamps
+    assert columns["utc_offsets"] == [(0, -4 * 3600), (3, -5 * 3600)]
+    assert [record["timestamp"] for record in columnar.iter_block(block)] == [
+        "2025-03-09T03:00:00.000001", "2025-03-09T03:30:00.999999", "2025-11-02T01:30:00",
+        "2025-11-02T01:30:00.250000", "2025-11-02T01:30:00.250000",
+    ]
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+
+import pytest
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.transport import shared_ring
+from log_sdk.transport.shared_ring import RingLogger, SharedRing
+
+
+READING = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    duration=1.0,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing(capacity=64)
+    yield ring
+    ring.close()
+
+
+def log(logger, first, count):
+    for measurement in range(first, first + count):
+        logger.log_vibration(measurement=float(measurement), **READING)
+
+
+def crashing_worker(ring_name, first, count):
+    logger = RingLogger(ring_name, "worker")
+    logger.update_machine_status(Action.START)
+    log(logger, first, count)
+    # Exits without close(), like a crashed worker.
+    os._exit(0)
+
+
+def read(ring, count=1000):
+    return [(record.sensor_id, record.measurement) for record in ring.read_many(count)]
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_restarted_worker_resumes_at_the_shared_write_index(ring):
+    context = multiprocessing.get_context("fork")
+    for first in (0, 5):
+        worker = context.Process(target=crashing_worker, args=(ring.name, first, 5))
+        worker.start()
+        worker.join()
+        assert worker.exitcode == 0
+        if first == 0:
+            assert read(ring, 2) == [("worker", 0.0), ("worker", 1.0)]
+
+    assert read(ring) == [("worker", float(measurement)) for measurement in range(2, 10)]
+
+
+def test_reattached_writer_keeps_a_record_written_before_the_index(ring):
+    writer = SharedRing(ring.name)
+    logger = RingLogger(ring.name, "sensor", ring=writer)
+    log(logger, 0, 2)
+    # The crash hit between writing the second slot and publishing the write index.
+    writer._header[shared_ring._WRITE_INDEX] = 1
+    logger.close()
+    writer.close()
+
+    logger = RingLogger(ring.name, "sensor")
+    log(logger, 2, 1)
+    logger.close()
+    assert read(ring) == [("sensor", 0.0), ("sensor", 1.0), ("sensor", 2.0)]
+
+
+def test_loggers_of_one_ring_share_the_writer(ring):
+    first = RingLogger(ring.name, "first")
+    second = RingLogger(ring.name, "second")
+    assert first.ring is second.ring
+    for measurement in range(10):
+        log(first, measurement, 1)
+        log(second, measurement, 1)
+    first.close()
+    log(second, 10, 1)
+    second.close()
+
+    records = read(ring)
+    assert len(records) == 21
+    assert [measurement for sensor_id, measurement in records if sensor_id == "first"] == [float(m) for m in range(10)]
+    assert [measurement for sensor_id, measurement in records if sensor_id == "second"] == [float(m) for m in range(11)]
+
+
+def test_second_writing_handle_or_process_is_rejected(ring):
+    logger = RingLogger(ring.name, "sensor")
+    other = SharedRing(ring.name)
+    with pytest.raises(RuntimeError):
+        other.attach_writer()
+    other.close()
+    logger.close()
+
+    # A writer process that is still running (the parent of the test process stands in for it).
+    ring._header[shared_ring._WRITER] = os.getppid()
+    with pytest.raises(RuntimeError):
+        RingLogger(ring.name, "sensor")
+    ring._header[shared_ring._WRITER] = 0
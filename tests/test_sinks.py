@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.logger_config import LoggerConfig
+from log_sdk.transport.partitioning import partition_for
+from log_sdk.transport.sinks import create_sink, create_sinks
+from log_sdk.transport.sinks.base import FanOutSink, Sink, SinkError
+from log_sdk.transport.sinks.memory_sink import MemorySink
+from tests.fakes import FakeBroker
+
+PARTITIONS = 4
+
+
+class FailingSink(Sink):
+    """
+    Raises on every send while fail is set, and keeps the payloads it accepted.
+    """
+    label = "Failing"
+
+    def __init__(self):
+        self.fail = True
+        self.payloads = []
+
+
+    async def send(self, payload, key=None):
+        if self.fail:
+            raise ConnectionError("Simulated outage")
+        self.payloads.append(payload)
+
+
+class UnkeyedSink(Sink):
+    """
+    A sink written before partition keys, whose send takes no key.
+    """
+    def __init__(self):
+        self.payloads = []
+
+
+    async def send(self, payload):
+        self.payloads.append(payload)
+
+
+async def log_readings(logger, sensors, readings):
+    logger.update_machine_status(Action.START)
+    for measurement in range(readings):
+        for sensor_id in sensors:
+            logger.sensor_id = sensor_id
+            await logger.log_temperature(
+                channel=Channel.SENSOR,
+                data_center=DataCenter.FACTORY_1,
+                duration=1.0,
+                measurement=float(measurement),
+                product=Product.MACHINE_MONITORING,
+                status=Status.NORMAL,
+            )
+
+
+def make_logger(sinks, **options):
+    logger = LoggerConfig(
+        sensor_id="sensor-0",
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=FakeBroker(PARTITIONS),
+        sinks=sinks,
+        **options,
+    )
+    # Without a file the logger has no handler; keep the expected send errors off stderr.
+    logger.logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def test_fan_out_delivers_every_record_to_every_sink_with_its_key():
+    memory = MemorySink()
+    logger = make_logger(["kafka", memory], partition_key="sensor_id")
+    sensors = [f"sensor-{i}" for i in range(8)]
+
+    async def run():
+        await logger.initialize()
+        await log_readings(logger, sensors, 5)
+        await logger.close()
+
+    asyncio.run(run())
+    assert isinstance(logger.sink, FanOutSink)
+    assert [json.loads(payload) for payload in logger.producer.messages] == memory.records()
+
+    per_sensor = {}
+    for partition, messages in enumerate(logger.producer.partitions):
+        for key, payload in messages:
+            record = json.loads(payload)
+            assert key == record["sensor_id"].encode()
+            assert partition == partition_for(key, PARTITIONS)
+            per_sensor.setdefault(record["sensor_id"], []).append(record["measurement"])
+    assert per_sensor == {sensor_id: [float(m) for m in range(5)] for sensor_id in sensors}
+
+
+def test_failing_sink_does_not_stop_the_others():
+    failing, memory, unkeyed = FailingSink(), MemorySink(), UnkeyedSink()
+    sink = FanOutSink([failing, memory, unkeyed])
+    assert sink.label == "Failing+Memory+Sink"
+
+    with pytest.raises(SinkError) as raised:
+        asyncio.run(sink.send(b"first"))
+    assert raised.value.label == "Failing"
+    assert isinstance(raised.value.__cause__, ConnectionError)
+
+    failing.fail = False
+    asyncio.run(sink.send(b"second"))
+    assert failing.payloads == [b"second"]
+    assert list(memory.payloads) == [b"first", b"second"]
+    assert unkeyed.payloads == [b"first", b"second"]
+
+
+def test_fan_out_counts_failures_and_replays_them_from_the_spool(tmp_path):
+    failing, memory = FailingSink(), MemorySink()
+    logger = make_logger([failing, memory], spool_directory=str(tmp_path), replay_rate=10000.0)
+
+    async def run():
+        await logger.initialize()
+        await log_readings(logger, ["sensor-0"], 10)
+        snapshot = logger.metrics_snapshot()
+        failing.fail = False
+        for _ in range(500):
+            if not logger.spool.pending:
+                break
+            await asyncio.sleep(0.01)
+        await logger.close()
+        return snapshot
+
+    snapshot = asyncio.run(run())
+    # After the first failure the records go straight to the spool until the sinks recover.
+    assert snapshot["send_failures_total"] == 1
+    assert snapshot["records_spooled_total"] == 10
+    expected = [float(m) for m in range(10)]
+    assert [json.loads(payload)["measurement"] for payload in failing.payloads] == expected
+    # The memory sink had accepted the first record and gets it again on replay (at least once).
+    assert [record["measurement"] for record in memory.records()] == [0.0] + expected
+
+
+def test_create_sinks():
+    memory = MemorySink()
+    assert create_sinks([]) is None
+    assert create_sinks([memory]) is memory
+    assert create_sink(memory) is memory
+
+    fan_out = create_sinks(["memory", "udp://127.0.0.1:9999"])
+    assert isinstance(fan_out, FanOutSink)
+    assert fan_out.label == "Memory+UDP"
+    with pytest.raises(ValueError):
+        create_sink("udp://127.0.0.1")
+    with pytest.raises(ValueError):
+        create_sink("carrier-pigeon")
@@ -0,0 +1,153 @@
+import asyncio
+import os
+
+from log_sdk.transport.spool import DiskSpool, SpoolReplayer
+
+
+def payload(i):
+    return f"record-{i:04d}".encode()
+
+
+def replay(spool, batch=7):
+    """
+    Reads and commits everything in the spool.
+    """
+    payloads = []
+    while True:
+        records = spool.read(batch)
+        if not records:
+            return payloads
+        payloads.extend(data for data, _ in records)
+        spool.commit(records[-1][1])
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".seg"))
+
+
+def test_replay_resumes_after_restart_in_the_tail_segment(tmp_path):
+    spool = DiskSpool(str(tmp_path))
+    for i in range(10):
+        spool.append(payload(i))
+    records = spool.read(4)
+    spool.commit(records[-1][1])
+    spool.close()
+
+    spool = DiskSpool(str(tmp_path))
+    assert spool.pending == 6
+    for i in range(10, 15):
+        spool.append(payload(i))
+    assert segment_files(tmp_path) == ["0000000001.seg"]
+    assert replay(spool) == [payload(i) for i in range(4, 15)]
+    spool.close()
+
+    spool = DiskSpool(str(tmp_path))
+    assert spool.pending == 0 and spool.read(10) == []
+    spool.close()
+
+
+def test_torn_tail_is_cut_before_appending(tmp_path):
+    spool = DiskSpool(str(tmp_path))
+    for i in range(3):
+        spool.append(payload(i))
+    spool.close()
+    with open(tmp_path / "0000000001.seg", "ab") as segment:
+        segment.write(b"\x20\x00\x00\x00torn")
+
+    spool = DiskSpool(str(tmp_path))
+    spool.append(payload(3))
+    assert replay(spool) == [payload(i) for i in range(4)]
+    assert spool.dropped == 0
+    spool.close()
+
+
+def test_overflow_drops_oldest_segments_and_counts_them_once(tmp_path):
+    frame = 8 + len(payload(0))
+    spool = DiskSpool(str(tmp_path), segment_bytes=10 * frame, max_bytes=30 * frame)
+    for i in range(50):
+        spool.append(payload(i))
+
+    assert spool.dropped == 20
+    assert spool.pending == 30
+    assert replay(spool) == [payload(i) for i in range(20, 50)]
+    assert spool.dropped == 20
+    spool.close()
+
+
+def test_commit_into_a_segment_dropped_after_read(tmp_path):
+    frame = 8 + len(payload(0))
+    spool = DiskSpool(str(tmp_path), segment_bytes=10 * frame, max_bytes=30 * frame)
+    for i in range(30):
+        spool.append(payload(i))
+    records = spool.read(5)
+
+    # The replayer sends the five records while new appends drop the segment they came from.
+    for i in range(30, 40):
+        spool.append(payload(i))
+    spool.commit(records[-1][1])
+
+    assert spool.dropped == 5
+    assert replay(spool) == [payload(i) for i in range(10, 40)]
+    assert spool.pending == 0
+    spool.close()
+
+
+def test_replayer_sends_the_backlog_in_order_after_a_restart(tmp_path):
+    sent = []
+
+    async def send(data):
+        sent.append(data)
+
+    async def run(spool, count):
+        replayer = SpoolReplayer(spool, send, rate=1e6, batch_size=4, retry_interval=0.001)
+        replayer.start()
+        while len(sent) < count:
+            await asyncio.sleep(0.001)
+        await replayer.close()
+
+    spool = DiskSpool(str(tmp_path))
+    for i in range(20):
+        spool.append(payload(i))
+    asyncio.run(run(spool, 8))
+    spool.close()
+
+    spool = DiskSpool(str(tmp_path))
+    asyncio.run(run(spool, 20))
+    spool.close()
+    assert sent == [payload(i) for i in range(20)]
+
+
+def test_replayer_waits_after_a_failure_in_the_middle_of_a_batch(tmp_path):
+    attempts, sent = [], []
+    failing = True
+
+    async def send(data):
+        attempts.append(data)
+        if failing and len(sent) == 2:
+            raise ConnectionError("Simulated outage")
+        sent.append(data)
+
+    async def run(spool):
+        nonlocal failing
+        errors = []
+        replayer = SpoolReplayer(spool, send, rate=1e6, batch_size=4, retry_interval=0.2, on_error=errors.append)
+        replayer.start()
+        await asyncio.sleep(0.1)
+        # Two records were sent and committed, then the sink failed and is retried only after retry_interval.
+        assert attempts == [payload(0), payload(1), payload(2)]
+        assert not replayer.healthy
+        assert len(errors) == 1
+        assert spool.pending == 8
+
+        failing = False
+        while len(sent) < 10:
+            await asyncio.sleep(0.01)
+        await replayer.close()
+        assert replayer.healthy
+
+    spool = DiskSpool(str(tmp_path))
+    for i in range(10):
+        spool.append(payload(i))
+    asyncio.run(run(spool))
+    spool.close()
+    assert sent == [payload(i) for i in range(10)]
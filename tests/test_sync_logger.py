@@ -0,0 +1,103 @@
+from array import array
+
+import json
+import logging
+import threading
+
+import pytest
+
+from log_sdk.common.action import Action
+from log_sdk.common.channel import Channel
+from log_sdk.common.data_center import DataCenter
+from log_sdk.common.product import Product
+from log_sdk.common.status import Status
+from log_sdk.sensor_logs.vibration import VibrationLogData
+from log_sdk.sync_logger import SyncLogger
+from tests.fakes import FakeProducer
+
+READING = dict(
+    channel=Channel.SENSOR,
+    data_center=DataCenter.FACTORY_1,
+    product=Product.MACHINE_MONITORING,
+    status=Status.NORMAL,
+)
+
+
+def make_logger(sensor_id="sensor-000", **options):
+    logger = SyncLogger(
+        sensor_id,
+        KAFKA_BOOTSTRAP_SERVERS="localhost:9092",
+        KAFKA_TOPIC="sensor_logs",
+        producer=FakeProducer(),
+        sinks=["kafka"],
+        **options,
+    )
+    logger.config.logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def measurements(producer):
+    per_sensor = {}
+    for payload in producer.messages:
+        message = json.loads(payload)
+        per_sensor.setdefault(message["sensor_id"], []).append(message["measurement"])
+    return per_sensor
+
+
+@pytest.mark.parametrize("batching", [True, False])
+def test_records_from_many_threads_keep_their_order_per_sensor(batching):
+    # A small max_pending makes the threads wait for the loop thread.
+    logger = make_logger(max_pending=32, batching=batching)
+    threads_count, records = 4, 500
+    start = threading.Barrier(threads_count)
+
+    def drive(index):
+        handle = logger.sensor(f"sensor-{index}")
+        handle.update_machine_status(Action.START)
+        start.wait()
+        for measurement in range(records):
+            handle.log_vibration(duration=1.0, measurement=float(measurement), **READING)
+
+    threads = [threading.Thread(target=drive, args=(index,)) for index in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert logger.sensor("sensor-0") is logger.sensor("sensor-0")
+    logger.close()
+
+    expected = [float(measurement) for measurement in range(records)]
+    assert measurements(logger.config.producer) == {f"sensor-{index}": expected for index in range(threads_count)}
+    assert logger.pending() == 0
+
+
+def test_flush_log_batch_and_metrics():
+    with make_logger() as logger:
+        logger.update_machine_status(Action.START)
+        logger.log_vibration(duration=1.0, measurement=1.0, **READING)
+
+        column = array("d", [2.0, 3.0])
+        logger.log_batch(VibrationLogData, column, durations=0.5, **READING)
+        # The column is copied by log_batch, so the caller may reuse it right away.
+        column[0] = -1.0
+
+        assert logger.flush(timeout=5.0)
+        producer = logger.config.producer
+        assert measurements(producer) == {"sensor-000": [1.0, 2.0, 3.0]}
+        assert [json.loads(payload)["duration"] for payload in producer.messages] == [1.0, 0.5, 0.5]
+        assert logger.metrics_snapshot()["records_emitted_total"] == 3
+        assert "records_emitted_total" in logger.metrics_text()
+
+    with pytest.raises(RuntimeError):
+        logger.log_vibration(duration=1.0, measurement=4.0, **READING)
+    # Closing again does nothing.
+    logger.close()
+
+
+def test_numpy_scalar_durations():
+    numpy = pytest.importorskip("numpy")
+    with make_logger() as logger:
+        logger.update_machine_status(Action.START)
+        logger.log_batch(VibrationLogData, numpy.arange(3, dtype=numpy.float32), durations=numpy.float32(0.5), **READING)
+        assert logger.flush(timeout=5.0)
+        assert [json.loads(payload)["duration"] for payload in logger.config.producer.messages] == [0.5] * 3